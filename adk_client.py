@@ -0,0 +1,149 @@
+"""
+Shared async client for talking to the ADK API server.
+
+The gateway in api.py used to open a fresh blocking ``requests`` connection
+for every call, which stalls the uvicorn event loop while waiting on ADK.
+This module keeps one long-lived ``httpx.AsyncClient`` per process with
+keep-alive pooling, so concurrent chats share warm connections instead of
+paying a TCP handshake (and a blocked worker) per turn.
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+
+class ADKClient:
+    """Long-lived, connection-pooled async client for the ADK API server.
+
+    Args:
+        base_url: Base URL of the ADK server (e.g. "http://localhost:8000")
+        app_name: ADK app name used in session URLs and run payloads
+        max_connections: Upper bound on open connections in the pool
+        max_keepalive_connections: Idle connections kept warm for reuse
+        keepalive_expiry: Seconds an idle pooled connection stays open
+        connect_timeout: Seconds to wait when opening a new connection
+        default_timeout: Default read/write timeout for short calls
+        run_timeout: Read timeout for agent runs, which can take a while
+        transport: Optional httpx transport override (used by tests)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        app_name: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        default_timeout: float = 10.0,
+        run_timeout: float = 60.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.app_name = app_name
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.default_timeout = httpx.Timeout(default_timeout, connect=connect_timeout)
+        self.run_timeout = httpx.Timeout(run_timeout, connect=connect_timeout)
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying pooled client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=self.default_timeout,
+                headers={"Content-Type": "application/json"},
+                transport=self.transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pool. Safe to call more than once."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    def session_path(self, user_id: str, session_id: str) -> str:
+        """Relative URL of an ADK session resource."""
+        return f"/apps/{self.app_name}/users/{user_id}/sessions/{session_id}"
+
+    def build_run_payload(
+        self,
+        user_id: str,
+        session_id: str,
+        message_parts: list,
+        streaming: bool = False,
+    ) -> Dict[str, Any]:
+        """Build the request body for ADK's /run and /run_sse endpoints."""
+        payload = {
+            "app_name": self.app_name,
+            "user_id": user_id,
+            "session_id": session_id,
+            "new_message": {
+                "role": "user",
+                "parts": message_parts
+            }
+        }
+        if streaming:
+            payload["streaming"] = True
+        return payload
+
+    async def ping(self, timeout: float = 5.0) -> httpx.Response:
+        """GET the ADK root, used by health checks."""
+        return await self.client.get("/", timeout=timeout)
+
+    async def create_session(
+        self, user_id: str, session_id: str, state: Optional[dict] = None
+    ) -> httpx.Response:
+        """Create (or re-create) an ADK session with an optional initial state."""
+        return await self.client.post(
+            self.session_path(user_id, session_id), json=state or {}
+        )
+
+    async def get_session(self, user_id: str, session_id: str) -> httpx.Response:
+        """Fetch an ADK session, including its events."""
+        return await self.client.get(self.session_path(user_id, session_id))
+
+    async def run(
+        self, user_id: str, session_id: str, message_parts: list
+    ) -> httpx.Response:
+        """Run the agent for one turn and return ADK's full event list response."""
+        payload = self.build_run_payload(user_id, session_id, message_parts)
+        return await self.client.post("/run", json=payload, timeout=self.run_timeout)
+
+    async def run_sse(
+        self, user_id: str, session_id: str, message_parts: list
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run the agent through ADK's /run_sse endpoint with token streaming.
+
+        Yields each server-sent event as a dict as soon as it arrives. With
+        streaming enabled ADK emits ``partial`` events carrying text deltas,
+        followed by the aggregated, non-partial event for each model turn.
+        """
+        payload = self.build_run_payload(user_id, session_id, message_parts, streaming=True)
+        async with self.client.stream(
+            "POST", "/run_sse", json=payload, timeout=self.run_timeout
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                yield {"error": f"ADK returned {response.status_code}: {body.decode(errors='replace')}"}
+                return
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if not data:
+                    continue
+                try:
+                    yield json.loads(data)
+                except json.JSONDecodeError:
+                    yield {"error": f"Malformed event from ADK: {data[:200]}"}
@@ -10,7 +10,15 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from google.adk.cli.fast_api import get_fast_api_app
-from orchestrator_agent.agent import root_agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from google.adk.events import Event
+from orchestrator_agent.agent import response_cache, root_agent
+from orchestrator_agent.sub_agents.weather_agent.agent import forecast_cache, weather_cache, weather_client, weather_rate_limiter
+from orchestrator_agent.intent_router import get_classifier, route_fast_path
+from session_store import SessionRecord, SessionStore
+from sqlite_session_service import SqliteSessionService
 import base64
 import httpx
 from fastapi.middleware.cors import CORSMiddleware
@@ -64,9 +72,100 @@ async def startup_event():
         if key in ['PORT', 'RAILWAY_DEPLOYMENT_VERSION', 'OTEL_PYTHON_DISABLED']:
             logger.info(f"  {key}: {value}")
     logger.info("=" * 60)
+    if INTENT_FAST_PATH:
+        # Train the intent classifier now rather than on the event loop during the first message
+        await asyncio.to_thread(get_classifier)
 
-# Session storage (in production, use a proper database)
-sessions: Dict[str, Dict] = {}
+# Close pooled outbound connections on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    await weather_client.aclose()
+    if session_sweeper is not None:
+        session_sweeper.cancel()
+
+# Drive the orchestrator in-process through one shared Runner instead of
+# looping back through the mounted ADK HTTP app for every message
+APP_NAME = "orchestrator_agent"
+# Set SESSION_DB_PATH to persist conversations across restarts and share
+# them between uvicorn workers on the same host
+if os.getenv("SESSION_DB_PATH"):
+    session_service = SqliteSessionService(os.getenv("SESSION_DB_PATH"))
+    logger.info(f"Using SQLite session store at {os.getenv('SESSION_DB_PATH')}")
+else:
+    session_service = InMemorySessionService()
+runner = Runner(
+    agent=root_agent,
+    app_name=APP_NAME,
+    session_service=session_service,
+)
+
+def drop_adk_session(record: SessionRecord, reason: str):
+    """Delete the ADK session backing an evicted gateway session.
+
+    A persistent session store is shared with other workers and outlives this
+    process, so there only the local record goes; the database expires
+    sessions itself (see ``sweep_idle_sessions``).
+    """
+    logger.info(f"Evicting session {record.session_id} ({reason})")
+    if isinstance(session_service, SqliteSessionService):
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    loop.create_task(session_service.delete_session(
+        app_name=APP_NAME, user_id=record.user_id, session_id=record.session_id
+    ))
+
+# Idle persisted sessions are deleted from the database by a periodic sweep
+SESSION_DB_TTL_SECONDS = float(os.getenv("SESSION_DB_TTL_SECONDS", 7 * 24 * 3600))
+SESSION_DB_SWEEP_SECONDS = float(os.getenv("SESSION_DB_SWEEP_SECONDS", 3600))
+session_sweeper: Optional[asyncio.Task] = None
+
+async def sweep_idle_sessions():
+    """Delete persisted sessions idle for longer than SESSION_DB_TTL_SECONDS, forever."""
+    while True:
+        try:
+            deleted = await session_service.delete_idle_sessions(SESSION_DB_TTL_SECONDS)
+            if deleted:
+                logger.info(f"🧹 Deleted {deleted} idle session(s) from {os.getenv('SESSION_DB_PATH')}")
+        except Exception as e:
+            logger.error(f"Idle session sweep failed: {e}")
+        await asyncio.sleep(SESSION_DB_SWEEP_SECONDS)
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    global session_sweeper
+    if isinstance(session_service, SqliteSessionService) and SESSION_DB_TTL_SECONDS > 0:
+        session_sweeper = asyncio.create_task(sweep_idle_sessions())
+
+# Answer confidently classified time/weather/image-search requests locally,
+# skipping the orchestrator LLM round-trip
+INTENT_FAST_PATH = os.getenv("INTENT_FAST_PATH", "true").lower() == "true"
+INTENT_FAST_PATH_THRESHOLD = float(os.getenv("INTENT_FAST_PATH_THRESHOLD", 0.85))
+
+async def record_fast_path_turn(user_id: str, session_id: str, new_message: types.Content, response: str):
+    """Add a fast-path exchange to the ADK session so follow-ups keep their context."""
+    adk_session = await session_service.get_session(
+        app_name=APP_NAME, user_id=user_id, session_id=session_id
+    )
+    invocation_id = Event.new_id()
+    await session_service.append_event(adk_session, Event(
+        author="user", invocation_id=invocation_id, content=new_message
+    ))
+    await session_service.append_event(adk_session, Event(
+        author=root_agent.name,
+        invocation_id=invocation_id,
+        content=types.Content(role="model", parts=[types.Part.from_text(text=response)])
+    ))
+
+# Session storage: bounded, with idle-TTL eviction and capped history
+sessions = SessionStore(
+    ttl_seconds=float(os.getenv("SESSION_TTL_SECONDS", 3600)),
+    max_sessions=int(os.getenv("MAX_SESSIONS", 10000)),
+    max_messages=int(os.getenv("MAX_SESSION_MESSAGES", 50)),
+    on_evict=drop_adk_session,
+)
 
 # Pydantic models
 class SessionRequest(BaseModel):
@@ -109,12 +208,7 @@ async def start_session(request: Request):
             raise HTTPException(status_code=400, detail="user_id is required")
 
         session_id = f"session-{int(datetime.now().timestamp())}"
-        # Use a plain dict for session storage
-        sessions[session_id] = {
-            "user_id": user_id,
-            "created_at": datetime.now().isoformat(),
-            "messages": []
-        }
+        sessions.create(session_id, user_id)
         logger.info(f"Session created: {session_id} for user: {user_id}")
         return {
             "session_id": session_id,
@@ -126,112 +220,102 @@ async def start_session(request: Request):
         logger.error(f"Error creating session: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create session: {str(e)}")
 
+# Session store statistics
+@app.get("/sessions/stats")
+async def session_stats():
+    """Live session count, evictions and approximate memory held by history"""
+    return sessions.stats()
+
+# Host-wide OpenWeather quota usage
+@app.get("/weather/quota")
+async def weather_quota():
+    """Token-bucket state shared by all workers calling OpenWeather"""
+    if weather_rate_limiter is None:
+        return {"enabled": False}
+    return {"enabled": True, **weather_rate_limiter.stats()}
+
+# Sub-agent response cache statistics
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters of the sub-agent response cache and the weather caches"""
+    return {**response_cache.stats(), "weather": weather_cache.stats(), "forecast": forecast_cache.stats()}
+
 # Message sending endpoint
 @app.post("/send_message")
 async def send_message(request: MessageRequest):
     """Send a message to the ADK server"""
     try:
         # Validate session
-        if request.session_id not in sessions:
-            raise HTTPException(status_code=404, detail="Session not found")
+        session_record = sessions.get(request.session_id)
+        if session_record is None:
+            # The session may have been started by another worker or before a
+            # restart; adopt it if the persistent session service knows it
+            adk_session = await session_service.get_session(
+                app_name=APP_NAME, user_id=request.user_id, session_id=request.session_id
+            )
+            if adk_session is None:
+                raise HTTPException(status_code=404, detail="Session not found")
+            session_record = sessions.create(request.session_id, request.user_id)
         
-        # Prepare message parts
-        message_parts = [{"text": request.message}]
+        # Prepare message parts; the image and the text must be in separate parts
+        message_parts = [types.Part.from_text(text=request.message)]
         if request.photo_data:
-            # The image and the text must be in separate parts
-            message_parts.append({
-                "inline_data": {
-                    "mime_type": "image/jpeg",
-                    "data": request.photo_data
-                }
-            })
+            message_parts.append(types.Part.from_bytes(
+                data=base64.b64decode(request.photo_data),
+                mime_type="image/jpeg"
+            ))
+        new_message = types.Content(role="user", parts=message_parts)
         
-        # Get session data
-        session_data = sessions[request.session_id]
-        user_id = session_data["user_id"]
+        user_id = session_record.user_id
         
-        # Use the ADK app directly since it's integrated
-        if adk_app is None:
-            raise HTTPException(status_code=503, detail="ADK server not available")
+        # Make sure the ADK session exists for this conversation
+        adk_session = await session_service.get_session(
+            app_name=APP_NAME, user_id=user_id, session_id=request.session_id
+        )
+        if adk_session is None:
+            await session_service.create_session(
+                app_name=APP_NAME, user_id=user_id, session_id=request.session_id
+            )
         
-        # Create a test client for the main app (not the mounted ADK app)
-        from fastapi.testclient import TestClient
-        test_client = TestClient(app)
+        fast_route = None
+        if INTENT_FAST_PATH and not request.photo_data:
+            fast_route = await route_fast_path(request.message, INTENT_FAST_PATH_THRESHOLD)
         
-        # First, create the session in ADK
-        adk_session_url = f"/adk/apps/orchestrator_agent/users/{user_id}/sessions/{request.session_id}"
-        try:
-            session_response = test_client.post(adk_session_url)
-            if session_response.status_code != 200:
-                logger.warning(f"ADK session creation returned {session_response.status_code}")
-        except Exception as e:
-            logger.warning(f"Failed to create ADK session: {e}")
+        if fast_route:
+            logger.info(
+                f"Fast path for session {request.session_id}: {fast_route['tool']}"
+                f"({fast_route['args']}) confidence={fast_route['confidence']:.2f}"
+            )
+            final_response = fast_route["response"]
+            await record_fast_path_turn(user_id, request.session_id, new_message, final_response)
+        else:
+            logger.info(f"Running {APP_NAME} for session {request.session_id}")
+            
+            # Run the agent in-process and collect the final response text
+            final_response = ""
+            async for event in runner.run_async(
+                user_id=user_id,
+                session_id=request.session_id,
+                new_message=new_message
+            ):
+                if event.content and event.content.parts:
+                    for part in event.content.parts:
+                        if part.text:
+                            final_response += part.text
         
-        # Send message to ADK
-        adk_run_url = "/adk/run"
+        # Store message in session
+        sessions.append_message(request.session_id, "user", request.message)
+        sessions.append_message(request.session_id, "assistant", final_response)
         
-        payload = {
-            "app_name": "orchestrator_agent",
-            "user_id": user_id,
+        return {
+            "success": True,
+            "response": final_response,
             "session_id": request.session_id,
-            "new_message": {
-                "role": "user",
-                "parts": message_parts
-            }
+            "user_id": user_id
         }
         
-        logger.info(f"Sending message to: {adk_run_url}")
-        logger.info(f"Payload: {json.dumps(payload, indent=2)}")
-        
-        # Send the request to the ADK endpoint
-        response = test_client.post(adk_run_url, json=payload)
-        
-        if response.status_code == 200:
-            adk_response = response.json()
-            logger.info(f"ADK Response Events: {json.dumps(adk_response, indent=2)}")
-            
-            # Extract the final response text
-            final_response = ""
-            # Handle both dict (with "events") and list (direct events)
-            if isinstance(adk_response, dict) and "events" in adk_response:
-                events = adk_response["events"]
-            elif isinstance(adk_response, list):
-                events = adk_response
-            else:
-                events = []
-
-            for event in events:
-                if "content" in event and "parts" in event["content"]:
-                    for part in event["content"]["parts"]:
-                        if "text" in part:
-                            final_response += part["text"]
-            
-            # Store message in session
-            sessions[request.session_id]["messages"].append({
-                "role": "user",
-                "content": request.message,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            sessions[request.session_id]["messages"].append({
-                "role": "assistant", 
-                "content": final_response,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-            return {
-                "success": True,
-                "response": final_response,
-                "session_id": request.session_id,
-                "user_id": user_id
-            }
-        else:
-            logger.error(f"ADK server error: {response.text}")
-            raise HTTPException(
-                status_code=503, 
-                detail=f"ADK server error: {response.text}"
-            )
-            
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error sending message: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to send message to ADK: {str(e)}")
@@ -272,6 +356,9 @@ async def root():
             "health": "/health",
             "start_session": "/start_session",
             "send_message": "/send_message",
+            "session_stats": "/sessions/stats",
+            "cache_stats": "/cache/stats",
+            "weather_quota": "/weather/quota",
             "adk_ui": "/adk/dev-ui/",
             "adk_run": "/adk/run"
         }
@@ -26,8 +26,11 @@ agents_dir = os.path.dirname(os.path.abspath(__file__))
 
 try:
     # Create web server using ADK's built-in FastAPI app
+    # SESSION_SERVICE_URI (e.g. sqlite:///sessions.db) persists the sessions
+    # the api.py gateway creates; unset keeps ADK's in-memory default
     app = get_fast_api_app(
         agents_dir=agents_dir,
+        session_service_uri=os.getenv("SESSION_SERVICE_URI"),
         web=True,
     )
 
@@ -1,9 +1,10 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 import asyncio
-import requests
+import httpx
 import json
 import os
 from typing import Optional
@@ -11,6 +12,7 @@ import time
 import re
 from urllib.parse import quote_plus
 from dotenv import load_dotenv
+from adk_client import ADKClient
 
 # Load environment variables from .env file
 load_dotenv()
@@ -20,6 +22,13 @@ class Settings(BaseSettings):
     ADK_BASE_URL: str = "http://localhost:8000"
     APP_NAME: str = "orchestrator_agent"
     USER_ID: str = "traveler"
+    # Connection pool and timeouts for the shared ADK client
+    ADK_MAX_CONNECTIONS: int = 100
+    ADK_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    ADK_KEEPALIVE_EXPIRY: float = 30.0
+    ADK_CONNECT_TIMEOUT: float = 5.0
+    ADK_DEFAULT_TIMEOUT: float = 10.0
+    ADK_RUN_TIMEOUT: float = 60.0
     
     class Config:
         # Load from .env file
@@ -30,6 +39,22 @@ settings = Settings()
 
 app = FastAPI(title="Travel Assistant API", version="1.0.0")
 
+# One pooled client per worker process, shared by every endpoint
+adk_client = ADKClient(
+    base_url=settings.ADK_BASE_URL,
+    app_name=settings.APP_NAME,
+    max_connections=settings.ADK_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.ADK_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.ADK_KEEPALIVE_EXPIRY,
+    connect_timeout=settings.ADK_CONNECT_TIMEOUT,
+    default_timeout=settings.ADK_DEFAULT_TIMEOUT,
+    run_timeout=settings.ADK_RUN_TIMEOUT,
+)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await adk_client.aclose()
+
 # CORS configuration for Streamlit frontend
 app.add_middleware(
     CORSMiddleware,
@@ -71,7 +96,7 @@ class HealthResponse(BaseModel):
 async def health_check():
     """Check the health of both ADK and API servers."""
     try:
-        adk_response = requests.get(f"{settings.ADK_BASE_URL}/", timeout=5)
+        adk_response = await adk_client.ping(timeout=5)
         adk_status = "Online" if adk_response.status_code == 200 else "Error"
     except:
         adk_status = "Offline"
@@ -89,12 +114,7 @@ async def start_session(request: StartSessionRequest):
     try:
         # Create session with ADK using the correct endpoint pattern
         session_id = f"session-{int(time.time())}"
-        session_url = f"{settings.ADK_BASE_URL}/apps/{settings.APP_NAME}/users/{request.user_id}/sessions/{session_id}"
-        response = requests.post(
-            session_url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps({})
-        )
+        response = await adk_client.create_session(request.user_id, session_id)
         
         if response.status_code != 200:
             print(f"ADK session creation failed: {response.status_code} - {response.text}")
@@ -107,7 +127,7 @@ async def start_session(request: StartSessionRequest):
             user_id=request.user_id
         )
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"ADK server error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -117,42 +137,13 @@ async def start_session(request: StartSessionRequest):
 async def send_message(request: MessageRequest):
     """Send a message to the travel assistant agent."""
     try:
-        # Send message to ADK using the correct /run endpoint
-        run_url = f"{settings.ADK_BASE_URL}/run"
-        headers = {"Content-Type": "application/json"}
+        # Prepare message parts, including photo data if provided
+        message_parts = build_message_parts(request)
         
-        # Prepare message parts
-        message_parts = [{"text": request.message}]
+        # Send message to ADK using the /run endpoint over the pooled client
+        print(f"Sending message to: {settings.ADK_BASE_URL}/run")
         
-        # Add photo data if provided
-        if request.photo_data:
-            message_parts.append({
-                "inline_data": {
-                    "mime_type": "image/jpeg",
-                    "data": request.photo_data
-                }
-            })
-        
-        # Corrected payload structure based on working speaker_app.py example
-        payload = {
-            "app_name": settings.APP_NAME,
-            "user_id": request.user_id,
-            "session_id": request.session_id,
-            "new_message": {
-                "role": "user",
-                "parts": message_parts
-            }
-        }
-        
-        print(f"Sending message to: {run_url}")
-        print(f"Payload: {json.dumps(payload, indent=2)}")
-        
-        response = requests.post(
-            run_url,
-            json=payload,
-            headers=headers,
-            timeout=60
-        )
+        response = await adk_client.run(request.user_id, request.session_id, message_parts)
         
         if response.status_code != 200:
             print(f"ADK message sending failed: {response.status_code} - {response.text}")
@@ -163,40 +154,10 @@ async def send_message(request: MessageRequest):
         print(f"ADK Response Events: {json.dumps(events, indent=2)}")
         
         # Extract the agent's response from the events
-        full_response = ""
-        for event in events:
-            # Look for the final text response from the model
-            if (event.get("content", {}).get("role") == "model" and 
-                "parts" in event.get("content", {}) and 
-                len(event["content"]["parts"]) > 0 and
-                "text" in event["content"]["parts"][0]):
-                full_response = event["content"]["parts"][0]["text"]
-                break  # Take the first model response we find
-        
-        # If no response found, try alternative parsing
-        if not full_response:
-            for event in events:
-                if "content" in event and "parts" in event["content"]:
-                    for part in event["content"]["parts"]:
-                        if "text" in part:
-                            full_response = part["text"]
-                            break
-                    if full_response:
-                        break
+        full_response = extract_response_text(events)
         
         # Check if this is a tourist spots response and process accordingly
-        image_links = None
-        processed_response = full_response.strip() if full_response else "No response received"
-        
-        # Detect tourist spots queries (simple keyword matching)
-        tourist_keywords = ["tourist", "attractions", "landmarks", "sights", "places to visit", "must see"]
-        is_tourist_query = any(keyword in request.message.lower() for keyword in tourist_keywords)
-        
-        if is_tourist_query and "[IMAGE:" in processed_response:
-            # Process tourist spots response
-            processed_data = process_tourist_spots_response(processed_response)
-            processed_response = processed_data["text"]
-            image_links = processed_data["image_links"]
+        processed_response, image_links = finalize_response(request.message, full_response)
         
         return MessageResponse(
             response=processed_response,
@@ -205,25 +166,126 @@ async def send_message(request: MessageRequest):
             image_links=image_links
         )
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"ADK server error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+def extract_response_text(events: list) -> str:
+    """
+    The agent's answer in a list of (complete, non-partial) ADK events.
+
+    Shared by /send_message and /send_message_stream so both endpoints give
+    the same answer for the same conversation.
+
+    Returns:
+        The text of the first model event that has text, else the first text
+        part of any event, else "".
+    """
+    for event in events:
+        # Look for the final text response from the model
+        content = event.get("content") or {}
+        parts = content.get("parts") or []
+        if content.get("role") == "model" and parts and "text" in parts[0]:
+            return parts[0]["text"]
+    # If no response found, try alternative parsing
+    for event in events:
+        for part in (event.get("content") or {}).get("parts") or []:
+            if "text" in part:
+                return part["text"]
+    return ""
+
+def build_message_parts(request: MessageRequest) -> list:
+    """Build the ADK message parts for a user message and optional photo."""
+    message_parts = [{"text": request.message}]
+    if request.photo_data:
+        message_parts.append({
+            "inline_data": {
+                "mime_type": "image/jpeg",
+                "data": request.photo_data
+            }
+        })
+    return message_parts
+
+def sse_event(data: dict) -> str:
+    """Format a dict as one server-sent event."""
+    return f"data: {json.dumps(data)}\n\n"
+
+# Stream the agent's answer as it is generated
+@app.post("/send_message_stream")
+async def send_message_stream(request: MessageRequest):
+    """
+    Send a message to the travel assistant and stream the answer back as
+    server-sent events.
+
+    Emits ``{"type": "chunk", "text": ...}`` for each piece of model text as
+    ADK produces it, then a single ``{"type": "done", ...}`` event carrying
+    the full cleaned response and ``image_links``. Failures are reported as
+    ``{"type": "error", "detail": ...}``.
+    """
+    message_parts = build_message_parts(request)
+
+    async def event_stream():
+        final_events = []
+        streamed_text = ""
+        try:
+            async for event in adk_client.run_sse(request.user_id, request.session_id, message_parts):
+                if "error" in event:
+                    yield sse_event({"type": "error", "detail": event["error"]})
+                    return
+
+                content = event.get("content") or {}
+                if not event.get("partial"):
+                    final_events.append(event)
+                if content.get("role") != "model":
+                    continue
+                text = "".join(part.get("text", "") for part in content.get("parts", []))
+                if not text:
+                    continue
+
+                if event.get("partial"):
+                    streamed_text += text
+                    yield sse_event({"type": "chunk", "text": text})
+                else:
+                    # The aggregated event repeats what the partials already
+                    # sent; only forward it when nothing was streamed for it
+                    # (e.g. text coming straight from a sub-agent turn).
+                    if not streamed_text:
+                        yield sse_event({"type": "chunk", "text": text})
+                    streamed_text = ""
+        except httpx.HTTPError as e:
+            yield sse_event({"type": "error", "detail": f"ADK server error: {str(e)}"})
+            return
+
+        full_response = extract_response_text(final_events) or streamed_text
+        processed_response, image_links = finalize_response(request.message, full_response)
+        yield sse_event({
+            "type": "done",
+            "response": processed_response,
+            "success": True,
+            "session_id": request.session_id,
+            "image_links": image_links
+        })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Get session info
 @app.get("/session/{session_id}")
 async def get_session(session_id: str):
     """Get information about a specific session."""
     try:
-        session_url = f"{settings.ADK_BASE_URL}/apps/{settings.APP_NAME}/users/{settings.USER_ID}/sessions/{session_id}"
-        response = requests.get(session_url)
+        response = await adk_client.get_session(settings.USER_ID, session_id)
         
         if response.status_code == 404:
             raise HTTPException(status_code=404, detail="Session not found")
         
         return response.json()
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"ADK server error: {str(e)}")
 
 def extract_image_links_from_response(response_text):
@@ -250,6 +312,28 @@ def extract_image_links_from_response(response_text):
     
     return image_links
 
+def finalize_response(message, full_response):
+    """
+    Clean up the agent's final text and pull out tourist spot image links.
+
+    Returns:
+        Tuple of (processed_response, image_links), where image_links is None
+        unless the message was a tourist spots query with [IMAGE: ...] markers.
+    """
+    image_links = None
+    processed_response = full_response.strip() if full_response else "No response received"
+    
+    # Detect tourist spots queries (simple keyword matching)
+    tourist_keywords = ["tourist", "attractions", "landmarks", "sights", "places to visit", "must see"]
+    is_tourist_query = any(keyword in message.lower() for keyword in tourist_keywords)
+    
+    if is_tourist_query and "[IMAGE:" in processed_response:
+        processed_data = process_tourist_spots_response(processed_response)
+        processed_response = processed_data["text"]
+        image_links = processed_data["image_links"]
+    
+    return processed_response, image_links
+
 def process_tourist_spots_response(response_text):
     """
     Process tourist spots response to extract image links and clean up the text.
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-turn overhead of the combined service's /send_message path.
+
+Compares the old approach (a TestClient per message, looping back through the
+mounted ADK app for session create + /adk/run) with driving the agent
+in-process through a shared Runner. A no-LLM echo agent is used so the numbers
+isolate gateway overhead from model latency.
+
+Usage:
+    python bench_combined_turn.py [turns]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from google.adk.cli.fast_api import get_fast_api_app
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+ECHO_AGENT_SOURCE = '''
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.genai import types
+
+
+class EchoAgent(BaseAgent):
+    async def _run_async_impl(self, ctx):
+        text = ctx.user_content.parts[0].text if ctx.user_content else ""
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[types.Part.from_text(text=f"echo: {text}")]),
+        )
+
+
+root_agent = EchoAgent(name="echo_agent")
+'''
+
+
+def make_agents_dir() -> str:
+    """Write a throwaway agents dir containing the echo agent."""
+    agents_dir = tempfile.mkdtemp(prefix="bench_agents_")
+    package_dir = os.path.join(agents_dir, "echo_agent")
+    os.makedirs(package_dir)
+    with open(os.path.join(package_dir, "__init__.py"), "w") as f:
+        f.write("from . import agent\n")
+    with open(os.path.join(package_dir, "agent.py"), "w") as f:
+        f.write(ECHO_AGENT_SOURCE)
+    return agents_dir
+
+
+def bench_testclient(agents_dir: str, turns: int) -> list:
+    """Old path: new TestClient per message plus two loopback HTTP calls."""
+    app = FastAPI()
+    app.mount("/adk", get_fast_api_app(agents_dir=agents_dir, web=False))
+
+    timings = []
+    for i in range(turns):
+        start = time.perf_counter()
+        test_client = TestClient(app)
+        session_id = f"session-{i}"
+        test_client.post(f"/adk/apps/echo_agent/users/bench/sessions/{session_id}")
+        response = test_client.post("/adk/run", json={
+            "app_name": "echo_agent",
+            "user_id": "bench",
+            "session_id": session_id,
+            "new_message": {"role": "user", "parts": [{"text": "hello"}]}
+        })
+        assert response.status_code == 200, response.text
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_runner(agents_dir: str, turns: int) -> list:
+    """New path: shared Runner and session service, run_async awaited directly."""
+    sys.path.insert(0, agents_dir)
+    from echo_agent.agent import root_agent
+
+    session_service = InMemorySessionService()
+    runner = Runner(agent=root_agent, app_name="echo_agent", session_service=session_service)
+
+    async def run_turns():
+        timings = []
+        for i in range(turns):
+            start = time.perf_counter()
+            session_id = f"session-{i}"
+            session = await session_service.get_session(
+                app_name="echo_agent", user_id="bench", session_id=session_id
+            )
+            if session is None:
+                await session_service.create_session(
+                    app_name="echo_agent", user_id="bench", session_id=session_id
+                )
+            text = ""
+            async for event in runner.run_async(
+                user_id="bench",
+                session_id=session_id,
+                new_message=types.Content(role="user", parts=[types.Part.from_text(text="hello")])
+            ):
+                if event.content and event.content.parts:
+                    text += "".join(part.text or "" for part in event.content.parts)
+            assert text == "echo: hello"
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    return asyncio.run(run_turns())
+
+
+def report(label: str, timings: list) -> float:
+    timings_ms = sorted(t * 1000 for t in timings)
+    p50 = statistics.median(timings_ms)
+    p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+    print(f"{label:<28} p50 {p50:8.2f} ms   p95 {p95:8.2f} ms   mean {statistics.mean(timings_ms):8.2f} ms")
+    return p50
+
+
+if __name__ == "__main__":
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    agents_dir = make_agents_dir()
+
+    print(f"🏁 Per-turn gateway overhead over {turns} turns (echo agent, no LLM)")
+    print("=" * 80)
+    old = report("TestClient per message", bench_testclient(agents_dir, turns))
+    new = report("Shared in-process Runner", bench_runner(agents_dir, turns))
+    print("=" * 80)
+    print(f"Speedup at p50: {old / new:.1f}x")
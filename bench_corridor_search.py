@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark corridor search ("restaurants near my route") over synthetic
+city-sized point sets.
+
+Points are scattered uniformly over a ~15 x 15 km box around central Paris;
+routes are 2-8 random stops inside the central ~6 km. Reports, per dataset
+size:
+  - grid index build time
+  - median / p95 corridor query time (candidate gathering + exact distances)
+  - median time of a vectorized full scan over every point, for comparison
+
+Usage:
+    python bench_corridor_search.py [queries_per_size]
+"""
+
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.walking_routes_agent.corridor import corridor_search
+from orchestrator_agent.sub_agents.walking_routes_agent.grid_index import METERS_PER_DEG, GridIndex
+
+SIZES = [10_000, 100_000, 300_000, 1_000_000]
+BUFFER_M = 250
+LAT0, LON0 = 48.8566, 2.3522
+
+
+def full_scan(lat, lon, path_lat, path_lon, buffer_m):
+    scale = np.cos(np.radians(LAT0)) * METERS_PER_DEG
+    px, py = lon * scale, lat * METERS_PER_DEG
+    d = np.full(len(lat), np.inf)
+    for k in range(len(path_lat) - 1):
+        ax, ay = path_lon[k] * scale, path_lat[k] * METERS_PER_DEG
+        dx, dy = path_lon[k + 1] * scale - ax, path_lat[k + 1] * METERS_PER_DEG - ay
+        t = np.clip(((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy), 0, 1)
+        d = np.minimum(d, np.hypot(px - ax - t * dx, py - ay - t * dy))
+    return np.flatnonzero(d <= buffer_m)
+
+
+def main(queries: int) -> None:
+    rng = np.random.default_rng(7)
+    print(f"🍽️ Corridor search benchmark ({BUFFER_M} m buffer)")
+    print("=" * 78)
+    print(f"{'Points':>9}  {'build ms':>8}  {'median ms':>9}  {'p95 ms':>7}  {'full scan ms':>12}  {'avg hits':>8}")
+    for n in SIZES:
+        lat = rng.uniform(LAT0 - 0.07, LAT0 + 0.07, n).astype(np.float32)
+        lon = rng.uniform(LON0 - 0.1, LON0 + 0.1, n).astype(np.float32)
+        start = time.perf_counter()
+        grid = GridIndex(lat, lon, cell_m=200)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        times, scans, hits = [], [], []
+        lat64, lon64 = lat.astype(np.float64), lon.astype(np.float64)
+        for _ in range(queries):
+            stops = int(rng.integers(2, 9))
+            path_lat = rng.uniform(LAT0 - 0.027, LAT0 + 0.027, stops)
+            path_lon = rng.uniform(LON0 - 0.04, LON0 + 0.04, stops)
+            start = time.perf_counter()
+            idx, _, _ = corridor_search(grid, path_lat, path_lon, BUFFER_M)
+            times.append((time.perf_counter() - start) * 1000)
+            hits.append(len(idx))
+            if len(scans) < 10:
+                start = time.perf_counter()
+                full_scan(lat64, lon64, path_lat, path_lon, BUFFER_M)
+                scans.append((time.perf_counter() - start) * 1000)
+        times.sort()
+        p95 = times[min(len(times) - 1, int(0.95 * len(times)))]
+        print(
+            f"{n:9d}  {build_ms:8.1f}  {statistics.median(times):9.2f}  {p95:7.2f}  "
+            f"{statistics.median(scans):12.2f}  {statistics.mean(hits):8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local intent-classifier fast path.
+
+Runs a held-out set of realistic queries (phrasings and cities not in the
+training templates) through orchestrator_agent.intent_router.classify and
+reports:
+  - hit rate: share of all queries answered without the orchestrator LLM
+  - eligible hit rate: share of time/weather/image queries that took the fast path
+  - precision: fast-path routes that picked the right tool and argument
+  - classification latency
+  - estimated LLM time saved, given the orchestrator round-trip latency
+
+Usage:
+    python bench_intent_router.py [orchestrator_roundtrip_ms]
+"""
+
+import statistics
+import sys
+import time
+
+from orchestrator_agent.intent_router import classify, get_classifier
+
+# (message, expected tool or None, expected argument)
+HELD_OUT = [
+    ("what time is it in Auckland?", "get_current_time", "Auckland"),
+    ("What's the local time in Mexico City", "get_current_time", "Mexico City"),
+    ("current time in Nairobi please", "get_current_time", "Nairobi"),
+    ("Tell me the time in Bangkok right now", "get_current_time", "Bangkok"),
+    ("what time is it now in Honolulu?", "get_current_time", "Honolulu"),
+    ("time in Oslo", "get_current_time", "Oslo"),
+    ("weather in Reykjavik", "get_city_weather", "Reykjavik"),
+    ("How's the weather in Cape Town?", "get_city_weather", "Cape Town"),
+    ("is it raining in Seattle?", "get_city_weather", "Seattle"),
+    ("What's the temperature in Marrakech today?", "get_city_weather", "Marrakech"),
+    ("how cold is it in Helsinki right now", "get_city_weather", "Helsinki"),
+    ("What's the weather like in Hanoi?", "get_city_weather", "Hanoi"),
+    ("show me pictures of the Alhambra", "get_google_image_search_link", "the Alhambra"),
+    ("Find images of Angkor Wat at sunrise", "get_google_image_search_link", "Angkor Wat at sunrise"),
+    ("photos of the Golden Gate Bridge", "get_google_image_search_link", "the Golden Gate Bridge"),
+    ("can you show me a picture of Petra?", "get_google_image_search_link", "Petra"),
+    ("Best restaurants in Lisbon?", None, None),
+    ("Top tourist spots in Kyoto", None, None),
+    ("Write a blog post about my week in Peru", None, None),
+    ("what about in Madrid?", None, None),
+    ("now find cafes near the end of that route", None, None),
+    ("What is this landmark?", None, None),
+    ("Plan a walking route from Big Ben to the Tower of London", None, None),
+    ("where can I get good ramen in Osaka", None, None),
+    ("what should I wear in Iceland in March", None, None),
+    ("Tell me the history of this place", None, None),
+    ("things to do in Hanoi at night", None, None),
+    ("what's the weather?", None, None),
+]
+
+
+def main(roundtrip_ms: float) -> None:
+    start = time.perf_counter()
+    get_classifier()
+    train_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    hits = correct = eligible = eligible_hits = 0
+    for message, expected_tool, expected_arg in HELD_OUT:
+        t0 = time.perf_counter()
+        route = classify(message)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if expected_tool:
+            eligible += 1
+        if route:
+            hits += 1
+            if expected_tool:
+                eligible_hits += 1
+            arg = next(iter(route["args"].values()))
+            if route["tool"] == expected_tool and arg == expected_arg:
+                correct += 1
+            else:
+                print(f"  ❌ mis-route: {message!r} -> {route['tool']}({arg!r})")
+        elif expected_tool:
+            print(f"  ➖ missed: {message!r}")
+
+    # Steady-state latency over many repetitions
+    reps = 2000
+    t0 = time.perf_counter()
+    for i in range(reps):
+        classify(HELD_OUT[i % len(HELD_OUT)][0])
+    steady_ms = (time.perf_counter() - t0) * 1000 / reps
+
+    print("⚡ Intent fast-path benchmark")
+    print("=" * 60)
+    print(f"Training time (once per process):  {train_ms:8.1f} ms")
+    print(f"Queries:                           {len(HELD_OUT):8d}")
+    print(f"Fast-path hit rate (all queries):  {hits / len(HELD_OUT):8.1%}")
+    print(f"Hit rate on eligible queries:      {eligible_hits / eligible:8.1%}")
+    print(f"Fast-path precision:               {correct / max(hits, 1):8.1%}")
+    print(f"Classify latency p50:              {statistics.median(latencies):8.3f} ms")
+    print(f"Classify latency (steady state):   {steady_ms:8.3f} ms")
+    saved = hits * roundtrip_ms - len(HELD_OUT) * steady_ms
+    print(f"Est. orchestrator time saved:      {saved / len(HELD_OUT):8.1f} ms/query "
+          f"(assuming {roundtrip_ms:.0f} ms per orchestrator round-trip)")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1500.0)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark multi-day itinerary planning on large synthetic POI sets.
+
+POIs are drawn from a mix of dense neighbourhoods and background scatter
+over a ~10 x 10 km city, each with a 20-180 minute visit time. Reports, per
+POI count and number of days:
+  - clustering time (k-means with restarts + visit-time balancing)
+  - total planning time (clustering + ordering every day's walk)
+  - day load imbalance (heaviest day / mean day)
+  - average within-day walk vs splitting the input list into equal chunks
+
+Usage:
+    python bench_itinerary.py
+"""
+
+import time
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.walking_routes_agent.itinerary import cluster_days, plan_itinerary
+from orchestrator_agent.sub_agents.walking_routes_agent.poi_index import haversine_m
+
+LAT0, LON0 = 41.9, 12.49
+CASES = [(50, 3), (200, 7), (1000, 7), (1000, 125), (5000, 14), (5000, 625)]
+
+
+def synthetic_pois(rng, n):
+    hubs = rng.uniform([-0.04, -0.06], [0.04, 0.06], (12, 2))
+    near = rng.integers(0, 12, n)
+    clustered = hubs[near] + rng.normal(0, 0.004, (n, 2))
+    scatter = rng.uniform([-0.045, -0.065], [0.045, 0.065], (n, 2))
+    points = np.where(rng.random(n)[:, None] < 0.7, clustered, scatter)
+    return LAT0 + points[:, 0], LON0 + points[:, 1], rng.integers(20, 181, n).astype(float)
+
+
+def walk_km(lat, lon, days):
+    return sum(float(haversine_m(lat[d[:-1]], lon[d[:-1]], lat[d[1:]], lon[d[1:]]).sum()) for d in days) / 1000
+
+
+def main() -> None:
+    rng = np.random.default_rng(12)
+    print("🗓️ Itinerary planning benchmark")
+    print("=" * 78)
+    print(f"{'POIs':>5}  {'days':>4}  {'cluster ms':>10}  {'total ms':>9}  {'max/mean load':>13}  {'km/day':>7}  {'chunked km/day':>14}")
+    for n, days in CASES:
+        lat, lon, minutes = synthetic_pois(rng, n)
+        start = time.perf_counter()
+        labels = cluster_days(lat, lon, minutes, days)
+        cluster_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        plan = plan_itinerary(lat, lon, minutes, days)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        loads = np.bincount(labels, weights=minutes, minlength=days)
+        chunks = [np.asarray(c) for c in np.array_split(np.arange(n), days)]
+        planned = walk_km(lat, lon, [np.asarray(d) for d in plan]) / days
+        chunked = walk_km(lat, lon, chunks) / days
+        print(
+            f"{n:5d}  {days:4d}  {cluster_ms:10.1f}  {total_ms:9.1f}  {loads.max() / loads.mean():13.2f}  "
+            f"{planned:7.1f}  {chunked:14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
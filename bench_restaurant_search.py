@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark faceted restaurant retrieval on a synthetic table.
+
+Builds a table of N restaurants across 2,000 cities (one large city holds
+5%) and times typical tool queries against a vectorized full-column scan:
+  - facet index build time
+  - median query time: filter (bitmaps / posting lists) + top-k ranking
+  - median full-scan time for the same filters
+
+Usage:
+    python bench_restaurant_search.py [rows]
+"""
+
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.restaurant_recommendation_agent.facet_index import SLOT_MINUTES, open_slots
+from orchestrator_agent.sub_agents.restaurant_recommendation_agent.restaurant_index import RestaurantTable
+from test_restaurant_search import CUISINES, SCHEDULES, TAGS
+
+QUERIES = [
+    ("big city, cuisine", dict(city="Big City", cuisines=["italian"])),
+    ("big city, all facets", dict(city="Big City", cuisines=["italian", "tapas"], max_price=2, dietary=["vegetarian"], open_minute=20 * 60)),
+    ("small city, dietary", dict(city="City 17", dietary=["vegan"])),
+    ("no city, open late", dict(dietary=["gluten_free"], max_price=1, open_minute=60)),
+]
+
+
+def build(n, rng):
+    cities = np.array([f"City {k}" for k in range(2000)], dtype=object)[rng.integers(0, 2000, n)]
+    cities[rng.random(n) < 0.05] = "Big City"
+    return RestaurantTable(
+        names=[f"Place {k}" for k in range(n)],
+        cities=cities.tolist(),
+        lat=rng.uniform(-60, 60, n),
+        lon=rng.uniform(-180, 180, n),
+        cuisine=[CUISINES[k] for k in rng.integers(0, len(CUISINES), n)],
+        price=rng.integers(1, 5, n),
+        dietary=[[t for t in TAGS if rng.random() < 0.3] for _ in range(n)],
+        hours=[SCHEDULES[k] for k in rng.integers(0, len(SCHEDULES), n)],
+        rating=rng.uniform(3, 5, n),
+    )
+
+
+def full_scan(table, columns, city=None, cuisines=(), max_price=None, dietary=(), open_minute=None):
+    city_col, cuisine_col, tag_cols, open_col = columns
+    mask = np.ones(len(table), dtype=bool)
+    if city:
+        mask &= city_col == city
+    if cuisines:
+        mask &= np.isin(cuisine_col, cuisines)
+    if max_price:
+        mask &= (table.price >= 1) & (table.price <= max_price)
+    for tag in dietary:
+        mask &= tag_cols[tag]
+    if open_minute is not None:
+        mask &= open_col[:, open_minute // SLOT_MINUTES]
+    return table.rank(np.flatnonzero(mask), 8)
+
+
+def main(n: int) -> None:
+    rng = np.random.default_rng(1)
+    table = build(n, rng)
+    start = time.perf_counter()
+    facets = table.facets
+    build_ms = (time.perf_counter() - start) * 1000
+    # Column arrays a scan-based implementation would precompute
+    columns = (
+        np.array(table.cities, dtype=object),
+        np.array(table.cuisine, dtype=object),
+        {tag: np.array([tag in tags for tags in table.dietary]) for tag in TAGS},
+        np.array([open_slots(h) for h in table.hours]),
+    )
+
+    print(f"🍴 Restaurant search benchmark ({n:,} rows, facet build {build_ms:.0f} ms)")
+    print("=" * 78)
+    print(f"{'Query':<24}  {'matches':>8}  {'indexed ms':>10}  {'full scan ms':>12}")
+    for label, query in QUERIES:
+        indexed, scanned = [], []
+        for _ in range(20):
+            start = time.perf_counter()
+            rows = facets.match(**query)
+            table.rank(rows, 8)
+            indexed.append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            full_scan(table, columns, **query)
+            scanned.append((time.perf_counter() - start) * 1000)
+        print(f"{label:<24}  {len(rows):8d}  {statistics.median(indexed):10.2f}  {statistics.median(scanned):12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory-mapped route library against loading every route up
+front.
+
+For libraries of increasing city count (synthetic POI tables), reports:
+  - file size
+  - open time and Python heap allocated by opening (header + index views)
+  - median lookup time (binary search + one record decode)
+  - the same for loading all routes into a dict from one JSON document
+
+Usage:
+    python bench_route_library.py
+"""
+
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from orchestrator_agent.sub_agents.walking_routes_agent.route_library import RouteLibrary, build_route_library
+from test_route_library import synthetic_poi_csv
+
+SIZES = [100, 1000, 5000]
+
+
+def measure(load):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = load()
+    elapsed = (time.perf_counter() - start) * 1000
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, elapsed, allocated
+
+
+def main() -> None:
+    tmp = tempfile.mkdtemp()
+    print("🗺️ Route library benchmark")
+    print("=" * 78)
+    print(f"{'Cities':>6}  {'file KB':>7}  {'open ms':>7}  {'open KB':>7}  {'lookup µs':>9}  {'JSON load ms':>12}  {'JSON KB':>8}")
+    for n in SIZES:
+        poi_csv, out = os.path.join(tmp, f"pois{n}.csv"), os.path.join(tmp, f"routes{n}.bin")
+        synthetic_poi_csv(poi_csv, n)
+        build_route_library(poi_csv, out, aliases={})
+        library, open_ms, open_bytes = measure(lambda: RouteLibrary.open(out))
+
+        lookups = []
+        for c in range(0, n, max(1, n // 200)):
+            start = time.perf_counter()
+            library.find(f"Town {c}")
+            lookups.append((time.perf_counter() - start) * 1e6)
+
+        json_path = os.path.join(tmp, f"routes{n}.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({f"town {c}": library.find(f"Town {c}") for c in range(n)}, f)
+
+        def load_json():
+            with open(json_path, encoding="utf-8") as f:
+                return json.load(f)
+
+        _, json_ms, json_bytes = measure(load_json)
+        print(
+            f"{n:6d}  {os.path.getsize(out) / 1024:7.0f}  {open_ms:7.2f}  {open_bytes / 1024:7.1f}  "
+            f"{statistics.median(lookups):9.1f}  {json_ms:12.2f}  {json_bytes / 1024:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark walking-route stop ordering over random city POI sets.
+
+For each city in the bundled POI table, draws random stop sets inside the
+city's landmark bounding box (padded by ~1 km) and reports, per route size:
+  - median / p95 optimization time (distance matrix + nearest neighbour + 2-opt)
+  - how much shorter the optimized walk is than the random input order
+  - how much 2-opt improves on the nearest-neighbour seed alone
+
+Usage:
+    python bench_route_optimizer.py [sets_per_size]
+"""
+
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.walking_routes_agent.poi_index import get_poi_index, haversine_matrix
+from orchestrator_agent.sub_agents.walking_routes_agent.route_optimizer import (
+    nearest_neighbour,
+    optimize_order,
+    path_length,
+)
+
+SIZES = [5, 10, 20, 30, 50]
+PAD_DEG = 0.01
+
+
+def random_city_sets(rng, n, sets):
+    index = get_poi_index()
+    cities = sorted(set(index.cities))
+    for k in range(sets):
+        rows = index.city_rows(cities[k % len(cities)])
+        lat, lon = index.lat[rows], index.lon[rows]
+        yield (
+            rng.uniform(lat.min() - PAD_DEG, lat.max() + PAD_DEG, n),
+            rng.uniform(lon.min() - PAD_DEG, lon.max() + PAD_DEG, n),
+        )
+
+
+def main(sets: int) -> None:
+    rng = np.random.default_rng(42)
+    print("🔀 Route optimizer benchmark")
+    print("=" * 78)
+    print(f"{'Stops':>5}  {'median ms':>9}  {'p95 ms':>7}  {'vs input order':>14}  {'2-opt vs NN seed':>16}")
+    for n in SIZES:
+        times, saved, refined = [], [], []
+        for lat, lon in random_city_sets(rng, n, sets):
+            start = time.perf_counter()
+            dist = haversine_matrix(lat, lon)
+            order, length = optimize_order(dist)
+            times.append((time.perf_counter() - start) * 1000)
+
+            given = path_length(dist, range(n))
+            seed = min(path_length(dist, nearest_neighbour(dist, s)) for s in range(n))
+            saved.append(1 - length / given)
+            refined.append(1 - length / seed)
+        times.sort()
+        p95 = times[min(len(times) - 1, int(0.95 * len(times)))]
+        print(
+            f"{n:5d}  {statistics.median(times):9.2f}  {p95:7.2f}  "
+            f"{100 * statistics.mean(saved):13.1f}%  {100 * statistics.mean(refined):15.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
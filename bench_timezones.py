@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark timezone resolution for get_current_time.
+
+Compares the previous approach (rebuild a ~50-entry dict on every call, then
+scan every pytz zone with a substring test on a miss) against the shared
+precomputed index in orchestrator_agent.timezones, for both resolution alone
+and resolution plus constructing an aware datetime.
+
+Usage:
+    python bench_timezones.py [iterations]
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from orchestrator_agent.timezones import _CITY_ALIASES, get_zone, resolve_timezone
+
+# Mix of alias hits, zone-suffix hits and misses, as seen in real traffic
+QUERIES = [
+    "Paris", "London", "Tokyo", "new york", "Edinburgh", "Kathmandu", "Honolulu",
+    "Reykjavik", "Sao_Paulo", "Mexico_City", "Atlantis", "Springfield",
+]
+
+# Same size and shape as the dict the old implementation rebuilt per call
+_LEGACY_ITEMS = list(_CITY_ALIASES.items())[:51]
+
+
+def legacy_resolve(location: str, all_timezones):
+    timezone_map = dict(_LEGACY_ITEMS)
+    location_lower = location.lower()
+    if location_lower in timezone_map:
+        return timezone_map[location_lower]
+    for tz in all_timezones:
+        if location_lower in tz.lower():
+            return tz
+    return None
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(QUERIES[i % len(QUERIES)])
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+def main(iterations: int) -> None:
+    try:
+        import pytz
+    except ImportError:
+        print("pytz is not installed; the legacy path needs it for comparison")
+        return
+
+    all_timezones = pytz.all_timezones
+
+    def legacy_now(location):
+        tz_name = legacy_resolve(location, all_timezones)
+        return datetime.now(pytz.timezone(tz_name)) if tz_name else None
+
+    def indexed_now(location):
+        tz_name = resolve_timezone(location)
+        return datetime.now(get_zone(tz_name)) if tz_name else None
+
+    def indexed_uncached(location):
+        return resolve_timezone.__wrapped__(location)
+
+    results = {
+        "legacy resolve (dict rebuild + pytz scan)": timed(lambda q: legacy_resolve(q, all_timezones), iterations),
+        "index resolve (uncached)": timed(indexed_uncached, iterations),
+        "index resolve (cached)": timed(resolve_timezone, iterations),
+        "legacy resolve + datetime.now(tz)": timed(legacy_now, iterations),
+        "index resolve + datetime.now(tz)": timed(indexed_now, iterations),
+    }
+
+    print("🕐 Timezone resolution benchmark")
+    print("=" * 60)
+    print(f"Queries: {len(QUERIES)} distinct, {iterations} iterations")
+    for name, micros in results.items():
+        print(f"{name:45s} {micros:9.2f} µs/call")
+    legacy = results["legacy resolve + datetime.now(tz)"]
+    print(f"Speedup end to end: {legacy / results['index resolve + datetime.now(tz)']:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark GTFS timetable building and RAPTOR earliest-arrival queries.
+
+For synthetic grid networks of increasing size (one line per grid row and
+column, both directions, a trip every 10 minutes from 06:00 to 22:00),
+reports:
+  - stops, patterns, trips and stop times
+  - build time and timetable size on disk
+  - median and 95th percentile query time for random point-to-point
+    trips at random times of day
+
+Usage:
+    python bench_transit.py
+"""
+
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.walking_routes_agent.transit import TransitTimetable, build_timetable
+from test_transit import LAT0, LON0, WEEKDAY, write_grid_feed
+
+SIZES = [8, 16, 32]
+QUERIES = 200
+
+
+def main() -> None:
+    print("🚇 Transit routing benchmark")
+    print("=" * 84)
+    print(f"{'Grid':>5}  {'stops':>6}  {'patterns':>8}  {'trips':>6}  {'stop times':>10}  {'build s':>7}  {'MB':>5}  {'p50 ms':>7}  {'p95 ms':>7}")
+    for size in SIZES:
+        tmp = tempfile.mkdtemp()
+        try:
+            dlat, dlon = write_grid_feed(os.path.join(tmp, "feed"), size=size)
+            start = time.perf_counter()
+            meta = build_timetable(os.path.join(tmp, "feed"), os.path.join(tmp, "timetable"))
+            build_s = time.perf_counter() - start
+            disk_mb = sum(e.stat().st_size for e in os.scandir(os.path.join(tmp, "timetable"))) / 1e6
+            timetable = TransitTimetable.load(os.path.join(tmp, "timetable"))
+
+            rng = np.random.default_rng(0)
+            timings = []
+            timetable.earliest_arrival(LAT0, LON0, LAT0 + dlat, LON0 + dlon, 8 * 3600, WEEKDAY)  # warm the calendar cache
+            for _ in range(QUERIES):
+                a, b = rng.uniform(0, size - 1, size=(2, 2))
+                depart = int(rng.integers(6 * 3600, 21 * 3600))
+                start = time.perf_counter()
+                timetable.earliest_arrival(LAT0 + a[0] * dlat, LON0 + a[1] * dlon,
+                                           LAT0 + b[0] * dlat, LON0 + b[1] * dlon, depart, WEEKDAY)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(
+                f"{size:>2}x{size:<2}  {meta['stops']:6d}  {meta['patterns']:8d}  {meta['trips']:6d}  "
+                f"{len(timetable.arrivals):10d}  {build_s:7.2f}  {disk_mb:5.1f}  "
+                f"{statistics.median(timings):7.2f}  {np.percentile(timings, 95):7.2f}"
+            )
+        finally:
+            shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import asyncio
+import os
 
 # Import the main customer service agent
 # from root_agent.agent import root_agent
@@ -6,13 +7,18 @@ from orchestrator_agent.agent import root_agent
 from dotenv import load_dotenv
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
+from sqlite_session_service import SqliteSessionService
 from utils import add_user_query_to_history, call_agent_async
 
 load_dotenv()
 
-# ===== PART 1: Initialize In-Memory Session Service =====
-# Using in-memory storage for this example (non-persistent)
-session_service = InMemorySessionService()
+# ===== PART 1: Initialize Session Service =====
+# Using in-memory storage by default (non-persistent); set SESSION_DB_PATH
+# to keep conversations in a local SQLite file instead
+if os.getenv("SESSION_DB_PATH"):
+    session_service = SqliteSessionService(os.getenv("SESSION_DB_PATH"))
+else:
+    session_service = InMemorySessionService()
 
 
 # ===== PART 2: Define Initial State =====
@@ -1,15 +1,17 @@
 from google.adk.agents import Agent
-from .sub_agents.weather_agent.agent import weather_agent
+from .sub_agents.weather_agent.agent import weather_agent, weather_tool, multi_city_weather_tool, forecast_tool, city_snapshot_tool, best_time_tool
 from .sub_agents.tourist_spots_agent.agent import tourist_spots_agent
 from .sub_agents.blog_writer_agent.agent import blog_writer_agent
-from .sub_agents.walking_routes_agent.agent import walking_routes_agent
+from .sub_agents.walking_routes_agent.agent import walking_routes_agent, walking_plan_tool, isochrone_tool, itinerary_tool, transit_tool
 from .sub_agents.restaurant_recommendation_agent.agent import restaurant_recommendation_agent
 from .sub_agents.photo_story_agent.agent import photo_story_agent
-from .sub_agents.image_search_agent.agent import image_search_agent
+from .sub_agents.image_search_agent.agent import image_search_agent, google_image_search_tool
 from google.adk.tools.agent_tool import AgentTool
-from google.adk.tools import FunctionTool
+from .agent_tool_cache import CachedAgentTool, ResponseCache
+from .timezones import get_zone, resolve_timezone
+from .threaded_tools import ThreadedFunctionTool
 from datetime import datetime
-import pytz
+import os
 from urllib.parse import quote_plus
 
 def get_current_time(location: str) -> str:
@@ -23,75 +25,11 @@ def get_current_time(location: str) -> str:
         Current time in the specified location
     """
     try:
-        # Common timezone mappings
-        timezone_map = {
-            "paris": "Europe/Paris",
-            "london": "Europe/London",
-            "new york": "America/New_York",
-            "tokyo": "Asia/Tokyo",
-            "sydney": "Australia/Sydney",
-            "los angeles": "America/Los_Angeles",
-            "chicago": "America/Chicago",
-            "mumbai": "Asia/Kolkata",
-            "beijing": "Asia/Shanghai",
-            "dubai": "Asia/Dubai",
-            "moscow": "Europe/Moscow",
-            "berlin": "Europe/Berlin",
-            "rome": "Europe/Rome",
-            "madrid": "Europe/Madrid",
-            "amsterdam": "Europe/Amsterdam",
-            "vienna": "Europe/Vienna",
-            "prague": "Europe/Prague",
-            "budapest": "Europe/Budapest",
-            "warsaw": "Europe/Warsaw",
-            "stockholm": "Europe/Stockholm",
-            "oslo": "Europe/Oslo",
-            "copenhagen": "Europe/Copenhagen",
-            "helsinki": "Europe/Helsinki",
-            "riga": "Europe/Riga",
-            "tallinn": "Europe/Tallinn",
-            "vilnius": "Europe/Vilnius",
-            "brussels": "Europe/Brussels",
-            "zurich": "Europe/Zurich",
-            "geneva": "Europe/Zurich",
-            "milan": "Europe/Rome",
-            "barcelona": "Europe/Madrid",
-            "seville": "Europe/Madrid",
-            "valencia": "Europe/Madrid",
-            "bilbao": "Europe/Madrid",
-            "porto": "Europe/Lisbon",
-            "lisbon": "Europe/Lisbon",
-            "dublin": "Europe/Dublin",
-            "edinburgh": "Europe/London",
-            "glasgow": "Europe/London",
-            "manchester": "Europe/London",
-            "birmingham": "Europe/London",
-            "leeds": "Europe/London",
-            "liverpool": "Europe/London",
-            "newcastle": "Europe/London",
-            "cardiff": "Europe/London",
-            "belfast": "Europe/London",
-            "aberdeen": "Europe/London",
-            "dundee": "Europe/London",
-            "perth": "Europe/London",
-            "stirling": "Europe/London",
-            "inverness": "Europe/London",
-        }
-        
-        location_lower = location.lower()
-        if location_lower in timezone_map:
-            tz_name = timezone_map[location_lower]
-        else:
-            # Try to find a timezone that contains the location name
-            for tz in pytz.all_timezones:
-                if location_lower in tz.lower():
-                    tz_name = tz
-                    break
-            else:
-                return f"Sorry, I couldn't find timezone information for '{location}'. Please try with a major city name."
-        
-        tz = pytz.timezone(tz_name)
-        current_time = datetime.now(tz)
+        tz_name = resolve_timezone(location)
+        if tz_name is None:
+            return f"Sorry, I couldn't find timezone information for '{location}'. Please try with a major city name."
+
+        current_time = datetime.now(get_zone(tz_name))
         return f"Current time in {location}: {current_time.strftime('%I:%M %p, %A, %B %d, %Y')} ({tz_name})"
     
     except Exception as e:
@@ -112,23 +50,38 @@ def get_attraction_image(attraction: str, location: str) -> str:
     # In a production environment, you would use web scraping or TripAdvisor API
     return f"https://www.tripadvisor.com/Search?q={encoded_query}&searchType=attractions"
 
-current_time_tool = FunctionTool(get_current_time)
-get_attraction_image_tool = FunctionTool(get_attraction_image)
+current_time_tool = ThreadedFunctionTool(get_current_time)
+get_attraction_image_tool = ThreadedFunctionTool(get_attraction_image)
+
+# Cache for sub-agents whose answers don't depend on who is asking. The
+# orchestrator already hands them self-contained prompts, so "top sights in
+# Paris" can be served from cache instead of a fresh sub-agent run.
+AGENT_TOOL_CACHE = os.getenv("AGENT_TOOL_CACHE", "true").lower() == "true"
+response_cache = ResponseCache(
+    ttls={
+        "restaurant_recommendation_agent": float(os.getenv("RESTAURANT_CACHE_TTL", 24 * 3600)),
+        "tourist_spots_agent": float(os.getenv("TOURIST_SPOTS_CACHE_TTL", 7 * 24 * 3600)),
+    },
+    max_bytes=int(os.getenv("AGENT_TOOL_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+    disk_path=os.getenv("AGENT_TOOL_CACHE_PATH") or None,
+)
+
+def make_agent_tool(agent) -> AgentTool:
+    """Wrap a sub-agent in an AgentTool, cached if it has a cache TTL."""
+    if AGENT_TOOL_CACHE and response_cache.is_cacheable(agent.name):
+        return CachedAgentTool(agent, response_cache)
+    return AgentTool(agent)
 
 # Create AgentTool instances for sub-agents
 weather_agent_tool = AgentTool(weather_agent)
-tourist_spots_agent_tool = AgentTool(tourist_spots_agent)
+tourist_spots_agent_tool = make_agent_tool(tourist_spots_agent)
 walking_routes_agent_tool = AgentTool(walking_routes_agent)
-restaurant_agent_tool = AgentTool(restaurant_recommendation_agent)
+restaurant_agent_tool = make_agent_tool(restaurant_recommendation_agent)
 blog_writer_agent_tool = AgentTool(blog_writer_agent)
 photo_story_agent_tool = AgentTool(photo_story_agent)
 image_search_agent_tool = AgentTool(image_search_agent)
 
-root_agent = Agent(
-    name="orchestrator_agent",
-    model="gemini-1.5-flash",
-    description="A smart travel assistant that understands conversation context to route to the correct tool.",
-    instruction="""
+ORCHESTRATOR_INSTRUCTION = """
     You are a master orchestrator for a travel agency. Your primary job is to analyze the user's request
     **in the context of the conversation history** and route it to the correct specialized agent or tool.
     You MUST think step-by-step to determine the user's true intent, especially for follow-up questions.
@@ -185,15 +138,58 @@ root_agent = Agent(
         *   `User Prompt`: "What time is it in Sydney?" → `Action`: Use `get_current_time`.
 
     You MUST follow this logic precisely. Your goal is to be a smart, context-aware router.
-    """,
-    tools=[
-        weather_agent_tool,
+    """
+
+# Tool exposure mode. "agent" (default) wraps every sub-agent in an AgentTool.
+# "direct" registers the FunctionTools of the single-tool sub-agents (weather,
+# walking routes, image search) on the orchestrator itself, which removes the
+# sub-agent's two extra model calls from those routes.
+TOOL_MODE = os.getenv("ORCHESTRATOR_TOOL_MODE", "agent").lower()
+
+DIRECT_TOOLS_INSTRUCTION = """
+    **Direct Tools (call these yourself, there is no sub-agent for them):**
+        *   Weather questions → call `get_city_weather` with the city name, e.g. "What is the weather in Paris?" → `get_city_weather(city="Paris")`.
+        *   Weather in several cities → call `get_weather_for_cities` once with all of them, e.g. `get_weather_for_cities(cities=["Rome", "Florence", "Venice"])`.
+        *   Forecasts for the coming days → call `get_weather_forecast` with every city at once, e.g. `get_weather_forecast(cities=["Lisbon"], days=3)`.
+        *   "What's it like in X right now?" → call `get_city_snapshot(city="X")` for weather, local time and daylight in one step.
+        *   "When is the best time to visit X?" or seasonal climate questions → call `get_best_time_to_visit(city="X")`; add `preference="warm"` for beach trips or `"cool"` for those avoiding heat.
+        *   Walking routes → call `create_walking_plan_with_map` with a comma-separated list of two or more spots, or a single city name for a default tour. Pass `optimize=True` unless the user wants their own order, with `fix_start=True` / `fix_end=True` when they name where to start or finish.
+        *   "What's within a 15-minute walk of X?" → call `find_places_within_walk(start="X", minutes=15)`.
+        *   Multi-day trips ("3 days in Rome") → call `create_multi_day_itinerary(locations="Rome", days=3)`, or pass the user's spots comma-separated.
+        *   Public transport directions ("how do I get from X to Y by metro?") → call `plan_transit_trip(start="X", end="Y", depart_at="now")`, or with the time they give.
+        *   Image searches → call `get_google_image_search_link` with the corrected search subject, e.g. `get_google_image_search_link(query="The Starry Night by Van Gogh")`.
+    Present the tool result to the user directly; keep weather answers short and add one practical travel tip.
+    """
+
+def build_orchestrator_tools(mode: str = TOOL_MODE) -> list:
+    """Tools for the orchestrator in the given exposure mode ("agent" or "direct")."""
+    direct = mode == "direct"
+    return [
+        weather_tool if direct else weather_agent_tool,
+        *([multi_city_weather_tool, forecast_tool, city_snapshot_tool, best_time_tool] if direct else []),
         tourist_spots_agent_tool,
-        walking_routes_agent_tool,
+        walking_plan_tool if direct else walking_routes_agent_tool,
+        *([isochrone_tool, itinerary_tool, transit_tool] if direct else []),
         restaurant_agent_tool,
         blog_writer_agent_tool,
         photo_story_agent_tool,
-        image_search_agent_tool,
+        google_image_search_tool if direct else image_search_agent_tool,
         current_time_tool
-    ],
-) 
\ No newline at end of file
+    ]
+
+def build_orchestrator_instruction(mode: str = TOOL_MODE) -> str:
+    """The routing instruction, adjusted for the tool exposure mode."""
+    if mode == "direct":
+        return (
+            ORCHESTRATOR_INSTRUCTION.replace("`image_search_agent_tool`", "`get_google_image_search_link`")
+            + DIRECT_TOOLS_INSTRUCTION
+        )
+    return ORCHESTRATOR_INSTRUCTION
+
+root_agent = Agent(
+    name="orchestrator_agent",
+    model="gemini-1.5-flash",
+    description="A smart travel assistant that understands conversation context to route to the correct tool.",
+    instruction=build_orchestrator_instruction(),
+    tools=build_orchestrator_tools(),
+)
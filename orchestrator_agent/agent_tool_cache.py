@@ -0,0 +1,217 @@
+"""
+Response cache for sub-agents called through AgentTool.
+
+The orchestrator rewrites follow-ups into self-contained prompts ("Find the
+best restaurants in Rome") before calling a sub-agent, and for the
+recommendation agents the answer does not depend on who is asking. Those
+answers take a full sub-agent LLM run to produce, so we cache them keyed on
+the sub-agent name plus a normalized prompt. Prompts whose answer depends on the
+clock ("open now", "tonight", "at 9pm") bypass the cache entirely.
+
+Two tiers:
+  - memory: LRU bounded by total bytes, per-agent TTL
+  - disk (optional): a SQLite file shared by all workers on the host, so a
+    restart or another worker can reuse answers
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from google.adk.tools.agent_tool import AgentTool
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_FILLER_WORDS = {"please", "can", "you", "could", "would", "me", "the", "a", "an", "some"}
+# Wording that makes an answer depend on when it is asked (opening hours, "tonight")
+_TIME_DEPENDENT_RE = re.compile(
+    r"\b(?:now|open|opened|opening|closed|closing|tonight|today|currently|right away"
+    r"|this (?:morning|afternoon|evening)|late[- ]night|\d{1,2}(?::\d{2})?\s*(?:am|pm)|\d{1,2}:\d{2})\b",
+    re.IGNORECASE,
+)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonical form of a prompt so trivially different phrasings share a cache entry."""
+    text = _PUNCTUATION_RE.sub(" ", prompt.lower())
+    words = [w for w in _WHITESPACE_RE.split(text) if w and w not in _FILLER_WORDS]
+    return " ".join(words)
+
+
+def is_time_dependent(prompt: str) -> bool:
+    """Whether a prompt's answer changes with the time it is asked, so it must not be cached."""
+    return bool(_TIME_DEPENDENT_RE.search(prompt))
+
+
+class ResponseCache:
+    """
+    Two-tier (memory + optional SQLite) cache for sub-agent responses.
+
+    Args:
+        ttls: Seconds each agent's answers stay fresh, keyed by agent name.
+            Agents not listed are never cached.
+        max_bytes: Memory budget; least recently used entries are evicted past it
+        disk_path: Optional SQLite file for the shared on-disk tier
+        clock: Wall-clock time source (overridable for tests)
+    """
+
+    def __init__(
+        self,
+        ttls: Dict[str, float],
+        max_bytes: int = 32 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+        clock=time.time,
+    ):
+        self.ttls = dict(ttls)
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.metrics = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expired": 0,
+            "bypassed": 0,
+        }
+        if disk_path:
+            with self._disk() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, agent TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+
+    def is_cacheable(self, agent_name: str) -> bool:
+        return self.ttls.get(agent_name, 0) > 0
+
+    @staticmethod
+    def make_key(agent_name: str, prompt: str) -> str:
+        digest = hashlib.sha1(normalize_prompt(prompt).encode()).hexdigest()
+        return f"{agent_name}:{digest}"
+
+    def get(self, agent_name: str, prompt: str) -> Optional[str]:
+        """Return a fresh cached response, or None on a miss."""
+        key = self.make_key(agent_name, prompt)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, nbytes = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.metrics["memory_hits"] += 1
+                    return value
+                del self._entries[key]
+                self._bytes -= nbytes
+                self.metrics["expired"] += 1
+
+        if self.disk_path:
+            row = self._disk().execute(
+                "SELECT value, expires_at FROM responses WHERE key=?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                self._remember(key, row[0], row[1])
+                with self._lock:
+                    self.metrics["disk_hits"] += 1
+                return row[0]
+
+        with self._lock:
+            self.metrics["misses"] += 1
+        return None
+
+    def set(self, agent_name: str, prompt: str, value: str) -> None:
+        """Store a response under the agent's TTL."""
+        ttl = self.ttls.get(agent_name, 0)
+        if ttl <= 0:
+            return
+        key = self.make_key(agent_name, prompt)
+        expires_at = self.clock() + ttl
+        self._remember(key, value, expires_at)
+        with self._lock:
+            self.metrics["stores"] += 1
+        if self.disk_path:
+            conn = self._disk()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, agent, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, agent_name, value, expires_at),
+            )
+            conn.execute("DELETE FROM responses WHERE expires_at <= ?", (self.clock(),))
+
+    def record_bypass(self) -> None:
+        """Count a lookup skipped because the prompt was time-dependent."""
+        with self._lock:
+            self.metrics["bypassed"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.metrics["memory_hits"] + self.metrics["disk_hits"] + self.metrics["misses"]
+            hits = self.metrics["memory_hits"] + self.metrics["disk_hits"]
+            return {
+                **self.metrics,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, value: str, expires_at: float) -> None:
+        nbytes = len(value.encode()) + len(key)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (value, expires_at, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+                self.metrics["evictions"] += 1
+
+    def _disk(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.disk_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+
+class CachedAgentTool(AgentTool):
+    """AgentTool that serves repeated prompts from a ResponseCache."""
+
+    def __init__(self, agent, cache: ResponseCache, skip_summarization: bool = False):
+        super().__init__(agent, skip_summarization=skip_summarization)
+        self.cache = cache
+
+    async def run_async(self, *, args: dict[str, Any], tool_context) -> Any:
+        prompt = args.get("request")
+        if not isinstance(prompt, str) or not self.cache.is_cacheable(self.agent.name):
+            return await super().run_async(args=args, tool_context=tool_context)
+        if is_time_dependent(prompt):
+            self.cache.record_bypass()
+            return await super().run_async(args=args, tool_context=tool_context)
+
+        cached = await asyncio.to_thread(self.cache.get, self.agent.name, prompt)
+        if cached is not None:
+            logger.info(f"Cache hit for {self.agent.name}: {normalize_prompt(prompt)!r}")
+            return cached
+
+        result = await super().run_async(args=args, tool_context=tool_context)
+        if isinstance(result, str) and result.strip():
+            await asyncio.to_thread(self.cache.set, self.agent.name, prompt, result)
+        return result
@@ -0,0 +1,297 @@
+"""
+Local intent classifier that short-circuits trivially routable requests.
+
+Every message normally pays a full orchestrator LLM round-trip just to decide
+which tool to call. For three intents the answer is a single deterministic
+FunctionTool call, so we classify them locally instead:
+
+    time          -> get_current_time(location)
+    weather       -> get_city_weather(city)
+    image_search  -> get_google_image_search_link(query)
+
+Anything else (restaurants, tourist spots, blogs, walking routes, photos,
+follow-ups that need conversation context) is labelled ``other`` and goes to
+the LLM orchestrator as before. So do time/weather questions about another
+time ("weather in Paris in April", "...next week", "in summer", forecasts):
+the fast-path tools only report the present.
+
+The model is TF-IDF over word uni/bi-grams and character trigrams feeding a
+multinomial logistic regression, implemented in NumPy. It is trained on first
+use from the routing examples in the orchestrator instruction expanded with
+templates (~150 ms, CPU only, no model files); classifying a message then
+takes well under a millisecond.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+INTENTS = ["time", "weather", "image_search", "other"]
+
+_CITIES = [
+    "Sydney", "Tokyo", "Paris", "London", "New York", "Rome", "Berlin", "Madrid",
+    "Dubai", "Mumbai", "Lisbon", "Prague", "Vienna", "Chicago", "Los Angeles",
+    "Singapore", "Toronto", "Barcelona", "Amsterdam", "Seoul", "Cairo", "Istanbul",
+]
+
+_SUBJECTS = [
+    "the Mona Lisa", "the Northern Lights", "The Starry Night by Van Gogh",
+    "the Eiffel Tower at night", "Machu Picchu", "the Great Wall of China",
+    "cherry blossoms in Kyoto", "the aurora borealis", "Santorini sunsets",
+    "the Sistine Chapel ceiling", "Mount Fuji", "the Taj Mahal",
+]
+
+_TIME_TEMPLATES = [
+    "What time is it in {city}?", "what time is it in {city}", "current time in {city}",
+    "What's the time in {city} right now?", "time in {city}", "local time {city}",
+    "tell me the time in {city}", "what is the current time in {city}",
+    "Current time in {city}?", "what time is it now in {city}",
+]
+
+_WEATHER_TEMPLATES = [
+    "weather in {city}", "What's the weather in {city}?", "What's the weather like in {city} today?",
+    "How's the weather in {city}?", "Weather in {city}", "is it raining in {city}",
+    "what is the temperature in {city}", "how hot is it in {city}", "{city} weather",
+    "current weather in {city}", "is it cold in {city} right now", "how warm is it in {city} today",
+]
+
+_IMAGE_TEMPLATES = [
+    "Show me a picture of {subject}", "Find images of {subject}", "show me pictures of {subject}",
+    "photos of {subject}", "images of {subject}", "can you show me photos of {subject}",
+    "I want to see pictures of {subject}", "find me a photo of {subject}",
+]
+
+_OTHER_EXAMPLES = [
+    "Best restaurants in Rome?", "Find the best restaurants in Rome", "where should I eat in Paris",
+    "Top tourist spots in New York?", "what are the attractions in London?", "must see sights in Tokyo",
+    "Write a blog about my trip to Italy", "Create a travel blog post about Tokyo",
+    "Find a walking route from the Eiffel Tower to the Louvre", "now find restaurants near the end of that route",
+    "What is this landmark?", "what is this", "tell me the history of this place", "what is this building",
+    "what about in Paris?", "and in London?", "what about tomorrow", "plan a 3 day itinerary for Rome",
+    "cheap vegetarian food in Berlin", "walking tour of Prague old town", "hello", "thanks!",
+    "what should I pack for my trip", "best time of year to visit Lisbon", "how do I get from the airport to the city",
+    "recommend a romantic dinner spot in Venice", "things to do in Barcelona with kids",
+    "create a walking plan for Paris", "what's good to see near the Colosseum", "is Tokyo expensive",
+    "write a short story about this photo", "help me plan my honeymoon", "museums in Amsterdam",
+    "where can I watch the sunset in Santorini", "tell me about the history of the Colosseum",
+    "weather in Paris in April", "what will the weather be in Rome next week", "how hot is it in Dubai in summer",
+    "weather forecast for London tomorrow", "will it rain in Tokyo this weekend",
+]
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def _features(text: str) -> List[str]:
+    """Word uni/bi-grams plus character trigrams of the lowercased text."""
+    text = text.lower()
+    words = _TOKEN_RE.findall(text)
+    feats = [f"w:{w}" for w in words]
+    feats += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    padded = f" {' '.join(words)} "
+    feats += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return feats
+
+
+def _training_set() -> Tuple[List[str], List[int]]:
+    """Template-expanded routing examples and their intent indices."""
+    texts, labels = [], []
+    for city in _CITIES:
+        for template in _TIME_TEMPLATES:
+            texts.append(template.format(city=city))
+            labels.append(INTENTS.index("time"))
+        for template in _WEATHER_TEMPLATES:
+            texts.append(template.format(city=city))
+            labels.append(INTENTS.index("weather"))
+    for subject in _SUBJECTS:
+        for template in _IMAGE_TEMPLATES:
+            texts.append(template.format(subject=subject))
+            labels.append(INTENTS.index("image_search"))
+    for text in _OTHER_EXAMPLES:
+        texts.append(text)
+        labels.append(INTENTS.index("other"))
+    return texts, labels
+
+
+class IntentClassifier:
+    """TF-IDF + softmax regression intent classifier in pure NumPy."""
+
+    def __init__(self, texts: List[str], labels: List[int], epochs: int = 150, lr: float = 4.0, l2: float = 1e-5):
+        docs = [_features(t) for t in texts]
+        vocab: Dict[str, int] = {}
+        for doc in docs:
+            for feat in doc:
+                vocab.setdefault(feat, len(vocab))
+        self.vocab = vocab
+
+        df = np.zeros(len(vocab))
+        for doc in docs:
+            df[[vocab[f] for f in set(doc)]] += 1
+        self.idf = (np.log((1 + len(docs)) / (1 + df)) + 1.0).astype(np.float32)
+
+        X = np.vstack([self._vectorize(doc) for doc in docs])
+        y = np.eye(len(INTENTS), dtype=np.float32)[labels]
+        # Weight classes inversely to their size so the templated intents
+        # don't drown out the smaller hand-written "other" set
+        counts = np.bincount(labels, minlength=len(INTENTS)).astype(np.float32)
+        weights = (len(labels) / (len(INTENTS) * np.maximum(counts, 1)))[labels][:, None]
+        self.W = np.zeros((X.shape[1], len(INTENTS)), dtype=np.float32)
+        self.b = np.zeros(len(INTENTS), dtype=np.float32)
+        for _ in range(epochs):
+            probs = self._softmax(X @ self.W + self.b)
+            grad = (probs - y) * weights
+            self.W -= lr * (X.T @ grad / len(X) + l2 * self.W)
+            self.b -= lr * grad.mean(axis=0)
+
+    def _vectorize(self, feats: List[str]) -> np.ndarray:
+        vec = np.zeros(len(self.vocab), dtype=np.float32)
+        for feat in feats:
+            idx = self.vocab.get(feat)
+            if idx is not None:
+                vec[idx] += 1.0
+        vec *= self.idf
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    @staticmethod
+    def _softmax(z: np.ndarray) -> np.ndarray:
+        z = z - z.max(axis=-1, keepdims=True)
+        e = np.exp(z)
+        return e / e.sum(axis=-1, keepdims=True)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Return (intent, probability) for a message."""
+        probs = self._softmax(self._vectorize(_features(text)) @ self.W + self.b)
+        best = int(np.argmax(probs))
+        return INTENTS[best], float(probs[best])
+
+
+_MONTHS = "january|february|march|april|may|june|july|august|september|october|november|december"
+_DAYS = "monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+# Phrases placing a question at some other time than now
+_WHEN = (
+    rf"tomorrow|tonight|later(?: today)?|this (?:weekend|week|month|evening)|next (?:week|weekend|month|year|{_DAYS})"
+    rf"|(?:in|during) (?:the )?(?:summer|winter|spring|autumn|fall)|(?:in|during) (?:early |mid |late )?(?:{_MONTHS})"
+    rf"|on (?:{_DAYS})|in \d+ (?:days|weeks)"
+)
+# Forecast or seasonal wording the current-conditions tools can't answer
+_NOT_NOW_RE = re.compile(
+    rf"\b(?:{_WHEN}|forecasts?|will it|going to be|average|typical(?:ly)?|usually|seasons?|seasonal|climate)\b",
+    re.IGNORECASE,
+)
+_LOCATION_RE = re.compile(
+    rf"\b(?:in|for|at)\s+([a-z][a-z .'-]*?)\s*(?:{_WHEN}|right now|now|today|currently|at the moment)?"
+    r"\s*(?:,?\s*please)?\s*[?.!]*$",
+    re.IGNORECASE,
+)
+_LEADING_CITY_RE = re.compile(r"^([a-z][a-z'-]*(?:\s[a-z][a-z'-]*){0,2})\s+(?:weather|time)\s*[?.!]*$", re.IGNORECASE)
+# Words that can follow "in"/"for" without naming a place
+_NOT_A_PLACE = {"the", "a", "my", "your", "this", "that", "here", "there", "general", "summer", "winter", "spring", "autumn", "fall"}
+# Words that can only mean "in/at" something else than the place itself
+# ("weather in Tokyo in fahrenheit"); such slots go to the orchestrator
+_SLOT_PREPOSITIONS = {"in", "on", "at", "for", "with", "using", "by", "near", "from", "to", "during"}
+# Image subjects made only of these point back at earlier turns ("it",
+# "the first one", "those places") and need the conversation to resolve
+_POINTER_WORDS = {
+    "it", "this", "that", "these", "those", "them", "there", "here", "the", "same", "other", "all", "both",
+    "first", "second", "third", "fourth", "fifth", "last", "next", "previous", "one", "ones", "of",
+    "place", "places", "spot", "spots", "landmark", "landmarks", "sight", "sights",
+}
+_IMAGE_PREFIX_RE = re.compile(
+    r"^(?:can you |could you |please |i want to |i'd like to )?(?:show|find|see|get)?\s*(?:me\s+)?"
+    r"(?:an?\s+|some\s+)?(?:pictures?|photos?|images?|pics?)\s+of\s+",
+    re.IGNORECASE,
+)
+
+
+def extract_location(message: str) -> Optional[str]:
+    """Pull the city out of a time/weather question, or None if there isn't one."""
+    text = message.strip()
+    match = _LOCATION_RE.search(text) or _LEADING_CITY_RE.search(text)
+    if not match:
+        return None
+    location = match.group(1).strip(" .'-")
+    if not location or location.lower().split()[0] in _NOT_A_PLACE or location.lower() in {"what's the", "what is the"}:
+        return None
+    if _SLOT_PREPOSITIONS.intersection(location.lower().split()[1:]):
+        return None
+    return location.title()
+
+
+def extract_image_query(message: str) -> Optional[str]:
+    """Strip "show me pictures of ..." framing, leaving the search subject (None for "it", "the first one", ...)."""
+    text = message.strip().rstrip("?.!")
+    query, count = _IMAGE_PREFIX_RE.subn("", text, count=1)
+    query = query.strip()
+    if not count or not query or set(_TOKEN_RE.findall(query.lower())) <= _POINTER_WORDS:
+        return None
+    return query
+
+
+_classifier: Optional[IntentClassifier] = None
+
+
+def get_classifier() -> IntentClassifier:
+    """The shared classifier, trained on first use."""
+    global _classifier
+    if _classifier is None:
+        _classifier = IntentClassifier(*_training_set())
+    return _classifier
+
+
+def classify(message: str, threshold: float = 0.85) -> Optional[Dict]:
+    """
+    Decide whether a message can skip the LLM orchestrator.
+
+    Args:
+        message: The user's message
+        threshold: Minimum classifier probability to take the fast path
+
+    Returns:
+        ``{"intent", "confidence", "tool", "args"}`` for a confident match
+        with a usable argument, otherwise None.
+    """
+    intent, confidence = get_classifier().predict(message)
+    if intent == "other" or confidence < threshold:
+        return None
+    if intent != "image_search" and _NOT_NOW_RE.search(message):
+        return None
+    if intent == "image_search":
+        query = extract_image_query(message)
+        if not query:
+            return None
+        return {"intent": intent, "confidence": confidence,
+                "tool": "get_google_image_search_link", "args": {"query": query}}
+    location = extract_location(message)
+    if not location:
+        return None
+    if intent == "time":
+        return {"intent": intent, "confidence": confidence,
+                "tool": "get_current_time", "args": {"location": location}}
+    return {"intent": intent, "confidence": confidence,
+            "tool": "get_city_weather", "args": {"city": location}}
+
+
+async def route_fast_path(message: str, threshold: float = 0.85) -> Optional[Dict]:
+    """
+    Classify a message and, on a confident match, run the tool directly.
+    Weather goes through the async get_city_weather, so it shares the pooled
+    client, its retries and the weather cache's single-flight.
+
+    Returns:
+        The classify() result with the tool output under ``"response"``, or
+        None if the message should go to the LLM orchestrator.
+    """
+    route = classify(message, threshold)
+    if route is None:
+        return None
+    if route["tool"] == "get_current_time":
+        from .agent import get_current_time
+        route["response"] = get_current_time(**route["args"])
+    elif route["tool"] == "get_city_weather":
+        from .sub_agents.weather_agent.agent import get_city_weather
+        route["response"] = await get_city_weather(**route["args"])
+    else:
+        from .sub_agents.image_search_agent.agent import get_google_image_search_link
+        route["response"] = get_google_image_search_link(**route["args"])
+    return route
@@ -1,5 +1,5 @@
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
+from ...threaded_tools import ThreadedFunctionTool
 from urllib.parse import quote_plus
 
 def get_google_image_search_link(query: str) -> str:
@@ -18,7 +18,7 @@ def get_google_image_search_link(query: str) -> str:
     return f"https://www.google.com/search?tbm=isch&q={encoded_query}"
 
 # Create a tool from the function
-google_image_search_tool = FunctionTool(get_google_image_search_link)
+google_image_search_tool = ThreadedFunctionTool(get_google_image_search_link)
 
 # Create the image search agent
 image_search_agent = Agent(
@@ -1,4 +1,162 @@
 from google.adk.agents import Agent
+from ...threaded_tools import ThreadedFunctionTool
+from ...timezones import get_zone, parse_clock, resolve_timezone
+from ..walking_routes_agent.corridor import corridor_search, route_polyline
+from ..walking_routes_agent.poi_index import format_distance, get_poi_index
+from .restaurant_index import get_restaurant_table
+from datetime import datetime
+from typing import List, Optional
+import numpy as np
+
+MIN_BUFFER_M = 25
+MAX_BUFFER_M = 2000
+MAX_ROUTE_RESULTS = 15
+MAX_SEARCH_RESULTS = 10
+
+def split_terms(value: str) -> List[str]:
+    """Comma-separated filter terms ("italian, pizza") as a list."""
+    return [term.strip() for term in value.split(",") if term.strip()]
+
+def minute_of_day(when: str, city: str) -> Optional[int]:
+    """
+    Minute of the day for "19:30", "7pm", "noon" or "now" (local time in the city).
+    
+    Args:
+        when: The time to convert.
+        city: The city's name as stored in the restaurant table; "now" needs
+            it to match a known timezone exactly.
+    
+    Returns:
+        0-1439, or None if the time can't be understood.
+    """
+    when = when.strip().lower()
+    if when == "now":
+        tz_name = resolve_timezone(city, fuzzy=False)
+        if tz_name is None:
+            return None
+        local = datetime.now(get_zone(tz_name))
+        return local.hour * 60 + local.minute
+    return parse_clock(when)
+
+def search_restaurants(city: str, cuisine: str = "", max_price: int = 0, dietary: str = "", open_at: str = "", limit: int = 8) -> str:
+    """
+    Search the local restaurant list for a city by cuisine, budget, dietary needs and opening time.
+    
+    Args:
+        city: City to search (e.g., "Rome").
+        cuisine: Optional comma-separated cuisines, any of which match (e.g., "italian, pizza").
+        max_price: Optional budget: highest price band from 1 ($) to 4 ($$$$); 0 for any.
+        dietary: Optional comma-separated dietary needs, all of which must be met (e.g., "vegetarian, gluten free").
+        open_at: Optional time the restaurant must be open, like "19:30", "7pm" or "now" (local time).
+        limit: Maximum number of restaurants to return (up to 10).
+    
+    Returns:
+        The best-rated matching restaurants with cuisine, price, rating, dietary tags and hours.
+    """
+    try:
+        table = get_restaurant_table()
+        facets = table.facets
+        in_city = facets.rows_for("city", city)
+        if not len(in_city):
+            return f"I don't have local restaurant data for {city}; recommend from general knowledge instead."
+        
+        open_minute = None
+        if open_at.strip():
+            # The table's own spelling of the city, not the user's, picks the timezone
+            open_minute = minute_of_day(open_at, table.cities[int(in_city[0])])
+            if open_minute is None and open_at.strip().lower() == "now":
+                return f"Sorry, I don't know the local time in {city}. Give a time like '19:30' or '7pm' instead."
+            if open_minute is None:
+                return f"Sorry, I couldn't understand the time '{open_at}'. Use a time like '19:30' or '7pm', or 'now'."
+        max_price = max(0, min(int(max_price or 0), 4))
+        limit = max(1, min(int(limit), MAX_SEARCH_RESULTS))
+        cuisines, needs = split_terms(cuisine), split_terms(dietary)
+        
+        rows = facets.match(city=city, cuisines=cuisines, max_price=max_price, dietary=needs, open_minute=open_minute)
+        filters = [
+            *([" or ".join(cuisines)] if cuisines else []),
+            *([f"up to {'$' * max_price}"] if max_price else []),
+            *needs,
+            *([f"open at {open_minute // 60:02d}:{open_minute % 60:02d}"] if open_minute is not None else []),
+        ]
+        described = f" ({', '.join(filters)})" if filters else ""
+        if not len(rows):
+            available = sorted({table.cuisine[row].replace("_", " ") for row in in_city.tolist()})
+            return (
+                f"No restaurants in my {city} list match{described}. "
+                f"Cuisines I have there: {', '.join(available)}. Try relaxing a filter."
+            )
+        
+        top = table.rank(rows, limit)
+        lines = [f"🍴 **Top {len(top)} of {len(rows)} matching restaurants in {city}**{described}:", ""]
+        for k, row in enumerate(top.tolist(), 1):
+            details = []
+            if table.dietary[row]:
+                details.append(", ".join(tag.replace("_", " ") for tag in table.dietary[row]))
+            if table.hours[row]:
+                details.append(f"open {table.hours[row].replace(';', ', ')}")
+            suffix = f": {'; '.join(details)}" if details else ""
+            lines.append(f"{k}. {table.names[row]} ({table.describe(row)}){suffix}")
+        return "\n".join(lines)
+    
+    except Exception as e:
+        return f"Error searching restaurants: {str(e)}"
+
+def find_restaurants_along_route(stops: str, buffer_m: int = 250, limit: int = 10, cuisine: str = "", dietary: str = "") -> str:
+    """
+    Find restaurants within a short walk of a walking route or of a single landmark.
+    
+    Args:
+        stops: Comma-separated route stops in walking order (e.g., "Colosseum, Trevi Fountain, Pantheon"), or one landmark for "near X".
+        buffer_m: How far off the route to look, in metres (25 to 2000).
+        limit: Maximum number of restaurants to return (up to 15).
+        cuisine: Optional comma-separated cuisines, any of which match (e.g., "italian, pizza").
+        dietary: Optional comma-separated dietary needs, all of which must be met (e.g., "vegan").
+    
+    Returns:
+        Restaurants closest to the route first, with how far off the route each one is.
+    """
+    try:
+        spots = [spot.strip() for spot in stops.split(",") if spot.strip()]
+        if not spots:
+            return "Please provide at least one landmark or route stop."
+        
+        poi_index = get_poi_index()
+        rows = poi_index.resolve(spots)
+        located = [(spot, row) for spot, row in zip(spots, rows) if row is not None]
+        missing = [spot for spot, row in zip(spots, rows) if row is None]
+        if not located:
+            return f"Sorry, I don't have locations for {', '.join(spots)}, so I can't search near them."
+        
+        buffer_m = max(MIN_BUFFER_M, min(int(buffer_m), MAX_BUFFER_M))
+        limit = max(1, min(int(limit), MAX_ROUTE_RESULTS))
+        names = [poi_index.names[row] for _, row in located]
+        path_lat, path_lon, legs = route_polyline([row for _, row in located])
+        
+        table = get_restaurant_table()
+        idx, dist, segments = corridor_search(table.grid, path_lat, path_lon, buffer_m)
+        if cuisine.strip() or dietary.strip():
+            allowed = table.facets.match(cuisines=split_terms(cuisine), dietary=split_terms(dietary))
+            keep = np.isin(idx, allowed)
+            idx, dist, segments = idx[keep], dist[keep], segments[keep]
+        
+        where = " → ".join(names)
+        scope = f"of your route ({where})" if len(names) > 1 else f"of {where}"
+        note = f"\nℹ️ No location for {', '.join(missing)}; searched along the other stops." if missing else ""
+        if not len(idx):
+            return f"No restaurants in my local list within {format_distance(buffer_m)} {scope}. Try a wider distance.{note}"
+        
+        lines = [f"🍽️ **Restaurants within {format_distance(buffer_m)} {scope}:**", ""]
+        for k, (row, meters, segment) in enumerate(zip(idx[:limit].tolist(), dist[:limit].tolist(), segments[:limit].tolist()), 1):
+            near = f"between {names[legs[segment]]} and {names[legs[segment] + 1]}" if len(names) > 1 else f"from {names[0]}"
+            lines.append(f"{k}. {table.names[row]} ({table.describe(row)}): {format_distance(meters)} {near}")
+        return "\n".join(lines) + note
+    
+    except Exception as e:
+        return f"Error finding restaurants along the route: {str(e)}"
+
+restaurant_search_tool = ThreadedFunctionTool(search_restaurants)
+route_restaurants_tool = ThreadedFunctionTool(find_restaurants_along_route)
 
 restaurant_recommendation_agent = Agent(
     name="restaurant_recommendation_agent",
@@ -14,7 +172,11 @@ restaurant_recommendation_agent = Agent(
     - Cultural dining experiences and etiquette
     - Dietary considerations and alternatives
     
+    For restaurant requests in a city, first call `search_restaurants` with the city and any cuisine, budget (`max_price` 1-4), dietary needs or opening time (`open_at`, e.g. "now" or "20:00") the user mentioned.
+    When the request is about restaurants near a walking route or near specific landmarks (e.g., "restaurants near the Louvre" or "somewhere to eat between the Colosseum and the Pantheon"), call `find_restaurants_along_route` with the stops in walking order; pass only the last stop for "near the end of the route".
+    When a tool returns restaurants, recommend from that list only: a sentence or two per place on why it fits, without repeating every field. Only fall back to general knowledge when the tool says it has no data for the city.
+    
     Focus on authentic local experiences and memorable dining moments.
     """,
-    tools=[],
-)
\ No newline at end of file
+    tools=[restaurant_search_tool, route_restaurants_tool],
+)
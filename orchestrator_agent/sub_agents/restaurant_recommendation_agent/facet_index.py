@@ -0,0 +1,205 @@
+"""
+Precomputed facet indexes for restaurant filtering.
+
+Every facet value (a city, a cuisine, a price band, a dietary tag) maps to
+the set of rows that have it, stored in whichever form is smaller:
+
+  - a bitmap (``np.packbits``, one bit per row) for common values, e.g.
+    "vegetarian" or price band 2
+  - a sorted int32 posting list for rare values, e.g. one city among
+    thousands, where a bitmap would be mostly zeros
+
+(a posting list costs 32 bits per row, so the cut-over is 1 row in 32).
+Opening hours are one bitmap per 15-minute slot of the day: bit r of slot
+k is set when restaurant r is open at minute ``15 * k``.
+
+A query ANDs one set per filter. When any filter is a posting list, the
+shortest list is the starting candidate set and the other filters are
+applied as bit tests / membership checks on those rows only; otherwise the
+bitmaps are ANDed word-wise and unpacked once.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ...timezones import normalize_location
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+_TAG_ALIASES = {
+    "veggie": "vegetarian",
+    "veg": "vegetarian",
+    "plant_based": "vegan",
+    "gf": "gluten_free",
+    "glutenfree": "gluten_free",
+    "coeliac": "gluten_free",
+    "celiac": "gluten_free",
+}
+_INTERVAL = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$")
+
+
+def normalize_tag(value: str) -> str:
+    """Index key for a cuisine or dietary tag: "Gluten-free" -> "gluten_free"."""
+    key = re.sub(r"[\s\-]+", "_", value.strip().lower())
+    return _TAG_ALIASES.get(key, key)
+
+
+def open_slots(hours: str) -> np.ndarray:
+    """
+    Boolean mask of the 15-minute slots a restaurant is open in.
+
+    Args:
+        hours: ";"-separated "HH:MM-HH:MM" intervals; an end at or before
+            the start runs past midnight, "24:00" is end of day
+
+    Returns:
+        Array of ``SLOTS_PER_DAY`` booleans (all False if unparseable).
+    """
+    minutes = np.arange(SLOTS_PER_DAY) * SLOT_MINUTES
+    mask = np.zeros(SLOTS_PER_DAY, dtype=bool)
+    for interval in hours.split(";"):
+        match = _INTERVAL.match(interval)
+        if not match:
+            continue
+        h1, m1, h2, m2 = (int(g) for g in match.groups())
+        start, end = h1 * 60 + m1, h2 * 60 + m2
+        if end > start:
+            mask |= (minutes >= start) & (minutes < end)
+        else:
+            mask |= (minutes >= start) | (minutes < end)
+    return mask
+
+
+# A facet set is ("rows", sorted int32 rows) or ("bits", packed bitmap)
+FacetSet = Tuple[str, np.ndarray]
+
+
+class FacetIndex:
+    """
+    Args:
+        cities: City of each row
+        cuisines: Cuisine of each row
+        prices: Price band of each row (0 if unknown)
+        dietary: Dietary tags of each row
+        hours: Opening hours of each row (see ``open_slots``)
+    """
+
+    def __init__(
+        self,
+        cities: Sequence[str],
+        cuisines: Sequence[str],
+        prices: Sequence[int],
+        dietary: Sequence[Sequence[str]],
+        hours: Sequence[str],
+    ):
+        self.size = len(cities)
+        self._bitmaps: Dict[str, Dict[str, np.ndarray]] = {}
+        self._postings: Dict[str, Dict[str, np.ndarray]] = {}
+        self._add("city", cities)
+        self._add("cuisine", cuisines)
+        self._add("price", prices)
+        pairs = [(row, tag) for row, tags in enumerate(dietary) for tag in dict.fromkeys(tags)]
+        self._add("dietary", [tag for _, tag in pairs], rows=[row for row, _ in pairs])
+
+        # Rows share a handful of distinct schedules: parse each once
+        schedules: Dict[str, int] = {}
+        inverse = np.fromiter((schedules.setdefault(h, len(schedules)) for h in hours), dtype=np.intp, count=self.size)
+        masks = np.array([open_slots(h) for h in schedules], dtype=bool).reshape(len(schedules), SLOTS_PER_DAY)
+        self._open = np.packbits(masks[inverse].T, axis=1)
+
+    def _add(self, facet: str, values: Sequence, rows: Optional[List[int]] = None) -> None:
+        bitmaps = self._bitmaps.setdefault(facet, {})
+        postings = self._postings.setdefault(facet, {})
+        rows = np.arange(len(values), dtype=np.int32) if rows is None else np.asarray(rows, dtype=np.int32)
+        # Normalize each distinct raw value once, then group rows by key
+        keys = {value: self.key(facet, value) for value in set(values)}
+        codes: Dict[str, int] = {}
+        inverse = np.fromiter((codes.setdefault(keys[v], len(codes)) for v in values), dtype=np.intp, count=len(values))
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.r_[0, np.cumsum(np.bincount(inverse, minlength=len(codes)))]
+        for key, k in codes.items():
+            # Rows come in ascending order and the sort is stable, so members are sorted
+            members = rows[order[bounds[k]:bounds[k + 1]]]
+            if len(members) * 32 >= self.size:
+                bits = np.zeros(self.size, dtype=bool)
+                bits[members] = True
+                bitmaps[key] = np.packbits(bits)
+            else:
+                postings[key] = members
+
+    @staticmethod
+    def key(facet: str, value) -> str:
+        """Index key of a facet value as a user would write it."""
+        if facet == "city":
+            return normalize_location(value)
+        if facet == "price":
+            return str(int(value))
+        return normalize_tag(value)
+
+    def rows_for(self, facet: str, value) -> np.ndarray:
+        """Sorted rows having one facet value."""
+        kind, data = self._union(facet, [self.key(facet, value)])
+        return data if kind == "rows" else np.flatnonzero(np.unpackbits(data, count=self.size)).astype(np.int32)
+
+    def _union(self, facet: str, values: Iterable[str]) -> FacetSet:
+        bitmaps, postings = self._bitmaps[facet], self._postings[facet]
+        bits = [bitmaps[v] for v in values if v in bitmaps]
+        lists = [postings[v] for v in values if v in postings]
+        if not bits:
+            return "rows", (np.unique(np.concatenate(lists)) if lists else np.empty(0, dtype=np.int32))
+        merged = np.bitwise_or.reduce(bits)
+        for rows in lists:
+            extra = np.zeros(self.size, dtype=bool)
+            extra[rows] = True
+            merged = merged | np.packbits(extra)
+        return "bits", merged
+
+    def match(
+        self,
+        city: Optional[str] = None,
+        cuisines: Sequence[str] = (),
+        max_price: Optional[int] = None,
+        dietary: Sequence[str] = (),
+        open_minute: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Rows matching every given filter.
+
+        Args:
+            city: Restaurants in this city
+            cuisines: Any of these cuisines
+            max_price: Price band at most this (rows with unknown price are excluded)
+            dietary: Every one of these dietary tags
+            open_minute: Open at this minute of the day (0-1439)
+
+        Returns:
+            Sorted row numbers.
+        """
+        sets: List[FacetSet] = []
+        if city:
+            sets.append(self._union("city", [self.key("city", city)]))
+        if cuisines:
+            sets.append(self._union("cuisine", [self.key("cuisine", c) for c in cuisines]))
+        if max_price:
+            sets.append(self._union("price", [self.key("price", p) for p in range(1, int(max_price) + 1)]))
+        for tag in dietary:
+            sets.append(self._union("dietary", [self.key("dietary", tag)]))
+        if open_minute is not None:
+            sets.append(("bits", self._open[(int(open_minute) % 1440) // SLOT_MINUTES]))
+
+        lists = sorted((data for kind, data in sets if kind == "rows"), key=len)
+        bitmaps = [data for kind, data in sets if kind == "bits"]
+        if not lists:
+            if not bitmaps:
+                return np.arange(self.size, dtype=np.int32)
+            return np.flatnonzero(np.unpackbits(np.bitwise_and.reduce(bitmaps), count=self.size)).astype(np.int32)
+
+        rows = lists[0]
+        for other in lists[1:]:
+            rows = rows[np.isin(rows, other, assume_unique=True)]
+        for bits in bitmaps:
+            rows = rows[((bits[rows >> 3] >> (7 - (rows & 7)).astype(np.uint8)) & 1).astype(bool)]
+        return rows
@@ -0,0 +1,154 @@
+"""
+Local restaurant table with spatial and facet indexes.
+
+``data/restaurants.csv`` (or the CSV or Parquet file named by
+``RESTAURANT_DATA_PATH``) is loaded once into parallel column arrays.
+Coordinates are indexed with the walking-route ``GridIndex``, so radius and
+corridor queries only touch the cells near the query; city, cuisine, price,
+dietary tags and opening hours are indexed by ``FacetIndex``, so filtering
+is a few bitmap ANDs and ranking is one vectorized sort over the matches.
+
+Parquet files need pandas with pyarrow (both come with streamlit).
+"""
+
+import csv
+import os
+from functools import cached_property, lru_cache
+from typing import List, Sequence
+
+import numpy as np
+
+from ..walking_routes_agent.grid_index import GridIndex
+from .facet_index import FacetIndex
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "restaurants.csv")
+
+# ~ a one-minute walk; corridor buffers are usually 100-500 m
+GRID_CELL_M = 200.0
+
+
+class RestaurantTable:
+    """
+    Args:
+        names: Restaurant names
+        cities: City of each restaurant
+        lat: Latitudes in degrees
+        lon: Longitudes in degrees
+        cuisine: Cuisine of each restaurant (e.g. "italian")
+        price: Price band, 1 (budget) to 4 (fine dining)
+        dietary: Dietary tags of each restaurant (e.g. ["vegetarian", "vegan"])
+        hours: Opening hours as ";"-separated "HH:MM-HH:MM" intervals
+        rating: Average rating out of 5
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        cities: List[str],
+        lat,
+        lon,
+        cuisine: List[str],
+        price,
+        dietary: Sequence[Sequence[str]],
+        hours: List[str],
+        rating,
+    ):
+        self.names = names
+        self.cities = cities
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cuisine = cuisine
+        self.price = np.asarray(price, dtype=np.int8)
+        self.dietary = [tuple(tags) for tags in dietary]
+        self.hours = hours
+        self.rating = np.asarray(rating, dtype=np.float32)
+        self.grid = GridIndex(self.lat, self.lon, cell_m=GRID_CELL_M)
+
+    @classmethod
+    def from_csv(cls, path: str = DATA_PATH) -> "RestaurantTable":
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(line for line in f if not line.startswith("#")))
+        return cls(
+            names=[r["name"].strip() for r in rows],
+            cities=[r["city"].strip() for r in rows],
+            lat=[float(r["lat"]) for r in rows],
+            lon=[float(r["lon"]) for r in rows],
+            cuisine=[r["cuisine"].strip().lower() for r in rows],
+            price=[int(r["price"] or 0) for r in rows],
+            dietary=[[t.strip().lower() for t in (r.get("dietary") or "").split(";") if t.strip()] for r in rows],
+            hours=[(r.get("hours") or "").strip() for r in rows],
+            rating=[float(r["rating"] or "nan") for r in rows],
+        )
+
+    @classmethod
+    def from_parquet(cls, path: str) -> "RestaurantTable":
+        import pandas as pd
+
+        frame = pd.read_parquet(path)
+
+        def tags(value) -> List[str]:
+            if isinstance(value, str):
+                value = value.split(";")
+            elif value is None or (isinstance(value, float) and np.isnan(value)):
+                value = []
+            return [str(t).strip().lower() for t in value if str(t).strip()]
+
+        def schedule(value) -> str:
+            if value is None or isinstance(value, float):
+                return ""
+            return value.strip() if isinstance(value, str) else ";".join(str(v).strip() for v in value)
+
+        return cls(
+            names=frame["name"].astype(str).str.strip().tolist(),
+            cities=frame["city"].astype(str).str.strip().tolist(),
+            lat=frame["lat"].to_numpy(dtype=np.float64),
+            lon=frame["lon"].to_numpy(dtype=np.float64),
+            cuisine=frame["cuisine"].astype(str).str.strip().str.lower().tolist(),
+            price=frame["price"].fillna(0).to_numpy(dtype=np.int8),
+            dietary=[tags(v) for v in frame["dietary"]] if "dietary" in frame else [[]] * len(frame),
+            hours=[schedule(v) for v in frame["hours"]] if "hours" in frame else [""] * len(frame),
+            rating=frame["rating"].to_numpy(dtype=np.float32) if "rating" in frame else np.full(len(frame), np.nan),
+        )
+
+    @classmethod
+    def load(cls, path: str = DATA_PATH) -> "RestaurantTable":
+        """Load a ``.csv`` or ``.parquet`` restaurant table."""
+        if path.lower().endswith((".parquet", ".pq")):
+            return cls.from_parquet(path)
+        return cls.from_csv(path)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @cached_property
+    def facets(self) -> FacetIndex:
+        """Facet indexes, built on the first filtered query."""
+        return FacetIndex(self.cities, self.cuisine, self.price.tolist(), self.dietary, self.hours)
+
+    def rank(self, rows, limit: int) -> np.ndarray:
+        """
+        The best ``limit`` of the given rows: highest rating first, cheaper
+        first among equal ratings, unrated last.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        score = np.nan_to_num(self.rating[rows], nan=-1.0)
+        if len(rows) > limit:
+            # Keep everything tied with the limit-th score so price can break the tie
+            cutoff = -np.partition(-score, limit - 1)[limit - 1]
+            rows, score = rows[score >= cutoff], score[score >= cutoff]
+        return rows[np.lexsort((self.price[rows], -score))][:limit]
+
+    def describe(self, row: int) -> str:
+        """Short one-line summary: cuisine, price band and rating."""
+        parts = [self.cuisine[row].replace("_", " ")]
+        if self.price[row] > 0:
+            parts.append("$" * int(self.price[row]))
+        if not np.isnan(self.rating[row]):
+            parts.append(f"★{self.rating[row]:.1f}")
+        return ", ".join(parts)
+
+
+@lru_cache(maxsize=1)
+def get_restaurant_table() -> RestaurantTable:
+    """Process-wide restaurant table, loaded on first use."""
+    return RestaurantTable.load(os.getenv("RESTAURANT_DATA_PATH", DATA_PATH))
@@ -1,5 +1,6 @@
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
+from ...threaded_tools import ThreadedFunctionTool
+from ..weather_agent.agent import best_time_tool
 import requests
 import json
 import re
@@ -20,7 +21,7 @@ def get_attraction_image(attraction: str, location: str) -> str:
     # In a production environment, you would use web scraping or TripAdvisor API
     return f"https://www.tripadvisor.com/Search?q={encoded_query}&searchType=attractions"
 
-get_attraction_image_tool = FunctionTool(get_attraction_image)
+get_attraction_image_tool = ThreadedFunctionTool(get_attraction_image)
 
 tourist_spots_agent = Agent(
     name="tourist_spots_agent",
@@ -37,6 +38,8 @@ tourist_spots_agent = Agent(
     - Best times to visit each attraction
     - Practical tips for visiting
     
+    For the best season or months to visit, CALL get_best_time_to_visit with the city and summarize its best months in one or two sentences instead of guessing.
+    
     For each major attraction or landmark you mention, CALL the get_attraction_image tool with the attraction name and location, and include the returned image URL in your response as a thumbnail.
     
     Example format:
@@ -50,5 +53,5 @@ tourist_spots_agent = Agent(
     
     Provide direct, helpful recommendations for the requested location. Always include image thumbnails for at least 5-8 major attractions.
     """,
-    tools=[get_attraction_image_tool],
+    tools=[get_attraction_image_tool, best_time_tool],
 )
\ No newline at end of file
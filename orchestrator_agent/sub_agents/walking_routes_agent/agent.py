@@ -1,8 +1,75 @@
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
+from ...threaded_tools import ThreadedFunctionTool
+from ...timezones import get_zone, parse_clock, resolve_timezone
+from .isochrone import get_isochrone_index
+from .itinerary import plan_itinerary
+from .poi_index import WALKING_SPEED_KMH, format_distance, format_duration, get_poi_index, haversine_m, walking_distance_m, walking_minutes
+from .route_library import get_route_library
+from .route_optimizer import optimize_order, path_length
+from .street_graph import get_street_graph
+from .transit import TransitJourney, get_transit_timetable
+from datetime import datetime
+from typing import Optional, Tuple
+import re
 import urllib.parse
 
-def generate_walking_route_map(start_location: str, end_location: str, waypoints: str = "") -> str:
+# Legs longer than this get a public-transport hint instead of a plain walking estimate
+LONG_LEG_KM = 5.0
+# Legs longer than this are compared against the local transit timetable, if one is built
+TRANSIT_LEG_KM = 2.0
+# Transit is only suggested when it beats walking by at least this much
+MIN_TRANSIT_SAVING_MINUTES = 5
+
+MAX_ISOCHRONE_MINUTES = 60
+MAX_ITINERARY_DAYS = 14
+DEFAULT_VISIT_MINUTES = 60
+_VISIT_TIME = re.compile(r"^(.*?)\s*:\s*(\d+)\s*(?:min(?:utes?)?)?$")
+MAX_ISOCHRONE_RESULTS = 20
+# Landmarks this close to the starting point are where you are, not somewhere to walk to
+AT_ORIGIN_M = 50
+_COORDINATES = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+def walking_leg(row_a: int, row_b: int) -> Tuple[float, bool]:
+    """
+    On-foot distance in metres between two known stops.
+
+    Uses the local street graph when one is built and covers both stops,
+    otherwise the straight-line distance times the detour factor.
+
+    Returns:
+        (distance_m, follows_streets)
+    """
+    poi_index = get_poi_index()
+    lat_a, lon_a = float(poi_index.lat[row_a]), float(poi_index.lon[row_a])
+    lat_b, lon_b = float(poi_index.lat[row_b]), float(poi_index.lon[row_b])
+    graph = get_street_graph()
+    if graph is not None:
+        route = graph.route(lat_a, lon_a, lat_b, lon_b)
+        if route is not None:
+            return route.distance_m, True
+    return float(walking_distance_m(haversine_m(lat_a, lon_a, lat_b, lon_b))), False
+
+def walking_route_url(start_location: str, end_location: str, waypoints: str = "") -> str:
+    """Google Maps walking directions URL, with optional |-separated waypoints."""
+    # Base Google Maps directions URL
+    base_url = "https://www.google.com/maps/dir/"
+    
+    # Encode the locations
+    start_encoded = urllib.parse.quote(start_location)
+    end_encoded = urllib.parse.quote(end_location)
+    
+    # Build the URL
+    url = f"{base_url}{start_encoded}/{end_encoded}"
+    
+    # Add waypoints if provided
+    if waypoints:
+        waypoints_encoded = urllib.parse.quote(waypoints.replace("|", "/"))
+        url = f"{base_url}{start_encoded}/{waypoints_encoded}/{end_encoded}"
+    
+    # Add walking mode parameter
+    return url + "/data=!4m2!4m1!3e2"  # 3e2 specifies walking mode
+
+def generate_walking_route_map(start_location: str, end_location: str, waypoints: str = "", include_estimate: bool = True) -> str:
     """
     Generate a Google Maps walking route link between locations.
     
@@ -10,59 +77,54 @@ def generate_walking_route_map(start_location: str, end_location: str, waypoints
         start_location: Starting point (e.g., "Eiffel Tower, Paris")
         end_location: Ending point (e.g., "Louvre Museum, Paris")
         waypoints: Optional waypoints separated by | (e.g., "Notre Dame|Arc de Triomphe")
+        include_estimate: Append the walking distance and time when every stop is a known landmark
     
     Returns:
         Google Maps walking route URL
     """
     try:
-        # Base Google Maps directions URL
-        base_url = "https://www.google.com/maps/dir/"
+        url = walking_route_url(start_location, end_location, waypoints)
         
-        # Encode the locations
-        start_encoded = urllib.parse.quote(start_location)
-        end_encoded = urllib.parse.quote(end_location)
+        result = f"Walking Route Map: {url}\n\nYou can click this link to open Google Maps with the walking directions from {start_location} to {end_location}."
         
-        # Build the URL
-        url = f"{base_url}{start_encoded}/{end_encoded}"
+        if include_estimate:
+            stops = [start_location, *[w for w in waypoints.split("|") if w.strip()], end_location]
+            rows = get_poi_index().resolve([stop.strip() for stop in stops])
+            if None not in rows:
+                legs = [walking_leg(a, b) for a, b in zip(rows[:-1], rows[1:])]
+                total_m = sum(meters for meters, _ in legs)
+                source = "along streets" if all(on_streets for _, on_streets in legs) else "estimated"
+                result += f"\nWalking distance: about {format_distance(total_m)}, roughly {format_duration(walking_minutes(total_m))} ({source})."
         
-        # Add waypoints if provided
-        if waypoints:
-            waypoints_encoded = urllib.parse.quote(waypoints.replace("|", "/"))
-            url = f"{base_url}{start_encoded}/{waypoints_encoded}/{end_encoded}"
-        
-        # Add walking mode parameter
-        url += "/data=!4m2!4m1!3e2"  # 3e2 specifies walking mode
-        
-        return f"Walking Route Map: {url}\n\nYou can click this link to open Google Maps with the walking directions from {start_location} to {end_location}."
+        return result
     
     except Exception as e:
         return f"Error generating map link: {str(e)}"
 
-def create_walking_plan_with_map(locations: str) -> str:
+def create_walking_plan_with_map(locations: str, optimize: bool = False, fix_start: bool = False, fix_end: bool = False) -> str:
     """
     Create a comprehensive walking plan with map links for multiple tourist spots.
     If a city name is provided instead of specific locations, a default tour for that city is generated.
     
     Args:
         locations: Comma-separated list of spots (e.g., "Eiffel Tower, Louvre Museum") or a city name (e.g., "Paris").
+        optimize: Reorder the stops to minimise total walking distance instead of keeping the given order.
+        fix_start: With optimize, keep the first listed spot as the starting point.
+        fix_end: With optimize, keep the last listed spot as the finishing point.
     
     Returns:
-        A step-by-step walking plan with Google Maps links.
+        A step-by-step walking plan with Google Maps links and per-leg
+        distance and walking-time estimates for known landmarks.
     """
     try:
-        # Predefined popular walking routes for major cities
-        popular_routes = {
-            "paris": "Eiffel Tower, Arc de Triomphe, Louvre Museum, Notre Dame Cathedral",
-            "london": "Buckingham Palace, Big Ben, Tower of London, The British Museum",
-            "rome": "Colosseum, Roman Forum, Trevi Fountain, Pantheon",
-            "new york": "Times Square, Central Park, Statue of Liberty, Empire State Building"
-        }
-
-        # Check if the input is a known city for a default tour
-        city_key = locations.lower().strip()
-        if city_key in popular_routes:
-            plan_intro = f"Here is a suggested walking tour for the top spots in {city_key.title()}:\n\n"
-            locations = popular_routes[city_key]
+        # Check if the input is a city with a precomputed default tour; its
+        # stops are already in walking order with leg distances stored
+        library = get_route_library()
+        default_tour = library.find(locations) if library is not None and "," not in locations else None
+        if default_tour is not None:
+            plan_intro = f"Here is a suggested walking tour for the top spots in {default_tour['city']}:\n\n"
+            locations = ", ".join(default_tour["stops"])
+            optimize = False
         else:
             plan_intro = "Here is your custom walking route:\n\n"
 
@@ -72,9 +134,37 @@ def create_walking_plan_with_map(locations: str) -> str:
         if len(spots) < 2:
             return "Please provide at least 2 locations or a major city name to create a walking route."
         
+        # Stops with bundled coordinates get real leg distances: along the
+        # street graph when one is built, otherwise estimated from one
+        # straight-line distance matrix
+        poi_index = get_poi_index()
+        rows = poi_index.resolve(spots)
+        
+        optimize_note = ""
+        if optimize and len(spots) > 2:
+            missing = [spot for spot, row in zip(spots, rows) if row is None]
+            if missing:
+                optimize_note = f"ℹ️ Kept your order: no coordinates for {', '.join(missing)}, so the route could not be optimized.\n\n"
+            else:
+                distances = poi_index.distance_matrix(rows)
+                order, length = optimize_order(distances, fix_start=fix_start, fix_end=fix_end)
+                saved_m = float(walking_distance_m(path_length(distances, range(len(spots))) - length))
+                if saved_m >= 10:
+                    spots = [spots[k] for k in order]
+                    rows = [rows[k] for k in order]
+                    optimize_note = (
+                        f"🔀 Stops reordered to shorten the walk by about {format_distance(saved_m)} "
+                        f"(~{format_duration(walking_minutes(saved_m))}).\n\n"
+                    )
+                else:
+                    optimize_note = "🔀 Your order is already the shortest route found.\n\n"
+        
         plan = "🚶‍♂️ **Walking Route Plan**\n\n"
         plan += plan_intro
+        plan += optimize_note
         
+        total_m = 0.0
+        estimated_legs = 0
         # Create route between consecutive spots
         for i in range(len(spots) - 1):
             start = spots[i]
@@ -83,16 +173,52 @@ def create_walking_plan_with_map(locations: str) -> str:
             plan += f"**Step {i + 1}: {start} → {end}**\n"
             
             # Generate map link for this segment
-            map_link = generate_walking_route_map(start, end)
+            map_link = generate_walking_route_map(start, end, include_estimate=False)
             plan += f"{map_link}\n"
             
-            plan += f"Estimated walking time: 15-30 minutes (depending on distance)\n"
-            plan += f"Distance: Varies (check map for exact distance)\n\n"
+            # Library tours carry their own coordinates and leg distances, so
+            # their stops need not be in the bundled POI table
+            leg = None
+            if default_tour is not None:
+                (lat_a, lon_a), (lat_b, lon_b) = default_tour["coords"][i], default_tour["coords"][i + 1]
+                leg = default_tour["legs_m"][i], default_tour["along_streets"][i], default_tour["city"]
+            elif rows[i] is not None and rows[i + 1] is not None:
+                lat_a, lon_a = float(poi_index.lat[rows[i]]), float(poi_index.lon[rows[i]])
+                lat_b, lon_b = float(poi_index.lat[rows[i + 1]]), float(poi_index.lon[rows[i + 1]])
+                leg = (*walking_leg(rows[i], rows[i + 1]), poi_index.cities[rows[i]])
+            
+            if leg is not None:
+                leg_m, on_streets, city = leg
+                straight_m = float(haversine_m(lat_a, lon_a, lat_b, lon_b))
+                total_m += leg_m
+                estimated_legs += 1
+                plan += f"Estimated walking time: about {format_duration(walking_minutes(leg_m))}\n"
+                route_note = "along streets, " if on_streets else ""
+                plan += f"Distance: about {format_distance(leg_m)} on foot ({route_note}{format_distance(straight_m)} straight line)\n"
+                journey = None
+                if leg_m > TRANSIT_LEG_KM * 1000:
+                    journey = transit_journey(lat_a, lon_a, lat_b, lon_b, city=city)
+                if journey is not None and journey.minutes <= walking_minutes(leg_m) - MIN_TRANSIT_SAVING_MINUTES:
+                    lines = " → ".join(f"{ride.mode} {ride.route}".strip() for ride in journey.rides)
+                    plan += f"🚇 By public transport right now: about {format_duration(journey.minutes)} ({lines})\n"
+                elif leg_m > LONG_LEG_KM * 1000:
+                    plan += "This is a long leg; consider public transport or a taxi for part of it.\n"
+                plan += "\n"
+            else:
+                plan += f"Estimated walking time: 15-30 minutes (depending on distance)\n"
+                plan += f"Distance: Varies (check map for exact distance)\n\n"
+        
+        if estimated_legs:
+            legs_note = "" if estimated_legs == len(spots) - 1 else f" for {estimated_legs} of {len(spots) - 1} legs"
+            plan += (
+                f"**Total walking{legs_note}:** about {format_distance(total_m)}, "
+                f"roughly {format_duration(walking_minutes(total_m))} (excluding time spent at each stop)\n\n"
+            )
         
         # Create a complete route map if there are multiple waypoints
         if len(spots) > 2:
             waypoints = "|".join(spots[1:-1])  # All spots except first and last
-            complete_route = generate_walking_route_map(spots[0], spots[-1], waypoints)
+            complete_route = generate_walking_route_map(spots[0], spots[-1], waypoints, include_estimate=False)
             plan += f"**Complete Route Map (All Stops):**\n{complete_route}\n\n"
         
         plan += "**Tips:**\n"
@@ -107,21 +233,242 @@ def create_walking_plan_with_map(locations: str) -> str:
     except Exception as e:
         return f"Error creating walking plan: {str(e)}"
 
+def locate(place: str) -> Optional[Tuple[float, float, str]]:
+    """Coordinates and display name for a known landmark or a "lat,lon" string, or None."""
+    match = _COORDINATES.match(place)
+    if match:
+        lat, lon = float(match.group(1)), float(match.group(2))
+        if -90 <= lat <= 90 and -180 <= lon <= 180:
+            return lat, lon, f"{lat:.5f}, {lon:.5f}"
+        return None
+    row = get_poi_index().resolve([place.strip()])[0]
+    if row is None:
+        return None
+    poi_index = get_poi_index()
+    return float(poi_index.lat[row]), float(poi_index.lon[row]), poi_index.names[row]
+
+def find_places_within_walk(start: str, minutes: int = 15) -> str:
+    """
+    List landmarks reachable on foot within a time budget, nearest first.
+    
+    Args:
+        start: Starting point: a landmark (e.g., "Colosseum") or coordinates as "lat,lon" (e.g., "41.8902,12.4922").
+        minutes: Walking time budget in minutes (1 to 60).
+    
+    Returns:
+        Reachable places with walking time and distance.
+    """
+    try:
+        origin = locate(start)
+        if origin is None:
+            return (
+                f"Sorry, I couldn't locate '{start}'. Please give a well-known landmark "
+                f"or coordinates as 'latitude,longitude'."
+            )
+        lat, lon, label = origin
+        minutes = max(1, min(int(minutes), MAX_ISOCHRONE_MINUTES))
+        budget_m = minutes * WALKING_SPEED_KMH * 1000 / 60
+        
+        found, on_streets = get_isochrone_index().reachable_pois(lat, lon, budget_m)
+        poi_index = get_poi_index()
+        # The landmark you're standing at (named or given as coordinates) is not a destination
+        at_origin = [
+            row for row, _ in found
+            if haversine_m(lat, lon, poi_index.lat[row], poi_index.lon[row]) < AT_ORIGIN_M
+        ]
+        if at_origin and poi_index.names[at_origin[0]] != label:
+            label = f"{poi_index.names[at_origin[0]]} ({label})"
+        found = [(row, meters) for row, meters in found if row not in at_origin][:MAX_ISOCHRONE_RESULTS]
+        if not found:
+            return f"No landmarks I know of are within a {minutes}-minute walk of {label}. Try a longer time."
+        
+        method = "along streets" if on_streets else "estimated from straight-line distance"
+        lines = [f"🧭 **Within a {minutes}-minute walk of {label}** ({method}):", ""]
+        for k, (row, meters) in enumerate(found, 1):
+            lines.append(f"{k}. {poi_index.names[row]}: {format_duration(walking_minutes(meters))} ({format_distance(meters)})")
+        return "\n".join(lines)
+    
+    except Exception as e:
+        return f"Error finding places within walking distance: {str(e)}"
+
+def create_multi_day_itinerary(locations: str, days: int, minutes_per_stop: int = DEFAULT_VISIT_MINUTES) -> str:
+    """
+    Split many sights into a multi-day plan: each day a compact area with a similar amount of sightseeing, walked in a short order.
+    
+    Args:
+        locations: Comma-separated spots, optionally with minutes to spend at each (e.g., "Vatican Museums: 180, Pantheon: 30, Colosseum"), or a city name (e.g., "Rome") to use its best-known landmarks.
+        days: Number of days (1 to 14).
+        minutes_per_stop: Minutes to spend at spots without their own time.
+    
+    Returns:
+        A day-by-day plan with the stops in walking order, time at the stops, walking distance and a map link per day.
+    """
+    try:
+        poi_index = get_poi_index()
+        city_rows = poi_index.city_rows(locations)
+        if "," not in locations and len(city_rows):
+            spots = [poi_index.names[row] for row in city_rows]
+            minutes = [minutes_per_stop] * len(spots)
+            rows = city_rows.tolist()
+            title = poi_index.cities[city_rows[0]]
+        else:
+            spots, minutes = [], []
+            for item in (part.strip() for part in locations.split(",")):
+                if not item:
+                    continue
+                match = _VISIT_TIME.match(item)
+                spots.append(match.group(1) if match else item)
+                minutes.append(int(match.group(2)) if match else minutes_per_stop)
+            rows = poi_index.resolve(spots)
+            title = "your trip"
+        
+        if len(spots) < 2:
+            return "Please provide at least 2 locations or a city name to plan a multi-day itinerary."
+        
+        located = [k for k, row in enumerate(rows) if row is not None]
+        missing = [spots[k] for k, row in enumerate(rows) if row is None]
+        if len(located) < 2:
+            return f"Sorry, I don't have locations for enough of these spots ({', '.join(missing)}) to group them into days."
+        
+        days = max(1, min(int(days), MAX_ITINERARY_DAYS, len(located)))
+        loc_rows = [rows[k] for k in located]
+        plan = plan_itinerary(
+            poi_index.lat[loc_rows], poi_index.lon[loc_rows], [minutes[k] for k in located], days,
+        )
+        
+        result = f"🗓️ **{len(plan)}-day itinerary for {title}** ({len(located)} stops)\n\n"
+        for day, stops in enumerate(plan, 1):
+            names = [spots[located[k]] for k in stops]
+            visit = sum(minutes[located[k]] for k in stops)
+            walk_m = sum(walking_leg(loc_rows[a], loc_rows[b])[0] for a, b in zip(stops[:-1], stops[1:]))
+            result += f"**Day {day}:** {' → '.join(names)}\n"
+            result += f"About {format_duration(visit)} at the stops"
+            if len(names) > 1:
+                result += f" + {format_distance(walk_m)} walking (~{format_duration(walking_minutes(walk_m))})"
+                result += f"\nWalking Route Map: {walking_route_url(names[0], names[-1], '|'.join(names[1:-1]))}"
+            result += "\n\n"
+        
+        if missing:
+            result += f"ℹ️ No coordinates for {', '.join(missing)}: fit them into whichever day is closest.\n\n"
+        result += "**Tips:**\n"
+        result += "• Days are grouped by area so most walking is between nearby stops\n"
+        result += "• Check opening days: many museums close one day a week\n"
+        return result
+    
+    except Exception as e:
+        return f"Error creating itinerary: {str(e)}"
+
+def format_clock(seconds: int) -> str:
+    """"HH:MM" for seconds after midnight (wrapping past midnight)."""
+    minutes = int(seconds) // 60
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+def transit_journey(lat: float, lon: float, dest_lat: float, dest_lon: float, depart_at: str = "now",
+                    city: str = "") -> Optional[TransitJourney]:
+    """
+    Earliest-arrival journey over the local transit timetable, departing
+    today at ``depart_at`` ("now" or a clock time) in the feed's timezone.
+
+    Returns:
+        The journey (possibly a single walk), or None when no timetable is
+        built, the time can't be understood, or the trip is out of range.
+    """
+    timetable = get_transit_timetable()
+    if timetable is None:
+        return None
+    tz_name = timetable.meta.get("timezone") or (resolve_timezone(city) if city else None)
+    now = datetime.now(get_zone(tz_name)) if tz_name else datetime.now()
+    if depart_at.strip().lower() == "now":
+        minute = now.hour * 60 + now.minute
+    else:
+        minute = parse_clock(depart_at)
+        if minute is None:
+            return None
+    return timetable.earliest_arrival(lat, lon, dest_lat, dest_lon, minute * 60, now.date())
+
+def plan_transit_trip(start: str, end: str, depart_at: str = "now") -> str:
+    """
+    Public transport directions between two places from the local timetable: walk to a stop, ride, change if needed, walk to the destination.
+    
+    Args:
+        start: Starting point: a landmark (e.g., "Eiffel Tower") or coordinates as "lat,lon".
+        end: Destination: a landmark or coordinates as "lat,lon".
+        depart_at: Departure time today in local time: "now" or a clock time (e.g., "9:30", "6pm").
+    
+    Returns:
+        Step-by-step directions with departure and arrival times, or the walking time when walking is quicker.
+    """
+    try:
+        places = [locate(start), locate(end)]
+        for place, name in zip(places, (start, end)):
+            if place is None:
+                return (
+                    f"Sorry, I couldn't locate '{name}'. Please give a well-known landmark "
+                    f"or coordinates as 'latitude,longitude'."
+                )
+        (lat, lon, origin), (dest_lat, dest_lon, destination) = places
+        walk_m = float(walking_distance_m(haversine_m(lat, lon, dest_lat, dest_lon)))
+        walk_note = f"Walking all the way: about {format_duration(walking_minutes(walk_m))} ({format_distance(walk_m)})."
+        
+        if get_transit_timetable() is None:
+            return f"I don't have public transport timetables for this area. {walk_note}"
+        if depart_at.strip().lower() != "now" and parse_clock(depart_at) is None:
+            return f"Sorry, I couldn't understand the departure time '{depart_at}'. Try 'now', '9:30' or '6pm'."
+        city_row = get_poi_index().resolve([start.strip()])[0]
+        city = get_poi_index().cities[city_row] if city_row is not None else ""
+        journey = transit_journey(lat, lon, dest_lat, dest_lon, depart_at, city)
+        if journey is None:
+            return f"There are no public transport stops within walking distance of {origin} or {destination}. {walk_note}"
+        if not journey.rides:
+            return f"🚶 Walking is the quickest way from {origin} to {destination} at that time. {walk_note}"
+        
+        changes = len(journey.rides) - 1
+        change_note = "no changes" if changes == 0 else f"{changes} change{'s' if changes > 1 else ''}"
+        lines = [
+            f"🚇 **Public transport from {origin} to {destination}**",
+            f"Leave {format_clock(journey.depart_s)}, arrive about {format_clock(journey.arrive_s)} "
+            f"({format_duration(journey.minutes)}, {change_note})",
+            "",
+        ]
+        for k, leg in enumerate(journey.legs, 1):
+            if leg.mode == "walk":
+                target = leg.destination or destination
+                lines.append(f"{k}. 🚶 Walk {format_duration(max(1, (leg.arrive_s - leg.depart_s) / 60))} ({format_distance(leg.distance_m)}) to {target}")
+            else:
+                line = f"{leg.mode} {leg.route}".strip()
+                stops = f"{leg.stops} stop{'s' if leg.stops > 1 else ''}"
+                lines.append(
+                    f"{k}. 🚏 {line} from {leg.origin} at {format_clock(leg.depart_s)} "
+                    f"→ {leg.destination} at {format_clock(leg.arrive_s)} ({stops})"
+                )
+        lines += ["", walk_note, "Times are from the published timetable; check for live delays."]
+        return "\n".join(lines)
+    
+    except Exception as e:
+        return f"Error planning public transport trip: {str(e)}"
+
 # Create tools
-walking_plan_tool = FunctionTool(
+walking_plan_tool = ThreadedFunctionTool(
     create_walking_plan_with_map
 )
+isochrone_tool = ThreadedFunctionTool(find_places_within_walk)
+itinerary_tool = ThreadedFunctionTool(create_multi_day_itinerary)
+transit_tool = ThreadedFunctionTool(plan_transit_trip)
 
 walking_routes_agent = Agent(
     name="walking_routes_agent",
     model="gemini-1.5-flash",  # Ensure model is consistent
-    description="Generates a step-by-step walking tour plan with Google Maps links for multiple tourist spots.",
+    description="Generates step-by-step walking tour plans and multi-day itineraries with Google Maps links, finds places within walking distance of a point, and plans public transport trips from a local timetable.",
     instruction="""
     You are a specialized agent that creates step-by-step walking tour plans.
     Your primary purpose is to use the `create_walking_plan_with_map` tool.
 
     When a user provides a list of two or more locations for a walking route, you MUST call the `create_walking_plan_with_map` tool with the locations.
+    Set optimize=True unless the user asked to visit the spots in their order; set fix_start=True when they name a starting point (e.g. their hotel) and fix_end=True when they name where to finish, listing those spots first and last.
+    When the user wants several days of sightseeing ("3 days in Rome", or a long list of spots to split over days), call `create_multi_day_itinerary` with the spots (or the city name) and the number of days, adding ": minutes" after spots they want more or less time at.
+    When the user asks what is within walking distance of a place ("what's within a 15-minute walk of the Colosseum?"), call `find_places_within_walk` with the place and the number of minutes.
+    When the user asks how to get somewhere by public transport (bus, metro, tram, train), or two places are too far apart to walk, call `plan_transit_trip` with the start, the destination and the departure time ("now" unless they give one).
     Do not answer conversationally; your only job is to format the locations and call the tool.
     """,
-    tools=[walking_plan_tool],
+    tools=[walking_plan_tool, isochrone_tool, itinerary_tool, transit_tool],
 )
\ No newline at end of file
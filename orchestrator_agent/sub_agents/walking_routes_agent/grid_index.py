@@ -0,0 +1,139 @@
+"""
+Uniform grid spatial index over latitude/longitude points.
+
+Points are bucketed into roughly square cells of ``cell_m`` metres: rows are
+fixed-height latitude bands and each band's longitude cell width is scaled
+by the band's cosine, so cells stay square from the equator to high
+latitudes. Points are stored sorted by (row, column) key, which makes all
+cells of one row in a query window a single contiguous slice: a radius
+query costs one ``searchsorted`` pair per row plus an exact haversine
+filter over the candidates. Index size is three arrays of ``len(points)``.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from .poi_index import EARTH_RADIUS_M, haversine_m
+
+METERS_PER_DEG = np.pi * EARTH_RADIUS_M / 180
+_OFFSET = 1 << 30
+
+
+class GridIndex:
+    """
+    Args:
+        lat: Latitudes in degrees
+        lon: Longitudes in degrees
+        cell_m: Approximate cell edge length in metres
+    """
+
+    def __init__(self, lat, lon, cell_m: float = 250.0):
+        # Kept as given (possibly float32 memmaps); only the keys use float64
+        self.lat = np.asarray(lat)
+        self.lon = np.asarray(lon)
+        self.cell_m = cell_m
+        self._dlat = cell_m / METERS_PER_DEG
+        keys = self._keys(self.lat.astype(np.float64), self.lon.astype(np.float64))
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def _rows(self, lat):
+        return np.floor(np.asarray(lat) / self._dlat).astype(np.int64)
+
+    def _row_scale(self, row):
+        return np.maximum(np.cos(np.radians((np.asarray(row) + 0.5) * self._dlat)), 0.01)
+
+    def _cols(self, lon, row):
+        return np.floor(np.asarray(lon) * self._row_scale(row) / self._dlat).astype(np.int64)
+
+    def _keys(self, lat, lon):
+        rows = self._rows(lat)
+        return (rows + _OFFSET) << 32 | (self._cols(lon, rows) + _OFFSET)
+
+    def candidates(self, lat: float, lon: float, radius_m: float) -> np.ndarray:
+        """Indices of every point in the cells overlapping the query circle (a superset)."""
+        dlat = radius_m / METERS_PER_DEG
+        reach = min(90.0, abs(lat) + dlat)
+        dlon = min(180.0, radius_m / (METERS_PER_DEG * max(np.cos(np.radians(reach)), 0.01)))
+        chunks = []
+        for row in range(int(self._rows(lat - dlat)), int(self._rows(lat + dlat)) + 1):
+            first = (row + _OFFSET) << 32 | (int(self._cols(lon - dlon, row)) + _OFFSET)
+            last = (row + _OFFSET) << 32 | (int(self._cols(lon + dlon, row)) + _OFFSET)
+            lo, hi = np.searchsorted(self._sorted_keys, [first, last + 1])
+            if hi > lo:
+                chunks.append(self._order[lo:hi])
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.intp)
+
+    def candidates_union(self, lats, lons, radius_m: float) -> np.ndarray:
+        """
+        Indices of every point in the cells overlapping any of several
+        equal-radius query circles, each point once.
+
+        All circles' row ranges are looked up in one ``searchsorted`` call and
+        the overlapping key ranges merged, so sampling a long route densely
+        costs little more than querying it once.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if not len(lats):
+            return np.empty(0, dtype=np.intp)
+        dlat = radius_m / METERS_PER_DEG
+        reach = min(90.0, float(np.abs(lats).max()) + dlat)
+        dlon = min(180.0, radius_m / (METERS_PER_DEG * max(np.cos(np.radians(reach)), 0.01)))
+
+        # One (circle, row) pair per row each circle spans
+        row_lo = self._rows(lats - dlat)
+        span = self._rows(lats + dlat) - row_lo + 1
+        circle = np.repeat(np.arange(len(lats)), span)
+        rows = row_lo[circle] + np.arange(len(circle)) - np.repeat(np.cumsum(span) - span, span)
+        base = (rows + _OFFSET) << 32
+        first = base | (self._cols(lons[circle] - dlon, rows) + _OFFSET)
+        last = base | (self._cols(lons[circle] + dlon, rows) + _OFFSET)
+        lo = np.searchsorted(self._sorted_keys, first)
+        hi = np.searchsorted(self._sorted_keys, last + 1)
+
+        # Merge overlapping [lo, hi) ranges, then expand them to positions
+        keep = hi > lo
+        if not keep.any():
+            return np.empty(0, dtype=np.intp)
+        order = np.argsort(lo[keep], kind="stable")
+        lo, hi = lo[keep][order], hi[keep][order]
+        starts = np.flatnonzero(np.r_[True, lo[1:] > np.maximum.accumulate(hi)[:-1]])
+        lo, hi = lo[starts], np.maximum.reduceat(hi, starts)
+        lengths = hi - lo
+        positions = np.repeat(lo - np.cumsum(lengths) + lengths, lengths) + np.arange(int(lengths.sum()))
+        return self._order[positions]
+
+    def query_radius(self, lat: float, lon: float, radius_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Points within ``radius_m`` of a location.
+
+        Returns:
+            ``(indices, distances_m)`` sorted by distance.
+        """
+        idx = self.candidates(lat, lon, radius_m)
+        dist = haversine_m(lat, lon, self.lat[idx].astype(np.float64), self.lon[idx].astype(np.float64))
+        keep = dist <= radius_m
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return idx[order], dist[order]
+
+    def nearest(self, lat: float, lon: float, max_radius_m: float = 2000.0) -> Tuple[int, float]:
+        """
+        Closest point within ``max_radius_m``.
+
+        Returns:
+            ``(index, distance_m)``, or ``(-1, inf)`` if nothing is in range.
+        """
+        radius = self.cell_m
+        while True:
+            idx, dist = self.query_radius(lat, lon, min(radius, max_radius_m))
+            if len(idx):
+                return int(idx[0]), float(dist[0])
+            if radius >= max_radius_m:
+                return -1, float("inf")
+            radius *= 2
@@ -0,0 +1,120 @@
+"""
+"What's within an N-minute walk of here?" over the local street graph.
+
+A bounded Dijkstra from the street node nearest the origin settles every
+node reachable within the walking budget; landmarks are then looked up by
+the street node they snap to. Results per origin node are kept in a small
+LRU: a later query from the same origin with the same or a smaller budget
+is answered by filtering the cached distances, and a larger budget replaces
+the entry.
+
+Without a street graph (or for origins outside the extract) the answer
+falls back to straight-line distance times the detour factor, like the
+walking-plan leg estimates.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .grid_index import GridIndex
+from .poi_index import POIIndex, get_poi_index, walking_distance_m
+from .street_graph import StreetGraph, get_street_graph
+
+
+class IsochroneIndex:
+    """
+    Args:
+        graph: Street graph, or None to use straight-line estimates only
+        poi_index: Landmarks to report
+        max_origins: Number of recent origins whose Dijkstra results are cached
+    """
+
+    def __init__(self, graph: Optional[StreetGraph], poi_index: POIIndex, max_origins: int = 128):
+        self.graph = graph
+        self.poi_index = poi_index
+        self.max_origins = max_origins
+        self.poi_grid = GridIndex(poi_index.lat, poi_index.lon)
+        self._cache: "OrderedDict[int, Tuple[float, np.ndarray, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._poi_nodes = None
+        self._poi_snap = None
+        self.hits = 0
+        self.misses = 0
+
+    def _snap_pois(self) -> None:
+        nodes, snaps = [], []
+        for lat, lon in zip(self.poi_index.lat.tolist(), self.poi_index.lon.tolist()):
+            node, snap = self.graph.nearest_node(lat, lon)
+            nodes.append(node)
+            snaps.append(snap)
+        self._poi_snap = np.array(snaps)
+        self._poi_nodes = np.array(nodes, dtype=np.int64)
+
+    def reachable_nodes(self, source: int, max_distance_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Street nodes within ``max_distance_m`` of ``source`` (sorted by node id), cached per origin."""
+        with self._lock:
+            cached = self._cache.get(source)
+            if cached is not None and cached[0] >= max_distance_m:
+                self._cache.move_to_end(source)
+                self.hits += 1
+                _, nodes, dist = cached
+                keep = dist <= max_distance_m
+                return nodes[keep], dist[keep]
+            self.misses += 1
+
+        nodes, dist = self.graph.bounded_dijkstra(source, max_distance_m)
+        with self._lock:
+            self._cache[source] = (max_distance_m, nodes, dist)
+            self._cache.move_to_end(source)
+            while len(self._cache) > self.max_origins:
+                self._cache.popitem(last=False)
+        return nodes, dist
+
+    def reachable_pois(self, lat: float, lon: float, max_distance_m: float) -> Tuple[List[Tuple[int, float]], bool]:
+        """
+        Landmarks within a walking distance of a point.
+
+        Returns:
+            ``([(poi_row, distance_m), ...] sorted by distance, follows_streets)``
+        """
+        # Walking distance is never shorter than the straight line, so the
+        # circle of radius max_distance_m bounds every candidate
+        rows, straight = self.poi_grid.query_radius(lat, lon, max_distance_m)
+
+        source = -1
+        if self.graph is not None:
+            source, origin_snap = self.graph.nearest_node(lat, lon)
+        if source < 0:
+            walking = walking_distance_m(straight)
+            found = [(int(r), float(d)) for r, d in zip(rows, walking) if d <= max_distance_m]
+            return found, False
+
+        if self._poi_nodes is None:
+            self._snap_pois()
+        nodes, dist = self.reachable_nodes(source, max_distance_m - origin_snap)
+        found = []
+        for row in rows.tolist():
+            node = self._poi_nodes[row]
+            if node < 0:
+                continue
+            pos = int(np.searchsorted(nodes, node))
+            if pos < len(nodes) and nodes[pos] == node:
+                total = origin_snap + float(dist[pos]) + float(self._poi_snap[row])
+                if total <= max_distance_m:
+                    found.append((row, total))
+        found.sort(key=lambda item: item[1])
+        return found, True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"origins_cached": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+
+@lru_cache(maxsize=1)
+def get_isochrone_index() -> IsochroneIndex:
+    """Process-wide isochrone index over the bundled landmarks and street graph (if built)."""
+    return IsochroneIndex(get_street_graph(), get_poi_index())
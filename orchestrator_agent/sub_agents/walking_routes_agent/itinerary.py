@@ -0,0 +1,198 @@
+"""
+Split a set of stops into geographically compact days of similar length.
+
+1. Stops are projected to local metres and clustered with k-means (k-means++
+   seeding, a few restarts, every step a NumPy broadcast over the
+   ``(stops, days)`` distance matrix).
+2. k-means balances area, not time, so days are then rebalanced by visit
+   duration: while a day is more than ``tolerance`` over the mean load, its
+   stop that is cheapest to hand over (smallest extra distance to the other
+   day's centre) moves to a day that stays within the limit, or failing
+   that to any lighter day. Every move strictly lowers the sum of squared
+   day loads, so this terminates.
+3. Each day is ordered into a short walk with the route optimizer.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .grid_index import METERS_PER_DEG
+from .poi_index import haversine_matrix
+from .route_optimizer import nearest_neighbour, optimize_order, two_opt
+
+BALANCE_TOLERANCE = 0.15
+
+# optimize_order tries every nearest-neighbour start (O(n^3)); past this
+# many stops in a day a single seed plus bounded 2-opt is plenty
+EXACT_ORDER_MAX_STOPS = 40
+
+
+def project(lat, lon) -> np.ndarray:
+    """Local equirectangular projection to metres, ``(n, 2)``."""
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    scale = np.cos(np.radians(lat.mean()))
+    return np.column_stack(((lon - lon.mean()) * scale, lat - lat.mean())) * METERS_PER_DEG
+
+
+def _sq_distances(points: np.ndarray, centres: np.ndarray, point_norms: Optional[np.ndarray] = None) -> np.ndarray:
+    # |p|^2 + |c|^2 - 2 p.c, built in place: one (n, k) array per call
+    d2 = points @ (-2.0 * centres.T)
+    d2 += (points ** 2).sum(1)[:, None] if point_norms is None else point_norms[:, None]
+    d2 += (centres ** 2).sum(1)[None, :]
+    return np.maximum(d2, 0.0, out=d2)
+
+
+def kmeans(points: np.ndarray, k: int, rng: np.random.Generator, max_iter: int = 100):
+    """
+    One k-means run with k-means++ seeding.
+
+    Returns:
+        ``(labels, centres, inertia)``
+    """
+    n = len(points)
+    centres = np.empty((k, points.shape[1]))
+    centres[0] = points[rng.integers(n)]
+    closest = ((points - centres[0]) ** 2).sum(1)
+    for c in range(1, k):
+        total = closest.sum()
+        pick = rng.choice(n, p=closest / total) if total > 0 else rng.integers(n)
+        centres[c] = points[pick]
+        np.minimum(closest, ((points - centres[c]) ** 2).sum(1), out=closest)
+
+    norms = (points ** 2).sum(1)
+    labels = np.full(n, -1)
+    for _ in range(max_iter):
+        d2 = _sq_distances(points, centres, norms)
+        new_labels = d2.argmin(axis=1)
+        counts = np.bincount(new_labels, minlength=k)
+        # Re-seed empty clusters at the points furthest from their centre
+        for c in np.flatnonzero(counts == 0):
+            far = int(d2[np.arange(n), new_labels].argmax())
+            new_labels[far] = c
+            d2[far] = 0.0
+            counts = np.bincount(new_labels, minlength=k)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for axis in range(points.shape[1]):
+            centres[:, axis] = np.bincount(labels, weights=points[:, axis], minlength=k) / counts
+    inertia = float(((points - centres[labels]) ** 2).sum())
+    return labels, centres, inertia
+
+
+def balance_loads(points: np.ndarray, labels: np.ndarray, centres: np.ndarray, weights: np.ndarray,
+                  tolerance: float = BALANCE_TOLERANCE) -> np.ndarray:
+    """
+    Move boundary stops between days until no day exceeds the mean load by
+    more than ``tolerance`` (or no move can reduce the imbalance).
+
+    Args:
+        points: ``(n, 2)`` projected coordinates
+        labels: Day of each stop
+        centres: ``(k, 2)`` day centres
+        weights: Time at each stop
+
+    Returns:
+        The rebalanced labels.
+    """
+    labels = labels.copy()
+    k = len(centres)
+    dist = np.sqrt(_sq_distances(points, centres))
+    loads = np.bincount(labels, weights=weights, minlength=k).astype(np.float64)
+    limit = loads.sum() / k * (1 + tolerance)
+    while True:
+        # One sweep tries a move out of every overloaded day, heaviest first
+        moved = False
+        for day in np.argsort(-loads):
+            if loads[day] <= limit:
+                break
+            members = np.flatnonzero(labels == day)
+            if len(members) < 2:
+                continue
+            # Prefer receivers that stay within the limit; failing that, any
+            # receiver left lighter than the giver was. Cost is the extra
+            # distance to the receiving day's centre.
+            cost = dist[members] - dist[members, day][:, None]
+            after = loads[None, :] + weights[members][:, None]
+            valid = after <= limit
+            valid[:, day] = False
+            if not valid.any():
+                valid = after < loads[day]
+                valid[:, day] = False
+                if not valid.any():
+                    continue
+            best = int(np.where(valid, cost, np.inf).argmin())
+            stop, target = members[best // k], best % k
+            labels[stop] = target
+            loads[day] -= weights[stop]
+            loads[target] += weights[stop]
+            moved = True
+        if not moved:
+            return labels
+
+
+def cluster_days(lat, lon, durations, days: int, tolerance: float = BALANCE_TOLERANCE,
+                 restarts: int = 3, seed: int = 0) -> np.ndarray:
+    """
+    Assign each stop to a day.
+
+    Args:
+        lat: Stop latitudes
+        lon: Stop longitudes
+        durations: Minutes to spend at each stop
+        days: Number of days
+        tolerance: Allowed excess of a day's visiting time over the mean
+        restarts: k-means runs; the most compact is kept
+        seed: Random seed, for reproducible plans
+
+    Returns:
+        Day index (0..days-1) of every stop.
+    """
+    n = len(lat)
+    days = max(1, min(days, n))
+    if days == 1:
+        return np.zeros(n, dtype=np.intp)
+    points = project(lat, lon)
+    rng = np.random.default_rng(seed)
+    labels, centres, _ = min((kmeans(points, days, rng) for _ in range(restarts)), key=lambda run: run[2])
+    return balance_loads(points, labels, centres, np.asarray(durations, dtype=np.float64), tolerance)
+
+
+def order_stops(dist: np.ndarray) -> List[int]:
+    """Short open walk through every stop of one day."""
+    n = len(dist)
+    if n <= EXACT_ORDER_MAX_STOPS:
+        return optimize_order(dist)[0]
+    return two_opt(dist, nearest_neighbour(dist, 0), max_passes=n)
+
+
+def plan_itinerary(lat, lon, durations, days: int, seed: int = 0,
+                   priority: Optional[Sequence[int]] = None) -> List[List[int]]:
+    """
+    Multi-day plan: compact, time-balanced days, each in walking order.
+
+    Args:
+        lat: Stop latitudes
+        lon: Stop longitudes
+        durations: Minutes to spend at each stop
+        days: Number of days (fewer are returned if there are fewer stops)
+        seed: Random seed for clustering
+        priority: Rank of each stop (lower first); the day holding the
+            highest-priority stop comes first. Defaults to input order.
+
+    Returns:
+        One list of stop indices per day, in visiting order.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    labels = cluster_days(lat, lon, durations, days, seed=seed)
+    rank = np.arange(len(lat)) if priority is None else np.asarray(priority)
+    plan = []
+    for day in np.unique(labels):
+        stops = np.flatnonzero(labels == day)
+        order = order_stops(haversine_matrix(lat[stops], lon[stops]))
+        plan.append(stops[order].tolist())
+    plan.sort(key=lambda stops: int(rank[stops].min()))
+    return plan
@@ -0,0 +1,159 @@
+"""
+Coordinates for popular walking-tour stops and vectorized distance maths.
+
+``data/poi_coordinates.csv`` lists landmarks per city with alternative names.
+It is loaded once into parallel NumPy arrays plus a name -> rows dict, so
+resolving the stops of a 50-stop route is 50 dict lookups and the full
+pairwise distance matrix is a single broadcast haversine over those rows.
+
+Straight-line distance understates walking distance on a street grid, so
+leg estimates multiply it by a detour factor (1.3 is typical for dense city
+centres) and divide by a walking speed; both are env-configurable.
+"""
+
+import csv
+import os
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ...timezones import normalize_location
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "poi_coordinates.csv")
+EARTH_RADIUS_M = 6_371_008.8
+
+WALKING_SPEED_KMH = float(os.getenv("WALKING_SPEED_KMH", "4.8"))
+DETOUR_FACTOR = float(os.getenv("WALKING_DETOUR_FACTOR", "1.3"))
+
+
+def normalize_poi_name(name: str) -> str:
+    """Lookup key for a stop name: accents, apostrophes and a leading "the" removed."""
+    key = normalize_location(name).replace("'", "").replace("’", "")
+    key = " ".join(key.split())
+    return key[4:] if key.startswith("the ") else key
+
+
+def haversine_matrix(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distance between every pair of points.
+
+    Args:
+        lat: Latitudes in degrees, shape ``(n,)``
+        lon: Longitudes in degrees, shape ``(n,)``
+
+    Returns:
+        Symmetric ``(n, n)`` array of distances in metres.
+    """
+    phi = np.radians(np.asarray(lat, dtype=np.float64))
+    lam = np.radians(np.asarray(lon, dtype=np.float64))
+    dphi = phi[:, None] - phi[None, :]
+    dlam = lam[:, None] - lam[None, :]
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi)[:, None] * np.cos(phi)[None, :] * np.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_m(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Element-wise great-circle distance in metres (inputs broadcast)."""
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    a = (
+        np.sin((phi2 - phi1) / 2) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin(np.radians(np.asarray(lon2) - np.asarray(lon1)) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def walking_distance_m(straight_line_m):
+    """Estimated on-street distance for a straight-line distance."""
+    return np.asarray(straight_line_m) * DETOUR_FACTOR
+
+
+def walking_minutes(distance_m):
+    """Walking time in minutes for an on-street distance."""
+    return np.asarray(distance_m) / (WALKING_SPEED_KMH * 1000 / 60)
+
+
+def format_distance(meters: float) -> str:
+    return f"{meters / 1000:.1f} km" if meters >= 1000 else f"{int(round(meters, -1))} m"
+
+
+def format_duration(minutes: float) -> str:
+    minutes = max(1, int(round(minutes)))
+    if minutes < 60:
+        return f"{minutes} min"
+    return f"{minutes // 60} h {minutes % 60:02d} min"
+
+
+class POIIndex:
+    """
+    In-memory table of named stops.
+
+    Args:
+        cities: City of each stop
+        names: Display name of each stop
+        lat: Latitudes in degrees
+        lon: Longitudes in degrees
+        aliases: Alternative names for each stop
+    """
+
+    def __init__(self, cities: List[str], names: List[str], lat, lon, aliases: Sequence[Sequence[str]] = ()):
+        self.cities = cities
+        self.names = names
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self._rows: Dict[str, List[int]] = {}
+        self._city_rows: Dict[str, List[int]] = {}
+        for i, name in enumerate(names):
+            self._city_rows.setdefault(normalize_location(cities[i]), []).append(i)
+            for key in {normalize_poi_name(n) for n in (name, *(aliases[i] if aliases else ()))}:
+                self._rows.setdefault(key, []).append(i)
+
+    @classmethod
+    def from_csv(cls, path: str = DATA_PATH) -> "POIIndex":
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(line for line in f if not line.startswith("#")))
+        return cls(
+            cities=[r["city"].strip() for r in rows],
+            names=[r["name"].strip() for r in rows],
+            lat=[float(r["lat"]) for r in rows],
+            lon=[float(r["lon"]) for r in rows],
+            aliases=[[a.strip() for a in (r.get("aliases") or "").split(";") if a.strip()] for r in rows],
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def city_rows(self, city: str) -> np.ndarray:
+        """Rows of every stop in a city (empty if the city isn't covered)."""
+        return np.array(self._city_rows.get(normalize_location(city), []), dtype=np.intp)
+
+    def resolve(self, spots: Sequence[str]) -> List[Optional[int]]:
+        """
+        Map stop names to rows, or None for names we have no coordinates for.
+
+        Names shared by several cities (e.g. "Pantheon") are resolved to the
+        city most of the other stops are in.
+        """
+        candidates = [self._rows.get(normalize_poi_name(spot), []) for spot in spots]
+        votes = Counter(self.cities[c[0]] for c in candidates if len(c) == 1)
+        resolved: List[Optional[int]] = []
+        for rows in candidates:
+            if not rows:
+                resolved.append(None)
+            elif len(rows) == 1:
+                resolved.append(rows[0])
+            else:
+                resolved.append(max(rows, key=lambda row: votes.get(self.cities[row], 0)))
+        return resolved
+
+    def distance_matrix(self, rows: Sequence[int]) -> np.ndarray:
+        """Pairwise straight-line distances (metres) between the given rows."""
+        rows = np.asarray(rows, dtype=np.intp)
+        return haversine_matrix(self.lat[rows], self.lon[rows])
+
+
+@lru_cache(maxsize=1)
+def get_poi_index() -> POIIndex:
+    """Process-wide POI table, loaded on first use."""
+    return POIIndex.from_csv(os.getenv("POI_DATA_PATH", DATA_PATH))
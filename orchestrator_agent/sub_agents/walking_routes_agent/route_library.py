@@ -0,0 +1,245 @@
+"""
+Precomputed walking tours per city, in one memory-mapped indexed file.
+
+``build_route_library`` runs offline over a POI table (``poi_coordinates.csv``
+or any larger export with the same columns): for each city it picks the
+headline landmarks within a walkable span, orders them with the route
+optimizer and records every leg's walking distance. The result is written
+as a single binary file:
+
+    header          magic, version, key count, record count, source sha256
+    record_ends     uint64[records]  end offset of each record in the record blob
+    key_ends        uint32[keys]     end offset of each key in the key blob
+    key_records     uint32[keys]     record number of each key
+    key blob        sorted normalized city names and aliases (UTF-8)
+    record blob     one compact JSON object per city (stops, their coordinates,
+                    leg distances), self-contained so the stops need not
+                    be in the runtime POI table
+
+At runtime the file is ``mmap``-ed and only the header is parsed. A lookup
+binary-searches the key blob (decoding ~log2(keys) keys) and JSON-decodes
+the one matching record, so startup time and memory do not grow with the
+number of cities covered.
+
+Build with:
+    python -m orchestrator_agent.sub_agents.walking_routes_agent.route_library [poi.csv] [out.bin]
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ...timezones import normalize_location
+from .poi_index import DATA_PATH as POI_DATA_PATH
+from .poi_index import POIIndex, haversine_m, walking_distance_m
+from .route_optimizer import optimize_order
+from .street_graph import get_street_graph
+
+LIBRARY_PATH = os.path.join(os.path.dirname(__file__), "data", "route_library.bin")
+MAGIC = b"WRLB"
+VERSION = 2
+_HEADER = struct.Struct("<4sHHII32s")
+
+# A default tour: up to this many headline stops within this distance of
+# the city's first-listed landmark
+ROUTE_STOPS = 6
+MAX_SPAN_M = 4000.0
+
+# Stops every tour of these cities keeps (the original built-in default
+# tours); the rest of the tour is filled with the next listed landmarks
+HEADLINE_STOPS = {
+    "Paris": ["Eiffel Tower", "Arc de Triomphe", "Louvre Museum", "Notre Dame Cathedral"],
+    "London": ["Buckingham Palace", "Big Ben", "Tower of London", "The British Museum"],
+    "Rome": ["Colosseum", "Roman Forum", "Trevi Fountain", "Pantheon"],
+    "New York": ["Times Square", "Central Park", "Statue of Liberty", "Empire State Building"],
+}
+
+# Extra lookup keys for library cities
+CITY_ALIASES = {
+    "New York": ["nyc", "new york city", "manhattan"],
+    "Rome": ["roma"],
+    "Prague": ["praha"],
+    "Barcelona": ["bcn"],
+    "London": ["central london"],
+    "Paris": ["central paris"],
+}
+
+
+def _file_sha256(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def select_route(poi_index: POIIndex, city: str, headline: Optional[List[str]] = None) -> List[int]:
+    """
+    Rows of a city's default tour in walking order, starting at its
+    first-listed (headline) landmark.
+
+    Args:
+        poi_index: POI table to pick stops from
+        city: City name
+        headline: Stop names the tour must include, first one leading;
+            defaults to ``HEADLINE_STOPS`` for the city
+    """
+    rows = poi_index.city_rows(city)
+    if len(rows) < 2:
+        return []
+    headline = HEADLINE_STOPS.get(city, []) if headline is None else headline
+    required = [row for row in poi_index.resolve(headline) if row is not None and row in rows]
+    anchor = required[0] if required else rows[0]
+    span = haversine_m(poi_index.lat[anchor], poi_index.lon[anchor], poi_index.lat[rows], poi_index.lon[rows])
+    fill = [row for row in rows[span <= MAX_SPAN_M] if row not in required]
+    chosen = np.array(list(dict.fromkeys([anchor, *required, *fill]))[:max(ROUTE_STOPS, len(required))], dtype=np.intp)
+    if len(chosen) < 2:
+        return []
+    order, _ = optimize_order(poi_index.distance_matrix(chosen), fix_start=True)
+    return chosen[order].tolist()
+
+
+def _route_record(poi_index: POIIndex, city: str, rows: List[int]) -> dict:
+    graph = get_street_graph()
+    legs, along_streets = [], []
+    for a, b in zip(rows[:-1], rows[1:]):
+        lat_a, lon_a, lat_b, lon_b = (float(v) for v in (poi_index.lat[a], poi_index.lon[a], poi_index.lat[b], poi_index.lon[b]))
+        route = graph.route(lat_a, lon_a, lat_b, lon_b) if graph is not None else None
+        if route is not None:
+            legs.append(round(route.distance_m))
+            along_streets.append(True)
+        else:
+            legs.append(round(float(walking_distance_m(haversine_m(lat_a, lon_a, lat_b, lon_b)))))
+            along_streets.append(False)
+    return {
+        "city": city,
+        "stops": [poi_index.names[row] for row in rows],
+        "coords": [[round(float(poi_index.lat[row]), 6), round(float(poi_index.lon[row]), 6)] for row in rows],
+        "legs_m": legs,
+        "along_streets": along_streets,
+    }
+
+
+def build_route_library(poi_csv: str = POI_DATA_PATH, out_path: str = LIBRARY_PATH,
+                        aliases: Optional[Dict[str, List[str]]] = None) -> int:
+    """
+    Build the route library for every city in a POI table.
+
+    Returns:
+        Number of cities written.
+    """
+    aliases = CITY_ALIASES if aliases is None else aliases
+    poi_index = POIIndex.from_csv(poi_csv)
+    records: List[bytes] = []
+    keys: Dict[bytes, int] = {}
+    for city in dict.fromkeys(poi_index.cities):
+        rows = select_route(poi_index, city)
+        if not rows:
+            continue
+        record = _route_record(poi_index, city, rows)
+        for name in [city, *aliases.get(city, [])]:
+            keys.setdefault(normalize_location(name).encode("utf-8"), len(records))
+        records.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    sorted_keys = sorted(keys)
+    record_ends = np.cumsum([len(r) for r in records], dtype=np.uint64)
+    key_ends = np.cumsum([len(k) for k in sorted_keys], dtype=np.uint32)
+    key_records = np.array([keys[k] for k in sorted_keys], dtype=np.uint32)
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, len(sorted_keys), len(records), _file_sha256(poi_csv)))
+        f.write(record_ends.astype("<u8").tobytes())
+        f.write(key_ends.astype("<u4").tobytes())
+        f.write(key_records.astype("<u4").tobytes())
+        f.write(b"".join(sorted_keys))
+        f.write(b"".join(records))
+    os.replace(tmp_path, out_path)
+    return len(records)
+
+
+class RouteLibrary:
+    """
+    Read-only view of a built route library.
+
+    Args:
+        buffer: The library file's bytes, usually an ``mmap``
+    """
+
+    def __init__(self, buffer):
+        magic, version, _, n_keys, n_records, self.source_sha256 = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} route library")
+        self._buffer = buffer
+        offset = _HEADER.size
+        self._record_ends = np.frombuffer(buffer, dtype="<u8", count=n_records, offset=offset)
+        offset += 8 * n_records
+        self._key_ends = np.frombuffer(buffer, dtype="<u4", count=n_keys, offset=offset)
+        offset += 4 * n_keys
+        self._key_records = np.frombuffer(buffer, dtype="<u4", count=n_keys, offset=offset)
+        offset += 4 * n_keys
+        self._keys_start = offset
+        self._records_start = offset + (int(self._key_ends[-1]) if n_keys else 0)
+
+    @classmethod
+    def open(cls, path: str = LIBRARY_PATH) -> "RouteLibrary":
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return len(self._record_ends)
+
+    def _key(self, k: int) -> bytes:
+        start = int(self._key_ends[k - 1]) if k else 0
+        return bytes(self._buffer[self._keys_start + start:self._keys_start + int(self._key_ends[k])])
+
+    def _record(self, r: int) -> dict:
+        start = int(self._record_ends[r - 1]) if r else 0
+        end = int(self._record_ends[r])
+        return json.loads(bytes(self._buffer[self._records_start + start:self._records_start + end]).decode("utf-8"))
+
+    def find(self, city: str) -> Optional[dict]:
+        """
+        The default tour for a city ("Paris", "paris, france", "NYC"), or None.
+
+        Returns:
+            ``{"city", "stops", "coords", "legs_m", "along_streets"}`` with
+            stops in walking order and ``coords`` as ``[lat, lon]`` per stop.
+        """
+        for name in (city, city.split(",")[0]):
+            target = normalize_location(name).encode("utf-8")
+            lo, hi = 0, len(self._key_ends)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._key(mid) < target:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < len(self._key_ends) and self._key(lo) == target:
+                return self._record(int(self._key_records[lo]))
+        return None
+
+    def cities(self) -> List[str]:
+        """Every city in the library (decodes all records)."""
+        return [self._record(r)["city"] for r in range(len(self))]
+
+
+@lru_cache(maxsize=1)
+def get_route_library() -> Optional[RouteLibrary]:
+    """Process-wide route library, or None if none has been built."""
+    path = os.getenv("WALKING_ROUTE_LIBRARY", LIBRARY_PATH)
+    if not os.path.exists(path):
+        return None
+    return RouteLibrary.open(path)
+
+
+if __name__ == "__main__":
+    poi_csv = sys.argv[1] if len(sys.argv) > 1 else POI_DATA_PATH
+    out_path = sys.argv[2] if len(sys.argv) > 2 else LIBRARY_PATH
+    count = build_route_library(poi_csv, out_path)
+    print(f"✅ Wrote {count} city routes to {out_path}")
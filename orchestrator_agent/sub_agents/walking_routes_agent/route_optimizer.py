@@ -0,0 +1,131 @@
+"""
+Stop ordering for multi-stop walking plans.
+
+Given a pairwise distance matrix, find a short open path through every stop:
+a nearest-neighbour tour seeds the order and 2-opt refines it by reversing
+segments while that shortens the path. The start and/or end stop can be
+pinned (e.g. "start at my hotel").
+
+Each 2-opt pass scores every possible segment reversal at once with NumPy
+and applies the best one. Open path ends are handled by padding the order
+with a virtual stop that is zero distance from everything, so the first and
+last edges cost nothing to move.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+def path_length(dist: np.ndarray, order: Sequence[int]) -> float:
+    """Total length of visiting ``order`` in sequence (no return leg)."""
+    order = np.asarray(order, dtype=np.intp)
+    return float(dist[order[:-1], order[1:]].sum()) if len(order) > 1 else 0.0
+
+
+def nearest_neighbour(dist: np.ndarray, start: int, end: int = None) -> List[int]:
+    """
+    Greedy path from ``start``: always walk to the closest unvisited stop.
+
+    Args:
+        dist: ``(n, n)`` distance matrix
+        start: First stop
+        end: If given, held back and appended as the last stop
+    """
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    if end is not None:
+        visited[end] = True
+    order = [start]
+    current = start
+    for _ in range(n - visited.sum()):
+        candidates = np.where(visited, np.inf, dist[current])
+        current = int(candidates.argmin())
+        visited[current] = True
+        order.append(current)
+    if end is not None and end != start:
+        order.append(end)
+    return order
+
+
+def two_opt(dist: np.ndarray, order: Sequence[int], fix_start: bool = False, fix_end: bool = False,
+            max_passes: int = 1000) -> List[int]:
+    """
+    Improve an open path by segment reversals until no reversal helps.
+
+    Args:
+        dist: ``(n, n)`` distance matrix
+        order: Initial visiting order (a permutation of ``range(n)``)
+        fix_start: Keep ``order[0]`` first
+        fix_end: Keep ``order[-1]`` last
+        max_passes: Upper bound on applied moves
+
+    Returns:
+        The improved order.
+    """
+    n = len(order)
+    if n < 3:
+        return list(order)
+    # Virtual stop n (zero distance to all) at both ends turns the open
+    # path's free ends into ordinary, zero-cost edges
+    padded = np.zeros((n + 1, n + 1), dtype=np.float64)
+    padded[:n, :n] = dist
+    tour = np.concatenate(([n], np.asarray(order, dtype=np.intp), [n]))
+
+    # Reversing tour[i..j] (1 <= i < j <= n) swaps edges (i-1, i), (j, j+1)
+    # for (i-1, j), (i, j+1)
+    positions = np.arange(1, n + 1)
+    i_idx, j_idx = np.meshgrid(positions, positions, indexing="ij")
+    allowed = j_idx > i_idx
+    if fix_start:
+        allowed &= i_idx > 1
+    if fix_end:
+        allowed &= j_idx < n
+
+    for _ in range(max_passes):
+        prev, cur, nxt = tour[:-2], tour[1:-1], tour[2:]
+        edge_in = padded[prev, cur]
+        edge_out = padded[cur, nxt]
+        delta = (
+            padded[prev[:, None], cur[None, :]]
+            + padded[cur[:, None], nxt[None, :]]
+            - edge_in[:, None]
+            - edge_out[None, :]
+        )
+        delta = np.where(allowed, delta, 0.0)
+        best = int(delta.argmin())
+        i, j = divmod(best, n)
+        if delta[i, j] >= -1e-9:
+            break
+        i, j = i + 1, j + 1
+        tour[i:j + 1] = tour[i:j + 1][::-1].copy()
+    return tour[1:-1].tolist()
+
+
+def optimize_order(dist: np.ndarray, fix_start: bool = False, fix_end: bool = False) -> Tuple[List[int], float]:
+    """
+    Short visiting order for all stops in ``dist``.
+
+    Args:
+        dist: ``(n, n)`` distance matrix in the stops' original order
+        fix_start: Keep stop 0 first
+        fix_end: Keep stop n-1 last
+
+    Returns:
+        ``(order, length)`` where ``order`` indexes the original stops.
+    """
+    dist = np.asarray(dist, dtype=np.float64)
+    n = len(dist)
+    if n < 3:
+        return list(range(n)), path_length(dist, list(range(n)))
+    end = n - 1 if fix_end else None
+
+    # Nearest-neighbour from every allowed start is cheap at tour sizes and
+    # gives 2-opt a much better seed than a single arbitrary start
+    starts = [0] if fix_start else [s for s in range(n) if s != end]
+    seeds = [nearest_neighbour(dist, s, end) for s in starts]
+    seed = min(seeds, key=lambda order: path_length(dist, order))
+
+    order = two_opt(dist, seed, fix_start=fix_start, fix_end=fix_end)
+    return order, path_length(dist, order)
@@ -0,0 +1,309 @@
+"""
+Offline pedestrian routing over a compact street graph built from OpenStreetMap.
+
+``build_street_graph`` reads an OSM XML extract (``.osm``; convert ``.pbf``
+first with ``osmium cat city.osm.pbf -o city.osm``) in two streaming passes:
+walkable ways first, then the coordinates of only the nodes those ways use.
+The result is a CSR adjacency graph saved as plain ``.npy`` files:
+
+    lat, lon      float32[n]    node coordinates
+    osm_ids       int64[n]      original OSM node ids
+    indptr        int64[n + 1]  neighbours of node u are indices[indptr[u]:indptr[u + 1]]
+    indices       int32[m]      neighbour node ids
+    length_m      float32[m]    edge lengths in metres
+
+At runtime the arrays are opened with ``mmap_mode="r"``, so workers share one
+page-cache copy. ``StreetGraph.route`` snaps both endpoints to the nearest
+street node (grid index) and runs A* with a great-circle heuristic, which is
+admissible because every edge is at least as long as the straight line
+between its ends.
+
+Build with:
+    python -m orchestrator_agent.sub_agents.walking_routes_agent.street_graph city.osm [out_dir]
+"""
+
+import heapq
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from array import array
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .grid_index import GridIndex
+from .poi_index import haversine_m, walking_minutes
+
+DEFAULT_GRAPH_DIR = os.path.join(os.path.dirname(__file__), "data", "street_graph")
+ARRAYS = ("lat", "lon", "osm_ids", "indptr", "indices", "length_m")
+
+# Edge lengths are stored as float32; shrinking the heuristic slightly keeps
+# it admissible despite rounding
+_HEURISTIC_SCALE = 0.999
+
+# Endpoints further than this from any street node are outside the extract
+SNAP_RADIUS_M = float(os.getenv("STREET_GRAPH_SNAP_RADIUS_M", "300"))
+
+WALKABLE_HIGHWAYS = {
+    "footway", "pedestrian", "path", "steps", "living_street", "residential", "service",
+    "unclassified", "road", "track", "cycleway", "corridor", "crossing",
+    "tertiary", "tertiary_link", "secondary", "secondary_link", "primary", "primary_link",
+}
+_FOOT_ALLOWED = {"yes", "designated", "permissive"}
+_NO_ACCESS = {"no", "private"}
+
+
+def is_walkable(tags: dict) -> bool:
+    """Whether an OSM way with these tags can be walked."""
+    if tags.get("highway") not in WALKABLE_HIGHWAYS:
+        return False
+    if tags.get("foot") in _NO_ACCESS:
+        return False
+    return tags.get("access") not in _NO_ACCESS or tags.get("foot") in _FOOT_ALLOWED
+
+
+def _walkable_segments(osm_path: str):
+    """First pass: consecutive node pairs of every walkable way."""
+    starts, ends = array("q"), array("q")
+    for _, elem in ET.iterparse(osm_path, events=("end",)):
+        if elem.tag == "way":
+            tags = {t.get("k"): t.get("v") for t in elem.iter("tag")}
+            if is_walkable(tags):
+                refs = [int(nd.get("ref")) for nd in elem.iter("nd")]
+                starts.extend(refs[:-1])
+                ends.extend(refs[1:])
+            elem.clear()
+        elif elem.tag in ("node", "relation"):
+            elem.clear()
+    return np.frombuffer(starts, dtype=np.int64), np.frombuffer(ends, dtype=np.int64)
+
+
+def _node_coordinates(osm_path: str, wanted: np.ndarray):
+    """Second pass: coordinates of the nodes used by walkable ways."""
+    wanted_set = set(wanted.tolist())
+    ids, lats, lons = array("q"), array("d"), array("d")
+    for _, elem in ET.iterparse(osm_path, events=("end",)):
+        if elem.tag == "node":
+            node_id = int(elem.get("id"))
+            if node_id in wanted_set:
+                ids.append(node_id)
+                lats.append(float(elem.get("lat")))
+                lons.append(float(elem.get("lon")))
+        if elem.tag in ("node", "way", "relation"):
+            elem.clear()
+    ids = np.frombuffer(ids, dtype=np.int64)
+    order = np.argsort(ids)
+    return ids[order], np.frombuffer(lats)[order], np.frombuffer(lons)[order]
+
+
+def build_street_graph(osm_path: str, out_dir: str = DEFAULT_GRAPH_DIR) -> dict:
+    """
+    Build the CSR pedestrian graph for an OSM XML extract.
+
+    Returns:
+        The metadata written alongside the arrays (node/edge counts, bounds).
+    """
+    seg_from, seg_to = _walkable_segments(osm_path)
+    osm_ids, lat, lon = _node_coordinates(osm_path, np.unique(np.concatenate([seg_from, seg_to])))
+
+    # Map OSM ids to dense 0..n-1 and drop segments that leave the extract
+    u = np.searchsorted(osm_ids, seg_from)
+    v = np.searchsorted(osm_ids, seg_to)
+    u_ok = (u < len(osm_ids)) & (osm_ids[np.minimum(u, len(osm_ids) - 1)] == seg_from)
+    v_ok = (v < len(osm_ids)) & (osm_ids[np.minimum(v, len(osm_ids) - 1)] == seg_to)
+    keep = u_ok & v_ok & (seg_from != seg_to)
+    u, v = u[keep], v[keep]
+
+    # Pedestrians can walk every way in both directions
+    src = np.concatenate([u, v])
+    dst = np.concatenate([v, u])
+    order = np.argsort(src, kind="stable")
+    src, dst = src[order], dst[order]
+    # Lengths from the stored float32 coordinates, so they agree with the A* heuristic
+    lat, lon = lat.astype(np.float32), lon.astype(np.float32)
+    lat64, lon64 = lat.astype(np.float64), lon.astype(np.float64)
+    length = haversine_m(lat64[src], lon64[src], lat64[dst], lon64[dst])
+    indptr = np.zeros(len(osm_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(osm_ids)), out=indptr[1:])
+
+    arrays = {
+        "lat": lat,
+        "lon": lon,
+        "osm_ids": osm_ids,
+        "indptr": indptr,
+        "indices": dst.astype(np.int32),
+        "length_m": length.astype(np.float32),
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), values)
+    meta = {
+        "source": os.path.basename(osm_path),
+        "nodes": int(len(osm_ids)),
+        "edges": int(len(dst)),
+        "bounds": [float(lat.min()), float(lon.min()), float(lat.max()), float(lon.max())] if len(lat) else None,
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+    return meta
+
+
+class WalkingRoute:
+    """A shortest path: node ids plus total length (including the snaps to the street)."""
+    __slots__ = ("nodes", "distance_m")
+
+    def __init__(self, nodes: List[int], distance_m: float):
+        self.nodes = nodes
+        self.distance_m = distance_m
+
+    @property
+    def minutes(self) -> float:
+        return float(walking_minutes(self.distance_m))
+
+
+class StreetGraph:
+    """
+    CSR pedestrian graph.
+
+    Args:
+        lat, lon: Node coordinates
+        indptr, indices, length_m: CSR adjacency and edge lengths
+        osm_ids: Original OSM node ids (optional)
+    """
+
+    def __init__(self, lat, lon, indptr, indices, length_m, osm_ids=None, meta: Optional[dict] = None):
+        self.lat = lat
+        self.lon = lon
+        self.indptr = indptr
+        self.indices = indices
+        self.length_m = length_m
+        self.osm_ids = osm_ids
+        self.meta = meta or {}
+        self.grid = GridIndex(lat, lon, cell_m=100.0)
+        self._cached_path = lru_cache(maxsize=4096)(self._shortest_path)
+
+    @classmethod
+    def load(cls, graph_dir: str = DEFAULT_GRAPH_DIR) -> "StreetGraph":
+        arrays = {name: np.load(os.path.join(graph_dir, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+        with open(os.path.join(graph_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(meta=meta, **arrays)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.lat)
+
+    def nearest_node(self, lat: float, lon: float, max_radius_m: float = SNAP_RADIUS_M):
+        """``(node, distance_m)`` of the closest street node, or ``(-1, inf)``."""
+        return self.grid.nearest(lat, lon, max_radius_m)
+
+    def shortest_path(self, source: int, target: int) -> Optional[WalkingRoute]:
+        """A* between two nodes; None if they aren't connected. Results are cached."""
+        return self._cached_path(int(source), int(target))
+
+    def _shortest_path(self, source: int, target: int) -> Optional[WalkingRoute]:
+        if source == target:
+            return WalkingRoute([source], 0.0)
+        t_lat, t_lon = float(self.lat[target]), float(self.lon[target])
+        indptr, indices, length_m = self.indptr, self.indices, self.length_m
+
+        best = {source: 0.0}
+        parent = {source: -1}
+        start_h = _HEURISTIC_SCALE * float(haversine_m(float(self.lat[source]), float(self.lon[source]), t_lat, t_lon))
+        # Ties on f go to the node furthest along (larger g), which avoids
+        # expanding every equal-length detour on grid-like street plans
+        heap = [(start_h, -0.0, source)]
+        while heap:
+            _, neg_g, u = heapq.heappop(heap)
+            g = -neg_g
+            if u == target:
+                nodes = [u]
+                while parent[nodes[-1]] != -1:
+                    nodes.append(parent[nodes[-1]])
+                return WalkingRoute(nodes[::-1], g)
+            if g > best[u]:
+                continue  # stale heap entry; a shorter path to u was found later
+            lo, hi = int(indptr[u]), int(indptr[u + 1])
+            if lo == hi:
+                continue
+            neighbours = np.asarray(indices[lo:hi])
+            costs = g + np.asarray(length_m[lo:hi], dtype=np.float64)
+            h = _HEURISTIC_SCALE * haversine_m(
+                self.lat[neighbours].astype(np.float64), self.lon[neighbours].astype(np.float64), t_lat, t_lon
+            )
+            for v, cost, estimate in zip(neighbours.tolist(), costs.tolist(), h.tolist()):
+                if cost < best.get(v, float("inf")):
+                    best[v] = cost
+                    parent[v] = u
+                    heapq.heappush(heap, (cost + estimate, -cost, v))
+        return None
+
+    def bounded_dijkstra(self, source: int, max_distance_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Every node within ``max_distance_m`` walking distance of ``source``.
+
+        Returns:
+            ``(nodes, distances_m)``, sorted by node id for ``searchsorted`` lookups.
+        """
+        indptr, indices, length_m = self.indptr, self.indices, self.length_m
+        best = {source: 0.0}
+        settled = {}
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u in settled:
+                continue
+            settled[u] = d
+            lo, hi = int(indptr[u]), int(indptr[u + 1])
+            for v, w in zip(indices[lo:hi].tolist(), length_m[lo:hi].tolist()):
+                nd = d + w
+                if nd <= max_distance_m and nd < best.get(v, float("inf")):
+                    best[v] = nd
+                    heapq.heappush(heap, (nd, v))
+        nodes = np.fromiter(settled.keys(), dtype=np.int64, count=len(settled))
+        dist = np.fromiter(settled.values(), dtype=np.float64, count=len(settled))
+        order = np.argsort(nodes)
+        return nodes[order], dist[order]
+
+    def route(self, lat1: float, lon1: float, lat2: float, lon2: float) -> Optional[WalkingRoute]:
+        """
+        Walking route between two coordinates.
+
+        Returns:
+            The route, with the walk to and from the nearest street nodes
+            included in ``distance_m``; None if either end is outside the
+            extract or no path connects them.
+        """
+        source, snap_a = self.nearest_node(lat1, lon1)
+        target, snap_b = self.nearest_node(lat2, lon2)
+        if source < 0 or target < 0:
+            return None
+        path = self.shortest_path(source, target)
+        if path is None:
+            return None
+        return WalkingRoute(path.nodes, path.distance_m + snap_a + snap_b)
+
+
+@lru_cache(maxsize=1)
+def get_street_graph() -> Optional[StreetGraph]:
+    """Process-wide street graph, or None when no graph has been built."""
+    graph_dir = os.getenv("STREET_GRAPH_DIR", DEFAULT_GRAPH_DIR)
+    if not os.path.exists(os.path.join(graph_dir, "meta.json")):
+        return None
+    try:
+        graph = StreetGraph.load(graph_dir)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Could not load street graph from {graph_dir}, using distance estimates: {e}")
+        return None
+    print(f"🗺️ Street graph loaded: {graph.node_count} nodes from {graph.meta.get('source', graph_dir)}")
+    return graph
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m orchestrator_agent.sub_agents.walking_routes_agent.street_graph city.osm [out_dir]")
+        sys.exit(1)
+    meta = build_street_graph(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else DEFAULT_GRAPH_DIR)
+    print(f"✅ Built street graph: {meta['nodes']} nodes, {meta['edges']} directed edges")
@@ -0,0 +1,601 @@
+"""
+Public-transport timetables from a local GTFS feed, with RAPTOR earliest-arrival queries.
+
+``build_timetable`` converts a GTFS feed (a ``.zip`` or an unpacked
+directory) into flat NumPy arrays plus a ``meta.json``, the same layout as
+the street graph, so loading is a handful of ``np.load(mmap_mode="r")``
+calls. Trips are grouped into *patterns*: trips of one route that serve the
+same stop sequence. A pattern's times are one ``(stops, trips)`` block,
+stored stop by stop with trips sorted by departure; no trip overtakes
+another (overtaking trips are split into their own pattern), so each stop's
+departures are a sorted run.
+
+Queries use RAPTOR (round-based public transit routing): round k finds the
+earliest arrival at every stop with at most k vehicles. A round scans only
+the patterns serving a stop improved in the previous round, then relaxes
+footpaths (``transfers.txt`` plus walks between stops within
+``TRANSFER_RADIUS_M``) from the stops it improved. All patterns of a round
+are scanned in one batch of array operations: one ``searchsorted`` finds
+the first catchable trip at every scanned stop, and a running minimum per
+pattern gives the trip ridden to each later stop. Arrivals that cannot beat
+the best known arrival at the destination are pruned.
+
+Only trips of the query's service day are used; trips of the previous
+service day running past midnight (times of 24:00:00 and later) are not.
+
+Build with:
+    python -m orchestrator_agent.sub_agents.walking_routes_agent.transit feed.zip [out_dir]
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import zipfile
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .grid_index import GridIndex
+from .poi_index import WALKING_SPEED_KMH, haversine_m, walking_distance_m
+
+DEFAULT_TIMETABLE_DIR = os.path.join(os.path.dirname(__file__), "data", "transit")
+
+ARRAYS = (
+    "stop_lat", "stop_lon",
+    "pattern_stops_ptr", "pattern_stops", "pattern_trips_ptr", "pattern_times_ptr", "pattern_route",
+    "arrivals", "departures", "trip_service",
+    "stop_patterns_ptr", "stop_patterns", "stop_positions",
+    "transfer_ptr", "transfer_to", "transfer_s",
+    "service_weekdays", "service_start", "service_end",
+    "exception_service", "exception_date", "exception_type",
+)
+
+# Walks between stops generated at build time, and walks to and from the
+# query's origin and destination
+TRANSFER_RADIUS_M = 400.0
+ACCESS_RADIUS_M = 1000.0
+MAX_RIDES = 5
+
+# GTFS route_type -> label used in directions
+ROUTE_TYPES = {0: "Tram", 1: "Metro", 2: "Train", 3: "Bus", 4: "Ferry", 5: "Cable car", 6: "Gondola", 7: "Funicular", 11: "Trolleybus", 12: "Monorail"}
+
+_INF = np.iinfo(np.int64).max // 4
+_NONE, _ACCESS, _RIDE, _WALK = 0, 1, 2, 3
+
+
+def walk_seconds(straight_line_m):
+    """Walking time in seconds for a straight-line distance (detour factor included)."""
+    return np.ceil(walking_distance_m(straight_line_m) / (WALKING_SPEED_KMH / 3.6)).astype(np.int64)
+
+
+def parse_gtfs_time(value: str) -> int:
+    """Seconds after midnight for "H:MM:SS" (may exceed 24 h), or -1 if blank."""
+    value = value.strip()
+    if not value:
+        return -1
+    h, m, s = value.split(":")
+    return int(h) * 3600 + int(m) * 60 + int(s)
+
+
+def _read_table(feed_path: str, name: str) -> Iterator[Dict[str, str]]:
+    """Rows of one GTFS file; nothing if the feed doesn't have it."""
+    if os.path.isdir(feed_path):
+        path = os.path.join(feed_path, name)
+        if os.path.exists(path):
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                yield from csv.DictReader(f)
+        return
+    with zipfile.ZipFile(feed_path) as feed:
+        if name in feed.namelist():
+            with feed.open(name) as raw:
+                yield from csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+
+
+def _fill_times(arr: np.ndarray, dep: np.ndarray) -> None:
+    """Complete one trip's times in place: a missing arrival or departure
+    copies the other, and stops with neither are interpolated by position."""
+    np.copyto(arr, dep, where=arr < 0)
+    np.copyto(dep, arr, where=dep < 0)
+    known = np.flatnonzero(arr >= 0)
+    if len(known) < len(arr):
+        missing = np.flatnonzero(arr < 0)
+        arr[missing] = dep[missing] = np.interp(missing, known, arr[known]).astype(arr.dtype)
+
+
+def _fifo_chains(trips: List[Tuple[np.ndarray, np.ndarray, int]]) -> List[List[Tuple[np.ndarray, np.ndarray, int]]]:
+    """Split trips of one stop sequence into groups in which no trip overtakes another."""
+    chains: List[List[Tuple[np.ndarray, np.ndarray, int]]] = []
+    for trip in sorted(trips, key=lambda t: int(t[1][0])):
+        for chain in chains:
+            last = chain[-1]
+            if (last[0] <= trip[0]).all() and (last[1] <= trip[1]).all():
+                chain.append(trip)
+                break
+        else:
+            chains.append([trip])
+    return chains
+
+
+def _expand(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenated ranges ``[start, start + length)``."""
+    lengths = np.asarray(lengths, dtype=np.int64)
+    return np.repeat(np.asarray(starts, dtype=np.int64) - np.cumsum(lengths) + lengths, lengths) + np.arange(int(lengths.sum()))
+
+
+def _csr(keys: np.ndarray, size: int, *columns: np.ndarray):
+    """Group columns by an integer key: ``(indptr, *columns sorted by key)``."""
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=indptr[1:])
+    return (indptr, *(column[order] for column in columns))
+
+
+def build_timetable(feed_path: str, out_dir: str = DEFAULT_TIMETABLE_DIR) -> dict:
+    """
+    Convert a GTFS feed into timetable arrays.
+
+    Args:
+        feed_path: GTFS ``.zip`` or a directory of GTFS ``.txt`` files
+        out_dir: Directory for the ``.npy`` arrays and ``meta.json``
+
+    Returns:
+        The metadata written to ``meta.json``.
+    """
+    stops = [
+        r for r in _read_table(feed_path, "stops.txt")
+        if r.get("location_type", "").strip() in ("", "0") and r.get("stop_lat", "").strip()
+    ]
+    stop_index = {r["stop_id"]: k for k, r in enumerate(stops)}
+    stop_lat = np.array([float(r["stop_lat"]) for r in stops], dtype=np.float64)
+    stop_lon = np.array([float(r["stop_lon"]) for r in stops], dtype=np.float64)
+
+    routes = list(_read_table(feed_path, "routes.txt"))
+    route_index = {r["route_id"]: k for k, r in enumerate(routes)}
+    trips = {r["trip_id"]: (r["route_id"], r["service_id"]) for r in _read_table(feed_path, "trips.txt")}
+
+    # Services active by weekday over a date range (calendar.txt), plus
+    # single-date additions and removals (calendar_dates.txt)
+    services: Dict[str, int] = {}
+    calendar = list(_read_table(feed_path, "calendar.txt"))
+    exceptions = list(_read_table(feed_path, "calendar_dates.txt"))
+    for sid in [r["service_id"] for r in calendar] + [r["service_id"] for r in exceptions] + [s for _, s in trips.values()]:
+        services.setdefault(sid, len(services))
+    weekdays = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+    service_weekdays = np.zeros((len(services), 7), dtype=np.uint8)
+    service_start = np.zeros(len(services), dtype=np.int32)
+    service_end = np.zeros(len(services), dtype=np.int32)
+    for r in calendar:
+        s = services[r["service_id"]]
+        service_weekdays[s] = [int(r[day] or 0) for day in weekdays]
+        service_start[s], service_end[s] = int(r["start_date"]), int(r["end_date"])
+
+    # Stop times, grouped per trip in stop_sequence order
+    trip_codes: Dict[str, int] = {}
+    code, seq, stop, arr, dep = [], [], [], [], []
+    for r in _read_table(feed_path, "stop_times.txt"):
+        if r["trip_id"] not in trips or r["stop_id"] not in stop_index:
+            continue
+        code.append(trip_codes.setdefault(r["trip_id"], len(trip_codes)))
+        seq.append(int(r["stop_sequence"]))
+        stop.append(stop_index[r["stop_id"]])
+        arr.append(parse_gtfs_time(r.get("arrival_time", "")))
+        dep.append(parse_gtfs_time(r.get("departure_time", "")))
+    code, seq = np.array(code, dtype=np.int64), np.array(seq, dtype=np.int64)
+    order = np.lexsort((seq, code))
+    stop, arr, dep = (np.array(v, dtype=np.int32)[order] for v in (stop, arr, dep))
+    bounds = np.r_[0, np.cumsum(np.bincount(code, minlength=len(trip_codes)))]
+
+    grouped: Dict[Tuple[str, Tuple[int, ...]], List[Tuple[np.ndarray, np.ndarray, int]]] = {}
+    for trip_id, t in trip_codes.items():
+        lo, hi = bounds[t], bounds[t + 1]
+        if hi - lo < 2:
+            continue
+        trip_arr, trip_dep = arr[lo:hi].copy(), dep[lo:hi].copy()
+        if (trip_arr < 0).all() and (trip_dep < 0).all():
+            continue
+        _fill_times(trip_arr, trip_dep)
+        route_id, service_id = trips[trip_id]
+        grouped.setdefault((route_id, tuple(stop[lo:hi].tolist())), []).append((trip_arr, trip_dep, services[service_id]))
+
+    pattern_stops, pattern_route, pattern_sizes = [], [], []
+    arrivals, departures, trip_service = [], [], []
+    for (route_id, sequence), members in grouped.items():
+        for chain in _fifo_chains(members):
+            pattern_stops.append(np.array(sequence, dtype=np.int32))
+            pattern_route.append(route_index.get(route_id, -1))
+            pattern_sizes.append(len(chain))
+            # Stored stop by stop: each stop's departures are one sorted run
+            arrivals.append(np.stack([t[0] for t in chain], axis=1).ravel())
+            departures.append(np.stack([t[1] for t in chain], axis=1).ravel())
+            trip_service.extend(t[2] for t in chain)
+    stop_counts = np.array([len(s) for s in pattern_stops], dtype=np.int64)
+    pattern_stops_ptr = np.r_[0, np.cumsum(stop_counts)].astype(np.int64)
+    pattern_trips_ptr = np.r_[0, np.cumsum(pattern_sizes)].astype(np.int64)
+    pattern_times_ptr = np.r_[0, np.cumsum(stop_counts * np.array(pattern_sizes, dtype=np.int64))].astype(np.int64)
+    flat_stops = np.concatenate(pattern_stops) if pattern_stops else np.empty(0, dtype=np.int32)
+
+    # Patterns serving each stop, with the stop's position in the pattern
+    pattern_of = np.repeat(np.arange(len(pattern_stops), dtype=np.int32), stop_counts)
+    position = (np.arange(len(flat_stops)) - np.repeat(pattern_stops_ptr[:-1], stop_counts)).astype(np.int32)
+    stop_patterns_ptr, stop_patterns, stop_positions = _csr(flat_stops, len(stops), pattern_of, position)
+
+    # Footpaths: explicit minimum transfer times win over generated walks
+    footpaths: Dict[Tuple[int, int], int] = {}
+    grid = GridIndex(stop_lat, stop_lon, cell_m=TRANSFER_RADIUS_M)
+    for a in range(len(stops)):
+        near, dist = grid.query_radius(float(stop_lat[a]), float(stop_lon[a]), TRANSFER_RADIUS_M)
+        for b, seconds in zip(near.tolist(), walk_seconds(dist).tolist()):
+            if b != a:
+                footpaths[a, b] = seconds
+    for r in _read_table(feed_path, "transfers.txt"):
+        a, b = stop_index.get(r["from_stop_id"]), stop_index.get(r["to_stop_id"])
+        if a is not None and b is not None and a != b and r.get("transfer_type", "").strip() == "2":
+            footpaths[a, b] = int(r.get("min_transfer_time") or 0)
+    pairs = np.array(list(footpaths), dtype=np.int32).reshape(-1, 2)
+    transfer_ptr, transfer_to, transfer_s = _csr(
+        pairs[:, 0], len(stops), pairs[:, 1], np.array(list(footpaths.values()), dtype=np.int32)
+    )
+
+    arrays = {
+        "stop_lat": stop_lat.astype(np.float32),
+        "stop_lon": stop_lon.astype(np.float32),
+        "pattern_stops_ptr": pattern_stops_ptr,
+        "pattern_stops": flat_stops,
+        "pattern_trips_ptr": pattern_trips_ptr,
+        "pattern_times_ptr": pattern_times_ptr,
+        "pattern_route": np.array(pattern_route, dtype=np.int32),
+        "arrivals": np.concatenate(arrivals) if arrivals else np.empty(0, dtype=np.int32),
+        "departures": np.concatenate(departures) if departures else np.empty(0, dtype=np.int32),
+        "trip_service": np.array(trip_service, dtype=np.int32),
+        "stop_patterns_ptr": stop_patterns_ptr,
+        "stop_patterns": stop_patterns,
+        "stop_positions": stop_positions,
+        "transfer_ptr": transfer_ptr,
+        "transfer_to": transfer_to,
+        "transfer_s": transfer_s,
+        "service_weekdays": service_weekdays,
+        "service_start": service_start,
+        "service_end": service_end,
+        "exception_service": np.array([services[r["service_id"]] for r in exceptions], dtype=np.int32),
+        "exception_date": np.array([int(r["date"]) for r in exceptions], dtype=np.int32),
+        "exception_type": np.array([int(r["exception_type"]) for r in exceptions], dtype=np.int8),
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    for name, values in arrays.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), values)
+    agency = next(_read_table(feed_path, "agency.txt"), {})
+    meta = {
+        "source": os.path.basename(os.path.normpath(feed_path)),
+        "timezone": agency.get("agency_timezone", ""),
+        "stops": len(stops),
+        "patterns": len(pattern_stops),
+        "trips": int(pattern_trips_ptr[-1]),
+        "footpaths": len(footpaths),
+        "stop_ids": [r["stop_id"] for r in stops],
+        "stop_names": [r.get("stop_name", "").strip() or r["stop_id"] for r in stops],
+        "route_names": [r.get("route_short_name", "").strip() or r.get("route_long_name", "").strip() or r["route_id"] for r in routes],
+        "route_types": [int(r.get("route_type") or 3) for r in routes],
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+    return meta
+
+
+class TransitLeg:
+    """One part of a journey: a walk, or a ride from one stop to another."""
+    __slots__ = ("mode", "origin", "destination", "depart_s", "arrive_s", "route", "stops", "distance_m")
+
+    def __init__(self, mode: str, origin: str, destination: str, depart_s: int, arrive_s: int,
+                 route: str = "", stops: int = 0, distance_m: float = 0.0):
+        self.mode = mode  # "walk", or a vehicle label such as "Bus"
+        self.origin = origin
+        self.destination = destination
+        self.depart_s = depart_s
+        self.arrive_s = arrive_s
+        self.route = route
+        self.stops = stops
+        self.distance_m = distance_m
+
+
+class TransitJourney:
+    """Legs of an earliest-arrival journey; times are seconds after midnight."""
+    __slots__ = ("legs", "depart_s", "arrive_s")
+
+    def __init__(self, legs: List[TransitLeg], depart_s: int, arrive_s: int):
+        self.legs = legs
+        self.depart_s = depart_s
+        self.arrive_s = arrive_s
+
+    @property
+    def minutes(self) -> float:
+        return (self.arrive_s - self.depart_s) / 60
+
+    @property
+    def rides(self) -> List[TransitLeg]:
+        return [leg for leg in self.legs if leg.mode != "walk"]
+
+
+class TransitTimetable:
+    """
+    Array-based timetable built by ``build_timetable``.
+
+    Args:
+        arrays: The arrays in ``ARRAYS``, by name
+        meta: Contents of ``meta.json``
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: dict):
+        # Plain ndarray views of the memmaps (no copy): fancy indexing an
+        # ``np.memmap`` subclass adds overhead to every query step
+        for name in ARRAYS:
+            setattr(self, name, np.asarray(arrays[name]))
+        self.meta = meta
+        self.stop_names: List[str] = meta["stop_names"]
+        self.grid = GridIndex(self.stop_lat, self.stop_lon, cell_m=ACCESS_RADIUS_M / 4)
+        self._trip_counts = np.diff(self.pattern_trips_ptr)
+        self._stop_counts = np.diff(self.pattern_stops_ptr)
+        self._slot_pattern = np.repeat(np.arange(len(self._stop_counts)), self._stop_counts)
+        self._trip_pattern_end = np.repeat(self.pattern_trips_ptr[1:], self._trip_counts)
+        # (slot << 32 | departure) for every stop time, where a slot is one
+        # position of one pattern: sorted, since each slot's departures are
+        # a sorted run, so one searchsorted finds the first trip leaving
+        # every scanned slot on time (8 bytes per stop time, held in memory)
+        slots = np.repeat(np.arange(len(self.pattern_stops), dtype=np.int64), np.repeat(self._trip_counts, self._stop_counts))
+        self._departure_keys = slots << 32 | self.departures.astype(np.int64)
+        self._next_active = lru_cache(maxsize=8)(self._compute_next_active)
+
+    @classmethod
+    def load(cls, timetable_dir: str = DEFAULT_TIMETABLE_DIR) -> "TransitTimetable":
+        arrays = {name: np.load(os.path.join(timetable_dir, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+        with open(os.path.join(timetable_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(arrays, meta)
+
+    @property
+    def stop_count(self) -> int:
+        return len(self.stop_lat)
+
+    def route_label(self, pattern: int) -> Tuple[str, str]:
+        """``(vehicle, route name)`` of a pattern, e.g. ``("Bus", "64")``."""
+        route = int(self.pattern_route[pattern])
+        if route < 0:
+            return "Transit", ""
+        return ROUTE_TYPES.get(self.meta["route_types"][route], "Transit"), self.meta["route_names"][route]
+
+    def active_services(self, day: date) -> np.ndarray:
+        """Boolean mask of the services running on a date."""
+        ymd = day.year * 10000 + day.month * 100 + day.day
+        active = (self.service_weekdays[:, day.weekday()] == 1) & (self.service_start <= ymd) & (ymd <= self.service_end)
+        today = self.exception_date == ymd
+        active[self.exception_service[today & (self.exception_type == 1)]] = True
+        active[self.exception_service[today & (self.exception_type == 2)]] = False
+        return active
+
+    def _compute_next_active(self, day: date) -> np.ndarray:
+        # For every trip, the first trip at or after it in the same pattern
+        # that runs on this day (-1 if none): turns "first trip departing
+        # after t" into "first running trip departing after t" in one lookup
+        running = self.active_services(day)[self.trip_service]
+        n = len(running)
+        candidates = np.where(running, np.arange(n), n)
+        following = np.minimum.accumulate(candidates[::-1])[::-1]
+        return np.where(following < self._trip_pattern_end, following, -1)
+
+    def nearby_stops(self, lat: float, lon: float, radius_m: float = ACCESS_RADIUS_M) -> Tuple[np.ndarray, np.ndarray]:
+        """``(stops, walk_seconds)`` for stops within ``radius_m`` of a point."""
+        near, dist = self.grid.query_radius(lat, lon, radius_m)
+        return near, walk_seconds(dist)
+
+    def _ride(self, marked: np.ndarray, tau_prev: np.ndarray, next_active: np.ndarray):
+        """
+        Scan every pattern through a marked stop, from its first marked
+        position on, all patterns in one batch.
+
+        Returns:
+            ``(stops, arrivals, trips, boarding slots, alighting slots)`` for
+            every later position some trip reaches.
+        """
+        lo, hi = self.stop_patterns_ptr[marked], self.stop_patterns_ptr[marked + 1]
+        entries = _expand(lo, hi - lo)
+        first = np.full(len(self._stop_counts), _INF, dtype=np.int64)
+        np.minimum.at(first, self.stop_patterns[entries], self.stop_positions[entries])
+        patterns = np.flatnonzero(first < _INF)
+        if not len(patterns):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty, empty, empty
+        start = first[patterns]
+        lengths = self._stop_counts[patterns] - start
+        slot = _expand(self.pattern_stops_ptr[patterns] + start, lengths)
+        segment = np.repeat(np.arange(len(patterns)), lengths)
+        pattern = patterns[segment]
+        n_trips = self._trip_counts[pattern]
+        trip0 = self.pattern_trips_ptr[pattern]
+        column = self.pattern_times_ptr[pattern] + (slot - self.pattern_stops_ptr[pattern]) * n_trips
+
+        # First trip leaving each slot on time, then the first of those running today
+        ready = np.minimum(tau_prev[self.pattern_stops[slot]], 0xFFFFFFFF)
+        first_trip = np.searchsorted(self._departure_keys, slot << 32 | ready) - column
+        on_time = first_trip < n_trips
+        running = np.where(on_time, next_active[np.where(on_time, trip0 + first_trip, 0)], -1)
+        catchable = np.where(running >= 0, running - trip0, n_trips)
+
+        # Without overtaking, the earliest trip boarded so far in a pattern is
+        # the best ride to each later stop. Offsetting each pattern below the
+        # one before makes one running minimum restart at every pattern.
+        offset = (len(patterns) - segment) * (int(self._trip_counts.max()) + 1)
+        running_min = np.minimum.accumulate(offset + catchable)
+        earliest = running_min - offset
+        starts = np.zeros(len(slot), dtype=bool)
+        starts[np.cumsum(lengths) - lengths] = True
+        boarded = starts.copy()
+        boarded[1:] |= running_min[1:] < running_min[:-1]
+        board_at = np.maximum.accumulate(np.where(boarded, np.arange(len(slot)), 0))
+
+        alight = np.flatnonzero(~starts)
+        alight = alight[earliest[alight - 1] < n_trips[alight]]
+        trips = earliest[alight - 1]
+        arrive = self.arrivals[column[alight] + trips].astype(np.int64)
+        return self.pattern_stops[slot[alight]], arrive, trip0[alight] + trips, slot[board_at[alight - 1]], slot[alight]
+
+    def earliest_arrival(self, lat: float, lon: float, dest_lat: float, dest_lon: float, depart_s: int,
+                         day: date, max_rides: int = MAX_RIDES) -> Optional[TransitJourney]:
+        """
+        Fastest way between two points leaving at ``depart_s``, walking or by
+        transit with up to ``max_rides`` vehicles.
+
+        Args:
+            lat, lon: Origin
+            dest_lat, dest_lon: Destination
+            depart_s: Departure, seconds after midnight (local feed time)
+            day: Service date
+            max_rides: Most vehicles to use
+
+        Returns:
+            The journey with the earliest arrival (a single walk when that is
+            fastest), or None when neither end is within walking range of a
+            stop and walking all the way exceeds that range too.
+        """
+        origins, access_s = self.nearby_stops(lat, lon)
+        exits, egress_s = self.nearby_stops(dest_lat, dest_lon)
+        direct_m = float(haversine_m(lat, lon, dest_lat, dest_lon))
+        walk_arrival = depart_s + int(walk_seconds(direct_m))
+        walk_only = TransitJourney(
+            [TransitLeg("walk", "", "", depart_s, walk_arrival, distance_m=float(walking_distance_m(direct_m)))],
+            depart_s, walk_arrival,
+        )
+        if not len(origins) or not len(exits):
+            return walk_only if direct_m <= 2 * ACCESS_RADIUS_M else None
+
+        n = self.stop_count
+        best = np.full(n, _INF, dtype=np.int64)
+        best[origins] = depart_s + access_s
+        # Per round labels: how each stop was reached in that round
+        kind, time, source, trip_of, board_slot, alight_slot = [], [], [], [], [], []
+
+        def new_round():
+            kind.append(np.zeros(n, dtype=np.int8))
+            time.append(np.full(n, _INF, dtype=np.int64))
+            source.append(np.full(n, -1, dtype=np.int64))
+            trip_of.append(np.full(n, -1, dtype=np.int64))
+            board_slot.append(np.zeros(n, dtype=np.int64))
+            alight_slot.append(np.zeros(n, dtype=np.int64))
+
+        def improve(k: int, stops, arrive, bound: int):
+            # Earliest candidate per stop that beats both its best arrival and the bound
+            keep = np.flatnonzero((arrive < best[stops]) & (arrive < bound))
+            order = keep[np.lexsort((arrive[keep], stops[keep]))]
+            order = order[np.r_[True, stops[order][1:] != stops[order][:-1]]] if len(order) else order
+            best[stops[order]] = arrive[order]
+            time[k][stops[order]] = arrive[order]
+            return order
+
+        new_round()
+        kind[0][origins], time[0][origins] = _ACCESS, best[origins]
+        marked = origins
+        next_active = self._next_active(day)
+        bound = min(walk_arrival, int((best[exits] + egress_s).min()))
+
+        for k in range(1, max_rides + 1):
+            # A stop reached no earlier than the best arrival can't lead anywhere useful
+            marked = marked[best[marked] < bound]
+            if not len(marked):
+                break
+            new_round()
+            stops, arrive, trips, boards, alights = self._ride(marked, best.copy(), next_active)
+            won = improve(k, stops, arrive, bound)
+            if not len(won):
+                break
+            reached = stops[won]
+            kind[k][reached] = _RIDE
+            source[k][reached] = self.pattern_stops[boards[won]]
+            trip_of[k][reached], board_slot[k][reached], alight_slot[k][reached] = trips[won], boards[won], alights[won]
+            bound = min(bound, int((best[exits] + egress_s).min()))
+
+            # Footpaths from the stops reached by vehicle this round
+            lo, hi = self.transfer_ptr[reached], self.transfer_ptr[reached + 1]
+            entries = _expand(lo, hi - lo)
+            walk_from = np.repeat(reached, hi - lo)
+            walk_to = self.transfer_to[entries]
+            won = improve(k, walk_to, best[walk_from] + self.transfer_s[entries], bound)
+            kind[k][walk_to[won]], source[k][walk_to[won]] = _WALK, walk_from[won]
+            marked = np.union1d(reached, walk_to[won])
+            bound = min(bound, int((best[exits] + egress_s).min()))
+
+        total = best[exits] + egress_s
+        exit_k = int(total.argmin())
+        if int(total[exit_k]) >= walk_arrival:
+            return walk_only
+        return self._journey(kind, time, source, trip_of, board_slot, alight_slot,
+                             int(exits[exit_k]), int(egress_s[exit_k]), depart_s, lat, lon, dest_lat, dest_lon)
+
+    def _journey(self, kind, time, source, trip_of, board_slot, alight_slot, stop: int, egress: int,
+                 depart_s: int, lat: float, lon: float, dest_lat: float, dest_lon: float) -> TransitJourney:
+        """Walk the round labels back from the exit stop to the origin."""
+        def walk_m(lat_a, lon_a, lat_b, lon_b) -> float:
+            return float(walking_distance_m(haversine_m(lat_a, lon_a, lat_b, lon_b)))
+
+        exit_stop = stop
+        legs: List[TransitLeg] = []
+        k = len(kind) - 1
+        while True:
+            label = int(kind[k][stop])
+            if label == _NONE:
+                k -= 1
+                continue
+            at = int(time[k][stop])
+            name = self.stop_names[stop]
+            if label == _ACCESS:
+                legs.append(TransitLeg("walk", "", name, depart_s, at,
+                                       distance_m=walk_m(lat, lon, float(self.stop_lat[stop]), float(self.stop_lon[stop]))))
+                break
+            prev = int(source[k][stop])
+            if label == _WALK:
+                legs.append(TransitLeg("walk", self.stop_names[prev], name, int(time[k][prev]), at,
+                                       distance_m=walk_m(float(self.stop_lat[prev]), float(self.stop_lon[prev]),
+                                                         float(self.stop_lat[stop]), float(self.stop_lon[stop]))))
+                stop = prev
+                continue
+            board, alight = int(board_slot[k][stop]), int(alight_slot[k][stop])
+            p = int(self._slot_pattern[alight])
+            n_trips, first_slot = int(self._trip_counts[p]), int(self.pattern_stops_ptr[p])
+            trip = int(trip_of[k][stop]) - int(self.pattern_trips_ptr[p])
+            times = int(self.pattern_times_ptr[p]) + trip
+            vehicle, route = self.route_label(p)
+            legs.append(TransitLeg(vehicle, self.stop_names[prev], name,
+                                   int(self.departures[times + (board - first_slot) * n_trips]),
+                                   int(self.arrivals[times + (alight - first_slot) * n_trips]),
+                                   route=route, stops=alight - board))
+            stop = prev
+            k -= 1
+        legs.reverse()
+        last = legs[-1].arrive_s
+        legs.append(TransitLeg("walk", self.stop_names[exit_stop], "", last, last + egress,
+                               distance_m=walk_m(float(self.stop_lat[exit_stop]), float(self.stop_lon[exit_stop]), dest_lat, dest_lon)))
+        return TransitJourney(legs, depart_s, last + egress)
+
+
+@lru_cache(maxsize=1)
+def get_transit_timetable() -> Optional[TransitTimetable]:
+    """Process-wide transit timetable, or None when no GTFS feed has been built."""
+    timetable_dir = os.getenv("TRANSIT_TIMETABLE_DIR", DEFAULT_TIMETABLE_DIR)
+    if not os.path.exists(os.path.join(timetable_dir, "meta.json")):
+        return None
+    try:
+        timetable = TransitTimetable.load(timetable_dir)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Could not load transit timetable from {timetable_dir}: {e}")
+        return None
+    print(f"🚇 Transit timetable loaded: {timetable.stop_count} stops from {timetable.meta.get('source', timetable_dir)}")
+    return timetable
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m orchestrator_agent.sub_agents.walking_routes_agent.transit feed.zip [out_dir]")
+        sys.exit(1)
+    meta = build_timetable(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else DEFAULT_TIMETABLE_DIR)
+    print(f"✅ Built transit timetable: {meta['stops']} stops, {meta['patterns']} patterns, {meta['trips']} trips")
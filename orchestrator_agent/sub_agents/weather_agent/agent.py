@@ -1,15 +1,79 @@
-import requests
 import os
-from datetime import datetime
-import pytz
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
 from dotenv import load_dotenv
 from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
+from ...threaded_tools import ThreadedFunctionTool
+from ...timezones import get_zone, resolve_timezone
+from .climate_normals import PREFERENCES, format_best_time, get_climate_normals
+from .forecast import ForecastSeries, daily_summaries, format_forecast_table
+from .weather_cache import WeatherCache
+from .rate_limiter import SharedTokenBucket, default_state_path
+from .weather_client import DEFAULT_BASE_URL, OpenWeatherClient, WeatherAPIError
 
 # Load environment variables
 load_dotenv()
 
-def get_city_weather(city: str) -> str:
+# Current conditions change roughly every 10 minutes upstream, so repeated
+# questions about the same city are served from memory
+weather_cache = WeatherCache(
+    ttl=float(os.getenv("WEATHER_CACHE_TTL", "600")),
+    stale_ttl=float(os.getenv("WEATHER_STALE_TTL", "1800")),
+    not_found_ttl=float(os.getenv("WEATHER_NOT_FOUND_TTL", "3600")),
+    max_entries=int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "2048")),
+)
+
+# OpenWeather publishes a new 3-hourly forecast run every few hours; keep the
+# parsed arrays, not the raw JSON
+forecast_cache = WeatherCache(
+    ttl=float(os.getenv("FORECAST_CACHE_TTL", "1800")),
+    stale_ttl=float(os.getenv("FORECAST_STALE_TTL", "3600")),
+    not_found_ttl=float(os.getenv("WEATHER_NOT_FOUND_TTL", "3600")),
+    max_entries=int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "2048")),
+)
+
+# All workers on the host share one OpenWeather call budget (free tier: 60/min)
+try:
+    weather_rate_limiter = SharedTokenBucket(
+        os.getenv("OPENWEATHER_QUOTA_FILE") or default_state_path(),
+        rate_per_minute=float(os.getenv("OPENWEATHER_CALLS_PER_MINUTE", "60")),
+        burst=int(os.getenv("OPENWEATHER_BURST", "10")),
+    )
+except OSError as e:
+    print(f"⚠️ OpenWeather rate limiter disabled, cannot open quota file: {e}")
+    weather_rate_limiter = None
+MAX_QUOTA_WAIT = float(os.getenv("OPENWEATHER_MAX_QUOTA_WAIT", "2"))
+
+# One pooled async client per process; timeouts and retries are env-tunable
+weather_client = OpenWeatherClient(
+    base_url=os.getenv("OPENWEATHER_BASE_URL", DEFAULT_BASE_URL),
+    connect_timeout=float(os.getenv("OPENWEATHER_CONNECT_TIMEOUT", "3")),
+    read_timeout=float(os.getenv("OPENWEATHER_READ_TIMEOUT", "5")),
+    retries=int(os.getenv("OPENWEATHER_RETRIES", "2")),
+    rate_limiter=weather_rate_limiter,
+    max_quota_wait=MAX_QUOTA_WAIT,
+)
+
+
+def format_city_weather(city: str, weather_data: dict) -> str:
+    """Render an OpenWeatherMap current-conditions payload for the user."""
+    temp = weather_data["main"]["temp"]
+    temp_f = (temp * 9/5) + 32
+    description = weather_data["weather"][0]["description"]
+    humidity = weather_data["main"]["humidity"]
+    wind_speed = weather_data["wind"]["speed"]
+
+    return (
+        f"🌤️ Current Weather in {city}:\n"
+        f"🌡️ Temperature: {temp:.1f}°C ({temp_f:.1f}°F)\n"
+        f"☁️ Condition: {description.title()}\n"
+        f"💧 Humidity: {humidity}%\n"
+        f"💨 Wind Speed: {wind_speed} m/s\n\n"
+        f"For the most up-to-date information, check Weather.com or your phone's weather app."
+    )
+
+
+async def get_city_weather(city: str) -> str:
     """Get real-time weather information for a specific city using OpenWeatherMap API."""
     api_key = os.getenv('OPENWEATHER_API_KEY')
     
@@ -17,100 +81,223 @@ def get_city_weather(city: str) -> str:
         return "Weather API key not configured. Please set OPENWEATHER_API_KEY in your .env file."
     
     try:
-        url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={api_key}&units=metric"
-        response = requests.get(url)
-        
-        if response.status_code == 404:
+        weather_data = await weather_cache.aget_or_fetch(city, weather_client.current_weather)
+        if weather_data is None:
             return f"City '{city}' not found. Please check the spelling or try a different city."
-        
-        if response.status_code != 200:
-            return f"Error fetching weather data: {response.status_code}"
-        
-        weather_data = response.json()
-        temp = weather_data["main"]["temp"]
-        temp_f = (temp * 9/5) + 32
-        description = weather_data["weather"][0]["description"]
-        humidity = weather_data["main"]["humidity"]
-        wind_speed = weather_data["wind"]["speed"]
-        
-        return (
-            f"🌤️ Current Weather in {city}:\n"
-            f"🌡️ Temperature: {temp:.1f}°C ({temp_f:.1f}°F)\n"
-            f"☁️ Condition: {description.title()}\n"
-            f"💧 Humidity: {humidity}%\n"
-            f"💨 Wind Speed: {wind_speed} m/s\n\n"
-            f"For the most up-to-date information, check Weather.com or your phone's weather app."
-        )
-    except requests.exceptions.RequestException as e:
-        return f"Error fetching weather data: {str(e)}"
+        return format_city_weather(city, weather_data)
+    except WeatherAPIError as e:
+        return str(e)
     except (KeyError, IndexError) as e:
         return f"Error parsing weather data for '{city}'"
 
+# Upper bound on cities answered by one get_weather_for_cities call
+MAX_BATCH_CITIES = 20
+
+
+def summarize_conditions(weather_data: dict) -> str:
+    """Temperature, condition, humidity and wind on one line."""
+    temp = weather_data["main"]["temp"]
+    return (
+        f"{temp:.1f}°C ({temp * 9/5 + 32:.1f}°F), "
+        f"{weather_data['weather'][0]['description'].title()}, "
+        f"💧 {weather_data['main']['humidity']}%, 💨 {weather_data['wind']['speed']} m/s"
+    )
+
+
+def format_weather_line(city: str, weather_data: Any) -> str:
+    """One compact line per city for the multi-city summary."""
+    if weather_data is None:
+        return f"• {city}: not found"
+    if isinstance(weather_data, Exception):
+        return f"• {city}: unavailable ({weather_data})"
+    try:
+        return f"• {city}: {summarize_conditions(weather_data)}"
+    except (KeyError, IndexError, TypeError):
+        return f"• {city}: error parsing weather data"
+
+
+async def get_weather_for_cities(cities: List[str]) -> str:
+    """
+    Get current weather for several cities in one call.
+
+    Args:
+        cities: City names, e.g. ["Rome", "Florence", "Venice"]
+
+    Returns:
+        One line per city with temperature, conditions, humidity and wind.
+    """
+    api_key = os.getenv('OPENWEATHER_API_KEY')
+    
+    if not api_key:
+        return "Weather API key not configured. Please set OPENWEATHER_API_KEY in your .env file."
+    
+    # Drop blanks and repeats ("Rome, rome") while keeping the user's order
+    unique = {}
+    for city in cities:
+        if city and city.strip():
+            unique.setdefault(weather_cache.make_key(city), city.strip())
+    names = list(unique.values())[:MAX_BATCH_CITIES]
+    if not names:
+        return "Please name at least one city."
+
+    results = await weather_cache.aget_many(
+        names, weather_client.current_weather, weather_client.group_weather
+    )
+    lines = [format_weather_line(city, results[city]) for city in names]
+    return f"🌤️ Current Weather in {len(names)} cities:\n" + "\n".join(lines)
+
+
+async def fetch_forecast_series(city: str) -> Optional[ForecastSeries]:
+    """Fetch a city's 5-day / 3-hour forecast and keep it as column arrays."""
+    payload = await weather_client.forecast(city)
+    return ForecastSeries.from_payload(payload) if payload is not None else None
+
+
+async def get_weather_forecast(cities: List[str], days: int = 5) -> str:
+    """
+    Get a day-by-day weather forecast (up to 5 days) for one or more cities.
+
+    Args:
+        cities: City names, e.g. ["Lisbon"] or ["Rome", "Florence"]
+        days: Number of days to show, 1 to 5
+
+    Returns:
+        A short table per city with daily low/high, precipitation, chance of
+        precipitation and the main condition.
+    """
+    api_key = os.getenv('OPENWEATHER_API_KEY')
+    
+    if not api_key:
+        return "Weather API key not configured. Please set OPENWEATHER_API_KEY in your .env file."
+    
+    unique = {}
+    for city in cities:
+        if city and city.strip():
+            unique.setdefault(forecast_cache.make_key(city), city.strip())
+    names = list(unique.values())[:MAX_BATCH_CITIES]
+    if not names:
+        return "Please name at least one city."
+    days = max(1, min(int(days), 5))
+
+    results = await forecast_cache.aget_many(names, fetch_forecast_series)
+    found = [(city, results[city]) for city in names if isinstance(results[city], ForecastSeries)]
+    summaries = daily_summaries([series for _, series in found], days=days)
+
+    blocks = [format_forecast_table(city, summary) for (city, _), summary in zip(found, summaries)]
+    for city in names:
+        if results[city] is None:
+            blocks.append(f"📅 {city}: city not found")
+        elif isinstance(results[city], Exception):
+            blocks.append(f"📅 {city}: forecast unavailable ({results[city]})")
+    return "\n\n".join(blocks)
+
+
+def format_local_clock(ts: float, tz) -> str:
+    return datetime.fromtimestamp(ts, tz).strftime('%I:%M %p')
+
+
+async def get_city_snapshot(city: str) -> str:
+    """
+    Get what it's like in a city right now: current weather, local time,
+    timezone, and sunrise/sunset, in one call.
+
+    Args:
+        city: The city name (e.g., "Lisbon", "Tokyo")
+
+    Returns:
+        A short multi-line snapshot of the city's current conditions.
+    """
+    api_key = os.getenv('OPENWEATHER_API_KEY')
+    
+    if not api_key:
+        return "Weather API key not configured. Please set OPENWEATHER_API_KEY in your .env file."
+    
+    # Timezone and daylight come from the in-memory index and the weather
+    # payload, so the weather lookup (usually a cache hit) is the only I/O
+    tz_name = resolve_timezone(city)
+    try:
+        weather_result = await weather_cache.aget_or_fetch(city, weather_client.current_weather)
+    except WeatherAPIError as e:
+        weather_result = e
+    if weather_result is None:
+        return f"City '{city}' not found. Please check the spelling or try a different city."
+    weather_data = None if isinstance(weather_result, Exception) else weather_result
+
+    if weather_data is not None and "timezone" in weather_data:
+        # The payload's UTC offset belongs to the city the weather is for; the
+        # named zone only adds a label, and only when it agrees with it
+        offset = timedelta(seconds=int(weather_data["timezone"]))
+        if tz_name is not None and datetime.now(get_zone(tz_name)).utcoffset() == offset:
+            tz = get_zone(tz_name)
+        else:
+            tz_name, tz = None, timezone(offset)
+    elif tz_name is not None:
+        tz = get_zone(tz_name)
+    else:
+        return f"Error fetching weather data for '{city}': {weather_result}"
+
+    now = datetime.now(tz)
+    offset = now.strftime('%z')
+    lines = [
+        f"📍 {city} right now",
+        f"🕐 Local time: {now.strftime('%I:%M %p, %A, %B %d')} ({tz_name or 'local'}, UTC{offset[:3]}:{offset[3:]})",
+    ]
+    if weather_data is None:
+        lines.append(f"🌡️ Weather unavailable: {weather_result}")
+        return "\n".join(lines)
+
+    try:
+        lines.append(f"🌡️ {summarize_conditions(weather_data)}")
+    except (KeyError, IndexError, TypeError):
+        lines.append(f"🌡️ Error parsing weather data for '{city}'")
+    sun = weather_data.get("sys", {})
+    if "sunrise" in sun and "sunset" in sun:
+        sunrise, sunset = sun["sunrise"], sun["sunset"]
+        daylight = f"🌅 Sunrise {format_local_clock(sunrise, tz)} · 🌇 Sunset {format_local_clock(sunset, tz)}"
+        remaining = sunset - now.timestamp()
+        if sunrise <= now.timestamp() < sunset:
+            daylight += f" ({int(remaining // 3600)}h {int(remaining % 3600 // 60)}m of daylight left)"
+        lines.append(daylight)
+    return "\n".join(lines)
+
+
+def get_best_time_to_visit(city: str, preference: str = "mild") -> str:
+    """
+    Get the best months to visit a city from long-term climate averages:
+    monthly highs, lows, rainfall and daylight, with each month scored.
+
+    Args:
+        city: The city name (e.g., "Kyoto", "Lisbon")
+        preference: "mild" (default, 18-26°C), "warm" (beach weather) or "cool"
+
+    Returns:
+        The best and worst months plus a month-by-month climate table.
+    """
+    preference = (preference or "mild").strip().lower()
+    if preference not in PREFERENCES:
+        preference = "mild"
+    try:
+        normals = get_climate_normals()
+    except (OSError, ValueError) as e:
+        return f"Climate data unavailable: {str(e)}"
+
+    row = normals.find(city)
+    if row is None:
+        return (
+            f"Sorry, I don't have climate averages for '{city}'. "
+            f"Try a major destination, or use get_weather_forecast for the coming days."
+        )
+    return format_best_time(normals, row, preference)
+
+
 def get_current_time_and_location() -> str:
     """Get the current time and suggest weather for the user's current location."""
     try:
         # Get user's current timezone (this is a simplified approach)
         # In a real app, you'd get this from the user's device or IP
-        current_time = datetime.now()
-        
-        # Common timezone mappings for major cities
-        timezone_map = {
-            "paris": "Europe/Paris",
-            "london": "Europe/London", 
-            "new york": "America/New_York",
-            "tokyo": "Asia/Tokyo",
-            "sydney": "Australia/Sydney",
-            "los angeles": "America/Los_Angeles",
-            "chicago": "America/Chicago",
-            "mumbai": "Asia/Kolkata",
-            "beijing": "Asia/Shanghai",
-            "dubai": "Asia/Dubai",
-            "moscow": "Europe/Moscow",
-            "berlin": "Europe/Berlin",
-            "rome": "Europe/Rome",
-            "madrid": "Europe/Madrid",
-            "amsterdam": "Europe/Amsterdam",
-            "vienna": "Europe/Vienna",
-            "prague": "Europe/Prague",
-            "budapest": "Europe/Budapest",
-            "warsaw": "Europe/Warsaw",
-            "stockholm": "Europe/Stockholm",
-            "oslo": "Europe/Oslo",
-            "copenhagen": "Europe/Copenhagen",
-            "helsinki": "Europe/Helsinki",
-            "riga": "Europe/Riga",
-            "tallinn": "Europe/Tallinn",
-            "vilnius": "Europe/Vilnius",
-            "brussels": "Europe/Brussels",
-            "zurich": "Europe/Zurich",
-            "geneva": "Europe/Zurich",
-            "milan": "Europe/Rome",
-            "barcelona": "Europe/Madrid",
-            "seville": "Europe/Madrid",
-            "valencia": "Europe/Madrid",
-            "bilbao": "Europe/Madrid",
-            "porto": "Europe/Lisbon",
-            "lisbon": "Europe/Lisbon",
-            "dublin": "Europe/Dublin",
-            "edinburgh": "Europe/London",
-            "glasgow": "Europe/London",
-            "manchester": "Europe/London",
-            "birmingham": "Europe/London",
-            "leeds": "Europe/London",
-            "liverpool": "Europe/London",
-            "newcastle": "Europe/London",
-            "cardiff": "Europe/London",
-            "belfast": "Europe/London",
-            "aberdeen": "Europe/London",
-            "dundee": "Europe/London",
-            "perth": "Europe/London",
-            "stirling": "Europe/London",
-            "inverness": "Europe/London",
-        }
-        
         # For now, we'll use a default timezone (UTC) and suggest the user specify their location
         # In a real implementation, you'd detect the user's timezone
-        utc_time = datetime.now(pytz.UTC)
+        utc_time = datetime.now(timezone.utc)
         
         return (
             f"🕐 Current UTC Time: {utc_time.strftime('%I:%M %p, %A, %B %d, %Y')}\n\n"
@@ -124,75 +311,11 @@ def get_current_time_and_location() -> str:
 def get_current_time(location: str) -> str:
     """Get the current time for a specific location."""
     try:
-        # Common timezone mappings
-        timezone_map = {
-            "paris": "Europe/Paris",
-            "london": "Europe/London",
-            "new york": "America/New_York",
-            "tokyo": "Asia/Tokyo",
-            "sydney": "Australia/Sydney",
-            "los angeles": "America/Los_Angeles",
-            "chicago": "America/Chicago",
-            "mumbai": "Asia/Kolkata",
-            "beijing": "Asia/Shanghai",
-            "dubai": "Asia/Dubai",
-            "moscow": "Europe/Moscow",
-            "berlin": "Europe/Berlin",
-            "rome": "Europe/Rome",
-            "madrid": "Europe/Madrid",
-            "amsterdam": "Europe/Amsterdam",
-            "vienna": "Europe/Vienna",
-            "prague": "Europe/Prague",
-            "budapest": "Europe/Budapest",
-            "warsaw": "Europe/Warsaw",
-            "stockholm": "Europe/Stockholm",
-            "oslo": "Europe/Oslo",
-            "copenhagen": "Europe/Copenhagen",
-            "helsinki": "Europe/Helsinki",
-            "riga": "Europe/Riga",
-            "tallinn": "Europe/Tallinn",
-            "vilnius": "Europe/Vilnius",
-            "brussels": "Europe/Brussels",
-            "zurich": "Europe/Zurich",
-            "geneva": "Europe/Zurich",
-            "milan": "Europe/Rome",
-            "barcelona": "Europe/Madrid",
-            "seville": "Europe/Madrid",
-            "valencia": "Europe/Madrid",
-            "bilbao": "Europe/Madrid",
-            "porto": "Europe/Lisbon",
-            "lisbon": "Europe/Lisbon",
-            "dublin": "Europe/Dublin",
-            "edinburgh": "Europe/London",
-            "glasgow": "Europe/London",
-            "manchester": "Europe/London",
-            "birmingham": "Europe/London",
-            "leeds": "Europe/London",
-            "liverpool": "Europe/London",
-            "newcastle": "Europe/London",
-            "cardiff": "Europe/London",
-            "belfast": "Europe/London",
-            "aberdeen": "Europe/London",
-            "dundee": "Europe/London",
-            "perth": "Europe/London",
-            "stirling": "Europe/London",
-            "inverness": "Europe/London",
-        }
-        
-        location_lower = location.lower()
-        if location_lower in timezone_map:
-            tz_name = timezone_map[location_lower]
-        else:
-            # Try to find a timezone that contains the location name
-            for tz in pytz.all_timezones:
-                if location_lower in tz.lower():
-                    tz_name = tz
-                    break
-            else:
-                return f"Sorry, I couldn't find timezone information for '{location}'. Please try with a major city name."
-        
-        tz = pytz.timezone(tz_name)
-        current_time = datetime.now(tz)
+        tz_name = resolve_timezone(location)
+        if tz_name is None:
+            return f"Sorry, I couldn't find timezone information for '{location}'. Please try with a major city name."
+
+        current_time = datetime.now(get_zone(tz_name))
         return f"🕐 Current time in {location}: {current_time.strftime('%I:%M %p, %A, %B %d, %Y')} ({tz_name})"
     
     except Exception as e:
@@ -204,28 +327,40 @@ def get_weather_for_current_time() -> str:
     return current_info
 
 # Create tools without the name argument
-weather_tool = FunctionTool(get_city_weather)
-current_time_tool = FunctionTool(get_current_time)
-current_weather_tool = FunctionTool(get_weather_for_current_time)
+weather_tool = ThreadedFunctionTool(get_city_weather)
+multi_city_weather_tool = ThreadedFunctionTool(get_weather_for_cities)
+forecast_tool = ThreadedFunctionTool(get_weather_forecast)
+city_snapshot_tool = ThreadedFunctionTool(get_city_snapshot)
+best_time_tool = ThreadedFunctionTool(get_best_time_to_visit)
+current_time_tool = ThreadedFunctionTool(get_current_time)
+current_weather_tool = ThreadedFunctionTool(get_weather_for_current_time)
 
 weather_agent = Agent(
     name="weather_agent",
     model="gemini-2.0-flash",
-    description="Provides weather information and current time for locations.",
+    description="Provides current weather, multi-day forecasts, seasonal climate and current time for locations.",
     instruction="""
     You are a weather expert that provides weather information and current time.
     
     **How to respond:**
     - For weather questions: Use get_city_weather with the specified city
+    - For weather in two or more cities: Use get_weather_for_cities once with all of them
+    - For forecasts ("this week", "tomorrow", "next few days"): Use get_weather_forecast with every city at once
     - For current time: Use get_current_time with the specified location
+    - For "what's it like in X right now" (weather and time together): Use get_city_snapshot once instead of chaining tools
+    - For "best time to visit" or "what's X like in October": Use get_best_time_to_visit (climate averages, not a forecast)
     - For general weather queries: Use get_weather_for_current_time to show current time and ask for city
     
     **Examples:**
     - "Weather in Tokyo" → Get real-time weather for Tokyo
+    - "Weather in Rome, Florence and Venice" → get_weather_for_cities(["Rome", "Florence", "Venice"])
+    - "Will it rain in Lisbon this week?" → get_weather_forecast(["Lisbon"])
     - "Current time in London" → Get current time in London
+    - "What's it like in Lisbon right now?" → get_city_snapshot("Lisbon")
+    - "When is the best time to visit Kyoto?" → get_best_time_to_visit("Kyoto")
     - "What's the weather?" → Show current time and ask for city
     
     Provide direct, helpful answers with weather information and travel recommendations.
     """,
-    tools=[weather_tool, current_time_tool, current_weather_tool],
+    tools=[weather_tool, multi_city_weather_tool, forecast_tool, city_snapshot_tool, best_time_tool, current_time_tool, current_weather_tool],
 ) 
\ No newline at end of file
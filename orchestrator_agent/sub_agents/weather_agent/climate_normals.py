@@ -0,0 +1,255 @@
+"""
+Bundled monthly climate normals for "best time to visit" answers.
+
+The source of truth is ``data/climate_normals.csv`` (one row per city and
+variable, twelve monthly columns). ``build_climate_normals`` turns it into a
+``float32`` array of shape ``(cities, 12, fields)`` saved as ``.npy`` plus a
+small JSON index (city names, coordinates, field order and the CSV's hash).
+At runtime the array is opened with ``mmap_mode="r"``, so every worker shares
+the same page-cache copy and startup does no parsing. If the CSV changes, the
+hash no longer matches and the binary is rebuilt on first use.
+
+Daylight is not stored in the CSV; it is derived from latitude at build time
+(mid-month day length, ignoring refraction and terrain).
+
+Rebuild by hand with:
+    python -m orchestrator_agent.sub_agents.weather_agent.climate_normals
+"""
+
+import csv
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ...timezones import normalize_location
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+SOURCE_CSV = os.path.join(DATA_DIR, "climate_normals.csv")
+ARRAY_FILE = "climate_normals.npy"
+INDEX_FILE = "climate_normals_index.json"
+
+FIELDS = ("high_c", "low_c", "precip_mm", "daylight_h")
+HIGH, LOW, PRECIP, DAYLIGHT = range(len(FIELDS))
+MONTHS = ("January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December")
+
+# Comfortable daytime-high bands (°C) per travel style
+PREFERENCES = {
+    "mild": (18.0, 26.0),
+    "warm": (25.0, 32.0),
+    "cool": (10.0, 19.0),
+}
+
+# Names travellers use that differ from the city name in the dataset
+_ALIASES = {
+    "bali": "denpasar",
+    "nyc": "new york",
+    "new york city": "new york",
+    "la": "los angeles",
+    "sf": "san francisco",
+    "rio": "rio de janeiro",
+    "new delhi": "delhi",
+    "bombay": "mumbai",
+    "firenze": "florence",
+    "roma": "rome",
+    "venezia": "venice",
+    "praha": "prague",
+    "wien": "vienna",
+    "lisboa": "lisbon",
+}
+
+_MID_MONTH_DAY = np.array([15, 46, 74, 105, 135, 166, 196, 227, 258, 288, 319, 349])
+
+
+def daylight_hours(lat: np.ndarray) -> np.ndarray:
+    """
+    Mid-month day length in hours for each latitude.
+
+    Args:
+        lat: Latitudes in degrees, shape ``(n,)``
+
+    Returns:
+        Array of shape ``(n, 12)``.
+    """
+    declination = np.radians(23.44) * np.sin(2 * np.pi * (284 + _MID_MONTH_DAY) / 365)
+    cos_hour_angle = -np.tan(np.radians(lat))[:, None] * np.tan(declination)[None, :]
+    # Clipping covers polar day (-1) and polar night (+1)
+    return np.degrees(2 * np.arccos(np.clip(cos_hour_angle, -1.0, 1.0))) / 15.0
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_source(csv_path: str) -> Tuple[List[dict], np.ndarray]:
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(line for line in f if not line.startswith("#")))
+
+    cities: Dict[str, dict] = {}
+    values: Dict[Tuple[str, str], List[float]] = {}
+    for row in rows:
+        name = row["city"].strip()
+        cities.setdefault(name, {
+            "name": name,
+            "country": row["country"].strip(),
+            "lat": float(row["lat"]),
+            "lon": float(row["lon"]),
+        })
+        values[(name, row["variable"].strip())] = [float(row[m[:3].lower()]) for m in MONTHS]
+
+    data = np.zeros((len(cities), 12, len(FIELDS)), dtype=np.float32)
+    for i, name in enumerate(cities):
+        for j, field in enumerate(FIELDS[:DAYLIGHT]):
+            if (name, field) not in values:
+                raise ValueError(f"{csv_path}: missing '{field}' row for {name}")
+            data[i, :, j] = values[(name, field)]
+    data[:, :, DAYLIGHT] = daylight_hours(np.array([c["lat"] for c in cities.values()]))
+    return list(cities.values()), data
+
+
+def build_climate_normals(csv_path: str = SOURCE_CSV, out_dir: str = DATA_DIR) -> Tuple[str, str]:
+    """
+    Convert the CSV into the memory-mappable array and its JSON index.
+
+    Returns:
+        Paths of the written ``.npy`` and index files.
+    """
+    cities, data = _read_source(csv_path)
+    os.makedirs(out_dir, exist_ok=True)
+    array_path = os.path.join(out_dir, ARRAY_FILE)
+    index_path = os.path.join(out_dir, INDEX_FILE)
+
+    # Write to temporary names and rename, so concurrent readers never see a partial file
+    np.save(array_path + ".tmp.npy", data)
+    os.replace(array_path + ".tmp.npy", array_path)
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"source_sha256": _file_sha256(csv_path), "fields": list(FIELDS), "cities": cities}, f, indent=1)
+    os.replace(index_path + ".tmp", index_path)
+    return array_path, index_path
+
+
+class ClimateNormals:
+    """
+    Read-only view over the built dataset.
+
+    Args:
+        data: Array of shape ``(cities, 12, len(FIELDS))``, usually a memmap
+        cities: One dict per row of ``data`` with name, country, lat and lon
+    """
+
+    def __init__(self, data: np.ndarray, cities: List[dict]):
+        self.data = data
+        self.cities = cities
+        self._index: Dict[str, int] = {}
+        for i, city in enumerate(cities):
+            name = normalize_location(city["name"])
+            self._index[name] = i
+            self._index[f"{name} {normalize_location(city['country'])}"] = i
+        for alias, name in _ALIASES.items():
+            if name in self._index:
+                self._index[alias] = self._index[name]
+
+    @classmethod
+    def load(cls, data_dir: str = DATA_DIR, csv_path: str = SOURCE_CSV) -> "ClimateNormals":
+        """Memory-map the built dataset, rebuilding it first if it is missing or out of date."""
+        array_path = os.path.join(data_dir, ARRAY_FILE)
+        index_path = os.path.join(data_dir, INDEX_FILE)
+        index = None
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        stale = (
+            index is None
+            or not os.path.exists(array_path)
+            or index.get("fields") != list(FIELDS)
+            or (os.path.exists(csv_path) and index.get("source_sha256") != _file_sha256(csv_path))
+        )
+        if stale:
+            try:
+                build_climate_normals(csv_path, data_dir)
+            except OSError as e:
+                # Read-only install: keep the rebuilt data in memory instead
+                print(f"⚠️ Could not write climate normals to {data_dir}, using an in-memory copy: {e}")
+                cities, data = _read_source(csv_path)
+                return cls(data, cities)
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        return cls(np.load(array_path, mmap_mode="r"), index["cities"])
+
+    def find(self, location: str) -> Optional[int]:
+        """Row for a city name such as "Kyoto", "Paris, France" or "Bali", or None."""
+        key = normalize_location(location)
+        candidates = [key.replace(",", " "), *(part.strip() for part in key.split(","))]
+        for candidate in candidates:
+            row = self._index.get(" ".join(candidate.split()))
+            if row is not None:
+                return row
+        return None
+
+    def month_scores(self, preference: str = "mild", rows=None) -> np.ndarray:
+        """
+        Score every month for sightseeing, 0 (avoid) to 10 (ideal).
+
+        Penalizes daytime highs outside the preference band, rain above
+        ~40 mm/month, and short days. Vectorized over all requested cities.
+
+        Args:
+            preference: Key of ``PREFERENCES``
+            rows: Row index or indices to score (default: every city)
+
+        Returns:
+            Array of shape ``(..., 12)`` matching ``rows``.
+        """
+        low, high = PREFERENCES[preference]
+        data = np.asarray(self.data if rows is None else self.data[rows], dtype=np.float32)
+        temp = data[..., HIGH]
+        too_cold = np.maximum(0.0, low - temp)
+        too_hot = np.maximum(0.0, temp - high)
+        wet = np.maximum(0.0, data[..., PRECIP] - 40.0) / 25.0
+        dark = np.maximum(0.0, 10.0 - data[..., DAYLIGHT]) * 0.5
+        return np.clip(10.0 - 0.5 * (too_cold + too_hot) - wet - dark, 0.0, 10.0)
+
+
+@lru_cache(maxsize=1)
+def get_climate_normals() -> ClimateNormals:
+    """Process-wide dataset, loaded on first use."""
+    return ClimateNormals.load(os.getenv("CLIMATE_NORMALS_DIR", DATA_DIR))
+
+
+def format_best_time(normals: ClimateNormals, row: int, preference: str = "mild") -> str:
+    """Month-by-month table for one city with the best and worst months called out."""
+    city = normals.cities[row]
+    data = np.asarray(normals.data[row])
+    scores = normals.month_scores(preference, row)
+    # Stable sort keeps calendar order among equal scores
+    ranked = np.argsort(-scores, kind="stable")
+    best = [MONTHS[m] for m in ranked[:3]]
+    worst = [MONTHS[m] for m in ranked[::-1][:2] if scores[m] < 5]
+
+    lines = [
+        f"📆 Best time to visit {city['name']}, {city['country']} ({preference} weather)",
+        f"✅ Best months: {', '.join(best)}",
+    ]
+    if worst:
+        lines.append(f"⚠️ Least pleasant: {', '.join(worst)}")
+    lines.append(f"{'Month':5}  {'High':>6} {'Low':>6} {'Rain':>6}  {'Daylight':>8}  Score")
+    for m in range(12):
+        high, low, precip, daylight = data[m]
+        lines.append(
+            f"{MONTHS[m][:3]:5}  {high:4.0f}°C {low:4.0f}°C {precip:4.0f}mm  {daylight:7.1f}h  {scores[m]:4.1f}"
+        )
+    lines.append("Long-term monthly averages; actual weather in a given year varies.")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    array_path, index_path = build_climate_normals()
+    print(f"✅ Wrote {array_path} and {index_path}")
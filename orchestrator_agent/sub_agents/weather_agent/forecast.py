@@ -0,0 +1,145 @@
+"""
+Compact storage and daily aggregation of OpenWeather 5-day / 3-hour forecasts.
+
+A forecast response is ~40 JSON objects per city. We keep only the columns
+we summarize, as small NumPy arrays (about 1 KB per city instead of ~15 KB
+of decoded JSON), and reduce them to one row per local calendar day:
+low, high, total precipitation, peak chance of precipitation and the most
+frequent condition. ``daily_summaries`` does this for any number of cities
+in one vectorized pass by concatenating their series and reducing over
+contiguous (city, day) segments.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Condition groups derived from OpenWeather condition codes (id // 100, with
+# 800 split out as clear and 801-804 as clouds)
+CONDITION_LABELS = {
+    2: "Thunderstorm",
+    3: "Drizzle",
+    5: "Rain",
+    6: "Snow",
+    7: "Fog/Haze",
+    8: "Cloudy",
+    9: "Clear",
+}
+_N_CONDITIONS = 10
+
+
+class ForecastSeries:
+    """One city's 3-hourly forecast as column arrays."""
+    __slots__ = ("city", "country", "utc_offset", "dt", "temp_min", "temp_max", "precip", "pop", "condition")
+
+    def __init__(self, city, country, utc_offset, dt, temp_min, temp_max, precip, pop, condition):
+        self.city = city
+        self.country = country
+        self.utc_offset = utc_offset
+        self.dt = dt
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.precip = precip
+        self.pop = pop
+        self.condition = condition
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "ForecastSeries":
+        """Build from an OpenWeather /forecast response body."""
+        points = sorted(payload.get("list", []), key=lambda p: p["dt"])
+        city = payload.get("city", {})
+
+        def column(get, dtype):
+            return np.fromiter((get(p) for p in points), dtype=dtype, count=len(points))
+
+        def condition(point):
+            code = point["weather"][0]["id"] if point.get("weather") else 800
+            return 9 if code == 800 else code // 100
+
+        return cls(
+            city=city.get("name", ""),
+            country=city.get("country", ""),
+            utc_offset=int(city.get("timezone", 0)),
+            dt=column(lambda p: p["dt"], np.int64),
+            temp_min=column(lambda p: p["main"]["temp_min"], np.float32),
+            temp_max=column(lambda p: p["main"]["temp_max"], np.float32),
+            precip=column(lambda p: p.get("rain", {}).get("3h", 0.0) + p.get("snow", {}).get("3h", 0.0), np.float32),
+            pop=column(lambda p: p.get("pop", 0.0), np.float32),
+            condition=column(condition, np.int8),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in ("dt", "temp_min", "temp_max", "precip", "pop", "condition"))
+
+
+def daily_summaries(series: List[ForecastSeries], days: Optional[int] = None) -> List[Dict[str, np.ndarray]]:
+    """
+    Per-day summaries for several cities at once.
+
+    Args:
+        series: Forecasts to summarize
+        days: Keep at most this many leading days per city
+
+    Returns:
+        One dict per input series with equal-length arrays ``day`` (local
+        date, datetime64[D]), ``low``, ``high``, ``precip``, ``pop`` and
+        ``condition``.
+    """
+    if not series:
+        return []
+    lengths = np.array([len(s.dt) for s in series])
+    city_idx = np.repeat(np.arange(len(series)), lengths)
+    offsets = np.repeat(np.array([s.utc_offset for s in series], dtype=np.int64), lengths)
+    local_day = (np.concatenate([s.dt for s in series]) + offsets) // 86400
+
+    # Each series is sorted by time, so (city, day) pairs form contiguous runs
+    group_key = city_idx.astype(np.int64) << 32 | local_day
+    boundary = np.empty(len(group_key), dtype=bool)
+    boundary[:1] = True
+    boundary[1:] = group_key[1:] != group_key[:-1]
+    starts = np.flatnonzero(boundary)
+    group_of_point = np.cumsum(boundary) - 1
+
+    def reduce(ufunc, column):
+        values = np.concatenate([getattr(s, column) for s in series])
+        return ufunc.reduceat(values, starts) if len(starts) else values[:0]
+
+    low = reduce(np.minimum, "temp_min")
+    high = reduce(np.maximum, "temp_max")
+    precip = reduce(np.add, "precip")
+    pop = reduce(np.maximum, "pop")
+    conditions = np.concatenate([s.condition for s in series]).astype(np.int64)
+    counts = np.bincount(group_of_point * _N_CONDITIONS + conditions, minlength=len(starts) * _N_CONDITIONS)
+    # Ties go to the more severe (lower-numbered) condition group
+    condition = counts.reshape(len(starts), _N_CONDITIONS).argmax(axis=1)
+
+    group_city = city_idx[starts]
+    group_day = local_day[starts].astype("datetime64[D]")
+    results = []
+    for i in range(len(series)):
+        rows = np.flatnonzero(group_city == i)[:days]
+        results.append({
+            "day": group_day[rows],
+            "low": low[rows],
+            "high": high[rows],
+            "precip": precip[rows],
+            "pop": pop[rows],
+            "condition": condition[rows],
+        })
+    return results
+
+
+def format_forecast_table(name: str, summary: Dict[str, np.ndarray]) -> str:
+    """Render one city's daily summary as a short fixed-width table."""
+    lines = [f"📅 {name} ({len(summary['day'])}-day forecast, local dates)",
+             f"{'Day':9}  {'Low':>6} {'High':>6} {'Precip':>7}  {'Chance':>6}  Conditions"]
+    for day, low, high, precip, pop, condition in zip(
+        summary["day"], summary["low"], summary["high"], summary["precip"], summary["pop"], summary["condition"]
+    ):
+        label = day.item().strftime("%a %m-%d")
+        lines.append(
+            f"{label:9}  {low:4.0f}°C {high:4.0f}°C {precip:5.1f}mm  {pop * 100:5.0f}%  "
+            f"{CONDITION_LABELS.get(int(condition), 'Mixed')}"
+        )
+    return "\n".join(lines)
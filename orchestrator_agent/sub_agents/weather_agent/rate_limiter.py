@@ -0,0 +1,173 @@
+"""
+Host-wide token bucket for outbound OpenWeatherMap calls.
+
+Every uvicorn worker (and the combined Railway service) calls OpenWeather
+with the same API key, so per-process limiting doesn't stop a burst from
+tripping the account's per-minute quota. The bucket state lives in a small
+memory-mapped file that all processes on the host share; updates are
+serialized with ``fcntl.flock``. On platforms without ``fcntl`` the bucket
+falls back to being per-process.
+
+Callers take a token before each HTTP attempt. When the bucket is empty they
+wait up to a bounded time for the next token; if none arrives they get
+``False`` and can fall back to cached data.
+"""
+
+import asyncio
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, per-process bucket only
+    fcntl = None
+
+# magic, tokens, last_refill, window_start, window_count, granted, denied, waited
+_LAYOUT = struct.Struct("<Qdddqqqq")
+_MAGIC = 0x4F57515541544131  # "OWQUATA1"
+_WINDOW_SECONDS = 60.0
+
+
+def default_state_path() -> str:
+    return os.path.join(tempfile.gettempdir(), "openweather_quota.bin")
+
+
+class SharedTokenBucket:
+    """
+    Token bucket whose state is shared by every process using the same file.
+
+    Args:
+        path: State file; processes sharing it share the budget
+        rate_per_minute: Sustained calls allowed per minute
+        burst: Bucket capacity (calls allowed back to back after a quiet period)
+        clock: Wall-clock time source; must agree across processes
+    """
+
+    def __init__(self, path: str, rate_per_minute: float = 60, burst: int = 10, clock=time.time):
+        self.path = path
+        self.rate = rate_per_minute / 60.0
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < _LAYOUT.size:
+            os.ftruncate(self._fd, _LAYOUT.size)
+        self._map = mmap.mmap(self._fd, _LAYOUT.size)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+    def try_acquire(self) -> Tuple[bool, float]:
+        """
+        Take one token if available.
+
+        Returns:
+            ``(True, 0.0)`` on success, otherwise ``(False, seconds until the
+            next token is due)``.
+        """
+        with self._locked() as state:
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                state["granted"] += 1
+                state["window_count"] += 1
+                return True, 0.0
+            return False, (1 - state["tokens"]) / self.rate
+
+    def acquire(self, max_wait: float) -> bool:
+        """Blocking acquire; waits up to ``max_wait`` seconds for a token."""
+        deadline = time.monotonic() + max_wait
+        waited = False
+        while True:
+            ok, delay = self.try_acquire()
+            if ok:
+                if waited:
+                    self._count("waited")
+                return True
+            if time.monotonic() + delay > deadline:
+                self._count("denied")
+                return False
+            waited = True
+            time.sleep(delay)
+
+    async def acquire_async(self, max_wait: float) -> bool:
+        """Async acquire; waits up to ``max_wait`` seconds without blocking the loop."""
+        deadline = time.monotonic() + max_wait
+        waited = False
+        while True:
+            ok, delay = self.try_acquire()
+            if ok:
+                if waited:
+                    self._count("waited")
+                return True
+            if time.monotonic() + delay > deadline:
+                self._count("denied")
+                return False
+            waited = True
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Host-wide quota usage, including share of the per-minute budget used in the current window."""
+        with self._locked() as state:
+            return {
+                "rate_per_minute": self.rate_per_minute,
+                "burst": self.burst,
+                "tokens_available": round(state["tokens"], 2),
+                "calls_this_window": state["window_count"],
+                "utilization": state["window_count"] / self.rate_per_minute if self.rate_per_minute else 0.0,
+                "granted": state["granted"],
+                "waited": state["waited"],
+                "denied": state["denied"],
+                "shared_across_processes": fcntl is not None,
+            }
+
+    def _count(self, field: str) -> None:
+        with self._locked() as state:
+            state[field] += 1
+
+    def _locked(self):
+        return _LockedState(self)
+
+
+class _LockedState:
+    """Context manager: lock the state file, refill the bucket, write back on exit."""
+
+    _FIELDS = ("tokens", "last_refill", "window_start", "window_count", "granted", "denied", "waited")
+
+    def __init__(self, bucket: SharedTokenBucket):
+        self.bucket = bucket
+        self.state: Dict[str, Any] = {}
+
+    def __enter__(self) -> Dict[str, Any]:
+        bucket = self.bucket
+        bucket._lock.acquire()
+        if fcntl is not None:
+            fcntl.flock(bucket._fd, fcntl.LOCK_EX)
+        magic, *values = _LAYOUT.unpack_from(bucket._map, 0)
+        now = bucket.clock()
+        if magic != _MAGIC:
+            values = [float(bucket.burst), now, now, 0, 0, 0, 0]
+        state = dict(zip(self._FIELDS, values))
+        elapsed = max(0.0, now - state["last_refill"])
+        state["tokens"] = min(float(bucket.burst), state["tokens"] + elapsed * bucket.rate)
+        state["last_refill"] = now
+        if now - state["window_start"] >= _WINDOW_SECONDS:
+            state["window_start"] = now
+            state["window_count"] = 0
+        self.state = state
+        return state
+
+    def __exit__(self, *exc) -> None:
+        bucket = self.bucket
+        try:
+            _LAYOUT.pack_into(bucket._map, 0, _MAGIC, *(self.state[f] for f in self._FIELDS))
+        finally:
+            if fcntl is not None:
+                fcntl.flock(bucket._fd, fcntl.LOCK_UN)
+            bucket._lock.release()
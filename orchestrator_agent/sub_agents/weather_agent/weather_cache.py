@@ -0,0 +1,377 @@
+"""
+In-process cache for OpenWeatherMap current-conditions lookups.
+
+OpenWeather only refreshes current conditions about every 10 minutes, but a
+popular city can be asked for many times a minute across conversations. The
+cache is keyed on the normalized city name and:
+
+  - serves entries younger than ``ttl`` straight from memory
+  - serves entries up to ``ttl + stale_ttl`` old immediately while one
+    background refresh fetches a new copy (stale-while-revalidate)
+  - remembers "city not found" answers for ``not_found_ttl`` so typos don't
+    hit the API again and again
+  - lets concurrent misses for the same city share one outbound request
+  - falls back to an expired copy (up to ``fallback_ttl`` past the stale
+    window) when a fetch fails, e.g. because the API quota is exhausted
+
+``get_or_fetch`` takes a blocking fetcher and coordinates threads;
+``aget_or_fetch`` takes a coroutine fetcher and coordinates tasks;
+``aget_many`` resolves several cities at once, batching the misses whose
+OpenWeather city ID has been seen before into one group request.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ...timezones import normalize_location
+
+logger = logging.getLogger(__name__)
+
+# Stored in place of the payload for cities the API reported as unknown
+NOT_FOUND = object()
+
+
+class _Flight:
+    """One in-progress fetch that concurrent callers for the same city wait on."""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class WeatherCache:
+    """
+    TTL cache with stale-while-revalidate, negative caching and single-flight misses.
+
+    Args:
+        ttl: Seconds an entry is served without revalidation
+        stale_ttl: Extra seconds an expired entry may be served while refreshing
+        not_found_ttl: Seconds a "city not found" answer is remembered
+        fallback_ttl: Extra seconds past the stale window an entry is kept to
+            answer with when fetching fails
+        max_entries: Least recently used cities are evicted past this many
+        clock: Time source (overridable for tests)
+    """
+
+    def __init__(
+        self,
+        ttl: float = 600,
+        stale_ttl: float = 1800,
+        not_found_ttl: float = 3600,
+        fallback_ttl: float = 6 * 3600,
+        max_entries: int = 2048,
+        clock=time.monotonic,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.not_found_ttl = not_found_ttl
+        self.fallback_ttl = fallback_ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        # key -> (value, fetched_at, fresh_for, stale_for)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[str, asyncio.Future] = {}
+        self._tasks = set()
+        self._refreshing = set()
+        # normalized city -> OpenWeather city ID, learned from payloads; kept
+        # after the entry itself expires so a later miss can use the group endpoint
+        self._city_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.metrics = {
+            "hits": 0,
+            "stale_hits": 0,
+            "not_found_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+            "group_fetches": 0,
+            "fallbacks": 0,
+        }
+
+    @staticmethod
+    def make_key(city: str) -> str:
+        return normalize_location(city)
+
+    def get_or_fetch(self, city: str, fetch: Callable[[str], Optional[Any]]) -> Optional[Any]:
+        """
+        Return the cached payload for ``city``, fetching it on a miss.
+
+        Args:
+            city: City name as given by the user
+            fetch: Called with ``city``; returns the payload, None if the city
+                does not exist, or raises on a transient error (not cached)
+
+        Returns:
+            The payload, or None if the city is (negatively cached as) not found.
+        """
+        key = self.make_key(city)
+        with self._lock:
+            hit, value, stale = self._lookup(key)
+            if hit:
+                if stale and self._claim_refresh(key):
+                    self._refresh_executor().submit(self._refresh, key, city, fetch)
+                return value
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.metrics["misses"] += 1
+            else:
+                self.metrics["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = fetch(city)
+            self._store(key, value)
+            flight.value = value
+            return value
+        except Exception as e:
+            fallback = self._fallback(key, city, e)
+            if fallback is None:
+                flight.error = e
+                raise
+            flight.value = fallback
+            return fallback
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    async def aget_or_fetch(self, city: str, fetch: Callable[[str], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """
+        Async counterpart of get_or_fetch for coroutine fetchers.
+
+        Concurrent misses on the same event loop share one ``fetch`` call, and
+        stale entries are refreshed by a background task.
+        """
+        key = self.make_key(city)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            hit, value, stale = self._lookup(key)
+            if hit:
+                if stale and self._claim_refresh(key):
+                    task = loop.create_task(self._arefresh(key, city, fetch))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                return value
+
+            flight = self._async_flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._async_flights[key] = loop.create_future()
+                self.metrics["misses"] += 1
+            else:
+                self.metrics["coalesced"] += 1
+
+        if not leader:
+            # shield: one waiter being cancelled must not cancel the shared fetch
+            return await asyncio.shield(flight)
+
+        try:
+            value = await fetch(city)
+            self._store(key, value)
+            flight.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            fallback = self._fallback(key, city, e)
+            if fallback is None:
+                flight.set_exception(e)
+                flight.exception()  # mark retrieved; waiters (if any) still see it
+                raise
+            flight.set_result(fallback)
+            return fallback
+        except BaseException as e:
+            flight.set_exception(e)
+            flight.exception()  # mark retrieved; waiters (if any) still see it
+            raise
+        finally:
+            with self._lock:
+                self._async_flights.pop(key, None)
+
+    async def aget_many(
+        self,
+        cities: List[str],
+        fetch: Callable[[str], Awaitable[Optional[Any]]],
+        fetch_group: Optional[Callable[[List[int]], Awaitable[List[dict]]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Resolve several cities in one pass.
+
+        Cache hits are answered from memory. Misses whose city ID is known are
+        fetched together with one ``fetch_group`` call; the rest (and any the
+        group call leaves out) go through ``aget_or_fetch`` concurrently.
+
+        Args:
+            cities: City names as given by the user
+            fetch: Coroutine fetcher for a single city (see aget_or_fetch)
+            fetch_group: Optional coroutine taking city IDs and returning their
+                payloads; without it every miss is fetched individually
+
+        Returns:
+            ``{city: payload}``, where the payload is None for unknown cities
+            and the raised exception for cities that could not be fetched.
+        """
+        results: Dict[str, Any] = {}
+        by_id: Dict[int, List[str]] = {}
+        pending: List[str] = []
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for city in cities:
+                key = self.make_key(city)
+                hit, value, stale = self._lookup(key)
+                if hit:
+                    results[city] = value
+                    if stale and self._claim_refresh(key):
+                        task = loop.create_task(self._arefresh(key, city, fetch))
+                        self._tasks.add(task)
+                        task.add_done_callback(self._tasks.discard)
+                elif fetch_group and key in self._city_ids and key not in self._async_flights:
+                    by_id.setdefault(self._city_ids[key], []).append(city)
+                    self.metrics["misses"] += 1
+                else:
+                    pending.append(city)
+
+        if by_id:
+            try:
+                payloads = await fetch_group(list(by_id))
+                with self._lock:
+                    self.metrics["group_fetches"] += 1
+            except Exception as e:
+                logger.warning(f"Group weather fetch for {len(by_id)} cities failed: {e}")
+                payloads = []
+            for payload in payloads:
+                for city in by_id.pop(payload.get("id"), []):
+                    self._store(self.make_key(city), payload)
+                    results[city] = payload
+            # IDs the group call didn't answer fall back to single lookups
+            pending += [city for names in by_id.values() for city in names]
+
+        if pending:
+            fetched = await asyncio.gather(
+                *(self.aget_or_fetch(city, fetch) for city in pending), return_exceptions=True
+            )
+            results.update(zip(pending, fetched))
+        return {city: results[city] for city in cities}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = (self.metrics["hits"] + self.metrics["stale_hits"] + self.metrics["not_found_hits"]
+                       + self.metrics["misses"] + self.metrics["coalesced"])
+            return {
+                **self.metrics,
+                "entries": len(self._entries),
+                "hit_rate": (lookups - self.metrics["misses"]) / lookups if lookups else 0.0,
+            }
+
+    def _store(self, key: str, value: Optional[Any]) -> None:
+        if value is None:
+            record = (NOT_FOUND, self.clock(), self.not_found_ttl, 0)
+        else:
+            record = (value, self.clock(), self.ttl, self.stale_ttl)
+        with self._lock:
+            if isinstance(value, dict) and isinstance(value.get("id"), int):
+                self._city_ids[key] = value["id"]
+            self._entries[key] = record
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.metrics["evictions"] += 1
+
+    def _lookup(self, key: str) -> Tuple[bool, Optional[Any], bool]:
+        """(hit, value, stale) for ``key``, dropping dead entries. Called with the lock held."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None, False
+        value, fetched_at, fresh_for, stale_for = entry
+        age = self.clock() - fetched_at
+        if age >= fresh_for + stale_for:
+            # Past serving age; keep it a while as a fallback for failed fetches
+            if value is NOT_FOUND or age >= fresh_for + stale_for + self.fallback_ttl:
+                del self._entries[key]
+            return False, None, False
+        self._entries.move_to_end(key)
+        if value is NOT_FOUND:
+            self.metrics["not_found_hits"] += 1
+            return True, None, False
+        if age < fresh_for:
+            self.metrics["hits"] += 1
+            return True, value, False
+        self.metrics["stale_hits"] += 1
+        return True, value, True
+
+    def _fallback(self, key: str, city: str, error: Exception) -> Optional[Any]:
+        """An expired payload to answer with after a failed fetch, if one is still kept."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is NOT_FOUND:
+                return None
+            value, fetched_at, fresh_for, stale_for = entry
+            if self.clock() - fetched_at >= fresh_for + stale_for + self.fallback_ttl:
+                return None
+            self.metrics["fallbacks"] += 1
+        logger.warning(f"Serving expired weather for {city!r} after fetch failure: {error}")
+        return value
+
+    def _claim_refresh(self, key: str) -> bool:
+        """True if the caller should start the (only) refresh for ``key``. Called with the lock held."""
+        if key in self._refreshing:
+            return False
+        self._refreshing.add(key)
+        return True
+
+    def _refresh_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="weather-refresh")
+        return self._executor
+
+    def _refresh(self, key: str, city: str, fetch: Callable) -> None:
+        try:
+            self._refreshed(key, fetch(city))
+        except Exception as e:
+            self._refresh_failed(city, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def _arefresh(self, key: str, city: str, fetch: Callable) -> None:
+        try:
+            self._refreshed(key, await fetch(city))
+        except Exception as e:
+            self._refresh_failed(city, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _refreshed(self, key: str, value: Optional[Any]) -> None:
+        self._store(key, value)
+        with self._lock:
+            self.metrics["refreshes"] += 1
+
+    def _refresh_failed(self, city: str, error: Exception) -> None:
+        # Keep serving the stale copy; the next stale hit retries
+        logger.warning(f"Background weather refresh for {city!r} failed: {error}")
+        with self._lock:
+            self.metrics["refresh_errors"] += 1
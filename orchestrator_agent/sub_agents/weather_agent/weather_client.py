@@ -0,0 +1,150 @@
+"""
+Shared async client for the OpenWeatherMap API.
+
+get_city_weather used to call ``requests.get`` with no timeout from inside the
+ADK tool loop, so one slow OpenWeather response could hold up the serving
+event loop indefinitely. This client keeps one pooled ``httpx.AsyncClient``
+per event loop with connect/read timeouts, and retries timeouts, connection
+errors, 429s and 5xx responses a bounded number of times with exponential
+backoff. Every attempt first takes a token from the optional host-wide
+rate limiter (see rate_limiter.py).
+"""
+
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+DEFAULT_BASE_URL = "http://api.openweathermap.org/data/2.5"
+
+# The group endpoint accepts at most this many city IDs per request
+GROUP_MAX_IDS = 20
+
+# Statuses worth retrying; anything else (401, 400, ...) fails immediately
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class WeatherAPIError(Exception):
+    """OpenWeatherMap returned an unexpected (non-404) status or was unreachable."""
+
+
+class QuotaExceededError(WeatherAPIError):
+    """The shared OpenWeather call budget had no token within the allowed wait."""
+
+
+class OpenWeatherClient:
+    """Connection-pooled async OpenWeatherMap client with timeouts and retries.
+
+    Args:
+        api_key: OpenWeather API key; read from OPENWEATHER_API_KEY when None
+        base_url: API root (e.g. "http://api.openweathermap.org/data/2.5")
+        max_connections: Upper bound on open connections in the pool
+        max_keepalive_connections: Idle connections kept warm for reuse
+        connect_timeout: Seconds to wait when opening a new connection
+        read_timeout: Seconds to wait for a response
+        retries: Extra attempts after a retryable failure
+        backoff: Delay before the first retry; doubles on each further retry
+        rate_limiter: Optional SharedTokenBucket; one token is taken per attempt
+        max_quota_wait: Seconds to wait for a token before giving up
+        transport: Optional httpx transport override (used by tests)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        max_connections: int = 50,
+        max_keepalive_connections: int = 10,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 5.0,
+        retries: int = 2,
+        backoff: float = 0.25,
+        rate_limiter=None,
+        max_quota_wait: float = 2.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter
+        self.max_quota_wait = max_quota_wait
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        # Pooled connections belong to the loop that opened them
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pool. Safe to call more than once."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def get_json(self, path: str, params: Dict[str, Any]) -> Optional[dict]:
+        """
+        GET an API resource with retries.
+
+        Returns:
+            The decoded JSON body, or None on a 404.
+
+        Raises:
+            QuotaExceededError: If the shared call budget stays exhausted.
+            WeatherAPIError: On a non-retryable status, or once retries run out.
+        """
+        api_key = self.api_key or os.getenv("OPENWEATHER_API_KEY")
+        query = {**params, "appid": api_key, "units": "metric"}
+        error: Optional[WeatherAPIError] = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            if self.rate_limiter is not None and not await self.rate_limiter.acquire_async(self.max_quota_wait):
+                raise QuotaExceededError("Weather service is busy right now (rate limit reached). Please try again shortly.")
+            try:
+                response = await self.client.get(path, params=query)
+            except httpx.TransportError as e:
+                error = WeatherAPIError(f"Error fetching weather data: {e.__class__.__name__}")
+                continue
+            if response.status_code == 404:
+                return None
+            if response.status_code == 200:
+                return response.json()
+            error = WeatherAPIError(f"Error fetching weather data: {response.status_code}")
+            if response.status_code not in _RETRY_STATUSES:
+                break
+        raise error
+
+    async def current_weather(self, city: str) -> Optional[dict]:
+        """Current conditions for a city, or None if OpenWeather doesn't know it."""
+        return await self.get_json("/weather", {"q": city})
+
+    async def forecast(self, city: str) -> Optional[dict]:
+        """5-day / 3-hour forecast for a city, or None if OpenWeather doesn't know it."""
+        return await self.get_json("/forecast", {"q": city})
+
+    async def group_weather(self, city_ids: List[int]) -> List[dict]:
+        """Current conditions for several OpenWeather city IDs, 20 per request."""
+        chunks = [city_ids[i:i + GROUP_MAX_IDS] for i in range(0, len(city_ids), GROUP_MAX_IDS)]
+        bodies = await asyncio.gather(
+            *(self.get_json("/group", {"id": ",".join(map(str, chunk))}) for chunk in chunks)
+        )
+        return [payload for body in bodies if body for payload in body.get("list", [])]
@@ -0,0 +1,63 @@
+"""
+FunctionTool variant that keeps synchronous tools off the event loop.
+
+ADK's FunctionTool awaits coroutine functions but calls plain functions
+inline, so a sync tool that blocks on I/O (an HTTP call, a slow file read)
+stalls every other conversation served by the same event loop until it
+returns. ThreadedFunctionTool runs sync functions on a shared, bounded thread
+pool instead; async functions are awaited as usual.
+
+The pool size comes from TOOL_THREAD_POOL_SIZE (default 32).
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from google.adk.tools import FunctionTool
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """The process-wide thread pool for blocking tool calls, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("TOOL_THREAD_POOL_SIZE", "32")),
+                thread_name_prefix="tool",
+            )
+        return _executor
+
+
+def _is_async(func: Callable) -> bool:
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(getattr(func, "__call__", None))
+
+
+def offload(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a sync function so calls run on the tool thread pool.
+
+    The wrapper keeps the original name, docstring and signature
+    (``functools.wraps``), so ADK builds the same function declaration.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(get_tool_executor(), call)
+
+    return wrapper
+
+
+class ThreadedFunctionTool(FunctionTool):
+    """FunctionTool that runs synchronous functions on a thread pool."""
+
+    def __init__(self, func: Callable[..., Any]):
+        super().__init__(func if _is_async(func) else offload(func))
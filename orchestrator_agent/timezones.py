@@ -0,0 +1,423 @@
+"""
+Shared city/timezone resolution.
+
+Both the orchestrator and the weather agent need to turn a user-supplied
+place ("Sydney", "new york", "Paris, France", "Japan") into an IANA zone.
+This module builds one immutable index at import time from:
+
+  - city aliases for major travel destinations
+  - country names, mapped to the capital's zone
+  - IANA zone suffixes ("Sao_Paulo" -> "sao paulo") and full zone names
+
+Lookups are a dict hit in the common case. On a miss we try a unique key
+prefix (binary search over the sorted keys) and then a typo match: trigram
+postings pick the few keys that could be within one or two edits, and the
+closest one by edit distance wins only if it is clearly ahead of any other
+zone. Anything looser returns None rather than a confident wrong zone.
+A qualifier after a comma ("Paris, Texas") overrides a same-named city on
+another continent. Resolved ``ZoneInfo`` objects are cached.
+"""
+
+import bisect
+import re
+import unicodedata
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo, available_timezones
+
+_CITY_ALIASES = {
+    "paris": "Europe/Paris",
+    "london": "Europe/London",
+    "new york": "America/New_York",
+    "new york city": "America/New_York",
+    "nyc": "America/New_York",
+    "tokyo": "Asia/Tokyo",
+    "kyoto": "Asia/Tokyo",
+    "osaka": "Asia/Tokyo",
+    "sydney": "Australia/Sydney",
+    "melbourne": "Australia/Melbourne",
+    "los angeles": "America/Los_Angeles",
+    "la": "America/Los_Angeles",
+    "san francisco": "America/Los_Angeles",
+    "sf": "America/Los_Angeles",
+    "seattle": "America/Los_Angeles",
+    "las vegas": "America/Los_Angeles",
+    "chicago": "America/Chicago",
+    "washington dc": "America/New_York",
+    "boston": "America/New_York",
+    "miami": "America/New_York",
+    "montreal": "America/Toronto",
+    "vancouver": "America/Vancouver",
+    "mumbai": "Asia/Kolkata",
+    "bombay": "Asia/Kolkata",
+    "delhi": "Asia/Kolkata",
+    "new delhi": "Asia/Kolkata",
+    "bangalore": "Asia/Kolkata",
+    "beijing": "Asia/Shanghai",
+    "hong kong": "Asia/Hong_Kong",
+    "dubai": "Asia/Dubai",
+    "abu dhabi": "Asia/Dubai",
+    "moscow": "Europe/Moscow",
+    "st petersburg": "Europe/Moscow",
+    "berlin": "Europe/Berlin",
+    "munich": "Europe/Berlin",
+    "rome": "Europe/Rome",
+    "florence": "Europe/Rome",
+    "venice": "Europe/Rome",
+    "naples": "Europe/Rome",
+    "milan": "Europe/Rome",
+    "madrid": "Europe/Madrid",
+    "barcelona": "Europe/Madrid",
+    "seville": "Europe/Madrid",
+    "valencia": "Europe/Madrid",
+    "bilbao": "Europe/Madrid",
+    "amsterdam": "Europe/Amsterdam",
+    "vienna": "Europe/Vienna",
+    "prague": "Europe/Prague",
+    "budapest": "Europe/Budapest",
+    "warsaw": "Europe/Warsaw",
+    "krakow": "Europe/Warsaw",
+    "stockholm": "Europe/Stockholm",
+    "oslo": "Europe/Oslo",
+    "copenhagen": "Europe/Copenhagen",
+    "helsinki": "Europe/Helsinki",
+    "riga": "Europe/Riga",
+    "tallinn": "Europe/Tallinn",
+    "vilnius": "Europe/Vilnius",
+    "brussels": "Europe/Brussels",
+    "zurich": "Europe/Zurich",
+    "geneva": "Europe/Zurich",
+    "porto": "Europe/Lisbon",
+    "lisbon": "Europe/Lisbon",
+    "dublin": "Europe/Dublin",
+    "edinburgh": "Europe/London",
+    "glasgow": "Europe/London",
+    "manchester": "Europe/London",
+    "birmingham": "Europe/London",
+    "leeds": "Europe/London",
+    "liverpool": "Europe/London",
+    "newcastle": "Europe/London",
+    "cardiff": "Europe/London",
+    "belfast": "Europe/London",
+    "aberdeen": "Europe/London",
+    "dundee": "Europe/London",
+    "stirling": "Europe/London",
+    "inverness": "Europe/London",
+    # The original map was Scotland-focused; "Perth, Australia" still resolves
+    "perth": "Europe/London",
+    "perth australia": "Australia/Perth",
+    "athens": "Europe/Athens",
+    "santorini": "Europe/Athens",
+    "istanbul": "Europe/Istanbul",
+    "cairo": "Africa/Cairo",
+    "marrakech": "Africa/Casablanca",
+    "cape town": "Africa/Johannesburg",
+    "nairobi": "Africa/Nairobi",
+    "singapore": "Asia/Singapore",
+    "bangkok": "Asia/Bangkok",
+    "hanoi": "Asia/Bangkok",
+    "ho chi minh city": "Asia/Ho_Chi_Minh",
+    "saigon": "Asia/Ho_Chi_Minh",
+    "seoul": "Asia/Seoul",
+    "bali": "Asia/Makassar",
+    "kuala lumpur": "Asia/Kuala_Lumpur",
+    "manila": "Asia/Manila",
+    "taipei": "Asia/Taipei",
+    "auckland": "Pacific/Auckland",
+    "honolulu": "Pacific/Honolulu",
+    "rio de janeiro": "America/Sao_Paulo",
+    "rio": "America/Sao_Paulo",
+    "buenos aires": "America/Argentina/Buenos_Aires",
+    "cusco": "America/Lima",
+    "reykjavik": "Atlantic/Reykjavik",
+    "utc": "UTC",
+    "gmt": "UTC",
+}
+
+_COUNTRY_CAPITALS = {
+    "france": "Europe/Paris",
+    "united kingdom": "Europe/London",
+    "uk": "Europe/London",
+    "england": "Europe/London",
+    "scotland": "Europe/London",
+    "wales": "Europe/London",
+    "ireland": "Europe/Dublin",
+    "germany": "Europe/Berlin",
+    "italy": "Europe/Rome",
+    "spain": "Europe/Madrid",
+    "portugal": "Europe/Lisbon",
+    "netherlands": "Europe/Amsterdam",
+    "holland": "Europe/Amsterdam",
+    "belgium": "Europe/Brussels",
+    "switzerland": "Europe/Zurich",
+    "austria": "Europe/Vienna",
+    "czech republic": "Europe/Prague",
+    "czechia": "Europe/Prague",
+    "hungary": "Europe/Budapest",
+    "poland": "Europe/Warsaw",
+    "sweden": "Europe/Stockholm",
+    "norway": "Europe/Oslo",
+    "denmark": "Europe/Copenhagen",
+    "finland": "Europe/Helsinki",
+    "iceland": "Atlantic/Reykjavik",
+    "greece": "Europe/Athens",
+    "turkey": "Europe/Istanbul",
+    "croatia": "Europe/Zagreb",
+    "russia": "Europe/Moscow",
+    "ukraine": "Europe/Kyiv",
+    "romania": "Europe/Bucharest",
+    "bulgaria": "Europe/Sofia",
+    "serbia": "Europe/Belgrade",
+    "estonia": "Europe/Tallinn",
+    "latvia": "Europe/Riga",
+    "lithuania": "Europe/Vilnius",
+    "japan": "Asia/Tokyo",
+    "china": "Asia/Shanghai",
+    "south korea": "Asia/Seoul",
+    "korea": "Asia/Seoul",
+    "india": "Asia/Kolkata",
+    "thailand": "Asia/Bangkok",
+    "vietnam": "Asia/Ho_Chi_Minh",
+    "singapore": "Asia/Singapore",
+    "malaysia": "Asia/Kuala_Lumpur",
+    "indonesia": "Asia/Jakarta",
+    "philippines": "Asia/Manila",
+    "taiwan": "Asia/Taipei",
+    "united arab emirates": "Asia/Dubai",
+    "uae": "Asia/Dubai",
+    "israel": "Asia/Jerusalem",
+    "jordan": "Asia/Amman",
+    "qatar": "Asia/Qatar",
+    "saudi arabia": "Asia/Riyadh",
+    "nepal": "Asia/Kathmandu",
+    "sri lanka": "Asia/Colombo",
+    "pakistan": "Asia/Karachi",
+    "egypt": "Africa/Cairo",
+    "morocco": "Africa/Casablanca",
+    "south africa": "Africa/Johannesburg",
+    "kenya": "Africa/Nairobi",
+    "nigeria": "Africa/Lagos",
+    "tanzania": "Africa/Dar_es_Salaam",
+    "united states": "America/New_York",
+    "usa": "America/New_York",
+    "us": "America/New_York",
+    "canada": "America/Toronto",
+    "mexico": "America/Mexico_City",
+    "brazil": "America/Sao_Paulo",
+    "argentina": "America/Argentina/Buenos_Aires",
+    "chile": "America/Santiago",
+    "peru": "America/Lima",
+    "colombia": "America/Bogota",
+    "cuba": "America/Havana",
+    "australia": "Australia/Sydney",
+    "new zealand": "Pacific/Auckland",
+    "fiji": "Pacific/Fiji",
+}
+
+# Qualifiers after a comma ("Portland, Oregon", "Paris, TX"); only used in
+# that position, since the two-letter codes clash with ordinary words
+_REGION_QUALIFIERS = {}
+for _names, _zone in [
+    (("alabama", "al"), "America/Chicago"), (("alaska", "ak"), "America/Anchorage"),
+    (("arizona", "az"), "America/Phoenix"), (("arkansas", "ar"), "America/Chicago"),
+    (("california", "ca"), "America/Los_Angeles"), (("colorado", "co"), "America/Denver"),
+    (("connecticut", "ct"), "America/New_York"), (("delaware", "de"), "America/New_York"),
+    (("florida", "fl"), "America/New_York"), (("georgia", "ga"), "America/New_York"),
+    (("hawaii", "hi"), "Pacific/Honolulu"), (("idaho", "id"), "America/Boise"),
+    (("illinois", "il"), "America/Chicago"), (("indiana", "in"), "America/Indiana/Indianapolis"),
+    (("iowa", "ia"), "America/Chicago"), (("kansas", "ks"), "America/Chicago"),
+    (("kentucky", "ky"), "America/New_York"), (("louisiana",), "America/Chicago"),
+    (("maine", "me"), "America/New_York"), (("maryland", "md"), "America/New_York"),
+    (("massachusetts", "ma"), "America/New_York"), (("michigan", "mi"), "America/Detroit"),
+    (("minnesota", "mn"), "America/Chicago"), (("mississippi", "ms"), "America/Chicago"),
+    (("missouri", "mo"), "America/Chicago"), (("montana", "mt"), "America/Denver"),
+    (("nebraska", "ne"), "America/Chicago"), (("nevada", "nv"), "America/Los_Angeles"),
+    (("new hampshire", "nh"), "America/New_York"), (("new jersey", "nj"), "America/New_York"),
+    (("new mexico", "nm"), "America/Denver"), (("new york state", "ny"), "America/New_York"),
+    (("north carolina", "nc"), "America/New_York"), (("north dakota", "nd"), "America/Chicago"),
+    (("ohio", "oh"), "America/New_York"), (("oklahoma", "ok"), "America/Chicago"),
+    (("oregon", "or"), "America/Los_Angeles"), (("pennsylvania", "pa"), "America/New_York"),
+    (("rhode island", "ri"), "America/New_York"), (("south carolina", "sc"), "America/New_York"),
+    (("south dakota", "sd"), "America/Chicago"), (("tennessee", "tn"), "America/Chicago"),
+    (("texas", "tx"), "America/Chicago"), (("utah", "ut"), "America/Denver"),
+    (("vermont", "vt"), "America/New_York"), (("virginia", "va"), "America/New_York"),
+    (("washington", "washington state", "wa"), "America/Los_Angeles"),
+    (("west virginia", "wv"), "America/New_York"), (("wisconsin", "wi"), "America/Chicago"),
+    (("wyoming", "wy"), "America/Denver"),
+    (("ontario", "on"), "America/Toronto"), (("quebec", "qc"), "America/Toronto"),
+    (("british columbia", "bc"), "America/Vancouver"), (("alberta", "ab"), "America/Edmonton"),
+]:
+    for _name in _names:
+        _REGION_QUALIFIERS[_name] = _zone
+
+# Region prefixes of canonical IANA zones; legacy aliases like "US/Eastern" are skipped
+_REGIONS = ("Africa/", "America/", "Antarctica/", "Asia/", "Atlantic/", "Australia/", "Europe/", "Indian/", "Pacific/")
+
+
+def normalize_location(location: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    text = unicodedata.normalize("NFKD", location)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower().replace("_", " ").replace(".", "")
+    return " ".join(text.replace("-", " ").split())
+
+
+def _trigrams(text: str) -> FrozenSet[str]:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _build_index() -> Tuple[Mapping[str, str], List[str], Dict[str, List[Tuple[str, int]]]]:
+    index: Dict[str, str] = {}
+    zones = available_timezones()
+    for zone in sorted(zones):
+        if zone.startswith(_REGIONS):
+            index.setdefault(normalize_location(zone.rsplit("/", 1)[-1]), zone)
+        index.setdefault(normalize_location(zone), zone)
+    # Curated names win over raw zone suffixes
+    for name, zone in {**_COUNTRY_CAPITALS, **_CITY_ALIASES}.items():
+        if zone in zones:
+            index[name] = zone
+    keys = sorted(index)
+    # Inverted trigram index over place names (full "region/city" keys excluded)
+    postings: Dict[str, List[Tuple[str, int]]] = {}
+    for key in keys:
+        if "/" not in key:
+            grams = _trigrams(key)
+            for gram in grams:
+                postings.setdefault(gram, []).append((key, len(grams)))
+    return MappingProxyType(index), keys, postings
+
+
+LOCATION_INDEX, _SORTED_KEYS, _TRIGRAM_POSTINGS = _build_index()
+
+
+def _prefix_match(name: str) -> Optional[str]:
+    """Zone of the only indexed key starting with ``name``, if exactly one zone matches."""
+    start = bisect.bisect_left(_SORTED_KEYS, name)
+    matches = set()
+    for key in _SORTED_KEYS[start:]:
+        if not key.startswith(name):
+            break
+        matches.add(LOCATION_INDEX[key])
+        if len(matches) > 1:
+            return None
+    return matches.pop() if matches else None
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two short strings."""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+# Typo matching: names shorter than this never match fuzzily; one edit is
+# allowed up to LONG_NAME characters, two beyond
+MIN_FUZZY_LENGTH = 4
+LONG_NAME = 8
+
+
+def _typo_match(name: str) -> Optional[str]:
+    """
+    Zone of the indexed key closest to ``name`` by edit distance, if it is
+    within the typo budget and no key of another zone is as close.
+    """
+    if len(name) < MIN_FUZZY_LENGTH:
+        return None
+    max_edits = 1 if len(name) <= LONG_NAME else 2
+    grams = _trigrams(name)
+    shared: Dict[Tuple[str, int], int] = {}
+    for gram in grams:
+        for entry in _TRIGRAM_POSTINGS.get(gram, ()):
+            shared[entry] = shared.get(entry, 0) + 1
+    # Each edit changes at most three trigrams, which bounds the candidates
+    best: Dict[str, int] = {}
+    for (key, size), overlap in shared.items():
+        if overlap < max(len(grams), size) - 3 * max_edits or abs(len(key) - len(name)) > max_edits:
+            continue
+        distance = _edit_distance(name, key)
+        zone = LOCATION_INDEX[key]
+        if distance <= max_edits and distance < best.get(zone, max_edits + 1):
+            best[zone] = distance
+    ranked = sorted(best.items(), key=lambda item: item[1])
+    if not ranked or (len(ranked) > 1 and ranked[1][1] == ranked[0][1]):
+        return None
+    return ranked[0][0]
+
+
+@lru_cache(maxsize=4096)
+def resolve_timezone(location: str, fuzzy: bool = True) -> Optional[str]:
+    """
+    Resolve a city, country or zone name to an IANA timezone name.
+
+    Args:
+        location: e.g. "Tokyo", "Paris, France", "japan", "America/New_York"
+        fuzzy: Also try unique prefixes and typo matches; turn off for names
+            taken from data rather than typed by a user
+
+    Returns:
+        The IANA zone name, or None if nothing plausible matches.
+    """
+    name = normalize_location(location)
+    if not name:
+        return None
+    zone = LOCATION_INDEX.get(" ".join(name.replace(",", " ").split()))
+    if zone:
+        return zone
+    parts = [part.strip() for part in name.split(",") if part.strip()]
+    if not parts:
+        return None
+    # "Paris, France" -> "paris" (fuzzy only on this, the most specific part), qualified by "france"
+    city = parts[0]
+    city_zone = LOCATION_INDEX.get(city)
+    if city_zone is None and fuzzy and len(city) >= MIN_FUZZY_LENGTH:
+        city_zone = _prefix_match(city) or _typo_match(city)
+    qualifier_zone = None
+    for qualifier in parts[1:]:
+        qualifier_zone = _REGION_QUALIFIERS.get(qualifier) or LOCATION_INDEX.get(qualifier)
+        if qualifier_zone:
+            break
+    # A qualifier on another continent means a different place of the same name ("Paris, Texas")
+    if city_zone and qualifier_zone and city_zone.split("/")[0] != qualifier_zone.split("/")[0]:
+        return qualifier_zone
+    return city_zone or qualifier_zone
+
+
+@lru_cache(maxsize=None)
+def get_zone(tz_name: str) -> ZoneInfo:
+    """Cached ZoneInfo for an IANA zone name."""
+    return ZoneInfo(tz_name)
+
+
+_CLOCK = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\s*$")
+
+
+def parse_clock(when: str) -> Optional[int]:
+    """
+    Minute of the day for a clock time: "19:30", "7pm", "12 am", "noon".
+
+    Returns:
+        0-1439, or None if the time can't be understood.
+    """
+    when = when.strip().lower()
+    if when == "noon":
+        return 12 * 60
+    if when == "midnight":
+        return 0
+    match = _CLOCK.match(when)
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    if match.group(3):
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if match.group(3) == "pm" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
@@ -0,0 +1,203 @@
+"""
+Bounded, TTL-evicting session store for the combined service.
+
+Replaces the module-level ``sessions`` dict in adk_server_with_api.py, which
+grew for the lifetime of the process. Sessions idle for longer than the TTL
+are dropped, the total number of live sessions is capped (least recently used
+goes first), and each session keeps only its most recent messages.
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rough per-message overhead (tuple + role + timestamp float) used by the
+# bytes estimate, on top of the message text itself.
+_MESSAGE_OVERHEAD = sys.getsizeof((None, None, None)) + sys.getsizeof(0.0) + 60
+
+
+class SessionRecord:
+    """One chat session. ``messages`` is a ring buffer of (role, content, timestamp)."""
+
+    __slots__ = ("session_id", "user_id", "created_at", "last_access", "messages", "nbytes")
+
+    def __init__(self, session_id: str, user_id: str, max_messages: int, now: float):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.created_at = time.time()
+        self.last_access = now
+        self.messages = deque(maxlen=max_messages)
+        self.nbytes = 0
+
+    def to_dict(self) -> Dict:
+        """Render the session in the same shape the old dict store used."""
+        return {
+            "user_id": self.user_id,
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(),
+            "messages": [
+                {
+                    "role": role,
+                    "content": content,
+                    "timestamp": datetime.fromtimestamp(timestamp).isoformat()
+                }
+                for role, content, timestamp in self.messages
+            ]
+        }
+
+
+# Fixed cost of an empty record (slots object + deque), for the bytes estimate.
+_RECORD_OVERHEAD = sys.getsizeof(SessionRecord("", "", 1, 0.0)) + sys.getsizeof(deque(maxlen=1))
+
+
+class SessionStore:
+    """
+    In-memory session store with idle-TTL eviction and size caps.
+
+    Sessions are kept in an OrderedDict ordered by last access, so both TTL
+    expiry (oldest at the front) and LRU capacity eviction are O(1) per
+    evicted session.
+
+    Args:
+        ttl_seconds: Idle time after which a session is evicted
+        max_sessions: Maximum number of live sessions
+        max_messages: Messages kept per session; older ones are overwritten
+        on_evict: Optional callback ``(record, reason)`` called for every
+            evicted session, e.g. to drop the matching ADK session
+        clock: Monotonic time source (overridable for tests)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_sessions: int = 10000,
+        max_messages: int = 50,
+        on_evict: Optional[Callable[[SessionRecord, str], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.on_evict = on_evict
+        self.clock = clock
+        self._sessions: "OrderedDict[str, SessionRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._created = 0
+        self._ttl_evictions = 0
+        self._capacity_evictions = 0
+        self._messages_dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def create(self, session_id: str, user_id: str) -> SessionRecord:
+        """Create (or replace) a session and make room for it if needed."""
+        now = self.clock()
+        evicted = []
+        with self._lock:
+            evicted += self._expire(now)
+            old = self._sessions.pop(session_id, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            while len(self._sessions) >= self.max_sessions:
+                _, record = self._sessions.popitem(last=False)
+                self._bytes -= record.nbytes
+                self._capacity_evictions += 1
+                evicted.append((record, "capacity"))
+            record = SessionRecord(session_id, user_id, self.max_messages, now)
+            self._sessions[session_id] = record
+            self._created += 1
+        self._notify(evicted)
+        return record
+
+    def get(self, session_id: str) -> Optional[SessionRecord]:
+        """Return a live session and mark it as recently used."""
+        now = self.clock()
+        with self._lock:
+            evicted = self._expire(now)
+            record = self._sessions.get(session_id)
+            if record is not None:
+                record.last_access = now
+                self._sessions.move_to_end(session_id)
+        self._notify(evicted)
+        return record
+
+    def append_message(self, session_id: str, role: str, content: str) -> bool:
+        """Append a message to a session's history. Returns False if the session is gone."""
+        record = self.get(session_id)
+        if record is None:
+            return False
+        size = sys.getsizeof(content) + _MESSAGE_OVERHEAD
+        with self._lock:
+            if len(record.messages) == record.messages.maxlen:
+                # Ring buffer is full: the oldest message is about to be overwritten
+                size -= sys.getsizeof(record.messages[0][1]) + _MESSAGE_OVERHEAD
+                self._messages_dropped += 1
+            record.messages.append((role, content, time.time()))
+            record.nbytes += size
+            if self._sessions.get(session_id) is record:
+                self._bytes += size
+        return True
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session. Returns True if it existed."""
+        with self._lock:
+            record = self._sessions.pop(session_id, None)
+            if record is not None:
+                self._bytes -= record.nbytes
+        return record is not None
+
+    def evict_expired(self) -> int:
+        """Drop every session idle for longer than the TTL. Returns how many were evicted."""
+        with self._lock:
+            evicted = self._expire(self.clock())
+        self._notify(evicted)
+        return len(evicted)
+
+    def stats(self) -> Dict:
+        """Live count, eviction counters and an estimate of memory held by history."""
+        with self._lock:
+            live = len(self._sessions)
+            return {
+                "live_sessions": live,
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "max_messages_per_session": self.max_messages,
+                "sessions_created": self._created,
+                "ttl_evictions": self._ttl_evictions,
+                "capacity_evictions": self._capacity_evictions,
+                "messages_dropped": self._messages_dropped,
+                "bytes_estimate": self._bytes + live * _RECORD_OVERHEAD,
+            }
+
+    def _expire(self, now: float) -> list:
+        # Caller holds the lock. Least recently used sessions are at the front.
+        evicted = []
+        cutoff = now - self.ttl_seconds
+        while self._sessions:
+            session_id, record = next(iter(self._sessions.items()))
+            if record.last_access > cutoff:
+                break
+            del self._sessions[session_id]
+            self._bytes -= record.nbytes
+            self._ttl_evictions += 1
+            evicted.append((record, "ttl"))
+        return evicted
+
+    def _notify(self, evicted: list) -> None:
+        if self.on_evict is None:
+            return
+        for record, reason in evicted:
+            try:
+                self.on_evict(record, reason)
+            except Exception as e:
+                logger.warning(f"Session eviction callback failed for {record.session_id}: {e}")
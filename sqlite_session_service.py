@@ -0,0 +1,535 @@
+"""
+SQLite-backed ADK session service with batched, off-request-path writes.
+
+Drop-in replacement for ``InMemorySessionService`` so conversations survive
+restarts and can be shared by several uvicorn workers on the same host. The
+database runs in WAL mode, so readers in any process never block the writer.
+
+Event appends are applied to the in-memory ``Session`` immediately (which is
+all the Runner needs to keep going) and queued for a background writer
+thread. The writer drains whatever has accumulated and commits it as one
+transaction (group commit), so under load many events share a single fsync.
+A batch that fails to commit (e.g. a lock held past the busy timeout) is
+retried with backoff; if it never succeeds, readers waiting on it get a
+``SessionWriteError`` instead of a session silently missing those events.
+Reads from the same process first wait for that process's queued writes to
+the session (and the user/app state) they read, so a session always reflects
+its own appends without stalling behind unrelated conversations.
+"""
+
+import asyncio
+import atexit
+import copy
+import heapq
+import itertools
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+from google.adk.events.event import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, id)
+);
+CREATE INDEX IF NOT EXISTS events_by_session
+    ON events (app_name, user_id, session_id, timestamp);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+# Sentinel telling the writer thread to flush and exit
+_STOP = object()
+
+
+def _write_keys(app_name: str, user_id: str, session_id: str, app_delta: dict, user_delta: dict) -> list:
+    """Keys a queued write makes stale for readers: its session, its user's listing and any shared state."""
+    keys = [("session", app_name, user_id, session_id), ("sessions", app_name, user_id)]
+    if user_delta:
+        keys.append(("user", app_name, user_id))
+    if app_delta:
+        keys.append(("app", app_name))
+    return keys
+
+
+def _resolve(future: asyncio.Future, error: Optional[Exception] = None) -> None:
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
+
+
+class SessionWriteError(RuntimeError):
+    """Queued session events could not be committed, even after retrying."""
+
+
+def _split_state_delta(state: Optional[dict]):
+    """Split a state dict into app-, user- and session-scoped parts (temp: keys are dropped)."""
+    app_delta, user_delta, session_delta = {}, {}, {}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            app_delta[key.removeprefix(State.APP_PREFIX)] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_delta[key.removeprefix(State.USER_PREFIX)] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_delta[key] = value
+    return app_delta, user_delta, session_delta
+
+
+class SqliteSessionService(BaseSessionService):
+    """
+    ADK session service persisted to a local SQLite file.
+
+    Args:
+        db_path: Path of the SQLite database file (created if missing)
+        max_batch_size: Most queued events committed in one transaction
+        busy_timeout_ms: How long a connection waits on another process's lock
+        max_write_retries: Extra attempts for a batch whose commit fails
+            (e.g. SQLITE_BUSY under contention) before its readers get a
+            ``SessionWriteError``
+        retry_delay_s: First retry delay; doubles per attempt up to 2 s
+    """
+
+    def __init__(self, db_path: str, max_batch_size: int = 256, busy_timeout_ms: int = 5000,
+                 max_write_retries: int = 5, retry_delay_s: float = 0.05):
+        self.db_path = db_path
+        self.max_batch_size = max_batch_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.max_write_retries = max_write_retries
+        self.retry_delay_s = retry_delay_s
+        self._local = threading.local()
+        self._queue: "queue.Queue" = queue.Queue()
+        # Sequence watermark: every queued write gets a number; readers wait only
+        # until the newest write touching what they read has been processed
+        # (committed, or failed after retries, which they are told about)
+        self._seq_lock = threading.Lock()
+        self._enqueued = 0
+        self._committed = 0
+        self._pending: dict = {}
+        self._waiters: list = []
+        self._waiter_ids = itertools.count()
+        self.batches_written = 0
+        self.events_written = 0
+        self.events_failed = 0
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+        self._writer = threading.Thread(target=self._writer_loop, name="sqlite-session-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # ----- connections ---------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread (sqlite3 connections are not shareable)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    # ----- BaseSessionService --------------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        await self.flush(*self._read_keys(app_name, user_id, session_id))
+        return await asyncio.to_thread(self._create_session_sync, app_name, user_id, state, session_id)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self.flush(*self._read_keys(app_name, user_id, session_id))
+        return await asyncio.to_thread(self._get_session_sync, app_name, user_id, session_id, config)
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        await self.flush(("sessions", app_name, user_id))
+        return await asyncio.to_thread(self._list_sessions_sync, app_name, user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await self.flush(("session", app_name, user_id, session_id))
+        await asyncio.to_thread(self._delete_session_sync, app_name, user_id, session_id)
+
+    async def delete_idle_sessions(self, max_idle_seconds: float) -> int:
+        """
+        Delete sessions (and their events) that nobody has written to for a while.
+
+        This is the store-wide expiry for persisted conversations; evicting a
+        session from one worker's memory never deletes it here, since another
+        worker or a restarted process may still resume it.
+
+        Args:
+            max_idle_seconds: Sessions last updated longer ago than this are deleted
+
+        Returns:
+            Number of sessions deleted
+        """
+        with self._seq_lock:
+            pending = {key[1:] for key in self._pending if key[0] == "session"}
+        return await asyncio.to_thread(self._delete_idle_sessions_sync, time.time() - max_idle_seconds, pending)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        # Update the caller's session right away; persistence happens off the request path
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        state_delta = event.actions.state_delta if event.actions else None
+        app_delta, user_delta, session_delta = _split_state_delta(state_delta)
+        event_json = event.model_dump_json(exclude_none=True)
+        with self._seq_lock:
+            # Numbering and enqueueing under one lock keeps queue order == sequence order
+            self._enqueued += 1
+            seq = self._enqueued
+            for key in _write_keys(session.app_name, session.user_id, session.id, app_delta, user_delta):
+                self._pending[key] = seq
+            self._queue.put((
+                seq,
+                session.app_name,
+                session.user_id,
+                session.id,
+                event.id,
+                event.timestamp,
+                event_json,
+                app_delta,
+                user_delta,
+                session_delta,
+            ))
+        return event
+
+    # ----- write batching ------------------------------------------------------
+
+    @staticmethod
+    def _read_keys(app_name: str, user_id: str, session_id: str) -> tuple:
+        return ("session", app_name, user_id, session_id), ("user", app_name, user_id), ("app", app_name)
+
+    async def flush(self, *keys: tuple) -> None:
+        """
+        Wait until queued writes have been committed.
+
+        Args:
+            keys: Only wait for the newest write to these keys (see ``_write_keys``);
+                with no keys, wait for everything queued so far
+        """
+        with self._seq_lock:
+            if keys:
+                target = max(self._pending.get(key, 0) for key in keys)
+            else:
+                target = self._enqueued
+            if target <= self._committed:
+                return
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (target, next(self._waiter_ids), future))
+        await future
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _writer_loop(self) -> None:
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Group commit: take everything that piled up while the last batch was written
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+            items = [item for item in batch if item is not _STOP]
+            if items:
+                error = self._write_with_retries(conn, [item[1:] for item in items])
+                self._advance(items, error)
+        conn.close()
+
+    def _write_with_retries(self, conn: sqlite3.Connection, rows: list) -> Optional[Exception]:
+        """Commit a batch, retrying with backoff; returns the last error if it never succeeds."""
+        delay = self.retry_delay_s
+        for attempt in range(self.max_write_retries + 1):
+            try:
+                self._write_batch(conn, rows)
+                return None
+            except Exception as e:
+                if attempt == self.max_write_retries:
+                    logger.error(f"Failed to persist {len(rows)} session events after {attempt + 1} attempts: {e}")
+                    self.events_failed += len(rows)
+                    return SessionWriteError(f"{len(rows)} session events were not saved: {e}")
+                logger.warning(f"Retrying {len(rows)} session events in {delay:.2f}s: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+
+    def _advance(self, items: list, error: Optional[Exception] = None) -> None:
+        """
+        Move the watermark past a processed batch and wake readers waiting on
+        it; readers whose newest write was in a failed batch get ``error``.
+        """
+        woken = []
+        with self._seq_lock:
+            for seq, app_name, user_id, session_id, _, _, _, app_d, user_d, _ in items:
+                for key in _write_keys(app_name, user_id, session_id, app_d, user_d):
+                    if self._pending.get(key) == seq:
+                        del self._pending[key]
+            first_seq = items[0][0]
+            self._committed = items[-1][0]
+            while self._waiters and self._waiters[0][0] <= self._committed:
+                target, _, future = heapq.heappop(self._waiters)
+                woken.append((future, error if target >= first_seq else None))
+        for future, failure in woken:
+            try:
+                future.get_loop().call_soon_threadsafe(_resolve, future, failure)
+            except RuntimeError:
+                pass  # the waiting event loop has already been closed
+
+    def _write_batch(self, conn: sqlite3.Connection, items: list) -> None:
+        # Merge state deltas per scope so each row is rewritten once per batch
+        session_deltas: dict = {}
+        user_deltas: dict = {}
+        app_deltas: dict = {}
+        update_times: dict = {}
+        event_rows = []
+        for app_name, user_id, session_id, event_id, timestamp, event_json, app_d, user_d, session_d in items:
+            key = (app_name, user_id, session_id)
+            event_rows.append((app_name, user_id, session_id, event_id, timestamp, event_json))
+            update_times[key] = max(timestamp, update_times.get(key, 0.0))
+            if session_d:
+                session_deltas.setdefault(key, {}).update(session_d)
+            if user_d:
+                user_deltas.setdefault((app_name, user_id), {}).update(user_d)
+            if app_d:
+                app_deltas.setdefault(app_name, {}).update(app_d)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO events (app_name, user_id, session_id, id, timestamp, event) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                event_rows,
+            )
+            for key, delta in session_deltas.items():
+                row = conn.execute(
+                    "SELECT state FROM sessions WHERE app_name=? AND user_id=? AND id=?", key
+                ).fetchone()
+                if row is not None:
+                    state = json.loads(row[0])
+                    state.update(delta)
+                    conn.execute(
+                        "UPDATE sessions SET state=? WHERE app_name=? AND user_id=? AND id=?",
+                        (json.dumps(state), *key),
+                    )
+            for (app_name, user_id), delta in user_deltas.items():
+                self._merge_scoped_state(
+                    conn, "user_states", "app_name=? AND user_id=?", (app_name, user_id), delta
+                )
+            for app_name, delta in app_deltas.items():
+                self._merge_scoped_state(conn, "app_states", "app_name=?", (app_name,), delta)
+            conn.executemany(
+                "UPDATE sessions SET update_time=MAX(update_time, ?) WHERE app_name=? AND user_id=? AND id=?",
+                [(update_time, *key) for key, update_time in update_times.items()],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self.batches_written += 1
+        self.events_written += len(event_rows)
+
+    @staticmethod
+    def _merge_scoped_state(conn, table: str, where: str, key: tuple, delta: dict) -> None:
+        row = conn.execute(f"SELECT state FROM {table} WHERE {where}", key).fetchone()
+        state = json.loads(row[0]) if row else {}
+        state.update(delta)
+        columns = "app_name, user_id" if table == "user_states" else "app_name"
+        placeholders = ", ".join("?" for _ in key)
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} ({columns}, state) VALUES ({placeholders}, ?)",
+            (*key, json.dumps(state)),
+        )
+
+    # ----- synchronous implementations (run in worker threads) -----------------
+
+    def _scoped_states(self, conn, app_name: str, user_id: str):
+        app_row = conn.execute("SELECT state FROM app_states WHERE app_name=?", (app_name,)).fetchone()
+        user_row = conn.execute(
+            "SELECT state FROM user_states WHERE app_name=? AND user_id=?", (app_name, user_id)
+        ).fetchone()
+        return (json.loads(app_row[0]) if app_row else {}), (json.loads(user_row[0]) if user_row else {})
+
+    @staticmethod
+    def _merge_state(app_state: dict, user_state: dict, session_state: dict) -> dict:
+        merged = copy.deepcopy(session_state)
+        for key, value in app_state.items():
+            merged[State.APP_PREFIX + key] = value
+        for key, value in user_state.items():
+            merged[State.USER_PREFIX + key] = value
+        return merged
+
+    def _create_session_sync(self, app_name, user_id, state, session_id) -> Session:
+        app_delta, user_delta, session_state = _split_state_delta(state)
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-creating an existing id replaces it, like InMemorySessionService
+            conn.execute(
+                "DELETE FROM events WHERE app_name=? AND user_id=? AND session_id=?",
+                (app_name, user_id, session_id),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (app_name, user_id, id, state, create_time, update_time) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (app_name, user_id, session_id, json.dumps(session_state), now, now),
+            )
+            if user_delta:
+                self._merge_scoped_state(
+                    conn, "user_states", "app_name=? AND user_id=?", (app_name, user_id), user_delta
+                )
+            if app_delta:
+                self._merge_scoped_state(conn, "app_states", "app_name=?", (app_name,), app_delta)
+            app_state, user_state = self._scoped_states(conn, app_name, user_id)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merge_state(app_state, user_state, session_state),
+            last_update_time=now,
+        )
+
+    def _get_session_sync(self, app_name, user_id, session_id, config) -> Optional[Session]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT state, update_time FROM sessions WHERE app_name=? AND user_id=? AND id=?",
+            (app_name, user_id, session_id),
+        ).fetchone()
+        if row is None:
+            return None
+
+        query = "SELECT event FROM events WHERE app_name=? AND user_id=? AND session_id=?"
+        params: list = [app_name, user_id, session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        query += " ORDER BY timestamp DESC, rowid DESC"
+        if config and config.num_recent_events:
+            query += " LIMIT ?"
+            params.append(config.num_recent_events)
+        events = [Event.model_validate_json(r[0]) for r in conn.execute(query, params).fetchall()]
+        events.reverse()
+
+        app_state, user_state = self._scoped_states(conn, app_name, user_id)
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merge_state(app_state, user_state, json.loads(row[0])),
+            events=events,
+            last_update_time=row[1],
+        )
+
+    def _list_sessions_sync(self, app_name, user_id) -> ListSessionsResponse:
+        rows = self._conn().execute(
+            "SELECT id, update_time FROM sessions WHERE app_name=? AND user_id=?",
+            (app_name, user_id),
+        ).fetchall()
+        return ListSessionsResponse(sessions=[
+            Session(app_name=app_name, user_id=user_id, id=session_id, last_update_time=update_time)
+            for session_id, update_time in rows
+        ])
+
+    def _delete_session_sync(self, app_name, user_id, session_id) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM events WHERE app_name=? AND user_id=? AND session_id=?",
+                (app_name, user_id, session_id),
+            )
+            conn.execute(
+                "DELETE FROM sessions WHERE app_name=? AND user_id=? AND id=?",
+                (app_name, user_id, session_id),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _delete_idle_sessions_sync(self, cutoff: float, pending: set) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Sessions with writes still queued here are about to be touched, so keep them
+            idle = [
+                row for row in conn.execute(
+                    "SELECT app_name, user_id, id FROM sessions WHERE update_time < ?", (cutoff,)
+                ).fetchall()
+                if row not in pending
+            ]
+            conn.executemany("DELETE FROM events WHERE app_name=? AND user_id=? AND session_id=?", idle)
+            conn.executemany("DELETE FROM sessions WHERE app_name=? AND user_id=? AND id=?", idle)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(idle)
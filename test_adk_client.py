@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled async ADK client used by the api.py gateway.
+Runs against an in-process mock ADK server, no network needed.
+"""
+
+import asyncio
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+import api
+from adk_client import ADKClient
+
+
+def mock_adk_handler(request: httpx.Request) -> httpx.Response:
+    """Minimal stand-in for the ADK API server."""
+    if request.url.path == "/":
+        return httpx.Response(200, text="ok")
+    if request.url.path.startswith("/apps/orchestrator_agent/users/"):
+        if request.method == "POST":
+            return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1]})
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404, json={"detail": "Session not found"})
+        return httpx.Response(200, json={"id": request.url.path.rsplit("/", 1)[-1], "events": []})
+    if request.url.path == "/run":
+        payload = json.loads(request.content)
+        text = payload["new_message"]["parts"][0]["text"]
+        return httpx.Response(200, json=[
+            {"content": {"role": "model", "parts": [{"text": f"echo: {text}"}]}}
+        ])
+    return httpx.Response(404)
+
+
+def test_client_reuses_one_pool():
+    """Many concurrent calls should go through a single long-lived client."""
+    client = ADKClient(
+        "http://adk.test",
+        "orchestrator_agent",
+        transport=httpx.MockTransport(mock_adk_handler),
+    )
+
+    async def run():
+        first = client.client
+        responses = await asyncio.gather(*[
+            client.run("traveler", f"session-{i}", [{"text": f"hi {i}"}])
+            for i in range(50)
+        ])
+        assert client.client is first
+        await client.aclose()
+        await client.aclose()
+        return responses
+
+    responses = asyncio.run(run())
+    assert [r.json()[0]["content"]["parts"][0]["text"] for r in responses] == [
+        f"echo: hi {i}" for i in range(50)
+    ]
+    print("✅ 50 concurrent runs shared one pooled client")
+
+
+def test_run_payload_and_timeouts():
+    client = ADKClient("http://adk.test/", "orchestrator_agent", run_timeout=90, connect_timeout=2)
+    payload = client.build_run_payload("u1", "s1", [{"text": "hello"}])
+    assert client.base_url == "http://adk.test"
+    assert payload["new_message"] == {"role": "user", "parts": [{"text": "hello"}]}
+    assert "streaming" not in payload
+    assert client.run_timeout.read == 90
+    assert client.run_timeout.connect == 2
+    print("✅ Payload and timeouts configured")
+
+
+def test_gateway_endpoints_use_shared_client(monkeypatch):
+    monkeypatch.setattr(api.adk_client, "transport", httpx.MockTransport(mock_adk_handler))
+    monkeypatch.setattr(api.adk_client, "_client", None)
+    with TestClient(api.app) as client:
+        health = client.get("/health").json()
+        assert health["adk_server"] == "Online"
+
+        session = client.post("/start_session", json={"user_id": "traveler"}).json()
+        assert session["success"]
+
+        reply = client.post("/send_message", json={
+            "session_id": session["session_id"],
+            "message": "What's the weather in Rome?",
+        }).json()
+        assert reply["response"] == "echo: What's the weather in Rome?"
+
+        assert client.get("/session/missing").status_code == 404
+    print("✅ Gateway endpoints served through the pooled client")
+
+
+if __name__ == "__main__":
+    test_client_reuses_one_pool()
+    test_run_payload_and_timeouts()
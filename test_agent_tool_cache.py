@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the sub-agent response cache (orchestrator_agent/agent_tool_cache.py).
+"""
+
+import asyncio
+import os
+import tempfile
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+from orchestrator_agent.agent_tool_cache import CachedAgentTool, ResponseCache, is_time_dependent, normalize_prompt
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingAgent(BaseAgent):
+    """Answers every request and counts how often it actually ran."""
+    runs: int = 0
+
+    async def _run_async_impl(self, ctx):
+        self.runs += 1
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[
+                types.Part.from_text(text=f"Answer to: {ctx.user_content.parts[0].text}")
+            ]),
+        )
+
+
+def test_normalize_prompt():
+    assert normalize_prompt("Find the best restaurants in Rome!") == normalize_prompt("find best  restaurants in rome")
+    assert normalize_prompt("Top sights in Paris") != normalize_prompt("Top sights in Rome")
+    print("✅ Prompts normalized")
+
+
+def test_ttl_and_per_agent_policy():
+    clock = FakeClock()
+    cache = ResponseCache({"tourist_spots_agent": 60}, clock=clock)
+    cache.set("tourist_spots_agent", "Top sights in Paris", "Eiffel Tower...")
+    cache.set("blog_writer_agent", "Write a blog", "ignored")
+
+    assert cache.get("tourist_spots_agent", "top sights in paris?") == "Eiffel Tower..."
+    assert cache.get("blog_writer_agent", "Write a blog") is None
+    clock.now += 61
+    assert cache.get("tourist_spots_agent", "Top sights in Paris") is None
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 2 and stats["expired"] == 1
+    print("✅ Per-agent TTLs honoured, uncached agents skipped")
+
+
+def test_lru_eviction_by_bytes():
+    cache = ResponseCache({"a": 3600}, max_bytes=3000)
+    for i in range(5):
+        cache.set("a", f"prompt {i}", "x" * 900)
+    cache.get("a", "prompt 2")  # touch so it survives
+    cache.set("a", "prompt 5", "x" * 900)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 3000
+    assert stats["evictions"] >= 3
+    assert cache.get("a", "prompt 2") is not None
+    assert cache.get("a", "prompt 0") is None
+    print("✅ LRU eviction keeps memory under the byte budget")
+
+
+def test_disk_tier_shared_between_instances():
+    path = os.path.join(tempfile.mkdtemp(prefix="agent_cache_"), "cache.db")
+    first = ResponseCache({"restaurant_recommendation_agent": 3600}, disk_path=path)
+    first.set("restaurant_recommendation_agent", "Best restaurants in Rome", "Roscioli, Armando...")
+
+    second = ResponseCache({"restaurant_recommendation_agent": 3600}, disk_path=path)
+    assert second.get("restaurant_recommendation_agent", "best restaurants in Rome") == "Roscioli, Armando..."
+    assert second.get("restaurant_recommendation_agent", "best restaurants in Rome") == "Roscioli, Armando..."
+    stats = second.stats()
+    assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+    print("✅ On-disk tier serves another worker's answers and warms memory")
+
+
+def test_cached_agent_tool_skips_repeat_runs():
+    agent = CountingAgent(name="tourist_spots_agent")
+    tool = CachedAgentTool(agent, ResponseCache({"tourist_spots_agent": 3600}))
+
+    async def call(prompt):
+        service = InMemorySessionService()
+        session = await service.create_session(app_name="test", user_id="u")
+        ctx = InvocationContext(session_service=service, invocation_id="inv", agent=agent, session=session)
+        return await tool.run_async(args={"request": prompt}, tool_context=ToolContext(ctx))
+
+    async def run():
+        return [
+            await call("Top sights in Paris"),
+            await call("top sights in Paris?"),
+            await call("Top sights in Rome"),
+        ]
+
+    answers = asyncio.run(run())
+    assert answers[0] == answers[1] == "Answer to: Top sights in Paris"
+    assert answers[2] == "Answer to: Top sights in Rome"
+    assert agent.runs == 2
+    print("✅ Repeated prompts answered from cache without re-running the sub-agent")
+
+
+def test_time_dependent_prompts_bypass_the_cache():
+    assert is_time_dependent("Restaurants in Rome open now")
+    assert is_time_dependent("somewhere for dinner tonight in Paris")
+    assert is_time_dependent("ramen in Tokyo open at 9pm")
+    assert not is_time_dependent("Best restaurants in Rome")
+
+    agent = CountingAgent(name="restaurant_recommendation_agent")
+    cache = ResponseCache({"restaurant_recommendation_agent": 24 * 3600})
+    tool = CachedAgentTool(agent, cache)
+
+    async def call(prompt):
+        service = InMemorySessionService()
+        session = await service.create_session(app_name="test", user_id="u")
+        ctx = InvocationContext(session_service=service, invocation_id="inv", agent=agent, session=session)
+        return await tool.run_async(args={"request": prompt}, tool_context=ToolContext(ctx))
+
+    async def run():
+        for _ in range(2):
+            await call("Restaurants in Rome open now")
+            await call("Best restaurants in Rome")
+
+    asyncio.run(run())
+    assert agent.runs == 3
+    assert cache.stats()["bypassed"] == 2
+    assert cache.stats()["entries"] == 1
+    print("✅ \"Open now\" style prompts always re-run the sub-agent")
+
+
+if __name__ == "__main__":
+    test_normalize_prompt()
+    test_ttl_and_per_agent_policy()
+    test_lru_eviction_by_bytes()
+    test_disk_tier_shared_between_instances()
+    test_cached_agent_tool_skips_repeat_runs()
+    test_time_dependent_prompts_bypass_the_cache()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the get_city_snapshot tool (weather + local time + daylight in one call).
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import httpx
+
+import orchestrator_agent.sub_agents.weather_agent.agent as weather
+from orchestrator_agent.sub_agents.weather_agent.weather_cache import WeatherCache
+from orchestrator_agent.sub_agents.weather_agent.weather_client import OpenWeatherClient
+
+
+# UTC offsets OpenWeather would report; other cities get UTC+3
+CITY_ZONES = {"lisbon": "Europe/Lisbon", "portland": "America/Los_Angeles"}
+
+
+def payload(city):
+    now = int(time.time())
+    zone = CITY_ZONES.get(city.lower())
+    offset = int(datetime.now(ZoneInfo(zone)).utcoffset().total_seconds()) if zone else 3 * 3600
+    return {
+        "id": 42,
+        "name": city,
+        "main": {"temp": 21.0, "humidity": 40},
+        "weather": [{"description": "clear sky"}],
+        "wind": {"speed": 3.1},
+        "sys": {"sunrise": now - 4 * 3600, "sunset": now + 2 * 3600 + 30 * 60},
+        "timezone": offset,
+    }
+
+
+def use_fake_openweather(monkeypatch):
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test")
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        city = request.url.params["q"]
+        if city == "Atlantis":
+            return httpx.Response(404, json={"message": "city not found"})
+        return httpx.Response(200, json=payload(city))
+
+    monkeypatch.setattr(weather, "weather_client", OpenWeatherClient(api_key="test", transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(weather, "weather_cache", WeatherCache())
+    return requests
+
+
+def test_snapshot_combines_weather_time_and_daylight(monkeypatch):
+    requests = use_fake_openweather(monkeypatch)
+
+    async def scenario():
+        return await weather.get_city_snapshot("Lisbon"), await weather.get_city_snapshot("lisbon")
+
+    snapshot, again = asyncio.run(scenario())
+    lines = snapshot.split("\n")
+    assert lines[0] == "📍 Lisbon right now"
+    assert lines[1].startswith("🕐 Local time: ") and "(Europe/Lisbon, UTC+0" in lines[1]
+    assert lines[2] == "🌡️ 21.0°C (69.8°F), Clear Sky, 💧 40%, 💨 3.1 m/s"
+    assert lines[3].startswith("🌅 Sunrise ")
+    assert "(2h 29m of daylight left)" in lines[3] or "(2h 30m of daylight left)" in lines[3]
+    assert again.startswith("📍 lisbon right now")
+    assert len(requests) == 1
+    print("✅ One tool call returns weather, local time and daylight; repeats hit the cache")
+
+
+def test_snapshot_falls_back_to_openweather_offset(monkeypatch):
+    use_fake_openweather(monkeypatch)
+    snapshot = asyncio.run(weather.get_city_snapshot("Qqqzzyx"))
+    assert "(local, UTC+03:00)" in snapshot
+    print("✅ Cities missing from the timezone index use OpenWeather's UTC offset")
+
+
+def test_snapshot_trusts_the_payload_offset_over_a_mismatched_zone(monkeypatch):
+    use_fake_openweather(monkeypatch)
+    # As if the name had resolved to the wrong place's zone
+    monkeypatch.setattr(weather, "resolve_timezone", lambda city: "Europe/Warsaw")
+    snapshot = asyncio.run(weather.get_city_snapshot("Portland"))
+    offset = datetime.now(ZoneInfo("America/Los_Angeles")).strftime("%z")
+    assert "Europe/Warsaw" not in snapshot
+    assert f"(local, UTC{offset[:3]}:{offset[3:]})" in snapshot
+    print("✅ Local time follows the weather payload's UTC offset when the zone disagrees")
+
+
+def test_snapshot_unknown_city(monkeypatch):
+    use_fake_openweather(monkeypatch)
+    assert asyncio.run(weather.get_city_snapshot("Atlantis")).startswith("City 'Atlantis' not found")
+    print("✅ Unknown cities reported")
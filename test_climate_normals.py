@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the bundled climate-normals dataset and the best-time-to-visit tool.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import orchestrator_agent.sub_agents.weather_agent.agent as weather
+from orchestrator_agent.sub_agents.weather_agent.climate_normals import (
+    ARRAY_FILE,
+    DAYLIGHT,
+    FIELDS,
+    MONTHS,
+    SOURCE_CSV,
+    ClimateNormals,
+    build_climate_normals,
+    daylight_hours,
+    get_climate_normals,
+)
+
+
+def test_bundled_binary_matches_the_csv():
+    # A stale committed binary would be rebuilt at startup; keep them in sync
+    data_dir = tempfile.mkdtemp()
+    build_climate_normals(SOURCE_CSV, data_dir)
+    fresh = ClimateNormals.load(data_dir)
+    bundled = get_climate_normals()
+    assert isinstance(bundled.data, np.memmap)
+    assert bundled.data.shape == (len(bundled.cities), 12, len(FIELDS))
+    assert bundled.cities == fresh.cities
+    np.testing.assert_array_equal(bundled.data, fresh.data)
+    print(f"✅ {len(bundled.cities)} cities memory-mapped, binary in sync with the CSV")
+
+
+def test_rebuilds_when_the_csv_changes():
+    data_dir = tempfile.mkdtemp()
+    csv_path = os.path.join(data_dir, "normals.csv")
+    shutil.copy(SOURCE_CSV, csv_path)
+    first = ClimateNormals.load(data_dir, csv_path)
+    paris = first.find("Paris")
+    assert first.data[paris, 0, 0] == np.float32(7.6)
+
+    with open(csv_path) as f:
+        text = f.read()
+    with open(csv_path, "w") as f:
+        f.write(text.replace("Paris,France,48.857,2.352,high_c,7.6,", "Paris,France,48.857,2.352,high_c,9.9,"))
+    second = ClimateNormals.load(data_dir, csv_path)
+    assert second.data[paris, 0, 0] == np.float32(9.9)
+    assert os.path.exists(os.path.join(data_dir, ARRAY_FILE))
+    print("✅ Editing the CSV triggers a rebuild on next load")
+
+
+def test_lookup_accepts_common_spellings():
+    normals = get_climate_normals()
+    kyoto = normals.find("Kyoto")
+    assert kyoto is not None
+    assert normals.find("kyoto, japan") == normals.find("Kyoto Japan") == kyoto
+    assert normals.cities[normals.find("Bali")]["name"] == "Denpasar"
+    assert normals.cities[normals.find("Firenze")]["name"] == "Florence"
+    assert normals.find("Atlantis") is None
+    print("✅ City, 'City, Country' and local/alias names resolve")
+
+
+def test_daylight_follows_latitude_and_hemisphere():
+    hours = daylight_hours(np.array([0.0, 60.0, -60.0, 80.0]))
+    assert np.allclose(hours[0], 12.0, atol=0.01)
+    assert hours[1, 5] > 18 and hours[1, 11] < 6.5
+    assert np.allclose(hours[1], 24 - hours[2], atol=0.01)
+    assert hours[3, 5] == 24.0 and hours[3, 11] == 0.0
+    print("✅ Daylight is symmetric across hemispheres and handles polar day/night")
+
+
+def test_scores_rank_months_for_every_city_at_once():
+    normals = get_climate_normals()
+    scores = normals.month_scores("mild")
+    assert scores.shape == (len(normals.cities), 12)
+    assert ((scores >= 0) & (scores <= 10)).all()
+
+    best = scores.argmax(axis=1)
+    assert MONTHS[best[normals.find("Mumbai")]] in ("December", "January", "February")
+    assert MONTHS[best[normals.find("Reykjavik")]] in ("June", "July", "August")
+    # Southern hemisphere: a Sydney July is worse than a Sydney October
+    sydney = normals.find("Sydney")
+    assert scores[sydney, 9] > scores[sydney, 6]
+    # A beach traveller rates Bangkok's dry season above a mild-weather traveller
+    bangkok = normals.find("Bangkok")
+    assert normals.month_scores("warm", bangkok)[0] > normals.month_scores("mild", bangkok)[0]
+    print("✅ Month scores follow monsoons, hemispheres and traveller preference")
+
+
+def test_best_time_tool_output():
+    answer = weather.get_best_time_to_visit("Paris, France")
+    lines = answer.split("\n")
+    assert lines[0] == "📆 Best time to visit Paris, France (mild weather)"
+    assert lines[1].startswith("✅ Best months: ")
+    assert "December" in lines[2] and lines[2].startswith("⚠️ Least pleasant:")
+    assert sum(line[:3] in {m[:3] for m in MONTHS} for line in lines) == 12
+    assert "Jan       8°C    3°C   52mm" in answer
+    assert weather.get_best_time_to_visit("Paris", preference="tropical").endswith(answer.split("\n", 1)[1])
+    assert weather.get_best_time_to_visit("Atlantis").startswith("Sorry, I don't have climate averages for 'Atlantis'")
+    print("✅ Tool renders best months and a 12-month table; unknown preferences fall back to mild")
+
+
+def test_tool_is_registered_where_best_times_are_discussed():
+    from orchestrator_agent.agent import build_orchestrator_tools
+    from orchestrator_agent.sub_agents.tourist_spots_agent.agent import tourist_spots_agent
+
+    assert weather.best_time_tool in weather.weather_agent.tools
+    assert weather.best_time_tool in tourist_spots_agent.tools
+    assert weather.best_time_tool in build_orchestrator_tools("direct")
+    assert weather.best_time_tool not in build_orchestrator_tools("agent")
+    assert DAYLIGHT == FIELDS.index("daylight_h")
+    print("✅ Tool available to the weather and tourist agents and in direct mode")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the combined service's in-process Runner path in
+adk_server_with_api.py. The orchestrator is swapped for a no-LLM echo agent.
+"""
+
+import asyncio
+import base64
+import os
+import tempfile
+
+from fastapi.testclient import TestClient
+from google.adk.agents import BaseAgent
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.genai import types
+
+import adk_server_with_api as server
+from session_store import SessionRecord
+from sqlite_session_service import SqliteSessionService
+
+
+class EchoAgent(BaseAgent):
+    """Replies with the text and number of parts it received."""
+
+    async def _run_async_impl(self, ctx):
+        parts = ctx.user_content.parts
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            content=types.Content(role="model", parts=[
+                types.Part.from_text(text=f"echo: {parts[0].text} ({len(parts)} parts)")
+            ]),
+        )
+
+
+def use_echo_runner():
+    server.INTENT_FAST_PATH = False
+    server.runner = Runner(
+        agent=EchoAgent(name="echo_agent"),
+        app_name=server.APP_NAME,
+        session_service=server.session_service,
+    )
+
+
+def test_send_message_runs_in_process():
+    use_echo_runner()
+    client = TestClient(server.app)
+    session_id = client.post("/start_session", json={"user_id": "traveler"}).json()["session_id"]
+
+    first = client.post("/send_message", json={
+        "message": "Weather in Tokyo?", "session_id": session_id, "user_id": "traveler"
+    }).json()
+    assert first["response"] == "echo: Weather in Tokyo? (1 parts)"
+
+    photo = base64.b64encode(b"\xff\xd8fake-jpeg").decode()
+    second = client.post("/send_message", json={
+        "message": "What is this?", "session_id": session_id, "user_id": "traveler", "photo_data": photo
+    }).json()
+    assert second["response"] == "echo: What is this? (2 parts)"
+
+    assert len(server.sessions.get(session_id).messages) == 4
+    print("✅ Messages run through the shared Runner, photos sent as a separate part")
+
+
+def test_unknown_session_is_rejected():
+    use_echo_runner()
+    client = TestClient(server.app)
+    response = client.post("/send_message", json={
+        "message": "hello", "session_id": "does-not-exist", "user_id": "traveler"
+    })
+    assert response.status_code == 404
+    assert "Session not found" in response.json()["detail"]
+    print("✅ Unknown sessions rejected")
+
+
+def test_eviction_keeps_persisted_sessions(monkeypatch):
+    service = SqliteSessionService(os.path.join(tempfile.mkdtemp(), "sessions.db"))
+    monkeypatch.setattr(server, "session_service", service)
+
+    async def run():
+        await service.create_session(app_name=server.APP_NAME, user_id="traveler", session_id="shared")
+        server.drop_adk_session(SessionRecord("shared", "traveler", max_messages=10, now=0.0), "idle")
+        await asyncio.sleep(0.1)
+        return await service.get_session(app_name=server.APP_NAME, user_id="traveler", session_id="shared")
+
+    assert asyncio.run(run()) is not None
+    service.close()
+    print("✅ Local eviction leaves the persisted session for other workers")
+
+
+if __name__ == "__main__":
+    test_send_message_runs_in_process()
+    test_unknown_session_is_rejected()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for corridor search along walking routes and the restaurant tool
+built on it.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.restaurant_recommendation_agent.agent import find_restaurants_along_route
+from orchestrator_agent.sub_agents.restaurant_recommendation_agent.restaurant_index import get_restaurant_table
+from orchestrator_agent.sub_agents.walking_routes_agent import street_graph as sg
+from orchestrator_agent.sub_agents.walking_routes_agent.corridor import corridor_search, route_polyline
+from orchestrator_agent.sub_agents.walking_routes_agent.grid_index import METERS_PER_DEG, GridIndex
+from orchestrator_agent.sub_agents.walking_routes_agent.poi_index import get_poi_index
+from test_street_graph import write_osm
+
+
+def brute_force(lat, lon, path_lat, path_lon, buffer_m):
+    """Distance from every point to the polyline, one segment at a time."""
+    scale = np.cos(np.radians(path_lat.mean())) * METERS_PER_DEG
+    px, py = lon * scale, lat * METERS_PER_DEG
+    d = np.full(len(lat), np.inf)
+    for k in range(len(path_lat) - 1):
+        ax, ay = path_lon[k] * scale, path_lat[k] * METERS_PER_DEG
+        bx, by = path_lon[k + 1] * scale, path_lat[k + 1] * METERS_PER_DEG
+        t = np.clip(((px - ax) * (bx - ax) + (py - ay) * (by - ay)) / ((bx - ax) ** 2 + (by - ay) ** 2), 0, 1)
+        d = np.minimum(d, np.hypot(px - ax - t * (bx - ax), py - ay - t * (by - ay)))
+    return np.flatnonzero(d <= buffer_m), d
+
+
+def test_corridor_matches_brute_force():
+    rng = np.random.default_rng(11)
+    lat = rng.uniform(48.83, 48.89, 20_000)
+    lon = rng.uniform(2.28, 2.38, 20_000)
+    grid = GridIndex(lat, lon, cell_m=200)
+    for buffer_m in (50, 200, 600):
+        path_lat = rng.uniform(48.84, 48.88, 5)
+        path_lon = rng.uniform(2.29, 2.37, 5)
+        idx, dist, segments = corridor_search(grid, path_lat, path_lon, buffer_m)
+        expected, d = brute_force(lat, lon, path_lat, path_lon, buffer_m)
+        # The index projects around the route centre, not the origin; allow
+        # points right on the boundary to differ
+        on_edge = np.abs(d - buffer_m) < 0.5
+        assert set(expected[~on_edge[expected]]) <= set(idx.tolist())
+        assert not (set(idx.tolist()) - set(expected.tolist())) - set(np.flatnonzero(on_edge).tolist())
+        assert np.all(np.diff(dist) >= 0) and np.all(dist <= buffer_m)
+        assert np.allclose(dist, d[idx], atol=0.5)
+        assert segments.min() >= 0 and segments.max() <= 3
+    print("✅ Corridor search finds the same points as a full scan")
+
+
+def test_batched_candidates_match_single_queries():
+    rng = np.random.default_rng(3)
+    lat = rng.uniform(59.8, 60.0, 5_000)
+    lon = rng.uniform(10.6, 10.9, 5_000)
+    grid = GridIndex(lat, lon, cell_m=150)
+    q_lat, q_lon = rng.uniform(59.85, 59.95, 40), rng.uniform(10.65, 10.85, 40)
+    batched = grid.candidates_union(q_lat, q_lon, 300)
+    single = np.unique(np.concatenate([grid.candidates(a, b, 300) for a, b in zip(q_lat, q_lon)]))
+    assert len(batched) == len(set(batched.tolist()))
+    assert np.array_equal(np.sort(batched), single)
+    assert len(grid.candidates_union([], [], 300)) == 0
+    print("✅ Batched cell lookups return each candidate once")
+
+
+def test_single_stop_is_a_circle():
+    grid = GridIndex([41.89, 41.8905, 41.9], [12.49, 12.49, 12.49])
+    idx, dist, segments = corridor_search(grid, [41.89], [12.49], 100)
+    assert idx.tolist() == [0, 1] and dist[0] == 0 and not segments.any()
+    print("✅ A single stop searches a radius around it")
+
+
+def test_polyline_follows_streets_when_a_graph_is_built(monkeypatch):
+    rows = get_poi_index().resolve(["Colosseum", "Trevi Fountain", "Pantheon"])
+    lat, lon, legs = route_polyline(rows)
+    assert len(lat) == 3 and legs.tolist() == [0, 1]
+
+    tmp = tempfile.mkdtemp()
+    write_osm(os.path.join(tmp, "rome.osm"))
+    sg.build_street_graph(os.path.join(tmp, "rome.osm"), os.path.join(tmp, "graph"))
+    monkeypatch.setenv("STREET_GRAPH_DIR", os.path.join(tmp, "graph"))
+    sg.get_street_graph.cache_clear()
+    try:
+        lat, lon, legs = route_polyline(rows)
+    finally:
+        sg.get_street_graph.cache_clear()
+    assert len(lat) > 10 and len(legs) == len(lat) - 1
+    assert legs[0] == 0 and legs[-1] == 1 and np.all(np.diff(legs) >= 0)
+    print(f"✅ With a street graph the route polyline has {len(lat)} vertices")
+
+
+def test_restaurant_tool_searches_along_the_route():
+    result = find_restaurants_along_route("Colosseum, Trevi Fountain, Pantheon", 400)
+    assert result.startswith("🍽️ **Restaurants within 400 m of your route (Colosseum → Trevi Fountain → Pantheon):**")
+    lines = [line for line in result.split("\n") if line[:1].isdigit()]
+    assert lines[0].startswith("1. Armando al Pantheon (italian, $$$, ★4.6)")
+    assert "between Trevi Fountain and Pantheon" in lines[0]
+    assert all("Paris" not in line for line in lines)
+
+    gelato = find_restaurants_along_route("Colosseum, Trevi Fountain, Pantheon", 400, cuisine="gelato")
+    assert "1. Giolitti" in gelato and "Armando" not in gelato
+
+    near = find_restaurants_along_route("Louvre")
+    assert "within 250 m of Louvre Museum" in near and "Café Marly" in near
+
+    partial = find_restaurants_along_route("Big Ben, My Hotel", 100)
+    assert "No restaurants" in partial and "No location for My Hotel" in partial
+    assert "don't have locations" in find_restaurants_along_route("My Hotel")
+    assert len(get_restaurant_table()) > 50
+    print("✅ Restaurant tool lists places along the route, nearest first")
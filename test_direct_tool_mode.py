@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for the orchestrator's direct tool exposure mode
+(ORCHESTRATOR_TOOL_MODE=direct).
+"""
+
+from google.adk.tools import FunctionTool
+from google.adk.tools.agent_tool import AgentTool
+
+from orchestrator_agent.agent import build_orchestrator_instruction, build_orchestrator_tools
+
+
+def tool_names(tools):
+    return [tool.name for tool in tools]
+
+
+def test_agent_mode_keeps_agent_tools():
+    tools = build_orchestrator_tools("agent")
+    names = tool_names(tools)
+    assert {"weather_agent", "walking_routes_agent", "image_search_agent"} <= set(names)
+    assert "get_city_weather" not in names
+    assert "get_weather_for_cities" not in names
+    assert "`image_search_agent_tool`" in build_orchestrator_instruction("agent")
+    print("✅ Default mode wraps the sub-agents in AgentTools")
+
+
+def test_direct_mode_registers_function_tools():
+    tools = build_orchestrator_tools("direct")
+    names = tool_names(tools)
+    for name in ["get_city_weather", "get_weather_for_cities", "create_walking_plan_with_map", "get_google_image_search_link"]:
+        assert name in names
+        assert isinstance(tools[names.index(name)], FunctionTool)
+    for name in ["weather_agent", "walking_routes_agent", "image_search_agent"]:
+        assert name not in names
+    # Multi-step sub-agents are still delegated
+    assert isinstance(tools[names.index("tourist_spots_agent")], AgentTool)
+    assert len(names) == len(set(names))
+
+    instruction = build_orchestrator_instruction("direct")
+    assert "`image_search_agent_tool`" not in instruction
+    assert "`get_city_weather`" in instruction
+    print("✅ Direct mode exposes the single-tool sub-agents' FunctionTools on the orchestrator")
+
+
+if __name__ == "__main__":
+    test_agent_mode_keeps_agent_tools()
+    test_direct_mode_registers_function_tools()
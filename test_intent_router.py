@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the local intent-classifier fast path in front of the orchestrator.
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import adk_server_with_api as server
+from orchestrator_agent.intent_router import classify, extract_image_query, extract_location, route_fast_path
+
+
+def test_trivial_queries_take_the_fast_path():
+    cases = {
+        "What time is it in Sydney?": ("get_current_time", {"location": "Sydney"}),
+        "time in Reykjavik right now": ("get_current_time", {"location": "Reykjavik"}),
+        "weather in Tokyo": ("get_city_weather", {"city": "Tokyo"}),
+        "What's the weather like in Buenos Aires today?": ("get_city_weather", {"city": "Buenos Aires"}),
+        "Show me pictures of the Colosseum": ("get_google_image_search_link", {"query": "the Colosseum"}),
+    }
+    for message, (tool, args) in cases.items():
+        route = classify(message)
+        assert route is not None, message
+        assert (route["tool"], route["args"]) == (tool, args), message
+    print("✅ Time, weather and image queries classified with their arguments")
+
+
+def test_everything_else_goes_to_the_llm():
+    for message in [
+        "Best restaurants in Rome?",
+        "Top tourist spots in New York?",
+        "Write a blog about my trip to Italy",
+        "what about in Paris?",
+        "What is this landmark?",
+        "what's the weather?",
+        "now find restaurants near the end of that route",
+    ]:
+        assert classify(message) is None, message
+    print("✅ Context-dependent and open-ended queries fall through to the orchestrator")
+
+
+def test_other_times_go_to_the_llm():
+    for message in [
+        "weather in Paris in April",
+        "What's the weather in Rome next week?",
+        "how hot is it in Dubai in summer",
+        "Weather in Berlin tomorrow",
+        "weather forecast for Tokyo",
+        "will it rain in London this weekend?",
+        "what time is it in Sydney on Monday",
+    ]:
+        assert classify(message) is None, message
+    print("✅ Forecast and seasonal questions fall through to the orchestrator")
+
+
+def test_follow_ups_and_extra_slot_words_go_to_the_llm():
+    for message in [
+        "show me pictures of it",
+        "show me photos of there",
+        "Show me pictures of the first one",
+        "photos of those places",
+        "can you show me images of them?",
+        "weather in Tokyo in fahrenheit",
+        "what time is it in London for a call at 3pm",
+    ]:
+        assert classify(message) is None, message
+    assert extract_image_query("show me pictures of that place") is None
+    assert extract_image_query("show me pictures of the first cathedral") == "the first cathedral"
+    assert extract_location("weather in Tokyo in fahrenheit") is None
+    print("✅ Pointer subjects and over-long slots fall through to the orchestrator")
+
+
+def test_slot_extraction():
+    assert extract_location("is it raining in New York right now?") == "New York"
+    assert extract_location("Kyoto weather") == "Kyoto"
+    assert extract_location("weather in the summer") is None
+    assert extract_location("weather in Paris in April") == "Paris"
+    assert extract_location("how hot is it in Dubai in summer?") == "Dubai"
+    assert extract_location("weather in Rome next week") == "Rome"
+    assert extract_image_query("can you show me photos of Mount Fuji?") == "Mount Fuji"
+    assert extract_image_query("Mount Fuji") is None
+    print("✅ Locations and image subjects extracted")
+
+
+def test_route_runs_the_tool():
+    route = asyncio.run(route_fast_path("What time is it in Tokyo?"))
+    assert route["response"].startswith("Current time in Tokyo:")
+    assert "Asia/Tokyo" in route["response"]
+    print("✅ Fast path runs get_current_time directly")
+
+
+def test_combined_service_answers_without_the_llm():
+    server.INTENT_FAST_PATH = True
+
+    class NoLLMRunner:
+        def run_async(self, **kwargs):
+            raise AssertionError("orchestrator should not run for a fast-path query")
+
+    server.runner = NoLLMRunner()
+    client = TestClient(server.app)
+    session_id = client.post("/start_session", json={"user_id": "traveler"}).json()["session_id"]
+    reply = client.post("/send_message", json={
+        "message": "What time is it in Sydney?", "session_id": session_id, "user_id": "traveler"
+    }).json()
+    assert reply["response"].startswith("Current time in Sydney:")
+
+    adk_session = asyncio.run(server.session_service.get_session(
+        app_name=server.APP_NAME, user_id="traveler", session_id=session_id
+    ))
+    assert [e.author for e in adk_session.events] == ["user", "orchestrator_agent"]
+    print("✅ Combined service answered locally and kept the turn in session history")
+
+
+if __name__ == "__main__":
+    test_trivial_queries_take_the_fast_path()
+    test_everything_else_goes_to_the_llm()
+    test_other_times_go_to_the_llm()
+    test_follow_ups_and_extra_slot_words_go_to_the_llm()
+    test_slot_extraction()
+    test_route_runs_the_tool()
+    test_combined_service_answers_without_the_llm()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for walking isochrones: bounded Dijkstra on the street graph, the
+per-origin cache and the straight-line fallback.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pytest
+
+from orchestrator_agent.sub_agents.walking_routes_agent import isochrone
+from orchestrator_agent.sub_agents.walking_routes_agent import street_graph as sg
+from orchestrator_agent.sub_agents.walking_routes_agent.agent import find_places_within_walk
+from orchestrator_agent.sub_agents.walking_routes_agent.poi_index import POIIndex, get_poi_index
+from test_street_graph import LAT0, LON0, STEP, dijkstra, write_osm
+
+
+@pytest.fixture(scope="module")
+def graph():
+    tmp = tempfile.mkdtemp()
+    osm_path = os.path.join(tmp, "rome.osm")
+    write_osm(osm_path)
+    out_dir = os.path.join(tmp, "graph")
+    sg.build_street_graph(osm_path, out_dir)
+    return sg.StreetGraph.load(out_dir)
+
+
+def test_bounded_dijkstra_matches_full_search(graph):
+    source = graph.node_count // 2
+    nodes, dist = graph.bounded_dijkstra(source, 600)
+    assert np.all(np.diff(nodes) > 0) and np.all(dist <= 600)
+    assert dist[np.searchsorted(nodes, source)] == 0
+    for node, d in zip(nodes[::7].tolist(), dist[::7].tolist()):
+        assert abs(d - dijkstra(graph, source, node)) < 1e-3
+    # Nodes left out really are further away
+    outside = np.setdiff1d(np.arange(graph.node_count), nodes)[:20]
+    assert all(dijkstra(graph, source, int(node)) > 600 for node in outside)
+    print(f"✅ {len(nodes)} nodes within 600 m, distances match Dijkstra")
+
+
+def test_reachable_pois_use_street_distance_and_cache(graph):
+    pois = POIIndex(
+        cities=["Rome"] * 4,
+        names=["Start", "Block away", "Far corner", "Paris"],
+        lat=[LAT0 + 5 * STEP, LAT0 + 6 * STEP, LAT0 + 23 * STEP, 48.8584],
+        lon=[LON0 + 5 * STEP, LON0 + 5 * STEP, LON0 + 27 * STEP, 2.2945],
+    )
+    index = isochrone.IsochroneIndex(graph, pois)
+    found, on_streets = index.reachable_pois(LAT0 + 5 * STEP, LON0 + 5 * STEP, 1200)
+    assert on_streets
+    assert [pois.names[row] for row, _ in found] == ["Start", "Block away"]
+    assert found[0][1] == pytest.approx(0, abs=1) and 100 < found[1][1] < 125
+
+    # Same origin, smaller budget: answered from the cache
+    found, _ = index.reachable_pois(LAT0 + 5 * STEP, LON0 + 5 * STEP, 50)
+    assert [pois.names[row] for row, _ in found] == ["Start"]
+    assert index.stats() == {"origins_cached": 1, "hits": 1, "misses": 1}
+
+    # The far corner is ~3.4 km straight line but ~4.8 km along the grid
+    found, _ = index.reachable_pois(LAT0, LON0, 4500)
+    assert "Far corner" not in [pois.names[row] for row, _ in found]
+    found, _ = index.reachable_pois(LAT0, LON0, 5000)
+    assert "Far corner" in [pois.names[row] for row, _ in found]
+    assert index.stats()["misses"] == 3
+    print("✅ Landmarks found by street distance; smaller budgets reuse cached searches")
+
+
+def test_city_centre_isochrone_is_fast(graph):
+    index = isochrone.IsochroneIndex(graph, get_poi_index())
+    start = time.perf_counter()
+    index.reachable_pois(LAT0 + 12 * STEP, LON0 + 14 * STEP, 1200)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    index.reachable_pois(LAT0 + 12 * STEP, LON0 + 14 * STEP, 1200)
+    warm = time.perf_counter() - start
+    assert cold < 0.1 and warm < cold
+    print(f"✅ 15-minute isochrone: {cold * 1000:.1f} ms cold, {warm * 1000:.2f} ms cached")
+
+
+def test_tool_falls_back_to_estimates_without_a_graph(monkeypatch):
+    monkeypatch.setenv("STREET_GRAPH_DIR", tempfile.mkdtemp())
+    sg.get_street_graph.cache_clear()
+    isochrone.get_isochrone_index.cache_clear()
+    try:
+        result = find_places_within_walk("Colosseum", 15)
+        by_coordinates = find_places_within_walk("41.8902, 12.4922", 15)
+        clamped = find_places_within_walk("Colosseum", 500)
+    finally:
+        sg.get_street_graph.cache_clear()
+        isochrone.get_isochrone_index.cache_clear()
+
+    assert result.startswith("🧭 **Within a 15-minute walk of Colosseum** (estimated")
+    assert "1. Palatine Hill" in result and "Roman Forum" in result
+    assert "Colosseum:" not in result and "Trevi" not in result
+    # A coordinate start at a landmark names it instead of listing it at 0 m
+    assert by_coordinates.startswith("🧭 **Within a 15-minute walk of Colosseum (41.89020, 12.49220)**")
+    assert "Colosseum:" not in by_coordinates and "1. Palatine Hill" in by_coordinates
+    assert " 0 m)" not in by_coordinates
+    assert "60-minute walk" in clamped
+    assert "couldn't locate" in find_places_within_walk("My Hotel")
+    print("✅ Without a street graph the tool uses straight-line estimates")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-day itinerary planning: k-means day clustering, visit-time
+balancing and the itinerary tool.
+"""
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.walking_routes_agent.agent import create_multi_day_itinerary
+from orchestrator_agent.sub_agents.walking_routes_agent.itinerary import (
+    balance_loads,
+    cluster_days,
+    kmeans,
+    plan_itinerary,
+    project,
+)
+
+
+def blobs(rng, centres, per_blob, spread=0.004):
+    lat = np.concatenate([rng.normal(c[0], spread, per_blob) for c in centres])
+    lon = np.concatenate([rng.normal(c[1], spread, per_blob) for c in centres])
+    return lat, lon
+
+
+def test_kmeans_recovers_separated_neighbourhoods():
+    rng = np.random.default_rng(1)
+    centres = [(48.86, 2.29), (48.86, 2.36), (48.89, 2.34)]
+    lat, lon = blobs(rng, centres, 40)
+    labels, _, _ = kmeans(project(lat, lon), 3, rng)
+    for blob in range(3):
+        assert len(set(labels[blob * 40:(blob + 1) * 40].tolist())) == 1
+    assert len(set(labels.tolist())) == 3
+    print("✅ k-means separates three neighbourhoods")
+
+
+def test_days_are_balanced_by_visit_time():
+    rng = np.random.default_rng(2)
+    # One dense neighbourhood with most of the sights and two sparse ones
+    lat, lon = blobs(rng, [(41.89, 12.48)], 60)
+    lat2, lon2 = blobs(rng, [(41.90, 12.45), (41.91, 12.50)], 10)
+    lat, lon = np.r_[lat, lat2], np.r_[lon, lon2]
+    durations = rng.integers(20, 120, len(lat)).astype(float)
+    labels = cluster_days(lat, lon, durations, 4)
+    loads = np.bincount(labels, weights=durations, minlength=4)
+    assert loads.max() <= durations.sum() / 4 * 1.15 + durations.max()
+    assert loads.max() / loads.mean() < 1.2
+    print(f"✅ Day loads {np.round(loads / 60, 1).tolist()} h are within tolerance")
+
+
+def test_balancing_moves_reduce_imbalance_and_stop():
+    points = np.array([[0.0, 0], [10, 0], [20, 0], [30, 0], [1000, 0]])
+    labels = np.array([0, 0, 0, 0, 1])
+    centres = np.array([[15.0, 0], [1000, 0]])
+    balanced = balance_loads(points, labels, centres, np.ones(5), tolerance=0.0)
+    assert np.bincount(balanced).tolist() == [3, 2]
+    # The stop nearest the other day moves
+    assert balanced[3] == 1
+    # An impossible balance (one huge stop) terminates without moving it back and forth
+    heavy = balance_loads(points, labels, centres, np.array([1, 1, 1, 1, 100.0]), tolerance=0.0)
+    assert heavy.tolist() == [0, 0, 0, 0, 1]
+    print("✅ Rebalancing moves boundary stops and terminates")
+
+
+def test_plan_is_deterministic_and_ordered():
+    rng = np.random.default_rng(3)
+    lat, lon = rng.uniform(41.88, 41.91, 200), rng.uniform(12.45, 12.51, 200)
+    durations = np.full(200, 45.0)
+    plan = plan_itinerary(lat, lon, durations, 7)
+    assert plan == plan_itinerary(lat, lon, durations, 7)
+    assert sorted(sum(plan, [])) == list(range(200)) and len(plan) == 7
+    assert 0 in plan[0]
+    # Per-day walking orders are much shorter than the input order
+    for stops in plan:
+        seq = np.array(stops)
+        planned = np.hypot(np.diff(lat[seq]), np.diff(lon[seq])).sum()
+        given = np.hypot(np.diff(lat[np.sort(seq)]), np.diff(lon[np.sort(seq)])).sum()
+        assert planned < given
+    assert len(plan_itinerary(lat[:3], lon[:3], durations[:3], 5)) == 3
+    print("✅ Plans are reproducible and each day is walked in a short order")
+
+
+def test_itinerary_tool():
+    result = create_multi_day_itinerary("Rome", 3)
+    assert result.startswith("🗓️ **3-day itinerary for Rome**")
+    days = [line for line in result.split("\n") if line.startswith("**Day ")]
+    assert len(days) == 3
+    assert result.count("Walking Route Map: https://www.google.com/maps/dir/") == 3
+    # The Vatican sights end up on the same day
+    assert any("Vatican Museums" in day and "St. Peter's Basilica" in day for day in days)
+
+    custom = create_multi_day_itinerary("Vatican Museums: 180, Pantheon: 30 min, Colosseum, Trevi Fountain, My Hotel", 2)
+    assert "(4 stops)" in custom and "No coordinates for My Hotel" in custom
+    # Per-stop times count: the 3-hour museum visit gets a day of its own
+    assert "**Day 1:** Vatican Museums\nAbout 3 h 00 min at the stops\n" in custom
+    assert "About 2 h 30 min at the stops" in custom
+    assert "at least 2 locations" in create_multi_day_itinerary("Colosseum", 2)
+    assert "don't have locations" in create_multi_day_itinerary("My Hotel, Grandma's House", 2)
+    print("✅ Itinerary tool splits a city's landmarks into days")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the host-wide OpenWeather token bucket and quota fallbacks.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+
+import httpx
+
+from orchestrator_agent.sub_agents.weather_agent.rate_limiter import SharedTokenBucket
+from orchestrator_agent.sub_agents.weather_agent.weather_cache import WeatherCache
+from orchestrator_agent.sub_agents.weather_agent.weather_client import OpenWeatherClient, QuotaExceededError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def quota_path():
+    fd, path = tempfile.mkstemp(suffix=".quota")
+    os.close(fd)
+    os.unlink(path)
+    return path
+
+
+def test_bucket_refills_at_the_configured_rate():
+    clock = FakeClock()
+    bucket = SharedTokenBucket(quota_path(), rate_per_minute=60, burst=3, clock=clock)
+    assert [bucket.try_acquire()[0] for _ in range(3)] == [True, True, True]
+    ok, wait = bucket.try_acquire()
+    assert not ok and abs(wait - 1.0) < 1e-6
+    clock.now += 1.0
+    assert bucket.try_acquire()[0]
+    stats = bucket.stats()
+    assert stats["granted"] == 4 and stats["calls_this_window"] == 4
+    assert abs(stats["utilization"] - 4 / 60) < 1e-9
+    print("✅ Burst then one token per second")
+
+
+def test_state_is_shared_through_the_file():
+    path = quota_path()
+    clock = FakeClock()
+    first = SharedTokenBucket(path, rate_per_minute=60, burst=2, clock=clock)
+    second = SharedTokenBucket(path, rate_per_minute=60, burst=2, clock=clock)
+    assert first.try_acquire()[0]
+    assert second.try_acquire()[0]
+    assert not first.try_acquire()[0]
+    assert second.stats()["granted"] == 2
+    print("✅ Two buckets on one file share a single budget")
+
+
+def _grab_tokens(path, attempts, results):
+    bucket = SharedTokenBucket(path, rate_per_minute=0.001, burst=10)
+    results.put(sum(bucket.try_acquire()[0] for _ in range(attempts)))
+
+
+def test_budget_holds_across_processes():
+    path = quota_path()
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_grab_tokens, args=(path, 10, results)) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(10)
+    granted = sum(results.get(timeout=5) for _ in workers)
+    assert granted == 10, granted
+    print("✅ Four processes racing for tokens got exactly the burst of 10")
+
+
+def test_bounded_wait():
+    bucket = SharedTokenBucket(quota_path(), rate_per_minute=600, burst=1)
+
+    async def scenario():
+        assert await bucket.acquire_async(max_wait=1.0)
+        assert await bucket.acquire_async(max_wait=1.0)  # waits ~0.1 s for a refill
+        return await bucket.acquire_async(max_wait=0.01)
+
+    assert asyncio.run(scenario()) is False
+    stats = bucket.stats()
+    assert stats["waited"] == 1 and stats["denied"] == 1
+    assert bucket.acquire(max_wait=1.0)
+    print("✅ Callers queue for a bounded time, then give up")
+
+
+def test_client_raises_quota_error_and_cache_falls_back():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"id": 1, "name": "Oslo"}))
+    bucket = SharedTokenBucket(quota_path(), rate_per_minute=0.001, burst=1)
+    client = OpenWeatherClient(api_key="test", rate_limiter=bucket, max_quota_wait=0.01, transport=transport)
+    clock = FakeClock()
+    cache = WeatherCache(ttl=600, stale_ttl=0, fallback_ttl=3600, clock=clock)
+
+    async def scenario():
+        first = await cache.aget_or_fetch("Oslo", client.current_weather)
+        clock.now += 700  # expired, but within the fallback window
+        fallback = await cache.aget_or_fetch("Oslo", client.current_weather)
+        try:
+            await cache.aget_or_fetch("Bergen", client.current_weather)
+        except QuotaExceededError:
+            no_copy = "raised"
+        return first, fallback, no_copy
+
+    first, fallback, no_copy = asyncio.run(scenario())
+    assert first == fallback == {"id": 1, "name": "Oslo"}
+    assert no_copy == "raised"
+    assert cache.stats()["fallbacks"] == 1
+    print("✅ Exhausted quota serves the last known copy, or a clear error without one")
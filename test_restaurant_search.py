@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for faceted restaurant retrieval: bitmap / posting-list indexes,
+opening-hour slots, CSV and Parquet loading, and the search tool.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from orchestrator_agent.sub_agents.restaurant_recommendation_agent import restaurant_index
+from orchestrator_agent.sub_agents.restaurant_recommendation_agent.agent import (
+    minute_of_day,
+    search_restaurants,
+)
+from orchestrator_agent.sub_agents.restaurant_recommendation_agent.facet_index import FacetIndex, open_slots
+from orchestrator_agent.sub_agents.restaurant_recommendation_agent.restaurant_index import RestaurantTable
+
+CUISINES = ["italian", "french", "japanese", "indian", "vegan", "tapas"]
+TAGS = ["vegetarian", "vegan", "gluten_free", "halal"]
+SCHEDULES = ["12:00-15:00;19:00-23:00", "08:00-18:00", "18:00-02:00", "00:00-24:00", "", "11:30-22:45"]
+
+
+def synthetic_table(n, seed=0):
+    rng = np.random.default_rng(seed)
+    cities = [f"City {k}" for k in rng.integers(0, 500, n)]
+    cities[:n // 4] = ["Rome"] * (n // 4)
+    return RestaurantTable(
+        names=[f"Place {k}" for k in range(n)],
+        cities=cities,
+        lat=rng.uniform(41.8, 42.0, n),
+        lon=rng.uniform(12.4, 12.6, n),
+        cuisine=[CUISINES[k] for k in rng.integers(0, len(CUISINES), n)],
+        price=rng.integers(0, 5, n),
+        dietary=[[t for t in TAGS if rng.random() < 0.3] for _ in range(n)],
+        hours=[SCHEDULES[k] for k in rng.integers(0, len(SCHEDULES), n)],
+        rating=np.where(rng.random(n) < 0.1, np.nan, rng.uniform(3, 5, n)),
+    )
+
+
+def brute_force(table, city=None, cuisines=(), max_price=None, dietary=(), open_minute=None):
+    rows = []
+    for r in range(len(table)):
+        if city and table.cities[r].lower() != city.lower():
+            continue
+        if cuisines and table.cuisine[r] not in cuisines:
+            continue
+        if max_price and not 1 <= table.price[r] <= max_price:
+            continue
+        if any(tag not in table.dietary[r] for tag in dietary):
+            continue
+        if open_minute is not None and not open_slots(table.hours[r])[open_minute // 15]:
+            continue
+        rows.append(r)
+    return rows
+
+
+def test_open_slots_handle_split_and_overnight_hours():
+    lunch_dinner = open_slots("12:00-15:00;19:00-23:00")
+    assert lunch_dinner[12 * 4] and lunch_dinner[14 * 4 + 3] and not lunch_dinner[15 * 4]
+    assert not lunch_dinner[17 * 4] and lunch_dinner[22 * 4 + 3] and not lunch_dinner[23 * 4]
+    late = open_slots("18:00-02:00")
+    assert late[23 * 4] and late[1 * 4] and not late[2 * 4] and not late[12 * 4]
+    assert open_slots("00:00-24:00").all()
+    assert not open_slots("").any() and not open_slots("closed").any()
+    print("✅ Opening hours map to 15-minute slots, including past midnight")
+
+
+def test_facet_queries_match_brute_force():
+    table = synthetic_table(20_000)
+    facets = table.facets
+    # Common values are bitmaps, rare cities posting lists
+    assert "rome" in facets._bitmaps["city"] and "city 7" in facets._postings["city"]
+    assert "vegetarian" in facets._bitmaps["dietary"]
+    queries = [
+        dict(city="Rome"),
+        dict(city="City 7", cuisines=["italian", "tapas"]),
+        dict(cuisines=["vegan"], dietary=["gluten_free"], max_price=2),
+        dict(city="Rome", dietary=["vegan", "halal"], open_minute=23 * 60 + 30),
+        dict(city="City 42", max_price=3, open_minute=9 * 60),
+        dict(open_minute=1 * 60 + 10, max_price=1),
+        dict(city="Nowhere"),
+    ]
+    for query in queries:
+        assert facets.match(**query).tolist() == brute_force(table, **query), query
+    assert len(facets.match()) == len(table)
+    print("✅ Bitmap and posting-list filters agree with a full scan")
+
+
+def test_ranking_orders_by_rating_then_price():
+    table = RestaurantTable(
+        names=list("ABCDE"), cities=["Rome"] * 5, lat=[41.9] * 5, lon=[12.5] * 5,
+        cuisine=["italian"] * 5, price=[3, 1, 2, 1, 4], dietary=[[]] * 5, hours=[""] * 5,
+        rating=[4.5, 4.5, np.nan, 4.8, 4.5],
+    )
+    assert [table.names[r] for r in table.rank(np.arange(5), 5)] == ["D", "B", "A", "E", "C"]
+    assert [table.names[r] for r in table.rank(np.arange(5), 2)] == ["D", "B"]
+    print("✅ Ranking: rating first, cheaper wins ties, unrated last")
+
+
+def test_parquet_and_csv_tables_load_the_same():
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    csv_table = RestaurantTable.load(restaurant_index.DATA_PATH)
+    frame = pd.DataFrame({
+        "name": csv_table.names, "city": csv_table.cities, "lat": csv_table.lat, "lon": csv_table.lon,
+        "cuisine": csv_table.cuisine, "price": csv_table.price,
+        "dietary": [list(tags) for tags in csv_table.dietary],
+        "hours": [h.split(";") if h else [] for h in csv_table.hours],
+        "rating": csv_table.rating,
+    })
+    path = os.path.join(tempfile.mkdtemp(), "restaurants.parquet")
+    frame.to_parquet(path)
+    parquet_table = RestaurantTable.load(path)
+    assert parquet_table.names == csv_table.names and parquet_table.hours == csv_table.hours
+    assert parquet_table.dietary == csv_table.dietary
+    query = dict(city="London", dietary=["vegan"], open_minute=20 * 60)
+    assert parquet_table.facets.match(**query).tolist() == csv_table.facets.match(**query).tolist()
+    print("✅ Parquet tables load the same as CSV")
+
+
+def test_minute_of_day_parsing():
+    assert minute_of_day("19:30", "Rome") == 19 * 60 + 30
+    assert minute_of_day("7pm", "Rome") == 19 * 60
+    assert minute_of_day("12 am", "Rome") == 0
+    assert minute_of_day("noon", "Rome") == 12 * 60
+    assert 0 <= minute_of_day("now", "Tokyo") < 1440
+    assert minute_of_day("25:00", "Rome") is None and minute_of_day("13pm", "Rome") is None
+    assert minute_of_day("soon", "Rome") is None
+    # "now" only trusts an exact timezone match, never a lookalike ("Portland" ~ "Poland")
+    assert minute_of_day("now", "Portland") is None and minute_of_day("now", "Tokio") is None
+    print("✅ Opening times parse from clock times and 'now'")
+
+
+def test_search_tool_filters_the_bundled_list():
+    result = search_restaurants("rome", cuisine="Italian", max_price=2, dietary="veggie", open_at="1pm")
+    assert result.startswith("🍴 **Top 2 of 2 matching restaurants in rome** (Italian, up to $$, veggie, open at 13:00):")
+    assert "1. Da Enzo al 29 (italian, $$, ★4.6): vegetarian; open 12:30-15:00, 19:30-23:00" in result
+    assert "Li Rioni" not in result
+
+    assert "Top 3 of" in search_restaurants("London", dietary="gluten-free", limit=3)
+    none = search_restaurants("Paris", cuisine="sushi")
+    assert none.startswith("No restaurants in my Paris list match (sushi)") and "french" in none
+    assert "don't have local restaurant data for Oslo" in search_restaurants("Oslo")
+    assert "couldn't understand the time" in search_restaurants("Rome", open_at="later")
+    print("✅ Search tool returns a short ranked list for the agent to narrate")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for the precomputed, memory-mapped walking route library and its use
+for city-name walking plans.
+"""
+
+import csv
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from orchestrator_agent.sub_agents.walking_routes_agent import route_library as rl
+from orchestrator_agent.sub_agents.walking_routes_agent.agent import create_walking_plan_with_map
+from orchestrator_agent.sub_agents.walking_routes_agent.poi_index import get_poi_index
+
+
+def synthetic_poi_csv(path, cities, per_city=8, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["city", "name", "lat", "lon", "aliases"])
+        for c in range(cities):
+            lat0, lon0 = rng.uniform(-50, 60), rng.uniform(-170, 170)
+            for k in range(per_city):
+                writer.writerow([f"Town {c}", f"Sight {c}-{k}", lat0 + rng.normal(0, 0.01), lon0 + rng.normal(0, 0.01), ""])
+
+
+def test_bundled_library_is_current_and_covers_every_city():
+    library = rl.RouteLibrary.open(rl.LIBRARY_PATH)
+    assert library.source_sha256 == rl._file_sha256(rl.POI_DATA_PATH), (
+        "poi_coordinates.csv changed: rebuild with "
+        "python -m orchestrator_agent.sub_agents.walking_routes_agent.route_library"
+    )
+    assert sorted(library.cities()) == sorted(set(get_poi_index().cities))
+    paris = library.find("Paris")
+    assert paris["stops"][0] == "Eiffel Tower" and len(paris["stops"]) == rl.ROUTE_STOPS
+    assert len(paris["legs_m"]) == len(paris["stops"]) - 1 and all(m > 0 for m in paris["legs_m"])
+    for city, headline in rl.HEADLINE_STOPS.items():
+        stops = library.find(city)["stops"]
+        assert stops[0] == headline[0] and set(headline) <= set(stops), city
+    assert library.find("NYC")["city"] == "New York"
+    assert library.find("paris, france")["city"] == "Paris"
+    assert library.find("Praha")["city"] == "Prague"
+    assert library.find("Oslo") is None and library.find("") is None
+    print(f"✅ Bundled library covers {len(library)} cities and matches the POI table")
+
+
+def test_large_library_lookups():
+    tmp = tempfile.mkdtemp()
+    poi_csv, out = os.path.join(tmp, "pois.csv"), os.path.join(tmp, "routes.bin")
+    synthetic_poi_csv(poi_csv, 600)
+    assert rl.build_route_library(poi_csv, out, aliases={"Town 5": ["fifth town"]}) == 600
+    library = rl.RouteLibrary.open(out)
+    assert len(library) == 600
+    for c in (0, 1, 5, 99, 300, 599):
+        route = library.find(f"Town {c}")
+        assert route["city"] == f"Town {c}" and len(route["stops"]) == rl.ROUTE_STOPS
+        assert all(stop.startswith(f"Sight {c}-") for stop in route["stops"])
+        # Tours start at the headline (first-listed) landmark
+        assert route["stops"][0] == f"Sight {c}-0"
+    assert library.find("fifth town")["city"] == "Town 5"
+    assert library.find("Town 600") is None and library.find("Town") is None
+    print("✅ 600-city library: every lookup decodes a single record")
+
+
+def test_rejects_files_that_are_not_libraries():
+    path = os.path.join(tempfile.mkdtemp(), "bad.bin")
+    with open(path, "wb") as f:
+        f.write(b"\0" * 64)
+    with pytest.raises(ValueError):
+        rl.RouteLibrary.open(path)
+    print("✅ Files without the library header are rejected")
+
+
+def test_city_plans_come_from_the_library(monkeypatch):
+    plan = create_walking_plan_with_map("Paris")
+    assert "Here is a suggested walking tour for the top spots in Paris:" in plan
+    assert "**Step 1: Eiffel Tower → Arc de Triomphe**" in plan
+    legs = rl.get_route_library().find("Paris")["legs_m"]
+    assert f"**Total walking:** about {sum(legs) / 1000:.1f} km" in plan
+    assert "top spots in New York" in create_walking_plan_with_map("nyc")
+    assert "top spots in Prague" in create_walking_plan_with_map("Prague", optimize=True)
+
+    monkeypatch.setenv("WALKING_ROUTE_LIBRARY", os.path.join(tempfile.mkdtemp(), "missing.bin"))
+    rl.get_route_library.cache_clear()
+    try:
+        assert "at least 2 locations" in create_walking_plan_with_map("Paris")
+    finally:
+        rl.get_route_library.cache_clear()
+    print("✅ City-name plans use the stored tour and leg distances")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for walking-route stop ordering (nearest neighbour + 2-opt).
+"""
+
+import itertools
+import time
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.walking_routes_agent.agent import create_walking_plan_with_map
+from orchestrator_agent.sub_agents.walking_routes_agent.poi_index import haversine_matrix
+from orchestrator_agent.sub_agents.walking_routes_agent.route_optimizer import (
+    nearest_neighbour,
+    optimize_order,
+    path_length,
+    two_opt,
+)
+
+
+def random_matrix(rng, n):
+    points = rng.random((n, 2))
+    return np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1))
+
+
+def brute_force(dist, fix_start, fix_end):
+    n = len(dist)
+    return min(
+        path_length(dist, p)
+        for p in itertools.permutations(range(n))
+        if (not fix_start or p[0] == 0) and (not fix_end or p[-1] == n - 1)
+    )
+
+
+def test_close_to_optimal_and_respects_pins():
+    rng = np.random.default_rng(7)
+    ratios = []
+    for _ in range(60):
+        dist = random_matrix(rng, 7)
+        for fix_start, fix_end in [(False, False), (True, False), (False, True), (True, True)]:
+            order, length = optimize_order(dist, fix_start=fix_start, fix_end=fix_end)
+            assert sorted(order) == list(range(7))
+            assert not fix_start or order[0] == 0
+            assert not fix_end or order[-1] == 6
+            assert abs(length - path_length(dist, order)) < 1e-9
+            ratios.append(length / brute_force(dist, fix_start, fix_end))
+    assert np.mean(ratios) < 1.02 and max(ratios) < 1.35
+    print(f"✅ Within {100 * (np.mean(ratios) - 1):.2f}% of optimal on average; pinned stops stay put")
+
+
+def test_two_opt_never_makes_a_path_longer():
+    rng = np.random.default_rng(3)
+    for _ in range(30):
+        dist = random_matrix(rng, 12)
+        seed = nearest_neighbour(dist, 0)
+        assert sorted(seed) == list(range(12))
+        assert path_length(dist, two_opt(dist, seed)) <= path_length(dist, seed) + 1e-9
+    assert nearest_neighbour(random_matrix(rng, 5), 2, end=4)[::4] == [2, 4]
+    print("✅ 2-opt only applies improving moves")
+
+
+def test_thirty_stops_within_tens_of_milliseconds():
+    rng = np.random.default_rng(11)
+    lat = 41.88 + 0.04 * rng.random(30)
+    lon = 12.45 + 0.06 * rng.random(30)
+    dist = haversine_matrix(lat, lon)
+    optimize_order(dist)  # warm up
+    start = time.perf_counter()
+    order, length = optimize_order(dist)
+    elapsed = time.perf_counter() - start
+    assert length < path_length(dist, range(30)) / 2
+    assert elapsed < 0.05, f"{elapsed * 1000:.1f} ms"
+    print(f"✅ 30 stops optimized in {elapsed * 1000:.1f} ms")
+
+
+def test_plan_optimize_mode():
+    zigzag = "Eiffel Tower, Notre Dame, Arc de Triomphe, Sainte-Chapelle, Champs-Élysées, Louvre"
+    plan = create_walking_plan_with_map(zigzag, optimize=True, fix_start=True)
+    assert "🔀 Stops reordered to shorten the walk by about" in plan
+    assert plan.index("**Step 1: Eiffel Tower →") > 0
+    assert create_walking_plan_with_map(zigzag) == create_walking_plan_with_map(zigzag, optimize=False)
+
+    pinned = create_walking_plan_with_map(zigzag, optimize=True, fix_start=True, fix_end=True)
+    assert "→ Louvre**\n" in pinned.split("**Total walking")[0].rsplit("**Step ", 1)[1]
+
+    kept = create_walking_plan_with_map("Eiffel Tower, My Hotel, Louvre", optimize=True)
+    assert "Kept your order: no coordinates for My Hotel" in kept
+    already = create_walking_plan_with_map("Colosseum, Roman Forum, Pantheon", optimize=True, fix_start=True)
+    assert "already the shortest" in already
+    print("✅ optimize reorders stops, honours pins and explains when it can't")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the token-streaming /send_message_stream gateway endpoint.
+ADK's /run_sse endpoint is replaced by an in-process mock.
+"""
+
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+
+def sse(data: dict) -> str:
+    return f"data: {json.dumps(data)}\n\n"
+
+
+def mock_run_sse(request: httpx.Request) -> httpx.Response:
+    """Replay a streamed tourist spots answer the way ADK emits it."""
+    assert request.url.path == "/run_sse"
+    assert json.loads(request.content)["streaming"] is True
+    full = "Visit the Colosseum [IMAGE: Colosseum, Rome] and more."
+    body = "".join([
+        sse({"content": {"role": "model", "parts": [{"functionCall": {"name": "tourist_spots_agent"}}]}}),
+        sse({"content": {"role": "user", "parts": [{"functionResponse": {"name": "tourist_spots_agent"}}]}}),
+        sse({"partial": True, "content": {"role": "model", "parts": [{"text": "Visit the Colosseum "}]}}),
+        sse({"partial": True, "content": {"role": "model", "parts": [{"text": "[IMAGE: Colosseum, Rome] and more."}]}}),
+        sse({"content": {"role": "model", "parts": [{"text": full}]}}),
+    ])
+    return httpx.Response(200, text=body, headers={"content-type": "text/event-stream"})
+
+
+@pytest.fixture
+def use_adk_transport(monkeypatch):
+    """Route the gateway's pooled ADK client through a mock, restored after the test."""
+    def install(handler):
+        monkeypatch.setattr(api.adk_client, "transport", httpx.MockTransport(handler))
+        monkeypatch.setattr(api.adk_client, "_client", None)
+    return install
+
+
+def read_events(response) -> list:
+    return [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_stream_forwards_chunks_then_done(use_adk_transport):
+    use_adk_transport(mock_run_sse)
+    with TestClient(api.app) as client:
+        response = client.post("/send_message_stream", json={
+            "session_id": "session-1",
+            "message": "Top tourist attractions in Rome?",
+        })
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = read_events(response)
+
+    chunks = [e["text"] for e in events if e["type"] == "chunk"]
+    assert chunks == ["Visit the Colosseum ", "[IMAGE: Colosseum, Rome] and more."]
+
+    done = events[-1]
+    assert done["type"] == "done"
+    assert "[IMAGE:" not in done["response"]
+    assert done["image_links"][0]["attraction"] == "Colosseum"
+    print("✅ Partial chunks streamed, final event carries image_links")
+
+
+def test_stream_reports_adk_errors(use_adk_transport):
+    use_adk_transport(lambda request: httpx.Response(404, json={"detail": "Session not found"}))
+    with TestClient(api.app) as client:
+        response = client.post("/send_message_stream", json={
+            "session_id": "missing",
+            "message": "hello",
+        })
+    events = read_events(response)
+    assert len(events) == 1
+    assert events[0]["type"] == "error"
+    assert "404" in events[0]["detail"]
+    print("✅ ADK errors surface as an error event")
+
+
+# A turn with a sub-agent answer followed by the orchestrator's closing line
+TURN_EVENTS = [
+    {"content": {"role": "model", "parts": [{"functionCall": {"name": "restaurant_recommendation_agent"}}]}},
+    {"content": {"role": "user", "parts": [{"functionResponse": {"name": "restaurant_recommendation_agent"}}]}},
+    {"content": {"role": "model", "parts": [{"text": "Try Da Enzo al 29 in Trastevere."}]}},
+    {"content": {"role": "model", "parts": [{"text": "Anything else?"}]}},
+]
+
+
+def mock_adk_turn(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/run":
+        return httpx.Response(200, json=TURN_EVENTS)
+    return httpx.Response(200, text="".join(sse(e) for e in TURN_EVENTS), headers={"content-type": "text/event-stream"})
+
+
+def test_both_endpoints_return_the_same_answer(use_adk_transport):
+    use_adk_transport(mock_adk_turn)
+    message = {"session_id": "session-1", "message": "Where should I eat in Rome?"}
+    with TestClient(api.app) as client:
+        plain = client.post("/send_message", json=message).json()
+        streamed = read_events(client.post("/send_message_stream", json=message))[-1]
+    assert plain["response"] == streamed["response"] == "Try Da Enzo al 29 in Trastevere."
+    print("✅ /send_message and /send_message_stream pick the same answer")
+
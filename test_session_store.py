@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded, TTL-evicting SessionStore used by the combined service.
+"""
+
+from session_store import SessionRecord, SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_idle_sessions_expire():
+    clock = FakeClock()
+    evicted = []
+    store = SessionStore(ttl_seconds=60, clock=clock, on_evict=lambda r, reason: evicted.append((r.session_id, reason)))
+    store.create("a", "u1")
+    store.create("b", "u2")
+
+    clock.now += 30
+    assert store.get("a") is not None  # touching "a" keeps it alive
+
+    clock.now += 45
+    assert "a" in store
+    assert "b" not in store
+    assert evicted == [("b", "ttl")]
+    assert store.stats()["ttl_evictions"] == 1
+    print("✅ Idle sessions evicted after the TTL, active ones kept")
+
+
+def test_capacity_evicts_least_recently_used():
+    store = SessionStore(max_sessions=3, clock=FakeClock())
+    for session_id in ["a", "b", "c"]:
+        store.create(session_id, "u")
+    store.get("a")
+    store.create("d", "u")
+
+    assert len(store) == 3
+    assert "b" not in store
+    assert all(s in store for s in ["a", "c", "d"])
+    assert store.stats()["capacity_evictions"] == 1
+    print("✅ Session cap evicts the least recently used session")
+
+
+def test_history_is_a_ring_buffer():
+    store = SessionStore(max_messages=4, clock=FakeClock())
+    store.create("a", "u")
+    for i in range(10):
+        store.append_message("a", "user", f"message {i}")
+
+    record = store.get("a")
+    assert [content for _, content, _ in record.messages] == [f"message {i}" for i in range(6, 10)]
+    assert store.stats()["messages_dropped"] == 6
+    assert [m["content"] for m in record.to_dict()["messages"]] == [f"message {i}" for i in range(6, 10)]
+    assert store.append_message("missing", "user", "hi") is False
+    print("✅ Per-session history capped with ring-buffer semantics")
+
+
+def test_bytes_estimate_tracks_history():
+    store = SessionStore(max_messages=2, clock=FakeClock())
+    store.create("a", "u")
+    empty = store.stats()["bytes_estimate"]
+
+    store.append_message("a", "user", "x" * 10_000)
+    grown = store.stats()["bytes_estimate"]
+    assert grown - empty >= 10_000
+
+    store.append_message("a", "user", "y")
+    store.append_message("a", "user", "z")  # overwrites the 10 KB message
+    assert store.stats()["bytes_estimate"] < empty + 1_000
+
+    store.delete("a")
+    assert store.stats()["bytes_estimate"] == 0
+    print("✅ Bytes estimate follows appends, overwrites and deletes")
+
+
+def test_records_use_slots():
+    assert not hasattr(SessionRecord("a", "u", 1, 0.0), "__dict__")
+    print("✅ SessionRecord is slotted")
+
+
+if __name__ == "__main__":
+    test_idle_sessions_expire()
+    test_capacity_evicts_least_recently_used()
+    test_history_is_a_ring_buffer()
+    test_bytes_estimate_tracks_history()
+    test_records_use_slots()
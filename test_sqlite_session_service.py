@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite-backed ADK session service.
+Uses temporary database files; no ADK server or model calls needed.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai import types
+
+import pytest
+
+from sqlite_session_service import SessionWriteError, SqliteSessionService
+
+
+def make_event(text: str, state_delta: dict = None) -> Event:
+    return Event(
+        author="orchestrator_agent",
+        invocation_id="inv",
+        content=types.Content(role="model", parts=[types.Part.from_text(text=text)]),
+        actions=EventActions(state_delta=state_delta or {}),
+    )
+
+
+def temp_db() -> str:
+    return os.path.join(tempfile.mkdtemp(prefix="sessions_"), "sessions.db")
+
+
+def test_session_survives_restart():
+    db_path = temp_db()
+
+    async def write():
+        service = SqliteSessionService(db_path)
+        session = await service.create_session(
+            app_name="travel", user_id="u1", session_id="s1", state={"city": "Rome", "user:lang": "en"}
+        )
+        for i in range(20):
+            await service.append_event(session, make_event(f"turn {i}", {"turn": i, "temp:scratch": 1}))
+        await service.append_event(session, make_event("final", {"app:version": 2}))
+        assert session.state["turn"] == 19
+        service.close()
+        return service.events_written, service.batches_written
+
+    events_written, batches_written = asyncio.run(write())
+    assert events_written == 21
+    assert 1 <= batches_written <= 21
+
+    async def read():
+        service = SqliteSessionService(db_path)
+        session = await service.get_session(app_name="travel", user_id="u1", session_id="s1")
+        recent = await service.get_session(
+            app_name="travel", user_id="u1", session_id="s1", config=GetSessionConfig(num_recent_events=3)
+        )
+        listed = await service.list_sessions(app_name="travel", user_id="u1")
+        service.close()
+        return session, recent, listed
+
+    session, recent, listed = asyncio.run(read())
+    assert [e.content.parts[0].text for e in session.events][:2] == ["turn 0", "turn 1"]
+    assert len(session.events) == 21
+    assert session.state == {"city": "Rome", "turn": 19, "user:lang": "en", "app:version": 2}
+    assert [e.content.parts[0].text for e in recent.events] == ["turn 18", "turn 19", "final"]
+    assert [s.id for s in listed.sessions] == ["s1"]
+    print(f"✅ 21 events persisted in {batches_written} batch(es) and reloaded after restart")
+
+
+def test_reads_see_own_pending_writes():
+    async def run():
+        service = SqliteSessionService(temp_db())
+        session = await service.create_session(app_name="travel", user_id="u1", session_id="s1")
+        await service.append_event(session, make_event("hello", {"city": "Paris"}))
+        reloaded = await service.get_session(app_name="travel", user_id="u1", session_id="s1")
+        await service.delete_session(app_name="travel", user_id="u1", session_id="s1")
+        gone = await service.get_session(app_name="travel", user_id="u1", session_id="s1")
+        service.close()
+        return reloaded, gone
+
+    reloaded, gone = asyncio.run(run())
+    assert reloaded.state["city"] == "Paris"
+    assert len(reloaded.events) == 1
+    assert gone is None
+    print("✅ Reads wait for this process's queued writes; delete removes the session")
+
+
+def test_reads_do_not_wait_for_other_sessions():
+    async def run():
+        service = SqliteSessionService(temp_db())
+        quiet = await service.create_session(app_name="travel", user_id="u1", session_id="quiet")
+        busy = await service.create_session(app_name="travel", user_id="u2", session_id="busy")
+        await service.append_event(quiet, make_event("hello"))
+        await service.flush()
+
+        # Stall the writer on the busy session's batch
+        release = threading.Event()
+        write_batch = service._write_batch
+        def slow_write_batch(conn, items):
+            release.wait(10)
+            write_batch(conn, items)
+        service._write_batch = slow_write_batch
+        await service.append_event(busy, make_event("stuck", {"user:lang": "it"}))
+
+        quiet_reloaded = await asyncio.wait_for(
+            service.get_session(app_name="travel", user_id="u1", session_id="quiet"), timeout=2
+        )
+        busy_read = asyncio.ensure_future(service.get_session(app_name="travel", user_id="u2", session_id="busy"))
+        await asyncio.sleep(0.2)
+        blocked = not busy_read.done()
+        release.set()
+        busy_reloaded = await asyncio.wait_for(busy_read, timeout=10)
+        service.close()
+        return quiet_reloaded, blocked, busy_reloaded
+
+    quiet_reloaded, blocked, busy_reloaded = asyncio.run(run())
+    assert len(quiet_reloaded.events) == 1
+    assert blocked
+    assert busy_reloaded.state["user:lang"] == "it"
+    assert len(busy_reloaded.events) == 1
+    print("✅ A read waits only for queued writes to the session it reads")
+
+
+def test_failed_batches_are_retried_or_reported():
+    async def run():
+        service = SqliteSessionService(temp_db(), max_write_retries=2, retry_delay_s=0.01)
+        session = await service.create_session(app_name="travel", user_id="u1", session_id="s1")
+        write_batch = service._write_batch
+        failures = {"left": 1}
+
+        def flaky_write_batch(conn, items):
+            if failures["left"]:
+                failures["left"] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            write_batch(conn, items)
+
+        service._write_batch = flaky_write_batch
+        await service.append_event(session, make_event("survives one failure"))
+        retried = await service.get_session(app_name="travel", user_id="u1", session_id="s1")
+
+        failures["left"] = 3
+        await service.append_event(session, make_event("lost"))
+        with pytest.raises(SessionWriteError):
+            await service.get_session(app_name="travel", user_id="u1", session_id="s1")
+        service.close()
+        return retried, service.events_failed
+
+    retried, events_failed = asyncio.run(run())
+    assert [e.content.parts[0].text for e in retried.events] == ["survives one failure"]
+    assert events_failed == 1
+    print("✅ A failed commit is retried; readers are told when it never succeeds")
+
+
+def test_idle_sessions_are_swept():
+    db_path = temp_db()
+
+    async def run():
+        service = SqliteSessionService(db_path)
+        for session_id in ("stale", "fresh"):
+            session = await service.create_session(app_name="travel", user_id="u1", session_id=session_id)
+            await service.append_event(session, make_event(f"hi from {session_id}"))
+        await service.flush()
+        with service._connect() as conn:
+            conn.execute("UPDATE sessions SET update_time = update_time - 7200 WHERE id = 'stale'")
+        deleted = await service.delete_idle_sessions(3600)
+        listed = await service.list_sessions(app_name="travel", user_id="u1")
+        with service._connect() as conn:
+            orphans = conn.execute("SELECT COUNT(*) FROM events WHERE session_id = 'stale'").fetchone()[0]
+        service.close()
+        return deleted, listed, orphans
+
+    deleted, listed, orphans = asyncio.run(run())
+    assert deleted == 1
+    assert [s.id for s in listed.sessions] == ["fresh"]
+    assert orphans == 0
+    print("✅ Sessions idle past the TTL are deleted with their events")
+
+
+def _worker(db_path: str, worker_id: int, turns: int):
+    async def run():
+        service = SqliteSessionService(db_path)
+        session = await service.get_session(app_name="travel", user_id="u1", session_id="shared")
+        for i in range(turns):
+            await service.append_event(session, make_event(f"worker {worker_id} turn {i}"))
+        service.close()
+    asyncio.run(run())
+
+
+def test_multiple_processes_share_one_store():
+    db_path = temp_db()
+
+    async def create():
+        service = SqliteSessionService(db_path)
+        await service.create_session(app_name="travel", user_id="u1", session_id="shared")
+        service.close()
+    asyncio.run(create())
+
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_worker, args=(db_path, w, 25)) for w in range(3)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(timeout=120)
+        assert p.exitcode == 0
+
+    async def read():
+        service = SqliteSessionService(db_path)
+        session = await service.get_session(app_name="travel", user_id="u1", session_id="shared")
+        service.close()
+        return session
+
+    assert len(asyncio.run(read()).events) == 75
+    print("✅ Three worker processes appended to the same session without losing events")
+
+
+if __name__ == "__main__":
+    test_session_survives_restart()
+    test_reads_see_own_pending_writes()
+    test_reads_do_not_wait_for_other_sessions()
+    test_failed_batches_are_retried_or_reported()
+    test_idle_sessions_are_swept()
+    test_multiple_processes_share_one_store()
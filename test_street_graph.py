@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline CSR street graph: OSM extract build, A* routing and
+its use in walking plans.
+"""
+
+import heapq
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from orchestrator_agent.sub_agents.walking_routes_agent import street_graph as sg
+from orchestrator_agent.sub_agents.walking_routes_agent.agent import (
+    create_walking_plan_with_map,
+    generate_walking_route_map,
+)
+
+# A street grid over central Rome: ~110 m between east-west streets, ~83 m
+# between north-south footways
+LAT0, LON0, STEP = 41.884, 12.468, 0.001
+ROWS, COLS = 24, 28
+
+
+def node_id(r, c):
+    return 1000 + r * COLS + c
+
+
+def write_osm(path):
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>', '<osm version="0.6">']
+    for r in range(ROWS):
+        for c in range(COLS):
+            parts.append(f'<node id="{node_id(r, c)}" lat="{LAT0 + r * STEP:.6f}" lon="{LON0 + c * STEP:.6f}"/>')
+    # Nodes only used by excluded ways, and one node outside the extract
+    parts.append(f'<node id="1" lat="{LAT0 + 0.5 * STEP}" lon="{LON0 + 0.5 * STEP}"/>')
+
+    def way(way_id, refs, **tags):
+        nds = "".join(f'<nd ref="{ref}"/>' for ref in refs)
+        tag_xml = "".join(f'<tag k="{k}" v="{v}"/>' for k, v in tags.items())
+        parts.append(f'<way id="{way_id}">{nds}{tag_xml}</way>')
+
+    for r in range(ROWS):
+        way(10_000 + r, [node_id(r, c) for c in range(COLS)], highway="residential", name=f"Via {r}")
+    for c in range(COLS):
+        way(20_000 + c, [node_id(r, c) for r in range(ROWS)], highway="footway")
+    # A motorway shortcut, a private path and a no-foot road must all be ignored
+    way(30_000, [node_id(0, 0), 1, node_id(ROWS - 1, COLS - 1)], highway="motorway")
+    way(30_001, [node_id(0, 0), node_id(5, 5)], highway="path", access="private")
+    way(30_002, [node_id(0, 0), node_id(6, 6)], highway="tertiary", foot="no")
+    # Leaves the extract: node 99 has no coordinates
+    way(30_003, [node_id(3, 3), 99], highway="footway")
+    parts.append('<relation id="5"><member type="way" ref="10000" role=""/></relation>')
+    parts.append("</osm>")
+    with open(path, "w") as f:
+        f.write("\n".join(parts))
+
+
+@pytest.fixture(scope="module")
+def graph_dir():
+    tmp = tempfile.mkdtemp()
+    osm_path = os.path.join(tmp, "rome.osm")
+    write_osm(osm_path)
+    out_dir = os.path.join(tmp, "graph")
+    sg.build_street_graph(osm_path, out_dir)
+    return out_dir
+
+
+def dijkstra(graph, source, target):
+    best = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u == target:
+            return d
+        if d > best[u]:
+            continue
+        for k in range(graph.indptr[u], graph.indptr[u + 1]):
+            v, nd = int(graph.indices[k]), d + float(graph.length_m[k])
+            if nd < best.get(v, float("inf")):
+                best[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return None
+
+
+def test_build_keeps_only_walkable_ways(graph_dir):
+    graph = sg.StreetGraph.load(graph_dir)
+    assert graph.node_count == ROWS * COLS
+    assert 1 not in set(graph.osm_ids.tolist())
+    grid_edges = ROWS * (COLS - 1) + COLS * (ROWS - 1)
+    assert len(graph.indices) == 2 * grid_edges
+    assert isinstance(graph.indices, np.memmap) and graph.indices.dtype == np.int32
+    assert graph.indptr[-1] == len(graph.indices)
+    # Corner nodes have two neighbours; the private/no-foot shortcuts were dropped
+    corner = int(np.searchsorted(graph.osm_ids, node_id(0, 0)))
+    assert graph.indptr[corner + 1] - graph.indptr[corner] == 2
+    print(f"✅ {graph.node_count} nodes / {len(graph.indices)} directed edges, motorway and private ways excluded")
+
+
+def test_astar_matches_dijkstra(graph_dir):
+    graph = sg.StreetGraph.load(graph_dir)
+    rng = np.random.default_rng(5)
+    for _ in range(25):
+        a, b = (int(x) for x in rng.integers(0, graph.node_count, 2))
+        route = graph.shortest_path(a, b)
+        assert route.nodes[0] == a and route.nodes[-1] == b
+        assert abs(route.distance_m - dijkstra(graph, a, b)) < 1e-3
+        steps = sum(
+            float(graph.length_m[graph.indptr[u] + list(graph.indices[graph.indptr[u]:graph.indptr[u + 1]]).index(v)])
+            for u, v in zip(route.nodes[:-1], route.nodes[1:])
+        )
+        assert abs(steps - route.distance_m) < 1e-3
+    print("✅ A* finds the same shortest paths as Dijkstra")
+
+
+def test_route_snaps_endpoints_and_rejects_points_outside(graph_dir):
+    graph = sg.StreetGraph.load(graph_dir)
+    corner_to_corner = graph.route(LAT0, LON0, LAT0 + (ROWS - 1) * STEP, LON0 + (COLS - 1) * STEP)
+    north = (ROWS - 1) * STEP * 111_195
+    assert north < corner_to_corner.distance_m < north * 2
+    assert corner_to_corner.minutes > 20
+    # Half a block off the street costs the snap distance on top
+    snapped = graph.route(LAT0 + 0.5 * STEP, LON0 + 0.5 * STEP, LAT0, LON0)
+    assert 50 < snapped.distance_m < 200
+    assert graph.route(LAT0, LON0, 48.8584, 2.2945) is None
+    print("✅ Endpoints snap to the nearest street; points outside the extract return None")
+
+
+def test_plans_use_street_distances_when_a_graph_is_built(graph_dir, monkeypatch):
+    estimated = create_walking_plan_with_map("Colosseum, Trevi Fountain, Eiffel Tower")
+    monkeypatch.setenv("STREET_GRAPH_DIR", graph_dir)
+    sg.get_street_graph.cache_clear()
+    try:
+        plan = create_walking_plan_with_map("Colosseum, Trevi Fountain, Eiffel Tower")
+        link = generate_walking_route_map("Colosseum", "Pantheon", "Trevi Fountain")
+    finally:
+        sg.get_street_graph.cache_clear()
+
+    legs = [line for line in plan.split("\n") if line.startswith("Distance:")]
+    assert "(along streets, 1.4 km straight line)" in legs[0]
+    # Paris is outside the Rome extract, so that leg is estimated
+    assert "along streets" not in legs[1]
+    assert plan != estimated
+    assert link.endswith("(along streets).")
+    assert "Walking distance:" not in generate_walking_route_map("Colosseum", "My Hotel")
+    print("✅ Legs inside the extract use street distances, others fall back to estimates")
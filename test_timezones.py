@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared city/timezone index used by get_current_time.
+"""
+
+from orchestrator_agent.agent import get_current_time
+from orchestrator_agent.sub_agents.weather_agent.agent import get_current_time as weather_get_current_time
+from orchestrator_agent.timezones import LOCATION_INDEX, get_zone, resolve_timezone
+
+
+def test_exact_lookups():
+    cases = {
+        "Paris": "Europe/Paris",
+        "new york": "America/New_York",
+        "NYC": "America/New_York",
+        "Edinburgh": "Europe/London",
+        "japan": "Asia/Tokyo",
+        "America/Sao_Paulo": "America/Sao_Paulo",
+        "sao paulo": "America/Sao_Paulo",
+        "São Paulo": "America/Sao_Paulo",
+        "Kathmandu": "Asia/Kathmandu",
+        "Paris, France": "Europe/Paris",
+        "Perth, Australia": "Australia/Perth",
+    }
+    for location, zone in cases.items():
+        assert resolve_timezone(location) == zone, location
+    print("✅ City aliases, countries and IANA suffixes resolve by hash lookup")
+
+
+def test_fuzzy_fallbacks():
+    assert resolve_timezone("Edinb") == "Europe/London"
+    assert resolve_timezone("Londn") == "Europe/London"
+    assert resolve_timezone("Barcelna") == "Europe/Madrid"
+    assert resolve_timezone("Tokio") == "Asia/Tokyo"
+    for location in ["xyzzy", "restaurant", "", "la la land of nowhere"]:
+        assert resolve_timezone(location) is None, location
+    print("✅ Prefixes and typos resolve; nonsense does not")
+
+
+def test_no_confident_wrong_zones():
+    # Close to another name ("poland", "san juan") but not a typo of it
+    for location in ["Portland", "san", "Dallas", "Springfield"]:
+        assert resolve_timezone(location) is None, location
+    # A qualifier on another continent wins over the famous namesake
+    assert resolve_timezone("Paris, Texas") == "America/Chicago"
+    assert resolve_timezone("Portland, Oregon") == "America/Los_Angeles"
+    assert resolve_timezone("Melbourne, Australia") == "Australia/Melbourne"
+    print("✅ Near misses return None instead of a wrong zone")
+
+
+def test_index_is_immutable_and_zones_are_cached():
+    try:
+        LOCATION_INDEX["atlantis"] = "UTC"
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("LOCATION_INDEX should be read-only")
+    assert get_zone("Asia/Tokyo") is get_zone("Asia/Tokyo")
+    print("✅ Index is read-only and ZoneInfo objects are reused")
+
+
+def test_tool_output_format_is_unchanged():
+    result = get_current_time("Tokyo")
+    assert result.startswith("Current time in Tokyo: ") and result.endswith("(Asia/Tokyo)")
+    assert weather_get_current_time("London").startswith("🕐 Current time in London: ")
+    assert get_current_time("Atlantis").startswith("Sorry, I couldn't find timezone information")
+    print("✅ Both get_current_time tools keep their response format")
+
+
+if __name__ == "__main__":
+    test_exact_lookups()
+    test_fuzzy_fallbacks()
+    test_no_confident_wrong_zones()
+    test_index_is_immutable_and_zones_are_cached()
+    test_tool_output_format_is_unchanged()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Tests for GTFS timetable building, RAPTOR earliest-arrival queries and the
+public transport tool, on synthetic feeds.
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+
+import numpy as np
+import pytest
+
+from orchestrator_agent.sub_agents.walking_routes_agent import transit
+from orchestrator_agent.sub_agents.walking_routes_agent.agent import create_walking_plan_with_map, plan_transit_trip, transit_journey
+from orchestrator_agent.sub_agents.walking_routes_agent.poi_index import haversine_m
+
+LAT0, LON0 = 48.85, 2.30
+STEP_M = 350.0
+WEEKDAY, SUNDAY, HOLIDAY = date(2026, 3, 4), date(2026, 3, 8), date(2026, 3, 5)
+
+
+def _write(path, name, header, rows):
+    with open(os.path.join(path, name), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _hms(seconds):
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def write_grid_feed(path, size=8, headway_min=10, first_hour=6, last_hour=22, seed=0):
+    """
+    GTFS feed for a ``size`` x ``size`` grid of stops ``STEP_M`` apart, with
+    one line per row and per column running both ways. Every third weekday
+    trip is an express that leaves two minutes after a regular trip and
+    overtakes it. Sundays run half as often; ``HOLIDAY`` has no service.
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(path, exist_ok=True)
+    dlat = STEP_M / 111195.0
+    dlon = dlat / np.cos(np.radians(LAT0))
+    _write(path, "agency.txt", ["agency_id", "agency_name", "agency_url", "agency_timezone"],
+           [["A", "Grid Transit", "https://example.com", "Europe/Paris"]])
+    _write(path, "stops.txt", ["stop_id", "stop_name", "stop_lat", "stop_lon", "location_type"],
+           [["STATION", "Central Station", LAT0, LON0, 1]]
+           + [[f"S{r}_{c}", f"Stop {r}-{c}", LAT0 + r * dlat, LON0 + c * dlon, 0] for r in range(size) for c in range(size)])
+    _write(path, "calendar.txt",
+           ["service_id", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday", "start_date", "end_date"],
+           [["WK", 1, 1, 1, 1, 1, 0, 0, 20260101, 20261231], ["SU", 0, 0, 0, 0, 0, 0, 1, 20260101, 20261231]])
+    _write(path, "calendar_dates.txt", ["service_id", "date", "exception_type"], [["WK", 20260305, 2]])
+
+    routes, trips, stop_times = [], [], []
+    lines = [(f"R{r}", [f"S{r}_{c}" for c in range(size)]) for r in range(size)]
+    lines += [(f"C{c}", [f"S{r}_{c}" for r in range(size)]) for c in range(size)]
+    for k, (name, stops) in enumerate(lines):
+        routes.append([name, name, 3 if k % 2 else 1])
+        hop = int(rng.integers(60, 150))
+        for direction, sequence in enumerate((stops, stops[::-1])):
+            offset = int(rng.integers(0, headway_min * 60))
+            for service, headway in (("WK", headway_min), ("SU", 2 * headway_min)):
+                for n, start in enumerate(range(first_hour * 3600 + offset, last_hour * 3600, headway * 60)):
+                    express = service == "WK" and n % 3 == 1
+                    trip_id = f"{name}-{direction}-{service}-{n}"
+                    trips.append([name, service, trip_id])
+                    t = start + (120 if express else 0)
+                    for seq, stop in enumerate(sequence):
+                        # Regular trips leave some times blank (non-timepoints)
+                        blank = not express and 0 < seq < len(sequence) - 1 and seq % 4 == 2
+                        arrive, depart = ("", "") if blank else (_hms(t), _hms(t + 20))
+                        stop_times.append([trip_id, arrive, depart, stop, seq + 1])
+                        t += 20 + (hop // 2 if express else hop)
+    _write(path, "routes.txt", ["route_id", "route_short_name", "route_type"], routes)
+    _write(path, "trips.txt", ["route_id", "service_id", "trip_id"], trips)
+    _write(path, "stop_times.txt", ["trip_id", "arrival_time", "departure_time", "stop_id", "stop_sequence"], stop_times)
+    _write(path, "transfers.txt", ["from_stop_id", "to_stop_id", "transfer_type", "min_transfer_time"],
+           [["S0_0", f"S{size - 1}_{size - 1}", 2, 900]])
+    return dlat, dlon
+
+
+def connection_scan(timetable, lat, lon, dest_lat, dest_lon, depart_s, day):
+    """Reference earliest arrival: Connection Scan over every running trip."""
+    running = timetable.active_services(day)[timetable.trip_service]
+    connections = []
+    for p in range(len(timetable.pattern_route)):
+        stops = timetable.pattern_stops[timetable.pattern_stops_ptr[p]:timetable.pattern_stops_ptr[p + 1]]
+        n = len(stops)
+        for t in range(timetable.pattern_trips_ptr[p], timetable.pattern_trips_ptr[p + 1]):
+            if not running[t]:
+                continue
+            # Times are stored stop by stop
+            trips = timetable.pattern_trips_ptr[p + 1] - timetable.pattern_trips_ptr[p]
+            first = timetable.pattern_times_ptr[p] + t - timetable.pattern_trips_ptr[p]
+            for i in range(n - 1):
+                connections.append((int(timetable.departures[first + i * trips]), int(timetable.arrivals[first + (i + 1) * trips]),
+                                    int(stops[i]), int(stops[i + 1]), t))
+    connections.sort()
+
+    arrival = np.full(timetable.stop_count, np.inf)
+    origins, access = timetable.nearby_stops(lat, lon)
+    arrival[origins] = depart_s + access
+    on_board = set()
+    for dep, arr, a, b, trip in connections:
+        if trip in on_board or arrival[a] <= dep:
+            on_board.add(trip)
+            if arr < arrival[b]:
+                arrival[b] = arr
+                lo, hi = timetable.transfer_ptr[b], timetable.transfer_ptr[b + 1]
+                for to, seconds in zip(timetable.transfer_to[lo:hi], timetable.transfer_s[lo:hi]):
+                    arrival[to] = min(arrival[to], arr + seconds)
+    exits, egress = timetable.nearby_stops(dest_lat, dest_lon)
+    walk = depart_s + int(transit.walk_seconds(haversine_m(lat, lon, dest_lat, dest_lon)))
+    return min(walk, float((arrival[exits] + egress).min())) if len(exits) else walk
+
+
+@pytest.fixture(scope="module")
+def grid_timetable():
+    tmp = tempfile.mkdtemp()
+    dlat, dlon = write_grid_feed(os.path.join(tmp, "feed"))
+    meta = transit.build_timetable(os.path.join(tmp, "feed"), os.path.join(tmp, "timetable"))
+    yield transit.TransitTimetable.load(os.path.join(tmp, "timetable")), meta, dlat, dlon, tmp
+    shutil.rmtree(tmp)
+
+
+def test_build_groups_trips_into_fifo_patterns(grid_timetable):
+    timetable, meta, _, _, _ = grid_timetable
+    assert meta["stops"] == 64 and timetable.stop_count == 64  # the parent station is skipped
+    assert meta["timezone"] == "Europe/Paris"
+    # 32 line directions; overtaking expresses get patterns of their own
+    assert meta["patterns"] == 64
+    for p in range(meta["patterns"]):
+        n = timetable.pattern_stops_ptr[p + 1] - timetable.pattern_stops_ptr[p]
+        t = timetable.pattern_trips_ptr[p + 1] - timetable.pattern_trips_ptr[p]
+        block = slice(timetable.pattern_times_ptr[p], timetable.pattern_times_ptr[p + 1])
+        dep = np.asarray(timetable.departures[block]).reshape(n, t).T
+        arr = np.asarray(timetable.arrivals[block]).reshape(n, t).T
+        assert (np.diff(dep, axis=0) >= 0).all() and (np.diff(arr, axis=0) >= 0).all()
+        assert (arr >= 0).all() and (np.diff(arr, axis=1) > 0).all()  # blanks were interpolated
+    # Neighbouring stops get walking transfers; transfers.txt adds one long one
+    first = timetable.transfer_to[timetable.transfer_ptr[0]:timetable.transfer_ptr[1]].tolist()
+    assert meta["stop_ids"].index("S7_7") in first and meta["stop_ids"].index("S0_1") in first
+
+
+def test_service_calendar(grid_timetable):
+    timetable, _, _, _, _ = grid_timetable
+    weekday, sunday, holiday = (timetable.active_services(d) for d in (WEEKDAY, SUNDAY, HOLIDAY))
+    assert weekday.sum() == 1 and sunday.sum() == 1 and holiday.sum() == 0
+    assert not (weekday & sunday).any()
+
+
+def test_raptor_matches_connection_scan(grid_timetable):
+    timetable, _, dlat, dlon, _ = grid_timetable
+    rng = np.random.default_rng(1)
+    checked = 0
+    for _ in range(40):
+        a, b = rng.uniform(-0.5, 7.5, size=(2, 2))
+        depart = int(rng.integers(5 * 3600, 22 * 3600))
+        day = [WEEKDAY, SUNDAY, HOLIDAY][int(rng.integers(3))]
+        lat, lon = LAT0 + a[0] * dlat, LON0 + a[1] * dlon
+        dest_lat, dest_lon = LAT0 + b[0] * dlat, LON0 + b[1] * dlon
+        journey = timetable.earliest_arrival(lat, lon, dest_lat, dest_lon, depart, day, max_rides=20)
+        assert journey.arrive_s == connection_scan(timetable, lat, lon, dest_lat, dest_lon, depart, day)
+        checked += bool(journey.rides)
+
+        # Legs are consecutive in time and start and end on foot
+        assert journey.legs[0].mode == "walk" and journey.legs[-1].mode == "walk"
+        assert journey.legs[0].depart_s == depart and journey.legs[-1].arrive_s == journey.arrive_s
+        for prev, leg in zip(journey.legs[:-1], journey.legs[1:]):
+            assert leg.depart_s >= prev.arrive_s and leg.arrive_s >= leg.depart_s
+            assert leg.origin == prev.destination
+        if day == HOLIDAY:
+            assert not journey.rides
+    assert checked >= 15
+
+
+def test_journey_rides_and_changes(grid_timetable):
+    timetable, _, dlat, dlon, _ = grid_timetable
+    # Corner to corner needs a row line and a column line
+    journey = timetable.earliest_arrival(LAT0, LON0, LAT0 + 7 * dlat, LON0 + 7 * dlon, 8 * 3600, WEEKDAY)
+    assert len(journey.rides) >= 1 and journey.minutes < 60
+    ride = journey.rides[0]
+    assert ride.mode in ("Metro", "Bus") and ride.route and ride.stops >= 1
+    # Fewer vehicles can only be slower
+    one_ride = timetable.earliest_arrival(LAT0, LON0, LAT0 + 7 * dlat, LON0 + 7 * dlon, 8 * 3600, WEEKDAY, max_rides=1)
+    assert len(one_ride.rides) <= 1 and one_ride.arrive_s >= journey.arrive_s
+    # Next door: walking wins; far outside the network: nothing
+    near = timetable.earliest_arrival(LAT0, LON0, LAT0 + 0.2 * dlat, LON0, 8 * 3600, WEEKDAY)
+    assert not near.rides and len(near.legs) == 1
+    assert timetable.earliest_arrival(LAT0 + 1, LON0, LAT0, LON0, 8 * 3600, WEEKDAY) is None
+
+
+def test_zip_feed_builds_the_same_timetable(grid_timetable):
+    timetable, meta, _, _, tmp = grid_timetable
+    feed_zip = os.path.join(tmp, "feed.zip")
+    with zipfile.ZipFile(feed_zip, "w") as z:
+        for name in os.listdir(os.path.join(tmp, "feed")):
+            z.write(os.path.join(tmp, "feed", name), name)
+    transit.build_timetable(feed_zip, os.path.join(tmp, "zipped"))
+    zipped = transit.TransitTimetable.load(os.path.join(tmp, "zipped"))
+    assert zipped.meta["trips"] == meta["trips"]
+    assert np.array_equal(zipped.departures, timetable.departures)
+    assert np.array_equal(zipped.transfer_s, timetable.transfer_s)
+
+
+def test_transit_tool(monkeypatch):
+    # One tram line from the Eiffel Tower to Notre Dame, every 10 minutes, every day
+    tmp = tempfile.mkdtemp()
+    feed = os.path.join(tmp, "feed")
+    os.makedirs(feed)
+    lats, lons = np.linspace(48.8590, 48.8535, 9), np.linspace(2.2960, 2.3480, 9)
+    _write(feed, "agency.txt", ["agency_id", "agency_name", "agency_url", "agency_timezone"],
+           [["P", "Paris Trams", "https://example.com", "Europe/Paris"]])
+    _write(feed, "stops.txt", ["stop_id", "stop_name", "stop_lat", "stop_lon"],
+           [[f"T{k}", f"Quai {k}", lats[k], lons[k]] for k in range(9)])
+    _write(feed, "routes.txt", ["route_id", "route_short_name", "route_type"], [["T9", "T9", 0]])
+    _write(feed, "calendar.txt",
+           ["service_id", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday", "start_date", "end_date"],
+           [["ALL", 1, 1, 1, 1, 1, 1, 1, 20000101, 20991231]])
+    trips, times = [], []
+    for n, start in enumerate(range(0, 24 * 3600 - 1800, 600)):
+        trips.append(["T9", "ALL", f"t{n}"])
+        times += [[f"t{n}", _hms(start + 90 * k), _hms(start + 90 * k), f"T{k}", k] for k in range(9)]
+    _write(feed, "trips.txt", ["route_id", "service_id", "trip_id"], trips)
+    _write(feed, "stop_times.txt", ["trip_id", "arrival_time", "departure_time", "stop_id", "stop_sequence"], times)
+    transit.build_timetable(feed, os.path.join(tmp, "timetable"))
+
+    monkeypatch.setenv("TRANSIT_TIMETABLE_DIR", os.path.join(tmp, "timetable"))
+    transit.get_transit_timetable.cache_clear()
+    try:
+        result = plan_transit_trip("Eiffel Tower", "Notre Dame", "10:00")
+        assert "Public transport from Eiffel Tower to Notre Dame Cathedral" in result
+        assert "Tram T9 from Quai 0" in result and "→ Quai 8" in result
+        assert "Leave 10:00" in result and "no changes" in result and "8 stops" in result
+        assert "Walking all the way" in result
+        assert "Walking is the quickest" in plan_transit_trip("Eiffel Tower", "48.8590,2.2960", "10:00")
+        assert "couldn't understand" in plan_transit_trip("Eiffel Tower", "Notre Dame", "soon")
+        assert "couldn't locate" in plan_transit_trip("Atlantis", "Notre Dame")
+        # "now" is local time in the feed's timezone; late at night walking wins
+        assert not plan_transit_trip("Eiffel Tower", "Notre Dame", "now").startswith(("Error", "Sorry"))
+
+        # Long legs of a walking plan are compared against transit departing now
+        journey = transit_journey(48.8584, 2.2945, 48.8530, 2.3499, city="Paris")
+        plan = create_walking_plan_with_map("Eiffel Tower, Notre Dame")
+        assert ("By public transport right now" in plan) == bool(journey.rides)
+    finally:
+        transit.get_transit_timetable.cache_clear()
+        shutil.rmtree(tmp)
+
+    monkeypatch.setenv("TRANSIT_TIMETABLE_DIR", os.path.join(tmp, "missing"))
+    try:
+        assert "don't have public transport timetables" in plan_transit_trip("Eiffel Tower", "Notre Dame")
+    finally:
+        transit.get_transit_timetable.cache_clear()
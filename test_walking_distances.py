@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for POI-based walking distance and time estimates in walking plans.
+"""
+
+import time
+
+import numpy as np
+
+from orchestrator_agent.sub_agents.walking_routes_agent.agent import create_walking_plan_with_map
+from orchestrator_agent.sub_agents.walking_routes_agent.poi_index import (
+    get_poi_index,
+    haversine_matrix,
+    walking_minutes,
+)
+
+
+def test_haversine_matrix_matches_known_distances():
+    # Paris -> London is ~344 km; one degree of latitude is ~111.2 km
+    d = haversine_matrix(np.array([48.8566, 51.5074, 0.0, 1.0]), np.array([2.3522, -0.1278, 0.0, 0.0]))
+    assert d.shape == (4, 4)
+    assert np.allclose(d, d.T) and np.allclose(np.diag(d), 0)
+    assert abs(d[0, 1] - 343_900) < 1500
+    assert abs(d[2, 3] - 111_195) < 10
+    print("✅ Pairwise great-circle distances are symmetric and accurate")
+
+
+def test_resolves_aliases_and_shared_names_by_city():
+    index = get_poi_index()
+    rows = index.resolve(["the louvre", "Musée d'Orsay", "Notre-Dame", "Panthéon"])
+    assert [index.names[r] for r in rows] == ["Louvre Museum", "Musée d'Orsay", "Notre Dame Cathedral", "Panthéon"]
+    assert [index.cities[r] for r in rows] == ["Paris"] * 4
+    rome = index.resolve(["Colosseum", "Pantheon", "St Peter's Basilica"])
+    assert [index.cities[r] for r in rome] == ["Rome"] * 3
+    assert index.resolve(["Atlantis"]) == [None]
+    assert len(index.city_rows("new york")) > 10
+    print("✅ Aliases resolve and 'Pantheon' follows the other stops' city")
+
+
+def test_plan_reports_real_leg_and_total_estimates():
+    plan = create_walking_plan_with_map("Colosseum, Trevi Fountain, Pantheon")
+    assert "15-30 minutes" not in plan and "Varies" not in plan
+    # Colosseum -> Trevi Fountain is ~1.4 km in a straight line
+    assert "Distance: about 1.8 km on foot (1.4 km straight line)" in plan
+    assert "**Total walking:** about" in plan
+    print("✅ Known stops get per-leg distance, time and a route total")
+
+
+def test_unknown_stops_keep_the_generic_hint():
+    plan = create_walking_plan_with_map("Eiffel Tower, My Hotel, Louvre Museum")
+    assert plan.count("Distance: Varies") == 2
+    assert "**Total walking" not in plan
+    plan = create_walking_plan_with_map("Eiffel Tower, Arc de Triomphe, My Hotel")
+    assert "**Total walking for 1 of 2 legs:**" in plan
+    print("✅ Legs touching unknown stops fall back to the map link")
+
+
+def test_long_legs_suggest_transit():
+    plan = create_walking_plan_with_map("Statue of Liberty, Central Park")
+    assert "consider public transport" in plan
+    minutes = float(walking_minutes(1000))
+    assert 12 < minutes < 13
+    print("✅ Long legs get a public-transport hint")
+
+
+def test_fifty_stop_route_is_fast():
+    index = get_poi_index()
+    names = [index.names[r] for r in index.city_rows("Paris")] + [index.names[r] for r in index.city_rows("London")]
+    names = (names * 2)[:60]
+    create_walking_plan_with_map(", ".join(names[:5]))  # warm the table
+    start = time.perf_counter()
+    plan = create_walking_plan_with_map(", ".join(names))
+    elapsed = time.perf_counter() - start
+    assert plan.count("**Step ") == 59
+    assert elapsed < 0.05, f"{elapsed * 1000:.1f} ms"
+    print(f"✅ 60-stop plan built in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for the OpenWeatherMap response cache used by get_city_weather.
+"""
+
+import threading
+import time
+
+import orchestrator_agent.sub_agents.weather_agent.agent as weather
+from orchestrator_agent.sub_agents.weather_agent.weather_cache import WeatherCache
+
+PAYLOAD = {
+    "main": {"temp": 21.0, "humidity": 40},
+    "weather": [{"description": "clear sky"}],
+    "wind": {"speed": 3.1},
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingFetcher:
+    def __init__(self, value=PAYLOAD, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, city):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_fresh_hits_share_a_normalized_key():
+    clock = FakeClock()
+    cache = WeatherCache(ttl=600, stale_ttl=0, clock=clock)
+    fetch = CountingFetcher()
+    assert cache.get_or_fetch("Rome", fetch) == PAYLOAD
+    assert cache.get_or_fetch("  rome ", fetch) == PAYLOAD
+    assert cache.get_or_fetch("ROME", fetch) == PAYLOAD
+    assert fetch.calls == 1
+    clock.now += 601
+    cache.get_or_fetch("Rome", fetch)
+    assert fetch.calls == 2
+    print("✅ Fresh entries served from memory, expired ones refetched")
+
+
+def test_stale_while_revalidate():
+    clock = FakeClock()
+    cache = WeatherCache(ttl=600, stale_ttl=1800, clock=clock)
+    cache.get_or_fetch("Rome", CountingFetcher())
+
+    clock.now += 900
+    newer = dict(PAYLOAD, main={"temp": 25.0, "humidity": 40})
+    refresh = CountingFetcher(value=newer, delay=0.05)
+    assert cache.get_or_fetch("Rome", refresh) == PAYLOAD  # stale copy, immediately
+    assert cache.get_or_fetch("Rome", refresh) == PAYLOAD  # refresh still in flight
+    wait_for(lambda: cache.stats()["refreshes"] == 1)
+    assert refresh.calls == 1
+    assert cache.get_or_fetch("Rome", refresh) == newer
+    assert cache.stats()["stale_hits"] == 2
+    print("✅ Stale entries served while a single background refresh runs")
+
+
+def test_failed_refresh_keeps_serving_stale():
+    clock = FakeClock()
+    cache = WeatherCache(ttl=600, stale_ttl=1800, clock=clock)
+    cache.get_or_fetch("Rome", CountingFetcher())
+    clock.now += 900
+
+    def broken(city):
+        raise ConnectionError("upstream down")
+
+    assert cache.get_or_fetch("Rome", broken) == PAYLOAD
+    wait_for(lambda: cache.stats()["refresh_errors"] == 1)
+    assert cache.get_or_fetch("Rome", broken) == PAYLOAD
+    print("✅ Refresh failures fall back to the stale copy")
+
+
+def test_not_found_is_negatively_cached():
+    clock = FakeClock()
+    cache = WeatherCache(not_found_ttl=3600, clock=clock)
+    fetch = CountingFetcher(value=None)
+    assert cache.get_or_fetch("Atlantis", fetch) is None
+    assert cache.get_or_fetch("atlantis", fetch) is None
+    assert fetch.calls == 1
+    clock.now += 3601
+    cache.get_or_fetch("Atlantis", fetch)
+    assert fetch.calls == 2
+    print("✅ Unknown cities remembered for not_found_ttl")
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = WeatherCache()
+    fetch = CountingFetcher(delay=0.1)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("Paris", fetch))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert fetch.calls == 1
+    assert results == [PAYLOAD] * 8
+    assert cache.stats()["coalesced"] == 7
+    print("✅ Eight concurrent misses made one upstream call")
+
+
+def test_errors_are_not_cached_and_reach_waiters():
+    cache = WeatherCache()
+
+    def broken(city):
+        raise ConnectionError("upstream down")
+
+    for _ in range(2):
+        try:
+            cache.get_or_fetch("Paris", broken)
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("expected ConnectionError")
+    assert cache.stats()["misses"] == 2
+    print("✅ Transient errors propagate and are retried next time")
+
+
+def test_get_city_weather_uses_the_cache(monkeypatch):
+    import asyncio
+
+    class FakeClient:
+        def __init__(self, value=PAYLOAD):
+            self.value = value
+            self.calls = 0
+
+        async def current_weather(self, city):
+            self.calls += 1
+            return self.value
+
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test")
+    monkeypatch.setattr(weather, "weather_cache", WeatherCache())
+    client = FakeClient()
+    monkeypatch.setattr(weather, "weather_client", client)
+    first = asyncio.run(weather.get_city_weather("Lisbon"))
+    assert "🌡️ Temperature: 21.0°C" in first
+    assert asyncio.run(weather.get_city_weather("lisbon")).startswith("🌤️ Current Weather in lisbon:")
+    assert client.calls == 1
+
+    missing = FakeClient(value=None)
+    monkeypatch.setattr(weather, "weather_client", missing)
+    assert asyncio.run(weather.get_city_weather("Atlantis")).startswith("City 'Atlantis' not found")
+    asyncio.run(weather.get_city_weather("Atlantis"))
+    assert missing.calls == 1
+    print("✅ get_city_weather answers repeats from the cache")
+
+
+def test_async_stale_while_revalidate():
+    import asyncio
+
+    clock = FakeClock()
+    cache = WeatherCache(ttl=600, stale_ttl=1800, clock=clock)
+    calls = []
+
+    async def fetch(city):
+        calls.append(city)
+        await asyncio.sleep(0.01)
+        return dict(PAYLOAD, version=len(calls))
+
+    async def scenario():
+        first = await cache.aget_or_fetch("Rome", fetch)
+        clock.now += 900
+        stale = await cache.aget_or_fetch("Rome", fetch)
+        await asyncio.sleep(0.05)
+        fresh = await cache.aget_or_fetch("Rome", fetch)
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.run(scenario())
+    assert first["version"] == stale["version"] == 1
+    assert fresh["version"] == 2
+    assert len(calls) == 2
+    print("✅ Async lookups refresh stale entries in a background task")
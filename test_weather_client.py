@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for the async OpenWeatherMap client and thread-offloaded FunctionTools.
+"""
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+import orchestrator_agent.sub_agents.weather_agent.agent as weather
+from orchestrator_agent.sub_agents.weather_agent.weather_cache import WeatherCache
+from orchestrator_agent.sub_agents.weather_agent.weather_client import OpenWeatherClient, WeatherAPIError
+from orchestrator_agent.threaded_tools import ThreadedFunctionTool
+
+PAYLOAD = {
+    "main": {"temp": 18.0, "humidity": 55},
+    "weather": [{"description": "light rain"}],
+    "wind": {"speed": 4.2},
+}
+
+
+class ScriptedTransport(httpx.AsyncBaseTransport):
+    """Answers requests from a list of status codes / exceptions, recording each call."""
+
+    def __init__(self, script, delay=0.0):
+        self.script = list(script)
+        self.delay = delay
+        self.requests = []
+
+    async def handle_async_request(self, request):
+        self.requests.append(request)
+        await asyncio.sleep(self.delay)
+        step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(step, Exception):
+            raise step
+        return httpx.Response(step, json=PAYLOAD if step == 200 else {"message": "nope"})
+
+
+def make_client(script, **kwargs):
+    transport = ScriptedTransport(script, kwargs.pop("delay", 0.0))
+    return OpenWeatherClient(api_key="test", backoff=0.001, transport=transport, **kwargs), transport
+
+
+def test_retries_transient_failures():
+    client, transport = make_client([httpx.ConnectTimeout("slow"), 503, 200])
+    assert asyncio.run(client.current_weather("Oslo")) == PAYLOAD
+    assert len(transport.requests) == 3
+    assert transport.requests[0].url.params["q"] == "Oslo"
+    assert transport.requests[0].url.params["units"] == "metric"
+    print("✅ Timeouts and 5xx retried until success")
+
+
+def test_gives_up_after_bounded_retries():
+    client, transport = make_client([httpx.ReadTimeout("slow")], retries=2)
+    try:
+        asyncio.run(client.current_weather("Oslo"))
+    except WeatherAPIError as e:
+        assert "ReadTimeout" in str(e)
+    else:
+        raise AssertionError("expected WeatherAPIError")
+    assert len(transport.requests) == 3
+    print("✅ Retries are bounded")
+
+
+def test_not_found_and_client_errors_are_not_retried():
+    client, transport = make_client([404])
+    assert asyncio.run(client.current_weather("Atlantis")) is None
+    assert len(transport.requests) == 1
+
+    client, transport = make_client([401])
+    try:
+        asyncio.run(client.current_weather("Oslo"))
+    except WeatherAPIError as e:
+        assert str(e) == "Error fetching weather data: 401"
+    assert len(transport.requests) == 1
+    print("✅ 404 maps to None and 4xx fails fast")
+
+
+def test_async_tool_coalesces_concurrent_requests(monkeypatch):
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test")
+    client, transport = make_client([200], delay=0.05)
+    monkeypatch.setattr(weather, "weather_client", client)
+    monkeypatch.setattr(weather, "weather_cache", WeatherCache())
+
+    async def ask_five_times():
+        return await asyncio.gather(*[weather.get_city_weather("Bergen") for _ in range(5)])
+
+    answers = asyncio.run(ask_five_times())
+    assert all(a.startswith("🌤️ Current Weather in Bergen:") for a in answers)
+    assert len(transport.requests) == 1
+    assert weather.weather_cache.stats()["coalesced"] == 4
+    print("✅ Five concurrent async tool calls made one HTTP request")
+
+
+def test_threaded_tool_keeps_the_event_loop_free():
+    def slow_lookup(place: str) -> str:
+        """Blocking lookup."""
+        time.sleep(0.2)
+        return f"{place} from {threading.current_thread().name}"
+
+    tool = ThreadedFunctionTool(slow_lookup)
+    assert tool.name == "slow_lookup"
+    assert tool._get_declaration().parameters.properties["place"] is not None
+
+    async def run():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        result = await tool.run_async(args={"place": "Rome"}, tool_context=None)
+        beat.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run())
+    assert result.startswith("Rome from tool")
+    assert ticks >= 10, f"event loop stalled ({ticks} ticks)"
+    print("✅ Sync tool ran on the tool pool while the loop kept ticking")
+
+
+class CityTransport(httpx.AsyncBaseTransport):
+    """Fake OpenWeather serving /weather?q= and /group?id= from a small city table."""
+
+    CITIES = {"rome": 1, "florence": 2, "venice": 3, "milan": 4, "naples": 5}
+
+    def __init__(self):
+        self.requests = []
+
+    def payload(self, name, city_id):
+        return {**PAYLOAD, "id": city_id, "name": name.title()}
+
+    async def handle_async_request(self, request):
+        self.requests.append(request)
+        params = request.url.params
+        if request.url.path.endswith("/group"):
+            ids = {int(i) for i in params["id"].split(",")}
+            found = [self.payload(n, i) for n, i in self.CITIES.items() if i in ids]
+            return httpx.Response(200, json={"cnt": len(found), "list": found})
+        name = params["q"].lower()
+        if name not in self.CITIES:
+            return httpx.Response(404, json={"message": "city not found"})
+        return httpx.Response(200, json=self.payload(name, self.CITIES[name]))
+
+
+def test_multi_city_tool_batches_misses(monkeypatch):
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test")
+    transport = CityTransport()
+    clock = [0.0]
+    monkeypatch.setattr(weather, "weather_client", OpenWeatherClient(api_key="test", transport=transport))
+    monkeypatch.setattr(weather, "weather_cache", WeatherCache(ttl=600, stale_ttl=0, clock=lambda: clock[0]))
+
+    async def scenario():
+        # Warm the cache (and the city-ID table) for three cities, then let them expire
+        await weather.get_weather_for_cities(["Rome", "Florence", "Venice"])
+        clock[0] += 601
+        await weather.get_city_weather("Milan")
+        transport.requests.clear()
+        return await weather.get_weather_for_cities(["Rome", "Florence", "Venice", "Milan", "Naples", "Atlantis", "rome"])
+
+    summary = asyncio.run(scenario())
+    paths = sorted(r.url.path.rsplit("/", 1)[-1] for r in transport.requests)
+    # Rome/Florence/Venice: one group call; Milan: cache hit; Naples and Atlantis: single lookups
+    assert paths == ["group", "weather", "weather"], paths
+    assert summary.startswith("🌤️ Current Weather in 6 cities:")
+    assert "• Rome: 18.0°C (64.4°F), Light Rain, 💧 55%, 💨 4.2 m/s" in summary
+    assert "• Atlantis: not found" in summary
+    assert summary.count("\n") == 6
+    assert weather.weather_cache.stats()["group_fetches"] == 1
+    print("✅ Six cities answered with one group request plus two single lookups")
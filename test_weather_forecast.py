@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the forecast tool and its vectorized daily aggregation.
+"""
+
+import asyncio
+import random
+from collections import defaultdict
+
+import httpx
+import numpy as np
+
+import orchestrator_agent.sub_agents.weather_agent.agent as weather
+from orchestrator_agent.sub_agents.weather_agent.forecast import ForecastSeries, daily_summaries
+from orchestrator_agent.sub_agents.weather_agent.weather_cache import WeatherCache
+from orchestrator_agent.sub_agents.weather_agent.weather_client import OpenWeatherClient
+
+START = 1_717_200_000  # 2024-06-01 00:00 UTC
+
+
+def make_payload(name, utc_offset, seed, points=40):
+    rng = random.Random(seed)
+    items = []
+    for i in range(points):
+        temp = 15 + 10 * rng.random()
+        item = {
+            "dt": START + i * 3 * 3600,
+            "main": {"temp": temp, "temp_min": temp - rng.random(), "temp_max": temp + rng.random()},
+            "weather": [{"id": rng.choice([500, 800, 801, 803])}],
+            "pop": round(rng.random(), 2),
+        }
+        if item["weather"][0]["id"] == 500:
+            item["rain"] = {"3h": round(rng.random() * 3, 2)}
+        items.append(item)
+    rng.shuffle(items)  # the API is sorted, but don't rely on it
+    return {"list": items, "city": {"name": name, "country": "XX", "timezone": utc_offset}}
+
+
+def naive_daily(payload):
+    """Reference implementation: plain Python grouping by local date."""
+    offset = payload["city"]["timezone"]
+    days = defaultdict(list)
+    for item in payload["list"]:
+        days[(item["dt"] + offset) // 86400].append(item)
+    rows = []
+    for day in sorted(days):
+        items = days[day]
+        rows.append((
+            day,
+            min(i["main"]["temp_min"] for i in items),
+            max(i["main"]["temp_max"] for i in items),
+            sum(i.get("rain", {}).get("3h", 0.0) for i in items),
+            max(i["pop"] for i in items),
+        ))
+    return rows
+
+
+def test_daily_summary_matches_reference_per_city_and_batched():
+    payloads = [make_payload("Lisbon", 3600, 1), make_payload("Tokyo", 9 * 3600, 2), make_payload("Honolulu", -10 * 3600, 3)]
+    series = [ForecastSeries.from_payload(p) for p in payloads]
+    batched = daily_summaries(series)
+    for payload, one, summary in zip(payloads, series, batched):
+        expected = naive_daily(payload)
+        assert len(summary["day"]) == len(expected)
+        assert [int(d.astype(np.int64)) for d in summary["day"]] == [row[0] for row in expected]
+        np.testing.assert_allclose(summary["low"], [row[1] for row in expected], rtol=1e-5)
+        np.testing.assert_allclose(summary["high"], [row[2] for row in expected], rtol=1e-5)
+        np.testing.assert_allclose(summary["precip"], [row[3] for row in expected], rtol=1e-4, atol=1e-5)
+        np.testing.assert_allclose(summary["pop"], [row[4] for row in expected], rtol=1e-5)
+        # Summarizing one city alone gives the same result as the batch
+        alone = daily_summaries([one])[0]
+        for column in summary:
+            np.testing.assert_array_equal(alone[column], summary[column])
+    assert series[0].nbytes < 1024
+    print("✅ Vectorized daily summaries match a plain-Python reference")
+
+
+def test_days_limit_and_empty_series():
+    series = ForecastSeries.from_payload(make_payload("Lisbon", 0, 4))
+    assert len(daily_summaries([series], days=2)[0]["day"]) == 2
+    empty = ForecastSeries.from_payload({"list": [], "city": {}})
+    result = daily_summaries([empty, series])
+    assert len(result[0]["day"]) == 0 and len(result[1]["day"]) == 5
+    print("✅ Day limit respected and empty series handled")
+
+
+class ForecastTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.requests = []
+
+    async def handle_async_request(self, request):
+        self.requests.append(request)
+        city = request.url.params["q"]
+        if city == "Atlantis":
+            return httpx.Response(404, json={"message": "city not found"})
+        return httpx.Response(200, json=make_payload(city, 0, len(city)))
+
+
+def test_forecast_tool_renders_compact_tables(monkeypatch):
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test")
+    transport = ForecastTransport()
+    monkeypatch.setattr(weather, "weather_client", OpenWeatherClient(api_key="test", transport=transport))
+    monkeypatch.setattr(weather, "forecast_cache", WeatherCache())
+
+    async def scenario():
+        first = await weather.get_weather_forecast(["Rome", "Florence", "Atlantis"], days=3)
+        again = await weather.get_weather_forecast(["rome"], days=3)
+        return first, again
+
+    first, again = asyncio.run(scenario())
+    assert first.count("📅") == 3
+    assert "📅 Rome (3-day forecast, local dates)" in first
+    assert "Sat 06-01" in first and "Mon 06-03" in first and "Tue 06-04" not in first
+    assert "📅 Atlantis: city not found" in first
+    assert len(first) < 800
+    assert again.startswith("📅 rome (3-day forecast")
+    assert len(transport.requests) == 3  # the repeat of Rome came from the cache
+    print("✅ Forecast tool returns short per-city tables and caches the series")